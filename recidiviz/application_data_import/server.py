@@ -149,8 +149,7 @@ def _import_pathways(state_code: str, filename: str) -> Tuple[str, HTTPStatus]:
             )
 
     metric_cache = PathwaysMetricCache.build(_FakeStateCode(state_code))
-    for metric in get_metrics_for_entity(db_entity):
-        metric_cache.reset_cache(metric)
+    metric_cache.warm_up(get_metrics_for_entity(db_entity))
 
     return "", HTTPStatus.OK
 
@@ -24,7 +24,17 @@ import logging
 import time
 from collections import defaultdict
 from concurrent import futures
-from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import pandas as pd
 import pytz
@@ -46,6 +56,7 @@ from more_itertools import one
 from recidiviz.big_query.big_query_view import BigQueryView
 from recidiviz.big_query.export.export_query_config import ExportQueryConfig
 from recidiviz.utils import environment, metadata
+from recidiviz.utils.prefetch import prefetch_in_background
 from recidiviz.utils.string import StrictStringFormatter
 
 _clients_by_project_id_by_region: Dict[str, Dict[str, bigquery.Client]] = defaultdict(
@@ -81,12 +92,17 @@ def client(project_id: str, region: str) -> bigquery.Client:
 # https://github.com/googleapis/python-storage/issues/253
 BIG_QUERY_CLIENT_MAX_CONNECTIONS = 10
 
+# The default number of result pages to download ahead of the page currently being
+# processed when streaming query results.
+DEFAULT_MAX_PREFETCHED_PAGES = 2
+
 DATASET_BACKUP_TABLE_EXPIRATION_MS = 7 * 24 * 60 * 60 * 1000  # 7 days
 
 CROSS_REGION_COPY_STATUS_ATTEMPT_SLEEP_TIME_SEC = 10
 # Timeout for just checking the status of the cross-region copy.
 DEFAULT_GET_TRANSFER_RUN_TIMEOUT_SEC = 30
 DEFAULT_CROSS_REGION_COPY_TIMEOUT_SEC = 15 * 60
+
 # Required value for the data_source_id field when copying datasets between regions
 CROSS_REGION_COPY_DATA_SOURCE_ID = "cross_region_copy"
 CROSS_REGION_COPY_DISPLAY_NAME_TEMPLATE = (
@@ -238,8 +254,9 @@ class BigQueryClient:
         destination_table_schema: List[bigquery.SchemaField],
         write_disposition: bigquery.WriteDisposition,
         skip_leading_rows: int = 0,
+        source_format: str = bigquery.SourceFormat.CSV,
     ) -> bigquery.job.LoadJob:
-        """Loads a table from CSV data in GCS to BigQuery.
+        """Loads a table from CSV (or Parquet) data in GCS to BigQuery.
 
         Given a desired table name, source data URI(s) and destination schema, loads the
         table into BigQuery.
@@ -262,7 +279,9 @@ class BigQueryClient:
                 completely (WRITE_TRUNCATE) or adds to the table with new rows
                 (WRITE_APPEND). By default, WRITE_APPEND is used.
             skip_leading_rows: Optional number of leading rows to skip on each input
-                file. Defaults to zero
+                file. Defaults to zero. Only applies to CSV files.
+            source_format: The bigquery.SourceFormat of the input files. Defaults to
+                CSV.
         Returns:
             The LoadJob object containing job details.
         """
@@ -379,7 +398,9 @@ class BigQueryClient:
         self,
         *,
         query_str: str,
-        query_parameters: List[bigquery.ScalarQueryParameter] = None,
+        query_parameters: Sequence[
+            Union[bigquery.ScalarQueryParameter, bigquery.ArrayQueryParameter]
+        ] = None,
         use_query_cache: bool,
     ) -> bigquery.QueryJob:
         """Runs a query in BigQuery asynchronously.
@@ -410,7 +431,8 @@ class BigQueryClient:
         process_page_fn: Callable[[List[bigquery.table.Row]], None],
     ) -> None:
         """Reads the given result set from the given query job in pages to limit how many rows are read into memory at
-        any given time, processing the results of each row with the given callable.
+        any given time, processing the results of each row with the given callable. The next page is downloaded in
+        the background while the current page is processed.
 
         Args:
             query_job: the query job from which to process results.
@@ -418,6 +440,26 @@ class BigQueryClient:
             process_page_fn: a callable function which takes in the paged rows and performs some operation.
         """
 
+    @abc.abstractmethod
+    def stream_query_result_pages(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: int,
+        max_prefetched_pages: int = DEFAULT_MAX_PREFETCHED_PAGES,
+    ) -> Iterator[List[bigquery.table.Row]]:
+        """Returns an iterator over pages of the result set of the given query job.
+        Pages are downloaded on a background thread, up to |max_prefetched_pages| ahead
+        of the caller, so that the caller can process one page while the next ones
+        download. At most (max_prefetched_pages + 1) * page_size rows are held in
+        memory at once.
+
+        Args:
+            query_job: the query job from which to read results.
+            page_size: the maximum number of rows in each page.
+            max_prefetched_pages: the maximum number of pages to download ahead of the
+                page currently being processed.
+        """
+
     @abc.abstractmethod
     def copy_view(
         self,
@@ -929,6 +971,7 @@ class BigQueryClientImpl(BigQueryClient):
         destination_table_schema: List[bigquery.SchemaField],
         write_disposition: bigquery.WriteDisposition,
         skip_leading_rows: int = 0,
+        source_format: str = bigquery.SourceFormat.CSV,
     ) -> bigquery.job.LoadJob:
         """Triggers a load job, i.e. a job that will copy all of the data from the given
         Cloud Storage source into the given BigQuery destination. Returns once the job
@@ -941,10 +984,15 @@ class BigQueryClientImpl(BigQueryClient):
 
         job_config = bigquery.LoadJobConfig()
         job_config.schema = destination_table_schema
-        job_config.source_format = bigquery.SourceFormat.CSV
-        job_config.allow_quoted_newlines = True
+        job_config.source_format = source_format
         job_config.write_disposition = write_disposition
-        job_config.skip_leading_rows = skip_leading_rows
+        if source_format == bigquery.SourceFormat.CSV:
+            job_config.allow_quoted_newlines = True
+            job_config.skip_leading_rows = skip_leading_rows
+        elif skip_leading_rows:
+            raise ValueError(
+                f"Cannot skip leading rows for source format [{source_format}]."
+            )
 
         load_job = self.client.load_table_from_uri(
             source_uris, destination_table_ref, job_config=job_config
@@ -1129,11 +1177,13 @@ class BigQueryClientImpl(BigQueryClient):
         self,
         *,
         query_str: str,
-        query_parameters: List[bigquery.ScalarQueryParameter] = None,
+        query_parameters: Sequence[
+            Union[bigquery.ScalarQueryParameter, bigquery.ArrayQueryParameter]
+        ] = None,
         use_query_cache: bool,
     ) -> bigquery.QueryJob:
         job_config = bigquery.QueryJobConfig(use_query_cache=use_query_cache)
-        job_config.query_parameters = query_parameters or []
+        job_config.query_parameters = list(query_parameters or [])
 
         return self.client.query(
             query=query_str,
@@ -1152,36 +1202,33 @@ class BigQueryClientImpl(BigQueryClient):
             process_page_fn.__name__,
         )
 
-        start_index = 0
-
-        while True:
-            page_rows: bigquery.table.RowIterator = query_job.result(
-                max_results=page_size, start_index=start_index
-            )
+        num_rows_processed = 0
+        for page_rows in self.stream_query_result_pages(query_job, page_size):
             logging.info(
                 "Retrieved result set from query page of size [%d] starting at index [%d]",
-                page_size,
-                start_index,
+                len(page_rows),
+                num_rows_processed,
             )
+            process_page_fn(page_rows)
 
-            num_rows_read = 0
-            processed_rows: List[bigquery.table.Row] = []
-            for row in page_rows:
-                num_rows_read += 1
-                processed_rows.append(row)
+            num_rows_processed += len(page_rows)
+            logging.info("Processed [%d] rows...", num_rows_processed)
 
-            logging.info(
-                "Processed [%d] rows from query page starting at index [%d]",
-                num_rows_read,
-                start_index,
-            )
-            if num_rows_read == 0:
-                break
+    def stream_query_result_pages(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: int,
+        max_prefetched_pages: int = DEFAULT_MAX_PREFETCHED_PAGES,
+    ) -> Iterator[List[bigquery.table.Row]]:
+        # Reading pages via the iterator follows page tokens, rather than re-issuing a
+        # request for the job results at a new start index for every page.
+        row_iterator: bigquery.table.RowIterator = query_job.result(page_size=page_size)
 
-            process_page_fn(processed_rows)
+        def _read_pages() -> Iterator[List[bigquery.table.Row]]:
+            for page in row_iterator.pages:
+                yield list(page)
 
-            start_index += num_rows_read
-            logging.info("Processed [%d] rows...", start_index)
+        return prefetch_in_background(_read_pages(), max_prefetched_pages)
 
     def copy_view(
         self,
@@ -16,7 +16,10 @@
 # =============================================================================
 """Implements a class that allows us to walk across a DAG of BigQueryViews
 and perform actions on each of them in some order."""
+import heapq
 import logging
+import time
+from collections import Counter
 from concurrent import futures
 from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar
 
@@ -156,6 +159,44 @@ class BigQueryViewDagNodeFamily:
     child_dfs_tree_str: str = attr.ib(default=None)
 
 
+@attr.s(frozen=True, kw_only=True)
+class ProcessDagPerfStats:
+    """Performance information about a single run of
+    BigQueryViewDagWalker.process_dag()."""
+
+    # The wall time of the full DAG walk
+    total_runtime_sec: float = attr.ib()
+    # The time spent processing each individual view
+    view_runtimes_sec: Dict[BigQueryAddress, float] = attr.ib()
+    # The chain of views with the longest total processing time, ordered from root
+    # to leaf. The DAG walk can never finish faster than the sum of these runtimes.
+    critical_path: List[BigQueryAddress] = attr.ib()
+    # The sum of the processing times of all views on the critical path
+    critical_path_runtime_sec: float = attr.ib()
+    # The number of views at each level of the DAG, where a view's level is the
+    # length of the longest chain of views above it (i.e. roots are level 0). This is
+    # an upper bound on the parallelism available as we walk that level.
+    num_views_by_level: Dict[int, int] = attr.ib()
+
+    def log_summary(self) -> None:
+        logging.info(
+            "Processed [%s] views in [%.1f] seconds. Critical path runtime: [%.1f] "
+            "seconds.",
+            len(self.view_runtimes_sec),
+            self.total_runtime_sec,
+            self.critical_path_runtime_sec,
+        )
+        logging.info(
+            "Critical path: %s",
+            [
+                f"{address.dataset_id}.{address.table_id} "
+                f"({self.view_runtimes_sec.get(address, 0.0):.1f}s)"
+                for address in self.critical_path
+            ],
+        )
+        logging.info("Number of views per DAG level: %s", self.num_views_by_level)
+
+
 class BigQueryViewDagWalker:
     """Class implementation that walks a DAG of BigQueryViews."""
 
@@ -248,21 +289,91 @@ class BigQueryViewDagWalker:
         return self.nodes_by_key[DagKey.for_view(view)]
 
     def process_dag(
-        self, view_process_fn: Callable[[BigQueryView, ParentResultsT], ViewResultT]
+        self,
+        view_process_fn: Callable[[BigQueryView, ParentResultsT], ViewResultT],
+        *,
+        prioritize_critical_path: bool = False,
+        view_runtime_estimates_sec: Optional[Dict[BigQueryAddress, float]] = None,
     ) -> Dict[BigQueryView, ViewResultT]:
         """This method provides a level-by-level "breadth-first" traversal of a DAG and executes
-        view_process_fn on every node in level order."""
+        view_process_fn on every node in level order.
+
+        If |prioritize_critical_path| is True, nodes that are ready to be processed are
+        not submitted to the thread pool immediately. Instead, whenever a worker frees
+        up, we submit the ready node with the longest remaining downstream path, so that
+        long chains of views start as early as possible. Path lengths are computed from
+        |view_runtime_estimates_sec| (e.g. historical materialization times) if
+        provided, otherwise each view is given equal weight (i.e. DAG depth). Once the
+        walk completes, a summary of the critical path and per-level parallelism is
+        logged.
+        """
         processed: Set[DagKey] = set()
         queue: Set[BigQueryViewDagNode] = set(self.roots)
         result: Dict[BigQueryView, ViewResultT] = {}
+
+        downstream_path_weights: Dict[DagKey, float] = {}
+        if prioritize_critical_path:
+            downstream_path_weights = self._get_downstream_path_weights(
+                self._get_view_weights(view_runtime_estimates_sec)
+            )
+        # Heap of (negative downstream path weight, tiebreaker, node, parent results)
+        # for nodes whose parents have all been processed but have not yet been
+        # submitted to the thread pool.
+        ready_heap: List[
+            Tuple[float, Tuple[str, str], BigQueryViewDagNode, ParentResultsT]
+        ] = []
+        view_runtimes_sec: Dict[BigQueryAddress, float] = {}
+
+        def _timed_process_fn(
+            view: BigQueryView, parent_results: ParentResultsT
+        ) -> ViewResultT:
+            start = time.perf_counter()
+            view_result = view_process_fn(view, parent_results)
+            view_runtimes_sec[view.address] = time.perf_counter() - start
+            return view_result
+
+        walk_start = time.perf_counter()
         with futures.ThreadPoolExecutor(max_workers=DAG_WALKER_MAX_WORKERS) as executor:
-            future_to_view = {
-                executor.submit(
-                    structured_logging.with_context(view_process_fn), node.view, {}
-                ): node
-                for node in self.roots
-            }
-            processing = {node.dag_key for node in future_to_view.values()}
+            future_to_view: Dict[futures.Future, BigQueryViewDagNode] = {}
+            processing: Set[DagKey] = set()
+
+            def _submit(
+                node: BigQueryViewDagNode, parent_results: ParentResultsT
+            ) -> None:
+                future = executor.submit(
+                    structured_logging.with_context(_timed_process_fn),
+                    node.view,
+                    parent_results,
+                )
+                future_to_view[future] = node
+                processing.add(node.dag_key)
+
+            def _schedule(
+                node: BigQueryViewDagNode, parent_results: ParentResultsT
+            ) -> None:
+                if not prioritize_critical_path:
+                    _submit(node, parent_results)
+                    return
+                heapq.heappush(
+                    ready_heap,
+                    (
+                        -downstream_path_weights[node.dag_key],
+                        node.dag_key.as_tuple(),
+                        node,
+                        parent_results,
+                    ),
+                )
+                processing.add(node.dag_key)
+
+            def _submit_ready_nodes() -> None:
+                while ready_heap and len(future_to_view) < DAG_WALKER_MAX_WORKERS:
+                    _, _, node, parent_results = heapq.heappop(ready_heap)
+                    _submit(node, parent_results)
+
+            for root in self.roots:
+                _schedule(root, {})
+            _submit_ready_nodes()
+
             while processing:
                 completed, _not_completed = futures.wait(
                     future_to_view.keys(), return_when="FIRST_COMPLETED"
@@ -303,15 +414,120 @@ class BigQueryViewDagWalker:
                                 parent_view = self.nodes_by_key[parent_key].view
                                 parent_results[parent_view] = result[parent_view]
                         if parents_all_processed:
-                            future = executor.submit(
-                                structured_logging.with_context(view_process_fn),
-                                child_node.view,
-                                parent_results,
-                            )
-                            future_to_view[future] = child_node
-                            processing.add(child_node.dag_key)
+                            _schedule(child_node, parent_results)
+                _submit_ready_nodes()
+
+        if prioritize_critical_path:
+            self.get_perf_stats(
+                view_runtimes_sec=view_runtimes_sec,
+                total_runtime_sec=time.perf_counter() - walk_start,
+            ).log_summary()
         return result
 
+    def _get_view_weights(
+        self, view_runtime_estimates_sec: Optional[Dict[BigQueryAddress, float]]
+    ) -> Dict[DagKey, float]:
+        """Returns the weight to use for each node when computing path lengths. Views
+        without a runtime estimate are assigned the mean of all known estimates, or 1 if
+        there are no estimates at all (in which case path lengths are DAG depths).
+        """
+        estimates = {
+            address: runtime
+            for address, runtime in (view_runtime_estimates_sec or {}).items()
+            if DagKey(view_address=address) in self.nodes_by_key
+        }
+        default_weight = sum(estimates.values()) / len(estimates) if estimates else 1.0
+        return {
+            key: estimates.get(key.view_address, default_weight)
+            for key in self.nodes_by_key
+        }
+
+    def _get_topologically_sorted_keys(self) -> List[DagKey]:
+        """Returns the keys of all nodes in this DAG such that every node comes after
+        all of its parents.
+        """
+        num_unprocessed_parents = {
+            key: len([p for p in node.parent_keys if p in self.nodes_by_key])
+            for key, node in self.nodes_by_key.items()
+        }
+        to_visit = [node.dag_key for node in self.roots]
+        sorted_keys: List[DagKey] = []
+        while to_visit:
+            key = to_visit.pop()
+            sorted_keys.append(key)
+            for child_key in self.nodes_by_key[key].child_keys:
+                num_unprocessed_parents[child_key] -= 1
+                if not num_unprocessed_parents[child_key]:
+                    to_visit.append(child_key)
+        return sorted_keys
+
+    def _get_downstream_path_weights(
+        self, view_weights: Dict[DagKey, float]
+    ) -> Dict[DagKey, float]:
+        """For each node, returns the total weight of the heaviest path that starts at
+        that node and ends at a leaf node, including the node itself.
+        """
+        path_weights: Dict[DagKey, float] = {}
+        for key in reversed(self._get_topologically_sorted_keys()):
+            path_weights[key] = view_weights[key] + max(
+                (path_weights[c] for c in self.nodes_by_key[key].child_keys),
+                default=0.0,
+            )
+        return path_weights
+
+    def get_perf_stats(
+        self,
+        view_runtimes_sec: Dict[BigQueryAddress, float],
+        total_runtime_sec: float,
+    ) -> "ProcessDagPerfStats":
+        """Builds a ProcessDagPerfStats object for a walk of this DAG where each view
+        took the amount of time in |view_runtimes_sec| to process.
+        """
+        sorted_keys = self._get_topologically_sorted_keys()
+
+        # Heaviest path ending at each node, along with the parent on that path.
+        upstream_path_weights: Dict[DagKey, float] = {}
+        heaviest_parent: Dict[DagKey, Optional[DagKey]] = {}
+        levels: Dict[DagKey, int] = {}
+        for key in sorted_keys:
+            parent_keys = [
+                p for p in self.nodes_by_key[key].parent_keys if p in self.nodes_by_key
+            ]
+            levels[key] = max((levels[p] + 1 for p in parent_keys), default=0)
+            parent_key = (
+                max(
+                    parent_keys,
+                    key=lambda p: (upstream_path_weights[p], p.as_tuple()),
+                )
+                if parent_keys
+                else None
+            )
+            heaviest_parent[key] = parent_key
+            upstream_path_weights[key] = view_runtimes_sec.get(
+                key.view_address, 0.0
+            ) + (upstream_path_weights[parent_key] if parent_key else 0.0)
+
+        critical_path: List[BigQueryAddress] = []
+        critical_path_runtime_sec = 0.0
+        if upstream_path_weights:
+            last_key = max(
+                upstream_path_weights,
+                key=lambda k: (upstream_path_weights[k], k.as_tuple()),
+            )
+            critical_path_runtime_sec = upstream_path_weights[last_key]
+            path_key: Optional[DagKey] = last_key
+            while path_key:
+                critical_path.insert(0, path_key.view_address)
+                path_key = heaviest_parent[path_key]
+
+        return ProcessDagPerfStats(
+            total_runtime_sec=total_runtime_sec,
+            view_runtimes_sec=view_runtimes_sec,
+            critical_path=critical_path,
+            critical_path_runtime_sec=critical_path_runtime_sec,
+            num_views_by_level=dict(sorted(Counter(levels.values()).items())),
+        )
+
     def _check_sub_dag_input_views(self, *, input_views: List[BigQueryView]) -> None:
         missing_views = set(input_views).difference(self.views)
         if missing_views:
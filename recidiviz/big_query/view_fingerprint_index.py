@@ -0,0 +1,392 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Class that persists fingerprints of all deployed views (and the source tables they
+read from) to BQ so that view deploys can determine which views need to be updated
+without querying BigQuery for the state of every view.
+"""
+import hashlib
+import json
+import logging
+from concurrent import futures
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import attr
+from google.api_core import exceptions
+from google.cloud import bigquery
+
+from recidiviz.big_query.big_query_address import BigQueryAddress
+from recidiviz.big_query.big_query_client import BigQueryClient
+from recidiviz.big_query.big_query_view import BigQueryView
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.big_query.rematerialization_success_persister import (
+    VIEW_UPDATE_METADATA_DATASET,
+)
+from recidiviz.utils import structured_logging
+
+# Table that holds a fingerprint for every view that was deployed in the most recent
+# successful view update, as well as for every source table those views read from.
+VIEW_FINGERPRINT_INDEX_TABLE_ID = "view_fingerprint_index"
+
+DATASET_ID_COL = "dataset_id"
+TABLE_ID_COL = "table_id"
+VIEW_QUERY_HASH_COL = "view_query_hash"
+CLUSTERING_FIELDS_COL = "clustering_fields"
+SCHEMA_HASH_COL = "schema_hash"
+
+# Limit on the number of concurrent source dataset schema queries
+MAX_WORKERS = 10
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+@attr.s(frozen=True, kw_only=True)
+class BigQueryTableFingerprint:
+    """Summarizes the state of a view or source table that, if changed, means that a
+    view and all of its descendants must be redeployed.
+    """
+
+    address: BigQueryAddress = attr.ib()
+
+    # Hash of the view query, description and materialized address, if this is a view
+    view_query_hash: Optional[str] = attr.ib()
+
+    # Comma-separated list of clustering fields, if this is a view with clustering
+    # fields
+    clustering_fields: Optional[str] = attr.ib()
+
+    # Hash of the table schema, if this is a source table
+    schema_hash: Optional[str] = attr.ib()
+
+    @classmethod
+    def for_view(cls, view: BigQueryView) -> "BigQueryTableFingerprint":
+        """Builds a fingerprint for a view from everything that is deployed with it:
+        the query, the view description and, if the view is materialized, the
+        materialized table address (whose description is derived from the view's).
+        The materialized table schema is determined by the view query and the schemas
+        of the source tables it reads from, which have their own fingerprints.
+        """
+        materialized_address = view.materialized_address
+        view_definition = {
+            "view_query": view.view_query,
+            "description": view.description,
+            "materialized_address": (
+                [materialized_address.dataset_id, materialized_address.table_id]
+                if materialized_address
+                else None
+            ),
+        }
+        return BigQueryTableFingerprint(
+            address=view.address,
+            view_query_hash=_hash(json.dumps(view_definition, sort_keys=True)),
+            clustering_fields=(
+                ",".join(view.clustering_fields) if view.clustering_fields else None
+            ),
+            schema_hash=None,
+        )
+
+    @classmethod
+    def for_source_table(
+        cls, address: BigQueryAddress, schema_columns: List[Dict[str, Any]]
+    ) -> "BigQueryTableFingerprint":
+        """Builds a fingerprint for a source table with the provided columns, which
+        must be sorted by column position.
+        """
+        return BigQueryTableFingerprint(
+            address=address,
+            view_query_hash=None,
+            clustering_fields=None,
+            schema_hash=_hash(json.dumps(schema_columns, sort_keys=True)),
+        )
+
+    def as_row(self) -> Dict[str, Optional[str]]:
+        return {
+            DATASET_ID_COL: self.address.dataset_id,
+            TABLE_ID_COL: self.address.table_id,
+            VIEW_QUERY_HASH_COL: self.view_query_hash,
+            CLUSTERING_FIELDS_COL: self.clustering_fields,
+            SCHEMA_HASH_COL: self.schema_hash,
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Optional[str]]) -> "BigQueryTableFingerprint":
+        dataset_id = row[DATASET_ID_COL]
+        table_id = row[TABLE_ID_COL]
+        if not dataset_id or not table_id:
+            raise ValueError(f"Found fingerprint row with no address: {row}")
+        return BigQueryTableFingerprint(
+            address=BigQueryAddress(dataset_id=dataset_id, table_id=table_id),
+            view_query_hash=row[VIEW_QUERY_HASH_COL],
+            clustering_fields=row[CLUSTERING_FIELDS_COL],
+            schema_hash=row[SCHEMA_HASH_COL],
+        )
+
+
+class BigQueryViewFingerprintIndex:
+    """Class that persists fingerprints of deployed views and their source tables to
+    BQ and uses them to compute which views in a DAG have changed since the last
+    successful deploy.
+    """
+
+    def __init__(self, bq_client: BigQueryClient) -> None:
+        self.bq_client = bq_client
+        self.table_address = BigQueryAddress(
+            dataset_id=VIEW_UPDATE_METADATA_DATASET,
+            table_id=VIEW_FINGERPRINT_INDEX_TABLE_ID,
+        )
+
+    def load_fingerprints(self) -> Dict[BigQueryAddress, BigQueryTableFingerprint]:
+        """Returns the fingerprints saved by the most recent call to
+        save_fingerprints(), or an empty dict if nothing has been saved yet.
+        """
+        dataset_ref = self.bq_client.dataset_ref_for_id(self.table_address.dataset_id)
+        if not self.bq_client.table_exists(dataset_ref, self.table_address.table_id):
+            return {}
+        query_job = self.bq_client.run_query_async(
+            query_str=f"SELECT * FROM `{self.bq_client.project_id}.{self.table_address.dataset_id}.{self.table_address.table_id}`",
+            use_query_cache=False,
+        )
+        fingerprints = [
+            BigQueryTableFingerprint.from_row(dict(row)) for row in query_job
+        ]
+        return {f.address: f for f in fingerprints}
+
+    def save_fingerprints(
+        self, fingerprints: Sequence[BigQueryTableFingerprint]
+    ) -> None:
+        """Replaces the contents of the index with the provided fingerprints."""
+        dataset_ref = self.bq_client.dataset_ref_for_id(self.table_address.dataset_id)
+        self.bq_client.create_dataset_if_necessary(dataset_ref)
+        if not self.bq_client.table_exists(dataset_ref, self.table_address.table_id):
+            self.bq_client.create_table_with_schema(
+                dataset_ref.dataset_id,
+                self.table_address.table_id,
+                schema_fields=self._get_table_schema(),
+            )
+        self.bq_client.load_into_table_async(
+            dataset_ref,
+            self.table_address.table_id,
+            [f.as_row() for f in fingerprints],
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        ).result()
+
+    def invalidate_fingerprints(self, addresses: Set[BigQueryAddress]) -> None:
+        """Removes any saved fingerprints for the provided addresses, so that those
+        views are treated as changed the next time the index is used. Rows are removed
+        with a single DML DELETE so that fingerprints for other addresses are never
+        rewritten (and cannot be clobbered by a concurrent deploy).
+        """
+        if not addresses:
+            return
+        dataset_ref = self.bq_client.dataset_ref_for_id(self.table_address.dataset_id)
+        if not self.bq_client.table_exists(dataset_ref, self.table_address.table_id):
+            return
+        self.bq_client.run_query_async(
+            query_str=f"""
+DELETE FROM `{self.bq_client.project_id}.{self.table_address.dataset_id}.{self.table_address.table_id}`
+WHERE CONCAT({DATASET_ID_COL}, '.', {TABLE_ID_COL}) IN UNNEST(@addresses)
+""",
+            query_parameters=[
+                bigquery.ArrayQueryParameter(
+                    "addresses",
+                    bigquery.enums.SqlTypeNames.STRING.value,
+                    sorted(f"{a.dataset_id}.{a.table_id}" for a in addresses),
+                )
+            ],
+            use_query_cache=False,
+        ).result()
+
+    def get_current_fingerprints(
+        self, dag_walker: BigQueryViewDagWalker
+    ) -> Dict[BigQueryAddress, BigQueryTableFingerprint]:
+        """Computes fingerprints for every view in the DAG (locally) and for every
+        source table those views read from (with one INFORMATION_SCHEMA query per
+        source dataset).
+        """
+        fingerprints = {
+            v.address: BigQueryTableFingerprint.for_view(v) for v in dag_walker.views
+        }
+        source_table_addresses = {
+            parent_key.view_address
+            for node in dag_walker.nodes_by_key.values()
+            for parent_key in node.parent_keys
+            if parent_key not in dag_walker.nodes_by_key
+        }
+        source_datasets = {a.dataset_id for a in source_table_addresses}
+
+        with futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            schema_futures = [
+                executor.submit(
+                    structured_logging.with_context(self._get_source_table_schemas),
+                    dataset_id,
+                )
+                for dataset_id in source_datasets
+            ]
+            for future in futures.as_completed(schema_futures):
+                for address, schema_columns in future.result().items():
+                    if address in source_table_addresses:
+                        fingerprints[
+                            address
+                        ] = BigQueryTableFingerprint.for_source_table(
+                            address, schema_columns
+                        )
+        return fingerprints
+
+    def get_deployed_addresses(
+        self, dag_walker: BigQueryViewDagWalker
+    ) -> Set[BigQueryAddress]:
+        """Returns the addresses of every view and materialized table in the DAG that
+        currently exists in BigQuery, listing each dataset the DAG deploys to once.
+        """
+        deployed_addresses = {v.address for v in dag_walker.views} | {
+            v.materialized_address for v in dag_walker.views if v.materialized_address
+        }
+        dataset_ids = {a.dataset_id for a in deployed_addresses}
+
+        existing_addresses: Set[BigQueryAddress] = set()
+        with futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list_futures = [
+                executor.submit(
+                    structured_logging.with_context(self._list_table_addresses),
+                    dataset_id,
+                )
+                for dataset_id in dataset_ids
+            ]
+            for future in futures.as_completed(list_futures):
+                existing_addresses.update(future.result())
+        return deployed_addresses & existing_addresses
+
+    def _list_table_addresses(self, dataset_id: str) -> Set[BigQueryAddress]:
+        """Returns the addresses of all tables and views in the given dataset. If the
+        dataset does not exist, returns an empty set.
+        """
+        try:
+            return {
+                BigQueryAddress(dataset_id=dataset_id, table_id=table.table_id)
+                for table in self.bq_client.list_tables(dataset_id)
+            }
+        except exceptions.NotFound:
+            return set()
+
+    def _get_source_table_schemas(
+        self, dataset_id: str
+    ) -> Dict[BigQueryAddress, List[Dict[str, Any]]]:
+        """Returns the ordered list of columns for every table in the given dataset. If
+        the dataset does not exist, returns an empty dict.
+        """
+        if not self.bq_client.dataset_exists(
+            self.bq_client.dataset_ref_for_id(dataset_id)
+        ):
+            return {}
+        query_job = self.bq_client.run_query_async(
+            query_str=f"""
+SELECT table_name, column_name, data_type, is_nullable
+FROM `{self.bq_client.project_id}.{dataset_id}.INFORMATION_SCHEMA.COLUMNS`
+ORDER BY table_name, ordinal_position
+""",
+            use_query_cache=False,
+        )
+        schemas: Dict[BigQueryAddress, List[Dict[str, Any]]] = {}
+        for row in query_job:
+            address = BigQueryAddress(dataset_id=dataset_id, table_id=row["table_name"])
+            schemas.setdefault(address, []).append(
+                {
+                    "column_name": row["column_name"],
+                    "data_type": row["data_type"],
+                    "is_nullable": row["is_nullable"],
+                }
+            )
+        return schemas
+
+    @staticmethod
+    def get_changed_views(
+        dag_walker: BigQueryViewDagWalker,
+        stored_fingerprints: Dict[BigQueryAddress, BigQueryTableFingerprint],
+        current_fingerprints: Dict[BigQueryAddress, BigQueryTableFingerprint],
+        deployed_addresses: Set[BigQueryAddress],
+    ) -> List[BigQueryView]:
+        """Returns all views in the DAG that have changed since the stored fingerprints
+        were saved, that read directly from a source table that has changed or is
+        missing, or whose view or materialized table is not in |deployed_addresses|
+        (e.g. because it was deleted outside of a deploy). Descendants of these views
+        are not included.
+        """
+        changed_addresses: Set[BigQueryAddress] = {
+            address
+            for address, fingerprint in current_fingerprints.items()
+            if stored_fingerprints.get(address) != fingerprint
+        }
+        changed_views = []
+        for key, node in dag_walker.nodes_by_key.items():
+            view = node.view
+            if (
+                key.view_address in changed_addresses
+                or view.address not in deployed_addresses
+                or (
+                    view.materialized_address
+                    and view.materialized_address not in deployed_addresses
+                )
+            ):
+                changed_views.append(view)
+                continue
+            for parent_key in node.parent_keys:
+                if parent_key in dag_walker.nodes_by_key:
+                    continue
+                if (
+                    parent_key.view_address in changed_addresses
+                    or parent_key.view_address not in current_fingerprints
+                ):
+                    changed_views.append(view)
+                    break
+        logging.info(
+            "Found [%s] of [%s] views with changed queries or source tables, or that "
+            "are missing from BigQuery.",
+            len(changed_views),
+            len(dag_walker.views),
+        )
+        return changed_views
+
+    @staticmethod
+    def _get_table_schema() -> List[bigquery.SchemaField]:
+        return [
+            bigquery.SchemaField(
+                name=DATASET_ID_COL,
+                field_type=bigquery.enums.SqlTypeNames.STRING.value,
+                mode="REQUIRED",
+            ),
+            bigquery.SchemaField(
+                name=TABLE_ID_COL,
+                field_type=bigquery.enums.SqlTypeNames.STRING.value,
+                mode="REQUIRED",
+            ),
+            bigquery.SchemaField(
+                name=VIEW_QUERY_HASH_COL,
+                field_type=bigquery.enums.SqlTypeNames.STRING.value,
+                mode="NULLABLE",
+            ),
+            bigquery.SchemaField(
+                name=CLUSTERING_FIELDS_COL,
+                field_type=bigquery.enums.SqlTypeNames.STRING.value,
+                mode="NULLABLE",
+            ),
+            bigquery.SchemaField(
+                name=SCHEMA_HASH_COL,
+                field_type=bigquery.enums.SqlTypeNames.STRING.value,
+                mode="NULLABLE",
+            ),
+        ]
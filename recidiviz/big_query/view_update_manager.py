@@ -29,12 +29,14 @@ from opencensus.stats import aggregation, measure
 from opencensus.stats import view as opencensus_view
 
 from recidiviz.big_query.address_overrides import BigQueryAddressOverrides
+from recidiviz.big_query.big_query_address import BigQueryAddress
 from recidiviz.big_query.big_query_client import BigQueryClient, BigQueryClientImpl
 from recidiviz.big_query.big_query_view import BigQueryView, BigQueryViewBuilder
 from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
 from recidiviz.big_query.rematerialization_success_persister import (
     RematerializationSuccessPersister,
 )
+from recidiviz.big_query.view_fingerprint_index import BigQueryViewFingerprintIndex
 from recidiviz.big_query.view_update_manager_utils import (
     cleanup_datasets_and_delete_unmanaged_views,
     get_managed_view_and_materialized_table_addresses_by_dataset,
@@ -74,6 +76,10 @@ TEMP_DATASET_DEFAULT_TABLE_EXPIRATION_MS = 24 * 60 * 60 * 1000
 # https://github.com/googleapis/python-storage/issues/253
 MAX_WORKERS = 10
 
+# How far back to look for materialization jobs when estimating how long it will take
+# to rematerialize each view.
+MATERIALIZATION_RUNTIME_LOOKBACK_DAYS = 7
+
 
 def retry_predicate(exception: Exception) -> Callable[[Exception], bool]:
     """ "A function that will determine whether we should retry a given Google exception."""
@@ -97,6 +103,7 @@ def update_all_managed_views() -> Tuple[str, HTTPStatus]:
         view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
         view_builders_to_update=deployed_view_builders(metadata.project_id()),
         historically_managed_datasets_to_clean=DEPLOYED_DATASETS_THAT_HAVE_EVER_BEEN_MANAGED,
+        use_fingerprint_index=True,
     )
 
     logging.info("All managed views successfully updated and materialized.")
@@ -175,13 +182,67 @@ def rematerialize_views_for_view_builders(
 
             bq_client.materialize_view_to_table(view=v, use_query_cache=True)
 
-        views_to_rematerialize_dag.process_dag(_materialize_view)
+        views_to_rematerialize_dag.process_dag(
+            _materialize_view,
+            prioritize_critical_path=True,
+            view_runtime_estimates_sec=_get_historical_materialization_runtimes_sec(
+                bq_client, views_to_rematerialize_dag
+            ),
+        )
     except Exception as e:
         with monitoring.measurements() as measurements:
             measurements.measure_int_put(m_failed_view_update, 1)
         raise e from e
 
 
+def _get_historical_materialization_runtimes_sec(
+    bq_client: BigQueryClientImpl, dag_walker: BigQueryViewDagWalker
+) -> Dict[BigQueryAddress, float]:
+    """Returns the average runtime of recent materialization jobs for each
+    materialized view in the DAG, keyed by view address. Non-materialized views are
+    assigned a runtime of 0 since rematerialization does nothing for them. Views with
+    no recent materialization jobs are omitted. If the job history cannot be queried,
+    returns an empty dict so that the DAG walk falls back to depth-based
+    prioritization.
+    """
+    materialized_view_addresses = {
+        v.materialized_address: v.address
+        for v in dag_walker.views
+        if v.materialized_address
+    }
+    runtimes_sec: Dict[BigQueryAddress, float] = {
+        v.address: 0.0 for v in dag_walker.views if not v.materialized_address
+    }
+    query = f"""
+SELECT
+  destination_table.dataset_id AS dataset_id,
+  destination_table.table_id AS table_id,
+  AVG(TIMESTAMP_DIFF(end_time, start_time, MILLISECOND)) / 1000 AS runtime_sec
+FROM `region-{bq_client.region}`.INFORMATION_SCHEMA.JOBS_BY_PROJECT
+WHERE creation_time >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {MATERIALIZATION_RUNTIME_LOOKBACK_DAYS} DAY)
+  AND job_type = 'QUERY'
+  AND state = 'DONE'
+  AND error_result IS NULL
+  AND destination_table.project_id = '{bq_client.project_id}'
+GROUP BY 1, 2
+"""
+    try:
+        for row in bq_client.run_query_async(query_str=query, use_query_cache=False):
+            address = BigQueryAddress(
+                dataset_id=row["dataset_id"], table_id=row["table_id"]
+            )
+            if address in materialized_view_addresses:
+                runtimes_sec[materialized_view_addresses[address]] = row["runtime_sec"]
+    except exceptions.GoogleCloudError as e:
+        logging.warning(
+            "Unable to query historical materialization runtimes, falling back to "
+            "DAG depth for view prioritization: %s",
+            e,
+        )
+        return {}
+    return runtimes_sec
+
+
 def create_managed_dataset_and_deploy_views_for_view_builders(
     view_source_table_datasets: Set[str],
     view_builders_to_update: Sequence[BigQueryViewBuilder],
@@ -190,6 +251,8 @@ def create_managed_dataset_and_deploy_views_for_view_builders(
     bq_region_override: Optional[str] = None,
     force_materialize: bool = False,
     default_table_expiration_for_new_datasets: Optional[int] = None,
+    use_fingerprint_index: bool = False,
+    invalidate_fingerprint_index: bool = False,
 ) -> None:
     """Creates or updates all the views in the provided list with the view query in the
     provided view builder list. If any materialized view has been updated (or if an
@@ -199,9 +262,32 @@ def create_managed_dataset_and_deploy_views_for_view_builders(
     If a |historically_managed_datasets_to_clean| set is provided,
     then cleans up unmanaged views and datasets by deleting them from BigQuery.
 
+    If |use_fingerprint_index| is True, only views whose query, clustering fields or
+    source tables have changed since the last deploy that used the index, or that are
+    missing from BigQuery (and their descendants) are updated. Should only be used
+    when deploying the full set of deployed views, and may not be used with address or
+    region overrides.
+
+    If |invalidate_fingerprint_index| is True, fingerprints for the views being
+    updated are removed from the index before deploying, so that the next deploy that
+    uses the index redeploys them. Should be set by deploys of production views that do
+    not use the index themselves, and may not be used with address or region overrides.
+
     Should only be called if we expect the views to have changed (either the view query
     or schema from querying underlying tables), e.g. at deploy time.
     """
+    if use_fingerprint_index and (address_overrides or bq_region_override):
+        raise ValueError(
+            "Can only use the view fingerprint index when deploying views without "
+            "address overrides and in the default region."
+        )
+    if invalidate_fingerprint_index and (
+        use_fingerprint_index or address_overrides or bq_region_override
+    ):
+        raise ValueError(
+            "Can only invalidate the view fingerprint index when deploying views "
+            "without the index, without address overrides and in the default region."
+        )
     if default_table_expiration_for_new_datasets is None and address_overrides:
         default_table_expiration_for_new_datasets = (
             TEMP_DATASET_DEFAULT_TABLE_EXPIRATION_MS
@@ -223,6 +309,8 @@ def create_managed_dataset_and_deploy_views_for_view_builders(
             force_materialize,
             historically_managed_datasets_to_clean=historically_managed_datasets_to_clean,
             default_table_expiration_for_new_datasets=default_table_expiration_for_new_datasets,
+            use_fingerprint_index=use_fingerprint_index,
+            invalidate_fingerprint_index=invalidate_fingerprint_index,
         )
     except Exception as e:
         with monitoring.measurements() as measurements:
@@ -319,6 +407,8 @@ def _create_managed_dataset_and_deploy_views(
     force_materialize: bool,
     historically_managed_datasets_to_clean: Optional[Set[str]] = None,
     default_table_expiration_for_new_datasets: Optional[int] = None,
+    use_fingerprint_index: bool = False,
+    invalidate_fingerprint_index: bool = False,
 ) -> None:
     """Create and update the given views and their parent datasets. Cleans up unmanaged views and datasets
 
@@ -340,6 +430,12 @@ def _create_managed_dataset_and_deploy_views(
             process. If null, does not perform the cleanup step. If provided,
             will error if any dataset required for the |views_to_update| is not
             included in this set.
+        use_fingerprint_index: If True, only updates views that have changed since
+            the fingerprints in the BigQueryViewFingerprintIndex were saved or that
+            are missing from BigQuery, along with their descendants, then saves
+            fingerprints for the new deploy.
+        invalidate_fingerprint_index: If True, removes the fingerprints for all
+            |views_to_update| from the BigQueryViewFingerprintIndex before deploying.
     """
     bq_client = BigQueryClientImpl(region_override=bq_region_override)
     dag_walker = BigQueryViewDagWalker(views_to_update)
@@ -372,7 +468,48 @@ def _create_managed_dataset_and_deploy_views(
             bq_client, v, parent_results, force_materialize
         )
 
-    dag_walker.process_dag(process_fn)
+    if not use_fingerprint_index:
+        if invalidate_fingerprint_index:
+            # These views may differ from the versions recorded in the index once they
+            # are deployed, so make sure they are redeployed on the next deploy that
+            # uses the index. This happens before deploying so that the index is never
+            # stale, even if the deploy fails partway through.
+            BigQueryViewFingerprintIndex(bq_client).invalidate_fingerprints(
+                {v.address for v in views_to_update}
+            )
+        dag_walker.process_dag(process_fn)
+        return
+
+    fingerprint_index = BigQueryViewFingerprintIndex(bq_client)
+    current_fingerprints = fingerprint_index.get_current_fingerprints(dag_walker)
+    if force_materialize:
+        results = dag_walker.process_dag(process_fn)
+    else:
+        changed_views_dag = dag_walker.get_descendants_sub_dag(
+            fingerprint_index.get_changed_views(
+                dag_walker,
+                fingerprint_index.load_fingerprints(),
+                current_fingerprints,
+                fingerprint_index.get_deployed_addresses(dag_walker),
+            )
+        )
+        logging.info("Updating [%s] changed views.", len(changed_views_dag.views))
+        results = changed_views_dag.process_dag(process_fn)
+
+    # Views that were skipped have not been deployed, so we do not save their
+    # fingerprints in order to re-check whether they can be deployed next time.
+    skipped_addresses = {
+        v.address
+        for v, status in results.items()
+        if status == CreateOrUpdateViewStatus.SKIPPED
+    }
+    fingerprint_index.save_fingerprints(
+        [
+            f
+            for address, f in current_fingerprints.items()
+            if address not in skipped_addresses
+        ]
+    )
 
 
 def _create_or_update_view_and_materialize_if_necessary(
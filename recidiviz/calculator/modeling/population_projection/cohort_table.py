@@ -15,70 +15,150 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Encapsulate the population data per cohort and time step"""
+from typing import List
 
+import numpy as np
 import pandas as pd
 
 from recidiviz.calculator.modeling.population_projection.utils.transitions_utils import (
     SIG_FIGS,
 )
 
+# Number of cohorts and time steps to allocate space for when a table is created. The
+# populations array doubles in size whenever it runs out of room.
+_INITIAL_CAPACITY = 64
+
 
 class CohortTable:
-    """Store population counts for one cohort of people that enter one category in the same year"""
+    """Store population counts for one cohort of people that enter one category in the same year
+
+    Populations are stored in a NumPy array with one row per cohort, ordered by start_ts,
+    and one column per simulation ts, so that compartments can advance every cohort at
+    once with array operations. `cohort_df` exposes the same data as a DataFrame.
+    """
 
     def __init__(self) -> None:
-        self.cohort_df = pd.DataFrame(dtype=float)
-        self.cohort_df.index.name = "start_ts"
-        self.cohort_df.columns.name = "simulation_ts"
+        self._start_ts = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._simulation_ts: List[int] = []
+        self._populations = np.zeros((_INITIAL_CAPACITY, _INITIAL_CAPACITY))
+        self._num_cohorts = 0
+
+    @property
+    def cohort_df(self) -> pd.DataFrame:
+        cohort_df = pd.DataFrame(
+            self._populations[: self._num_cohorts, : len(self._simulation_ts)].copy(),
+            index=pd.Index(self.start_ts.copy(), name="start_ts"),
+            columns=pd.Index(self._simulation_ts, name="simulation_ts"),
+        )
+        return cohort_df
 
-    def get_latest_population(self) -> pd.Series:
-        if self.cohort_df.empty:
-            return pd.Series(
-                {start_ts: 0 for start_ts in self.cohort_df.index}, dtype=float
+    @cohort_df.setter
+    def cohort_df(self, cohort_df: pd.DataFrame) -> None:
+        cohort_df = cohort_df.sort_index().sort_index(axis=1)
+        self._simulation_ts = [int(ts) for ts in cohort_df.columns]
+        self._num_cohorts = len(cohort_df)
+        self._start_ts = np.empty(
+            max(self._num_cohorts, _INITIAL_CAPACITY), dtype=np.int64
+        )
+        self._start_ts[: self._num_cohorts] = cohort_df.index.to_numpy(dtype=np.int64)
+        self._populations = np.zeros(
+            (
+                max(self._num_cohorts, _INITIAL_CAPACITY),
+                max(len(self._simulation_ts), _INITIAL_CAPACITY),
             )
+        )
+        self._populations[
+            : self._num_cohorts, : len(self._simulation_ts)
+        ] = cohort_df.to_numpy(dtype=float)
+
+    @property
+    def start_ts(self) -> np.ndarray:
+        """The start ts of each cohort, in ascending order"""
+        return self._start_ts[: self._num_cohorts]
+
+    def get_latest_population_array(self) -> np.ndarray:
+        """Cohort populations at the end of the latest ts, ordered like `start_ts`"""
+        if not self._simulation_ts:
+            return np.zeros(self._num_cohorts)
+        return self._populations[: self._num_cohorts, len(self._simulation_ts) - 1]
+
+    def get_latest_population(self) -> pd.Series:
+        index = pd.Index(self.start_ts.copy(), name="start_ts")
+        if not self._simulation_ts:
+            return pd.Series(0, index=index, dtype=float)
 
-        return self.cohort_df.iloc[:, -1]
+        return pd.Series(
+            self.get_latest_population_array().copy(),
+            index=index,
+            name=self._simulation_ts[-1],
+        )
 
     def get_per_ts_population(self) -> pd.Series:
         return self.cohort_df.sum(axis=0)
 
     def append_ts_end_count(self, cohort_sizes: pd.Series, projection_ts: int) -> None:
         """Append the cohort sizes for the end of the projection ts"""
-        latest_population = self.get_latest_population()
-        if (round(cohort_sizes, SIG_FIGS) > round(latest_population, SIG_FIGS)).any():
+        self.append_ts_end_populations(
+            cohort_sizes.reindex(self.start_ts).to_numpy(dtype=float), projection_ts
+        )
+
+    def append_ts_end_populations(
+        self, cohort_sizes: np.ndarray, projection_ts: int
+    ) -> None:
+        """Append the cohort sizes for the end of the projection ts, ordered like
+        `start_ts`"""
+        latest_population = self.get_latest_population_array()
+        if (
+            np.round(cohort_sizes, SIG_FIGS) > np.round(latest_population, SIG_FIGS)
+        ).any():
+            too_large = cohort_sizes > latest_population
             raise ValueError(
                 "Cannot append cohort data that is larger than the latest population\n"
-                f"Latest population: {latest_population[cohort_sizes > latest_population]}\n"
-                f"Attempting to append: {cohort_sizes[cohort_sizes > latest_population]}"
+                f"Latest population: {pd.Series(latest_population[too_large], index=self.start_ts[too_large])}\n"
+                f"Attempting to append: {pd.Series(cohort_sizes[too_large], index=self.start_ts[too_large])}"
             )
 
-        if projection_ts in self.cohort_df.columns:
+        if projection_ts in self._simulation_ts:
             raise ValueError(f"Cannot overwrite cohort for time {projection_ts}")
 
-        self.cohort_df[projection_ts] = cohort_sizes
+        self._ensure_capacity(self._num_cohorts, len(self._simulation_ts) + 1)
+        self._populations[: self._num_cohorts, len(self._simulation_ts)] = cohort_sizes
+        self._simulation_ts.append(projection_ts)
 
     def append_cohort(self, cohort_size: float, projection_ts: int) -> None:
-        """Add a new cohort to the bottom of the cohort table"""
-        if projection_ts not in self.cohort_df.columns:
+        """Add a new cohort to the cohort table"""
+        if projection_ts not in self._simulation_ts:
             raise ValueError(
                 f"Cannot append cohort with start time {projection_ts} outside of CohortTable timeline "
-                f"{self.cohort_df.columns}"
+                f"{self._simulation_ts}"
             )
-        if projection_ts in self.cohort_df.index:
+        if projection_ts in self.start_ts:
             raise ValueError(f"Cannot overwrite cohort for time {projection_ts}")
-        self.cohort_df = pd.concat(
-            [
-                self.cohort_df,
-                pd.DataFrame({projection_ts: [cohort_size]}, index=[projection_ts]),
-            ]
-        ).fillna(0)
+
+        self._ensure_capacity(self._num_cohorts + 1, len(self._simulation_ts))
+        num_ts = len(self._simulation_ts)
+        # Keep cohorts ordered by start_ts, shifting any later cohorts down one row
+        row = int(np.searchsorted(self.start_ts, projection_ts))
+        self._start_ts[row + 1 : self._num_cohorts + 1] = self._start_ts[
+            row : self._num_cohorts
+        ]
+        self._populations[row + 1 : self._num_cohorts + 1, :num_ts] = self._populations[
+            row : self._num_cohorts, :num_ts
+        ]
+        self._start_ts[row] = projection_ts
+        self._populations[row, :num_ts] = 0
+        self._populations[row, self._simulation_ts.index(projection_ts)] = cohort_size
+        self._num_cohorts += 1
+
+        populations = self._populations[: self._num_cohorts, :num_ts]
+        populations[np.isnan(populations)] = 0
 
     def scale_cohort_size(self, scalar: float) -> None:
         if scalar < 0:
             raise ValueError(f"Cannot scale cohort by a negative factor: {scalar}")
-        self.cohort_df *= scalar
+        self._populations[: self._num_cohorts, : len(self._simulation_ts)] *= scalar
 
-    def get_cohort_timeline(self, cohort_start_year: int) -> pd.DataFrame:
+    def get_cohort_timeline(self, cohort_start_year: int) -> pd.Series:
         return self.cohort_df.loc[cohort_start_year]
 
     def pop_cohorts(self) -> pd.DataFrame:
@@ -92,3 +172,18 @@ class CohortTable:
     ) -> None:
         """ingest new cohort_df from cross-simulation flow"""
         self.cohort_df = cross_simulation_flows
+
+    def _ensure_capacity(self, num_cohorts: int, num_ts: int) -> None:
+        """Grow the populations array so it can hold |num_cohorts| x |num_ts| values"""
+        rows, columns = self._populations.shape
+        if num_cohorts <= rows and num_ts <= columns:
+            return
+        new_rows = rows if num_cohorts <= rows else max(2 * rows, num_cohorts)
+        new_columns = columns if num_ts <= columns else max(2 * columns, num_ts)
+        populations = np.zeros((new_rows, new_columns))
+        populations[:rows, :columns] = self._populations
+        self._populations = populations
+        if new_rows > rows:
+            start_ts = np.empty(new_rows, dtype=np.int64)
+            start_ts[:rows] = self._start_ts
+            self._start_ts = start_ts
@@ -17,8 +17,9 @@
 """FullCompartment-specific table containing probabilities of transition to other FullCompartments"""
 
 import copy
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 from recidiviz.calculator.modeling.population_projection.spark_policy import SparkPolicy
@@ -43,6 +44,10 @@ class CompartmentTransitions:
 
         self.transition_tables: Dict[int, TransitionTable] = {}
 
+        # per-ts transition tables as arrays, which don't change once the transition
+        # tables are normalized
+        self._per_ts_transition_arrays: Dict[int, Tuple[np.ndarray, List[str]]] = {}
+
     @staticmethod
     def _check_inputs_valid(historical_outflows: pd.DataFrame) -> None:
         """Check historical data passed to CompartmentTransitions is valid."""
@@ -84,6 +89,7 @@ class CompartmentTransitions:
 
     def initialize_transition_tables(self, policy_list: List[SparkPolicy]) -> None:
         """Populate the 'before' transition table and initializes the max_sentence from historical data"""
+        self._per_ts_transition_arrays = {}
         self.transition_tables[MIN_POSSIBLE_POLICY_TS] = TransitionTable(
             MIN_POSSIBLE_POLICY_TS, []
         )
@@ -123,3 +129,21 @@ class CompartmentTransitions:
         policy_time_steps.sort(reverse=True)
         # take transitions from the most recent table whose policy ts has already passed
         return self.transition_tables[policy_time_steps[0]].get_per_ts_table(current_ts)
+
+    def get_per_ts_transition_array(
+        self, current_ts: int
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Returns the per-ts transition table as an array with one row per ts spent in
+        the compartment (starting from 1), along with the outflow for each column."""
+        policy_ts = max(ts for ts in self.transition_tables if ts <= current_ts)
+        table_ts = min(
+            current_ts, self.transition_tables[policy_ts].get_last_varying_ts()
+        )
+        if table_ts not in self._per_ts_transition_arrays:
+            per_ts_table = self.get_per_ts_transition_table(table_ts)
+            per_ts_table = per_ts_table.reindex(range(1, len(per_ts_table) + 1))
+            self._per_ts_transition_arrays[table_ts] = (
+                per_ts_table.to_numpy(dtype=float),
+                list(per_ts_table.columns),
+            )
+        return self._per_ts_transition_arrays[table_ts]
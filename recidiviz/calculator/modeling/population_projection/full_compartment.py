@@ -55,13 +55,13 @@ class FullCompartment(SparkCompartment):
         # transition tables object from compartment out
         self.compartment_transitions = compartment_transitions
 
-        # Series containing compartment population at the end of each ts in the simulation
-        self.end_ts_populations = pd.Series(dtype=float)
+        # compartment population at the end of each ts in the simulation
+        self.end_ts_populations: Dict[int, float] = {}
 
     def single_cohort_intitialize(self, total_population: int) -> None:
         """Populate cohort table with single starting cohort"""
-        self.cohorts.append_ts_end_count(
-            self.cohorts.get_latest_population(), self.current_ts
+        self.cohorts.append_ts_end_populations(
+            self.cohorts.get_latest_population_array(), self.current_ts
         )
         self.ingest_incoming_cohort({self.tag: total_population})
         self.create_new_cohort()
@@ -70,49 +70,53 @@ class FullCompartment(SparkCompartment):
     def _generate_outflow_dict(self) -> Dict[str, float]:
         """step forward all cohorts one time step and generate outflow dict"""
 
-        per_ts_transitions = self.compartment_transitions.get_per_ts_transition_table(
-            self.current_ts
-        )
+        (
+            per_ts_transitions,
+            transition_columns,
+        ) = self.compartment_transitions.get_per_ts_transition_array(self.current_ts)
 
-        latest_ts_pop = self.cohorts.get_latest_population()
+        latest_ts_pop = self.cohorts.get_latest_population_array()
 
-        # convert index from starting year to years in compartment
-        latest_ts_pop.index = self.current_ts - latest_ts_pop.index
+        # convert cohort starting ts to ts spent in compartment
+        ts_in_compartment = self.current_ts - self.cohorts.start_ts
 
         # no cohort should start in cohort after current_ts
-        if any(latest_ts_pop.index <= 0):
+        if (ts_in_compartment <= 0).any():
             raise ValueError(
                 "Cohort cannot start after current time step\n"
                 f"Current time step: {self.current_ts}\n"
-                f"Cohort start times: {self.current_ts - latest_ts_pop.index}"
+                f"Cohort start times: {self.cohorts.start_ts}"
             )
 
-        latest_ts_pop_short = latest_ts_pop[
-            latest_ts_pop.index <= len(per_ts_transitions)
-        ]
-        latest_ts_pop_long = latest_ts_pop[
-            latest_ts_pop.index > len(per_ts_transitions)
-        ]
+        is_short = ts_in_compartment <= len(per_ts_transitions)
+        latest_ts_pop_long = latest_ts_pop[~is_short]
         if not np.isclose(latest_ts_pop_long, 0, SIG_FIGS).all():
             raise ValueError(
                 f"cohorts not empty after max sentence: {latest_ts_pop_long}"
             )
 
-        # broadcast latest cohort populations onto transition table
-        latest_ts_pop_short = per_ts_transitions.mul(
-            latest_ts_pop_short, axis=0
-        ).dropna(how="all")
-
-        latest_ts_pop = pd.concat([latest_ts_pop_long, latest_ts_pop_short.remaining])
+        # broadcast latest cohort populations onto the transition table rows for the
+        # number of ts each cohort has spent in the compartment
+        cohort_transitions = (
+            per_ts_transitions[ts_in_compartment[is_short] - 1]
+            * latest_ts_pop[is_short][:, np.newaxis]
+        )
 
-        # convert index back to starting year from years in compartment
-        latest_ts_pop.index = self.current_ts - latest_ts_pop.index
+        remaining_index = transition_columns.index("remaining")
+        end_ts_pop = latest_ts_pop.copy()
+        end_ts_pop[is_short] = cohort_transitions[:, remaining_index]
 
-        self.cohorts.append_ts_end_count(latest_ts_pop.sort_index(), self.current_ts)
+        self.cohorts.append_ts_end_populations(end_ts_pop, self.current_ts)
 
+        # sum in order of ts spent in compartment, i.e. from the newest cohort to the
+        # oldest, over a contiguous array per outflow so that NumPy uses the same
+        # pairwise summation as summing each DataFrame column
+        outflow_totals = np.nansum(
+            np.ascontiguousarray(cohort_transitions[::-1].T), axis=1
+        )
         outflow_dict = {
-            outflow: latest_ts_pop_short.sum(axis=0)[outflow]
-            for outflow in latest_ts_pop_short.columns
+            outflow: outflow_totals[i]
+            for i, outflow in enumerate(transition_columns)
             if outflow != "remaining"
         }
         return outflow_dict
@@ -190,12 +194,7 @@ class FullCompartment(SparkCompartment):
                 f"Cannot prepare_for_next_step() if population already recorded for this time step \n"
                 f"time step {self.current_ts} already in end_ts_populations {self.end_ts_populations}"
             )
-        self.end_ts_populations = pd.concat(
-            [
-                self.end_ts_populations,
-                pd.Series({self.current_ts: self.get_current_population()}),
-            ]
-        )
+        self.end_ts_populations[self.current_ts] = self.get_current_population()
 
         super().prepare_for_next_step()
 
@@ -204,10 +203,10 @@ class FullCompartment(SparkCompartment):
 
     def get_per_ts_population(self) -> pd.Series:
         """Return the per_ts projected population as a pd.Series of counts per EOTS"""
-        return self.end_ts_populations
+        return pd.Series(self.end_ts_populations, dtype=float)
 
     def get_current_population(self) -> float:
-        return self.cohorts.get_latest_population().sum()
+        return np.nansum(self.cohorts.get_latest_population_array())
 
     def get_cohort_df(self) -> pd.DataFrame:
         return self.cohorts.pop_cohorts()
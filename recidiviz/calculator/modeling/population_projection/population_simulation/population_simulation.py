@@ -103,15 +103,20 @@ class PopulationSimulation:
     def _collect_subsimulation_populations(self) -> pd.DataFrame:
         """Helper function for step_forward(). Collects subgroup populations for total population scaling."""
         disaggregation_axes = list(list(self.sub_group_ids_dict.values())[0].keys())
-        populations_df = pd.DataFrame()
+        sub_simulation_populations = []
         for simulation_id, simulation_attr in self.sub_group_ids_dict.items():
             sim_pops = self.sub_simulations[simulation_id].get_current_populations()
             sim_pops[disaggregation_axes] = pd.Series(simulation_attr)
-            populations_df = pd.concat([populations_df, sim_pops])
-        return populations_df
+            sub_simulation_populations.append(sim_pops)
+        return pd.concat(sub_simulation_populations)
 
     def _cross_flow(self) -> None:
         """Helper function for step_forward. Transfer cohorts between SubSimulations"""
+        # Under the identity function every cohort stays in its SubSimulation, so there
+        # is no need to pop and re-ingest all the cohort tables
+        if self.cross_flow_function is PopulationSimulation.update_attributes_identity:
+            return
+
         cross_simulation_flows = pd.DataFrame()
         for sub_group_id, simulation_obj in self.sub_simulations.items():
             simulation_cohorts = simulation_obj.cross_flow()
@@ -186,6 +191,10 @@ class PopulationSimulation:
         ts_population_data = self.total_population_data[
             self.total_population_data.time_step == self.current_ts
         ]
+        # Nothing to scale to if there is no population data for this ts
+        if ts_population_data.empty:
+            return
+
         ts_population_data = (
             ts_population_data.groupby(population_df_sort_indices)
             .sum()
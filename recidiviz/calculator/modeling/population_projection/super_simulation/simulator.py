@@ -16,8 +16,12 @@
 # =============================================================================
 """SuperSimulation composed object for initializing simulations."""
 import logging
+import multiprocessing
+import sys
+from concurrent import futures
+from copy import copy
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -41,14 +45,66 @@ from recidiviz.calculator.modeling.population_projection.super_simulation.time_c
     TimeConverter,
 )
 
+# Name of a PopulationSimulation -> (user_inputs, data_inputs, policy_list, first_relevant_ts)
+_SimulationRuns = Dict[
+    str, Tuple[UserInputs, SimulationInputData, List[SparkPolicy], int]
+]
+
+# Runs to execute in a worker process. Populated by the pool initializer so that the
+# (read-only) inputs are inherited by forked workers instead of pickled per task.
+_worker_simulation_runs: _SimulationRuns = {}
+
+
+def _initialize_simulation_worker(simulation_runs: _SimulationRuns) -> None:
+    _worker_simulation_runs.clear()
+    _worker_simulation_runs.update(simulation_runs)
+
+
+def _run_simulation_in_worker(simulation_name: str, seed: int) -> PopulationSimulation:
+    # Seed per simulation so results don't depend on which worker ran which run
+    np.random.seed(seed)
+    return _run_population_simulation(*_worker_simulation_runs[simulation_name])
+
+
+def _run_population_simulation(
+    user_inputs: UserInputs,
+    data_inputs: SimulationInputData,
+    policy_list: List[SparkPolicy],
+    first_relevant_ts: int,
+) -> PopulationSimulation:
+    population_simulation = PopulationSimulationFactory.build_population_simulation(
+        user_inputs=user_inputs,
+        policy_list=policy_list,
+        first_relevant_ts=first_relevant_ts,
+        data_inputs=data_inputs,
+    )
+    population_simulation.simulate_policies()
+    return population_simulation
 
-class Simulator:
-    """Runs simulations for SuperSimulation."""
 
-    def __init__(self, microsim: bool, time_converter: TimeConverter) -> None:
+class Simulator:
+    """Runs simulations for SuperSimulation.
+
+    If `max_workers` is greater than 1, independent PopulationSimulations (policy and
+    control scenarios, run dates, backfill periods) are run in a pool of worker
+    processes. Inputs are shared with the workers when the pool is created rather
+    than sent with each run, and each finished PopulationSimulation is pickled back
+    to this process, so policies and override cross-flow functions must be picklable
+    (module-level functions or partials, not lambdas). Parallel runs each reseed
+    NumPy from a seed drawn up front, so they don't share the random state of this
+    process the way runs one after another do.
+    """
+
+    def __init__(
+        self,
+        microsim: bool,
+        time_converter: TimeConverter,
+        max_workers: Optional[int] = None,
+    ) -> None:
         self.pop_simulations: Dict[str, PopulationSimulation] = {}
         self.microsim = microsim
         self.time_converter = time_converter
+        self.max_workers = max_workers
 
     def get_population_simulations(self) -> Dict[str, PopulationSimulation]:
         if not self.pop_simulations:
@@ -73,16 +129,13 @@ class Simulator:
         """
         self._reset_pop_simulations()
 
-        self.pop_simulations["policy"] = self._build_population_simulation(
-            user_inputs, data_inputs, policy_list, first_relevant_ts
-        )
-        self.pop_simulations["control"] = self._build_population_simulation(
-            user_inputs, data_inputs, [], first_relevant_ts
+        self._run_population_simulations(
+            {
+                "policy": (user_inputs, data_inputs, policy_list, first_relevant_ts),
+                "control": (user_inputs, data_inputs, [], first_relevant_ts),
+            }
         )
 
-        self.pop_simulations["policy"].simulate_policies()
-        self.pop_simulations["control"].simulate_policies()
-
         results = {
             scenario: simulation.get_population_projections()
             for scenario, simulation in self.pop_simulations.items()
@@ -122,14 +175,10 @@ class Simulator:
             )
 
         # Run one simulation
-        self.pop_simulations[
-            "baseline_projections"
-        ] = self._build_population_simulation(
-            user_inputs, data_inputs, [], first_relevant_ts
+        self._run_population_simulations(
+            {"baseline_projections": (user_inputs, data_inputs, [], first_relevant_ts)}
         )
 
-        self.pop_simulations["baseline_projections"].simulate_policies()
-
         # log warnings from ARIMA model
         self._log_predicted_admissions_warnings()
 
@@ -173,15 +222,18 @@ class Simulator:
         if projection_time_steps_override is not None:
             user_inputs.projection_time_steps = projection_time_steps_override
 
+        simulation_runs: _SimulationRuns = {}
         for start_date, data_inputs in run_date_data_inputs.items():
             print(start_date)
             user_inputs.start_time_step = run_date_first_relevant_ts[start_date]
-            simulation_name = f"baseline_{start_date.date()}"
-            self.pop_simulations[simulation_name] = self._build_population_simulation(
-                user_inputs, data_inputs, [], run_date_first_relevant_ts[start_date]
+            simulation_runs[f"baseline_{start_date.date()}"] = (
+                copy(user_inputs),
+                data_inputs,
+                [],
+                run_date_first_relevant_ts[start_date],
             )
 
-            self.pop_simulations[simulation_name].simulate_policies()
+        self._run_population_simulations(simulation_runs)
 
         # log warnings from ARIMA model
         self._log_predicted_admissions_warnings()
@@ -199,16 +251,17 @@ class Simulator:
         """
         self._reset_pop_simulations()
 
-        for ts in np.arange(range_start, range_end, step_size):
-            self.pop_simulations[
-                f"backfill_period_{ts}_time_steps"
-            ] = self._build_population_simulation(
-                user_inputs,
-                data_inputs,
-                [],
-                first_relevant_ts=user_inputs.start_time_step - ts,
-            )
-            self.pop_simulations[f"backfill_period_{ts}_time_steps"].simulate_policies()
+        self._run_population_simulations(
+            {
+                f"backfill_period_{ts}_time_steps": (
+                    user_inputs,
+                    data_inputs,
+                    [],
+                    user_inputs.start_time_step - ts,
+                )
+                for ts in np.arange(range_start, range_end, step_size)
+            }
+        )
 
         # log warnings from ARIMA model
         self._log_predicted_admissions_warnings()
@@ -285,6 +338,45 @@ class Simulator:
     def _reset_pop_simulations(self) -> None:
         self.pop_simulations = {}
 
+    def _run_population_simulations(self, simulation_runs: _SimulationRuns) -> None:
+        """Build and run each PopulationSimulation in `simulation_runs`, adding them to
+        `pop_simulations` in the order they were given regardless of the order in which
+        they finish."""
+        max_workers = min(self.max_workers or 1, len(simulation_runs))
+        if max_workers <= 1:
+            for simulation_name, simulation_run in simulation_runs.items():
+                self.pop_simulations[simulation_name] = _run_population_simulation(
+                    *simulation_run
+                )
+            return
+
+        # Draw the seeds up front so parallel results only depend on the global seed
+        seeds = np.random.randint(
+            np.iinfo(np.int32).max, size=len(simulation_runs)
+        ).tolist()
+
+        # Forked workers inherit the inputs set up by the initializer; fork is only
+        # safe to rely on on Linux, so other platforms use their default start method
+        mp_context = (
+            multiprocessing.get_context("fork")
+            if sys.platform.startswith("linux")
+            else None
+        )
+        with futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_initialize_simulation_worker,
+            initargs=(simulation_runs,),
+        ) as executor:
+            simulation_futures = {
+                simulation_name: executor.submit(
+                    _run_simulation_in_worker, simulation_name, seed
+                )
+                for simulation_name, seed in zip(simulation_runs, seeds)
+            }
+            for simulation_name, future in simulation_futures.items():
+                self.pop_simulations[simulation_name] = future.result()
+
     def _log_predicted_admissions_warnings(self) -> None:
         """
         Checks if PredictedAdmissions objects have any warnings. If so, log them.
@@ -309,17 +401,3 @@ class Simulator:
         while warnings:
             w = warnings.pop()
             logging.warning(w)
-
-    @staticmethod
-    def _build_population_simulation(
-        user_inputs: UserInputs,
-        data_inputs: SimulationInputData,
-        policy_list: List[SparkPolicy],
-        first_relevant_ts: int,
-    ) -> PopulationSimulation:
-        return PopulationSimulationFactory.build_population_simulation(
-            user_inputs=user_inputs,
-            policy_list=policy_list,
-            first_relevant_ts=first_relevant_ts,
-            data_inputs=data_inputs,
-        )
@@ -15,7 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Population projection simulation initializer object -- instantiates SuperSimulation"""
-from typing import Dict, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 
@@ -47,8 +47,12 @@ class SuperSimulationFactory:
     """Parse yaml config and initialize a SuperSimulation"""
 
     @classmethod
-    def build_super_simulation(cls, yaml_file_path: str) -> SuperSimulation:
-        """Initialize a SuperSimulation object using the config defined in the YAML file"""
+    def build_super_simulation(
+        cls, yaml_file_path: str, max_workers: Optional[int] = None
+    ) -> SuperSimulation:
+        """Initialize a SuperSimulation object using the config defined in the YAML file.
+        `max_workers` is the number of processes used to run independent simulations in
+        parallel, see Simulator."""
         initialization_params = YAMLDict.from_path(yaml_file_path)
 
         cls._check_valid_yaml_inputs(initialization_params)
@@ -91,7 +95,7 @@ class SuperSimulationFactory:
             microsim,
         )
 
-        simulator = Simulator(microsim, time_converter)
+        simulator = Simulator(microsim, time_converter, max_workers)
         validator = Validator(microsim, time_converter)
         exporter = Exporter(microsim, compartment_costs, simulation_tag, time_converter)
 
@@ -273,6 +273,19 @@ class TransitionTable:
 
         return self._collapse_tables(self.tables, current_ts)
 
+    def get_last_varying_ts(self) -> int:
+        """Returns the last ts for which get_per_ts_table() can return a new table. After
+        that, every cohort is past the point where the tables were switched, so the
+        per-ts table is always the one for the latest time step."""
+        return max(self.tables) + max(
+            (
+                int(table.index.max())
+                for table in self.tables.values()
+                if not table.empty
+            ),
+            default=0,
+        )
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, TransitionTable):
             return False
@@ -364,13 +377,27 @@ class TransitionTable:
         if "remaining" not in table:
             raise ValueError("trying to unnormalize a table that isn't normalized")
 
-        for sentence_length in table.index.sort_values(ascending=False):
-            for shorter_sentence in range(1, sentence_length):
-                table.loc[sentence_length] *= (
-                    1 - table.loc[shorter_sentence].drop("remaining").sum()
-                )
+        sentence_lengths = table.index.to_numpy()
+        unnormalized = table.to_numpy(dtype=float, copy=True)
+
+        # fraction of the cohort left after each sentence length, from the normalized table
+        remaining_fractions = {
+            sentence_length: 1 - outflows.sum()
+            for sentence_length, outflows in zip(
+                sentence_lengths, unnormalized[:, table.columns != "remaining"]
+            )
+        }
+
+        # scale each sentence length by the fraction remaining after every shorter one,
+        # one shorter sentence length at a time
+        for shorter_sentence in range(1, sentence_lengths.max(initial=1)):
+            unnormalized[sentence_lengths > shorter_sentence] *= remaining_fractions[
+                shorter_sentence
+            ]
 
-        return table.drop("remaining", axis=1)
+        return pd.DataFrame(
+            unnormalized, index=table.index, columns=table.columns
+        ).drop("remaining", axis=1)
 
     def unnormalize_previous_tables(self) -> None:
         """revert all normalized previous table back to an un-normalized df. sum of all total populations will be 1"""
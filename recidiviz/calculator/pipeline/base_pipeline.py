@@ -28,6 +28,9 @@ from apache_beam.pvalue import PBegin
 from recidiviz.calculator.pipeline.normalization.utils.normalized_entities import (
     NormalizedStateEntity,
 )
+from recidiviz.calculator.pipeline.utils.beam_utils.entity_coder import (
+    register_entity_graph_coders,
+)
 from recidiviz.calculator.pipeline.utils.beam_utils.extractor_utils import (
     ExtractDataForPipeline,
 )
@@ -278,6 +281,10 @@ class BasePipeline:
         # successfully accessed.
         _ = schema.StatePerson()
 
+        # Entity graphs are shuffled between stages with a compact, schema-driven
+        # coder instead of being pickled
+        register_entity_graph_coders()
+
         pipeline_job_args = self.pipeline_run_delegate.pipeline_job_args
         state_code = pipeline_job_args.state_code
         person_id_filter_set = pipeline_job_args.person_id_filter_set
@@ -56,8 +56,10 @@ from recidiviz.calculator.pipeline.metrics.base_metric_producer import (
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
     PersonMetadata,
     RecidivizMetric,
+    RecidivizMetricRow,
     RecidivizMetricType,
     RecidivizMetricTypeT,
+    bq_column_names_for_metric_class,
     json_serializable_list_value_handler,
 )
 from recidiviz.calculator.pipeline.utils.beam_utils.bigquery_io_utils import (
@@ -139,6 +141,10 @@ class MetricPipelineJobArgs(Generic[RecidivizMetricTypeT], PipelineJobArgs):
     # metrics should be calculated. If unset, defaults to the current month.
     calculation_end_month: Optional[str] = attr.ib()
 
+    # Whether metrics should be emitted directly as BigQuery rows, without
+    # instantiating the RecidivizMetric objects
+    metric_row_output: bool = attr.ib(default=False)
+
 
 class MetricPipelineRunDelegate(PipelineRunDelegate[MetricPipelineJobArgs]):
     """Delegate for running a metric pipeline."""
@@ -196,6 +202,15 @@ class MetricPipelineRunDelegate(PipelineRunDelegate[MetricPipelineJobArgs]):
             default={"ALL"},
         )
 
+        parser.add_argument(
+            "--metric_row_output",
+            dest="metric_row_output",
+            action="store_true",
+            help="When set, metrics are emitted directly as BigQuery rows, without "
+            "instantiating the RecidivizMetric objects.",
+            default=False,
+        )
+
         if cls.include_calculation_limit_args():
             # Only for pipelines that may receive these arguments
             parser.add_argument(
@@ -290,6 +305,7 @@ class MetricPipelineRunDelegate(PipelineRunDelegate[MetricPipelineJobArgs]):
             job_name=str(all_beam_options["job_name"]),
             calculation_end_month=calculation_end_month,
             calculation_month_count=calculation_month_count,
+            metric_row_output=known_args.metric_row_output,
         )
 
     def _validate_pipeline_config(self) -> None:
@@ -354,6 +370,14 @@ class MetricPipelineRunDelegate(PipelineRunDelegate[MetricPipelineJobArgs]):
             >> beam.ParDo(ExtractPersonEventsMetadata())
         )
 
+        if self.pipeline_job_args.metric_row_output:
+            # Return the BigQuery rows of the metrics
+            return person_events_with_metadata | "Produce Metric Rows" >> beam.ParDo(
+                ProduceMetricRows(),
+                self.pipeline_job_args,
+                self.metric_producer(),
+            )
+
         # Return the metrics
         return person_events_with_metadata | "Get Metrics" >> GetMetrics(
             pipeline_job_args=self.pipeline_job_args,
@@ -368,13 +392,28 @@ class MetricPipelineRunDelegate(PipelineRunDelegate[MetricPipelineJobArgs]):
 
         Each metric type is a tag in the TaggedOutput and is accessed individually to
         be written to a separate table in BigQuery."""
-        writable_metrics = (
-            pipeline
-            | "Convert to dict to be written to BQ"
-            >> beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
-                *self._metric_type_values()
+        if self.pipeline_job_args.metric_row_output:
+            writable_metrics = (
+                pipeline
+                | "Convert rows to dict to be written to BQ"
+                >> beam.ParDo(
+                    RecidivizMetricRowWritableDict(),
+                    {
+                        DATAFLOW_TABLES_TO_METRIC_TYPES[
+                            DATAFLOW_METRICS_TO_TABLES[metric_subclass]
+                        ].value: bq_column_names_for_metric_class(metric_subclass)
+                        for metric_subclass in self._metric_subclasses
+                    },
+                ).with_outputs(*self._metric_type_values())
+            )
+        else:
+            writable_metrics = (
+                pipeline
+                | "Convert to dict to be written to BQ"
+                >> beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
+                    *self._metric_type_values()
+                )
             )
-        )
 
         for metric_subclass in self._metric_subclasses:
             table_id = DATAFLOW_METRICS_TO_TABLES[metric_subclass]
@@ -477,6 +516,68 @@ class ProduceMetrics(beam.DoFn):
         pass
 
 
+@with_input_types(
+    beam.typehints.Tuple[
+        entities.StatePerson,
+        Union[Dict[int, IdentifierResult], List[IdentifierResult]],
+        PersonMetadata,
+    ],
+    beam.typehints.Optional[MetricPipelineJobArgs],
+    beam.typehints.Optional[BaseMetricProducer],
+)
+@with_output_types(RecidivizMetricRow)
+class ProduceMetricRows(beam.DoFn):
+    """A DoFn that produces the BigQuery rows of metrics given a StatePerson,
+    metadata and associated events, without instantiating the metrics."""
+
+    # pylint: disable=arguments-differ
+    def process(
+        self,
+        element: Tuple[
+            entities.StatePerson,
+            Union[Dict[int, IdentifierResult], List[IdentifierResult]],
+            PersonMetadata,
+        ],
+        pipeline_job_args: MetricPipelineJobArgs,
+        metric_producer: BaseMetricProducer,
+    ) -> Generator[RecidivizMetricRow, None, None]:
+        """Produces the BigQuery row of each metric that ProduceMetrics would
+        produce for the same |element|.
+
+        Yields:
+            Each RecidivizMetricRow."""
+        person, results, person_metadata = element
+
+        pipeline_job_id = job_id(
+            project_id=pipeline_job_args.project_id,
+            region=pipeline_job_args.region,
+            job_name=pipeline_job_args.job_name,
+        )
+
+        metrics_producer_delegates = (
+            get_required_state_specific_metrics_producer_delegates(
+                pipeline_job_args.state_code,
+                set(metric_producer.metrics_producer_delegate_classes.values()),
+            )
+        )
+
+        yield from metric_producer.produce_metric_rows(
+            person=person,
+            identifier_results=results,
+            metric_inclusions=pipeline_job_args.metric_inclusions,
+            person_metadata=person_metadata,
+            pipeline_job_id=pipeline_job_id,
+            calculation_end_month=pipeline_job_args.calculation_end_month,
+            calculation_month_count=pipeline_job_args.calculation_month_count,
+            metrics_producer_delegates=metrics_producer_delegates,
+        )
+
+    def to_runner_api_parameter(
+        self, _unused_context: PipelineContext
+    ) -> Tuple[str, Any]:
+        pass
+
+
 @with_input_types(
     beam.typehints.Tuple[
         entities.StatePerson,
@@ -606,3 +707,47 @@ class RecidivizMetricWritableDict(beam.DoFn):
         self, _unused_context: PipelineContext
     ) -> Tuple[str, Any]:
         pass
+
+
+@with_input_types(
+    RecidivizMetricRow, beam.typehints.Dict[str, beam.typehints.Tuple[str, ...]]
+)
+@with_output_types(beam.typehints.Dict[str, Any])
+class RecidivizMetricRowWritableDict(beam.DoFn):
+    """Builds a dictionary in the format necessary to write a RecidivizMetricRow to
+    BigQuery."""
+
+    # pylint: disable=arguments-differ
+    def process(
+        self,
+        element: RecidivizMetricRow,
+        column_names_by_metric_type: Dict[str, Tuple[str, ...]],
+    ) -> Generator[Dict[str, Any], None, None]:
+        """The values of a RecidivizMetricRow are already in the formats required by
+        the BigQuery I/O connector, so this only zips them with the column names of
+        the table for the row's metric_type.
+
+        Args:
+            element: A RecidivizMetricRow
+            column_names_by_metric_type: The ordered column names of each metric
+                table, keyed by the value of the table's metric_type
+
+        Yields:
+            The same dictionary that RecidivizMetricWritableDict would produce for
+                the metric the row was built from.
+        """
+        column_names = column_names_by_metric_type.get(element.metric_type)
+
+        if column_names is None:
+            raise ValueError(
+                f"Unexpected metric_type [{element.metric_type}] on RecidivizMetricRow."
+            )
+
+        yield beam.pvalue.TaggedOutput(
+            element.metric_type, dict(zip(column_names, element.values))
+        )
+
+    def to_runner_api_parameter(
+        self, _unused_context: PipelineContext
+    ) -> Tuple[str, Any]:
+        pass
@@ -22,11 +22,13 @@ from typing import Dict, Generic, List, Optional, Type, TypeVar
 import attr
 
 from recidiviz.calculator.pipeline.metrics.utils.calculator_utils import (
+    produce_standard_event_metric_rows,
     produce_standard_event_metrics,
 )
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
     PersonMetadata,
     RecidivizMetric,
+    RecidivizMetricRow,
     RecidivizMetricType,
 )
 from recidiviz.calculator.pipeline.utils.identifier_models import IdentifierResult
@@ -81,15 +83,6 @@ class BaseMetricProducer(
         Returns:
             A list of RecidivizMetrics
         """
-        metrics_producer_delegate_class = self.metrics_producer_delegate_classes.get(
-            self.metric_class
-        )
-        metrics_producer_delegate = (
-            metrics_producer_delegates.get(metrics_producer_delegate_class.__name__)
-            if metrics_producer_delegate_class
-            else None
-        )
-
         metrics = produce_standard_event_metrics(
             person=person,
             identifier_results=identifier_results,  # type: ignore
@@ -99,7 +92,9 @@ class BaseMetricProducer(
             person_metadata=person_metadata,
             event_to_metric_classes=self.event_to_metric_classes,  # type: ignore
             pipeline_job_id=pipeline_job_id,
-            metrics_producer_delegate=metrics_producer_delegate,
+            metrics_producer_delegate=self._metrics_producer_delegate(
+                metrics_producer_delegates
+            ),
         )
 
         metrics_of_class: List[RecidivizMetricT] = []
@@ -113,3 +108,50 @@ class BaseMetricProducer(
             metrics_of_class.append(metric)
 
         return metrics_of_class
+
+    def produce_metric_rows(
+        self,
+        person: StatePerson,
+        identifier_results: IdentifierResultT,
+        metric_inclusions: Dict[RecidivizMetricTypeT, bool],
+        person_metadata: PersonMetadata,
+        pipeline_job_id: str,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+        calculation_end_month: Optional[str] = None,
+        calculation_month_count: int = -1,
+    ) -> List[RecidivizMetricRow]:
+        """Transforms the events and a StatePerson into the BigQuery rows of the
+        RecidivizMetrics that produce_metrics would return for the same arguments,
+        without instantiating the metrics themselves. Takes the same arguments as
+        produce_metrics.
+
+        Producers that override produce_metrics must also override this method.
+        """
+        return produce_standard_event_metric_rows(
+            person=person,
+            identifier_results=identifier_results,  # type: ignore
+            metric_inclusions=metric_inclusions,
+            calculation_end_month=calculation_end_month,
+            calculation_month_count=calculation_month_count,
+            person_metadata=person_metadata,
+            event_to_metric_classes=self.event_to_metric_classes,  # type: ignore
+            pipeline_job_id=pipeline_job_id,
+            metrics_producer_delegate=self._metrics_producer_delegate(
+                metrics_producer_delegates
+            ),
+        )
+
+    def _metrics_producer_delegate(
+        self,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+    ) -> Optional[StateSpecificMetricsProducerDelegate]:
+        """Returns the delegate in |metrics_producer_delegates| for this producer's
+        metric_class, if one exists."""
+        metrics_producer_delegate_class = self.metrics_producer_delegate_classes.get(
+            self.metric_class
+        )
+        return (
+            metrics_producer_delegates.get(metrics_producer_delegate_class.__name__)
+            if metrics_producer_delegate_class
+            else None
+        )
@@ -34,11 +34,13 @@ from recidiviz.calculator.pipeline.metrics.population_spans.spans import (
     SupervisionPopulationSpan,
 )
 from recidiviz.calculator.pipeline.metrics.utils.calculator_utils import (
+    produce_standard_span_metric_rows,
     produce_standard_span_metrics,
 )
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
     PersonMetadata,
     RecidivizMetric,
+    RecidivizMetricRow,
 )
 from recidiviz.calculator.pipeline.utils.identifier_models import Span
 from recidiviz.calculator.pipeline.utils.state_utils.state_specific_incarceration_metrics_producer_delegate import (
@@ -96,18 +98,6 @@ class PopulationSpanMetricProducer(
         Returns:
             A list of RecidivizMetrics
         """
-        metric_classes_to_producer_delegates: Dict[
-            Type[RecidivizMetric[PopulationSpanMetricType]],
-            Optional[StateSpecificMetricsProducerDelegate],
-        ] = {}
-        for (
-            metric_class,
-            metric_producer_delegate_class,
-        ) in self.metrics_producer_delegate_classes.items():
-            metric_classes_to_producer_delegates[
-                metric_class
-            ] = metrics_producer_delegates.get(metric_producer_delegate_class.__name__)
-
         metrics = produce_standard_span_metrics(
             person=person,
             identifier_results=identifier_results,  # type: ignore
@@ -115,7 +105,9 @@ class PopulationSpanMetricProducer(
             person_metadata=person_metadata,
             event_to_metric_classes=self.event_to_metric_classes,  # type: ignore
             pipeline_job_id=pipeline_job_id,
-            metric_classes_to_producer_delegates=metric_classes_to_producer_delegates,
+            metric_classes_to_producer_delegates=self._metric_classes_to_producer_delegates(
+                metrics_producer_delegates
+            ),
         )
 
         metrics_of_class: List[PopulationSpanMetric] = []
@@ -129,3 +121,51 @@ class PopulationSpanMetricProducer(
             metrics_of_class.append(metric)
 
         return metrics_of_class
+
+    def produce_metric_rows(
+        self,
+        person: StatePerson,
+        identifier_results: Sequence[Span],
+        metric_inclusions: Dict[PopulationSpanMetricType, bool],
+        person_metadata: PersonMetadata,
+        pipeline_job_id: str,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+        calculation_end_month: Optional[str] = None,
+        calculation_month_count: int = -1,
+    ) -> List[RecidivizMetricRow]:
+        """Transforms the spans and a StatePerson into the BigQuery rows of the
+        PopulationSpanMetrics that produce_metrics would return, without
+        instantiating the metrics themselves."""
+        return produce_standard_span_metric_rows(
+            person=person,
+            identifier_results=identifier_results,  # type: ignore
+            metric_inclusions=metric_inclusions,
+            person_metadata=person_metadata,
+            event_to_metric_classes=self.event_to_metric_classes,  # type: ignore
+            pipeline_job_id=pipeline_job_id,
+            metric_classes_to_producer_delegates=self._metric_classes_to_producer_delegates(
+                metrics_producer_delegates
+            ),
+        )
+
+    def _metric_classes_to_producer_delegates(
+        self,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+    ) -> Dict[
+        Type[RecidivizMetric[PopulationSpanMetricType]],
+        Optional[StateSpecificMetricsProducerDelegate],
+    ]:
+        """Maps each metric class to the delegate in |metrics_producer_delegates|
+        that should be used to produce it, if one exists."""
+        metric_classes_to_producer_delegates: Dict[
+            Type[RecidivizMetric[PopulationSpanMetricType]],
+            Optional[StateSpecificMetricsProducerDelegate],
+        ] = {}
+        for (
+            metric_class,
+            metric_producer_delegate_class,
+        ) in self.metrics_producer_delegate_classes.items():
+            metric_classes_to_producer_delegates[
+                metric_class
+            ] = metrics_producer_delegates.get(metric_producer_delegate_class.__name__)
+        return metric_classes_to_producer_delegates
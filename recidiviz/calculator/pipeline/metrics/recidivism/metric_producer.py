@@ -47,7 +47,11 @@ from recidiviz.calculator.pipeline.metrics.utils.calculator_utils import (
     age_at_date,
     build_metric,
 )
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    RecidivizMetricRow,
+    metric_row_for_metric,
+)
 from recidiviz.calculator.pipeline.utils.state_utils.state_specific_metrics_producer_delegate import (
     StateSpecificMetricsProducerDelegate,
 )
@@ -155,6 +159,37 @@ class RecidivismMetricProducer(
 
         return metrics
 
+    def produce_metric_rows(
+        self,
+        person: StatePerson,
+        identifier_results: Dict[int, List[ReleaseEvent]],
+        metric_inclusions: Dict[ReincarcerationRecidivismMetricType, bool],
+        person_metadata: PersonMetadata,
+        pipeline_job_id: str,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+        calculation_end_month: Optional[str] = None,
+        calculation_month_count: int = -1,
+    ) -> List[RecidivizMetricRow]:
+        """Transforms ReleaseEvents and a StatePerson into the BigQuery rows of the
+        ReincarcerationRecidivismMetrics that produce_metrics would return.
+
+        Recidivism metrics are built through the per-follow-up-period helpers below,
+        so the rows are converted from the built metrics.
+        """
+        return [
+            metric_row_for_metric(metric)
+            for metric in self.produce_metrics(
+                person,
+                identifier_results,
+                metric_inclusions,
+                person_metadata,
+                pipeline_job_id,
+                metrics_producer_delegates,
+                calculation_end_month,
+                calculation_month_count,
+            )
+        ]
+
     def reincarcerations_by_period(
         self,
         release_date: date,
@@ -19,8 +19,9 @@
 This contains the core logic for calculating supervision metrics on a person-by-person
 basis. It transforms SupervisionEvents into SupervisionMetrics.
 """
+import datetime
 from operator import attrgetter
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 
 from recidiviz.calculator.pipeline.metrics.base_metric_producer import (
     BaseMetricProducer,
@@ -44,13 +45,17 @@ from recidiviz.calculator.pipeline.metrics.supervision.metrics import (
     SupervisionTerminationMetric,
 )
 from recidiviz.calculator.pipeline.metrics.utils.calculator_utils import (
+    MetricFactory,
+    PersonCharacteristicsCache,
     age_at_date,
-    build_metric,
     get_calculation_month_lower_bound_date,
     get_calculation_month_upper_bound_date,
     include_in_output,
 )
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    RecidivizMetricRow,
+)
 from recidiviz.calculator.pipeline.utils.state_utils.state_calculation_config_manager import (
     get_state_specific_supervision_delegate,
 )
@@ -139,8 +144,96 @@ class SupervisionMetricProducer(
         Returns:
             A list of SupervisionMetrics.
         """
+        created_on = datetime.date.today()
         metrics: List[SupervisionMetric] = []
 
+        for (
+            metric_factory,
+            event,
+            person_attributes,
+            additional_attributes,
+        ) in self._metric_inputs(
+            person,
+            identifier_results,
+            metric_inclusions,
+            person_metadata,
+            metrics_producer_delegates,
+            calculation_end_month,
+            calculation_month_count,
+        ):
+            metric = metric_factory.build(
+                result=event,
+                person_attributes=person_attributes,
+                pipeline_job_id=pipeline_job_id,
+                created_on=created_on,
+                additional_attributes=additional_attributes,
+            )
+
+            if not isinstance(metric, SupervisionMetric):
+                raise ValueError(
+                    f"Unexpected metric type {type(metric)}. "
+                    "All metrics should be SupervisionMetric."
+                )
+
+            metrics.append(metric)
+
+        return metrics
+
+    def produce_metric_rows(
+        self,
+        person: StatePerson,
+        identifier_results: List[SupervisionEvent],
+        metric_inclusions: Dict[SupervisionMetricType, bool],
+        person_metadata: PersonMetadata,
+        pipeline_job_id: str,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+        calculation_end_month: Optional[str] = None,
+        calculation_month_count: int = -1,
+    ) -> List[RecidivizMetricRow]:
+        """Transforms SupervisionEvents and a StatePerson into the BigQuery rows of
+        the SupervisionMetrics that produce_metrics would return, without
+        instantiating the metrics themselves."""
+        created_on = datetime.date.today()
+
+        return [
+            metric_factory.build_row(
+                result=event,
+                person_attributes=person_attributes,
+                pipeline_job_id=pipeline_job_id,
+                created_on=created_on,
+                additional_attributes=additional_attributes,
+            )
+            for (
+                metric_factory,
+                event,
+                person_attributes,
+                additional_attributes,
+            ) in self._metric_inputs(
+                person,
+                identifier_results,
+                metric_inclusions,
+                person_metadata,
+                metrics_producer_delegates,
+                calculation_end_month,
+                calculation_month_count,
+            )
+        ]
+
+    def _metric_inputs(
+        self,
+        person: StatePerson,
+        identifier_results: List[SupervisionEvent],
+        metric_inclusions: Dict[SupervisionMetricType, bool],
+        person_metadata: PersonMetadata,
+        metrics_producer_delegates: Dict[str, StateSpecificMetricsProducerDelegate],
+        calculation_end_month: Optional[str],
+        calculation_month_count: int,
+    ) -> Iterator[
+        Tuple[MetricFactory, SupervisionEvent, Dict[str, Any], Dict[str, Any]]
+    ]:
+        """Yields the MetricFactory, event, person-level attributes and additional
+        attributes for each SupervisionMetric that should be produced from the
+        given SupervisionEvents."""
         identifier_results.sort(key=attrgetter("year", "month"))
 
         calculation_month_upper_bound = get_calculation_month_upper_bound_date(
@@ -159,6 +252,10 @@ class SupervisionMetricProducer(
             else None
         )
 
+        person_characteristics_cache = PersonCharacteristicsCache(
+            person, person_metadata
+        )
+
         for event in identifier_results:
             event_date = event.event_date
 
@@ -199,30 +296,18 @@ class SupervisionMetricProducer(
                     raise ValueError(f"No metric class for metric type {metric_type}")
 
                 if self.include_event_in_metric(event, metric_type):
-                    metric = build_metric(
-                        result=event,
-                        metric_class=metric_class,
-                        person=person,
-                        person_age=age_at_date(person, event_date),
-                        person_metadata=person_metadata,
-                        pipeline_job_id=pipeline_job_id,
-                        additional_attributes={
+                    yield (
+                        MetricFactory.for_result_type(type(event), metric_class),
+                        event,
+                        person_characteristics_cache.characteristics_for_age(
+                            age_at_date(person, event_date), metrics_producer_delegate
+                        ),
+                        {
                             "year": event_date.year,
                             "month": event_date.month,
                         },
-                        metrics_producer_delegate=metrics_producer_delegate,
                     )
 
-                    if not isinstance(metric, SupervisionMetric):
-                        raise ValueError(
-                            f"Unexpected metric type {type(metric)}. "
-                            "All metrics should be SupervisionMetric."
-                        )
-
-                    metrics.append(metric)
-
-        return metrics
-
     def include_event_in_metric(
         self,
         event: SupervisionEvent,
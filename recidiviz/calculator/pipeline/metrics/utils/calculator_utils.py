@@ -16,7 +16,7 @@
 # =============================================================================
 """Utils for the various calculation pipelines."""
 import datetime
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple, Type
 
 import attr
 from dateutil.relativedelta import relativedelta
@@ -28,7 +28,10 @@ from recidiviz.calculator.dataflow_config import (
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
     PersonMetadata,
     RecidivizMetric,
+    RecidivizMetricRow,
     RecidivizMetricTypeT,
+    bq_column_names_for_metric_class,
+    bq_row_value,
 )
 from recidiviz.calculator.pipeline.utils.identifier_models import (
     Event,
@@ -38,6 +41,7 @@ from recidiviz.calculator.pipeline.utils.identifier_models import (
 from recidiviz.calculator.pipeline.utils.state_utils.state_specific_metrics_producer_delegate import (
     StateSpecificMetricsProducerDelegate,
 )
+from recidiviz.common.attr_mixins import BuilderException
 from recidiviz.common.date import (
     first_day_of_month,
     last_day_of_month,
@@ -93,6 +97,195 @@ def person_characteristics(
     return characteristics
 
 
+@attr.s
+class PersonCharacteristicsCache:
+    """Computes the person_characteristics for a given person at most once per age
+    and metrics producer delegate, since every metric produced for a person at the
+    same age shares the same person-level dimensions."""
+
+    person: StatePerson = attr.ib()
+    person_metadata: PersonMetadata = attr.ib()
+
+    _characteristics: Dict[
+        Tuple[Optional[int], Optional[StateSpecificMetricsProducerDelegate]],
+        Dict[str, Any],
+    ] = attr.ib(factory=dict)
+
+    def characteristics_for_age(
+        self,
+        person_age: Optional[int],
+        metrics_producer_delegate: Optional[StateSpecificMetricsProducerDelegate],
+    ) -> Dict[str, Any]:
+        key = (person_age, metrics_producer_delegate)
+        if key not in self._characteristics:
+            self._characteristics[key] = person_characteristics(
+                self.person,
+                person_age,
+                self.person_metadata,
+                metrics_producer_delegate,
+            )
+        return self._characteristics[key]
+
+
+@attr.s(frozen=True)
+class MetricFactory:
+    """Builds metrics of a given RecidivizMetric class from IdentifierResults of a
+    given type.
+
+    Which attributes are copied from the result onto the metric is determined once
+    for the (result type, metric class) pair rather than for every metric built, and
+    the metric is constructed directly instead of through its Builder. The metric is
+    still validated in the same way as Builder.build: a BuilderException is raised
+    if a required field is missing or a field is set that the metric does not have.
+
+    The factory can also build a RecidivizMetricRow holding the values that would be
+    written to BigQuery for the metric, without constructing the metric object.
+    """
+
+    metric_class: Type[RecidivizMetric] = attr.ib()
+    # All fields on the metric_class
+    metric_fields: FrozenSet[str] = attr.ib()
+    # Fields on the metric_class that have a default value
+    fields_with_defaults: FrozenSet[str] = attr.ib()
+    # Fields on the metric_class that are also attributes of the result type
+    result_attributes: Tuple[str, ...] = attr.ib()
+    # The BigQuery columns for the metric_class, in schema order
+    columns: Tuple[str, ...] = attr.ib()
+    # The default value of each field on the metric_class that has one
+    default_values: Dict[str, Any] = attr.ib()
+
+    @classmethod
+    def for_result_type(
+        cls, result_type: Type[IdentifierResult], metric_class: Type[RecidivizMetric]
+    ) -> "MetricFactory":
+        """Returns the MetricFactory for building |metric_class| metrics from results
+        of type |result_type|, creating it the first time the pair is requested."""
+        key = (result_type, metric_class)
+        if key not in _METRIC_FACTORIES:
+            metric_fields = attr.fields_dict(metric_class)
+            result_fields = {
+                attribute.name
+                for attribute in getattr(result_type, "__attrs_attrs__", ())
+            }
+            default_values = {
+                field: attribute.default
+                for field, attribute in metric_fields.items()
+                if attribute.default is not attr.NOTHING
+            }
+            _METRIC_FACTORIES[key] = cls(
+                metric_class=metric_class,
+                metric_fields=frozenset(metric_fields),
+                fields_with_defaults=frozenset(default_values),
+                result_attributes=tuple(
+                    field
+                    for field in metric_fields
+                    if field in result_fields or hasattr(result_type, field)
+                ),
+                columns=bq_column_names_for_metric_class(metric_class),
+                default_values=default_values,
+            )
+        return _METRIC_FACTORIES[key]
+
+    def build(
+        self,
+        result: IdentifierResult,
+        person_attributes: Dict[str, Any],
+        pipeline_job_id: str,
+        created_on: datetime.date,
+        additional_attributes: Optional[Dict[str, Any]] = None,
+    ) -> RecidivizMetric:
+        """Builds a metric from the |result|, with the demographic and person-level
+        dimensions in |person_attributes| and any |additional_attributes| that are
+        relevant to the metric_class."""
+        return self.metric_class(
+            **self._metric_field_values(
+                result,
+                person_attributes,
+                pipeline_job_id,
+                created_on,
+                additional_attributes,
+            )
+        )
+
+    def build_row(
+        self,
+        result: IdentifierResult,
+        person_attributes: Dict[str, Any],
+        pipeline_job_id: str,
+        created_on: datetime.date,
+        additional_attributes: Optional[Dict[str, Any]] = None,
+    ) -> RecidivizMetricRow:
+        """Builds the RecidivizMetricRow for the metric that build() would return for
+        the same arguments."""
+        metric_field_values = self._metric_field_values(
+            result,
+            person_attributes,
+            pipeline_job_id,
+            created_on,
+            additional_attributes,
+        )
+        values = []
+        for column in self.columns:
+            value = (
+                metric_field_values[column]
+                if column in metric_field_values
+                else self.default_values[column]
+            )
+            values.append(bq_row_value(column, value))
+
+        return RecidivizMetricRow(
+            metric_type=self.default_values["metric_type"].value,
+            values=tuple(values),
+        )
+
+    def _metric_field_values(
+        self,
+        result: IdentifierResult,
+        person_attributes: Dict[str, Any],
+        pipeline_job_id: str,
+        created_on: datetime.date,
+        additional_attributes: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Returns the values of all fields to set on the metric, raising a
+        BuilderException if they don't match the fields on the metric_class."""
+        # Set pipeline attributes
+        metric_field_values: Dict[str, Any] = {
+            "job_id": pipeline_job_id,
+            "created_on": created_on,
+        }
+
+        # Add all demographic and person-level dimensions
+        metric_field_values.update(person_attributes)
+
+        # Add attributes from the event that are relevant to the metric_class
+        for metric_attribute in self.result_attributes:
+            metric_field_values[metric_attribute] = getattr(result, metric_attribute)
+
+        # Add any additional attributes not on the event
+        if additional_attributes:
+            for attribute, value in additional_attributes.items():
+                if attribute in self.metric_fields:
+                    metric_field_values[attribute] = value
+
+        fields_provided = metric_field_values.keys()
+        if not (
+            fields_provided <= self.metric_fields
+            and self.metric_fields <= fields_provided | self.fields_with_defaults
+        ):
+            raise BuilderException(
+                self.metric_class,
+                set(self.metric_fields),
+                set(fields_provided) | self.fields_with_defaults,
+            )
+
+        return metric_field_values
+
+
+_METRIC_FACTORIES: Dict[
+    Tuple[Type[IdentifierResult], Type[RecidivizMetric]], MetricFactory
+] = {}
+
+
 def age_at_date(person: StatePerson, check_date: datetime.date) -> Optional[int]:
     """Calculates the age of the StatePerson at the given date.
 
@@ -251,8 +444,85 @@ def produce_standard_event_metrics(
 ) -> List[RecidivizMetric]:
     """Produces metrics for pipelines with a standard mapping of event to metric
     type."""
-    metrics: List[RecidivizMetric] = []
+    created_on = datetime.date.today()
+    return [
+        metric_factory.build(
+            result=event,
+            person_attributes=person_attributes,
+            pipeline_job_id=pipeline_job_id,
+            created_on=created_on,
+            additional_attributes=event_attributes,
+        )
+        for metric_factory, event, person_attributes, event_attributes in _standard_event_metric_inputs(
+            person,
+            identifier_results,
+            metric_inclusions,
+            calculation_end_month,
+            calculation_month_count,
+            person_metadata,
+            event_to_metric_classes,
+            additional_attributes,
+            metrics_producer_delegate,
+        )
+    ]
+
 
+def produce_standard_event_metric_rows(
+    person: StatePerson,
+    identifier_results: List[Event],
+    metric_inclusions: Dict[RecidivizMetricTypeT, bool],
+    calculation_end_month: Optional[str],
+    calculation_month_count: int,
+    person_metadata: PersonMetadata,
+    event_to_metric_classes: Dict[
+        Type[Event],
+        List[Type[RecidivizMetric[RecidivizMetricTypeT]]],
+    ],
+    pipeline_job_id: str,
+    additional_attributes: Optional[Dict[str, Any]] = None,
+    metrics_producer_delegate: Optional[StateSpecificMetricsProducerDelegate] = None,
+) -> List[RecidivizMetricRow]:
+    """Produces the RecidivizMetricRows for the metrics that
+    produce_standard_event_metrics would produce for the same arguments."""
+    created_on = datetime.date.today()
+    return [
+        metric_factory.build_row(
+            result=event,
+            person_attributes=person_attributes,
+            pipeline_job_id=pipeline_job_id,
+            created_on=created_on,
+            additional_attributes=event_attributes,
+        )
+        for metric_factory, event, person_attributes, event_attributes in _standard_event_metric_inputs(
+            person,
+            identifier_results,
+            metric_inclusions,
+            calculation_end_month,
+            calculation_month_count,
+            person_metadata,
+            event_to_metric_classes,
+            additional_attributes,
+            metrics_producer_delegate,
+        )
+    ]
+
+
+def _standard_event_metric_inputs(
+    person: StatePerson,
+    identifier_results: List[Event],
+    metric_inclusions: Dict[RecidivizMetricTypeT, bool],
+    calculation_end_month: Optional[str],
+    calculation_month_count: int,
+    person_metadata: PersonMetadata,
+    event_to_metric_classes: Dict[
+        Type[Event],
+        List[Type[RecidivizMetric[RecidivizMetricTypeT]]],
+    ],
+    additional_attributes: Optional[Dict[str, Any]],
+    metrics_producer_delegate: Optional[StateSpecificMetricsProducerDelegate],
+) -> Iterator[Tuple[MetricFactory, Event, Dict[str, Any], Dict[str, Any]]]:
+    """Yields the MetricFactory, event, person attributes and additional attributes
+    for each metric that should be produced from the |identifier_results|."""
     calculation_month_upper_bound = get_calculation_month_upper_bound_date(
         calculation_end_month
     )
@@ -261,6 +531,9 @@ def produce_standard_event_metrics(
         calculation_month_upper_bound, calculation_month_count
     )
 
+    person_characteristics_cache = PersonCharacteristicsCache(person, person_metadata)
+    metric_factories_for_event_type: Dict[Type[Event], List[MetricFactory]] = {}
+
     for event in identifier_results:
         event_date = event.event_date
         event_year = event.event_date.year
@@ -274,30 +547,28 @@ def produce_standard_event_metrics(
         ):
             continue
 
-        metric_classes = event_to_metric_classes[type(event)]
-
-        for metric_class in metric_classes:
-            metric_type = metric_type_for_metric_class(metric_class)
-
-            if metric_inclusions.get(metric_type):
-                metric = build_metric(
-                    result=event,
-                    metric_class=metric_class,
-                    person=person,
-                    person_age=age_at_date(person, event_date),
-                    person_metadata=person_metadata,
-                    pipeline_job_id=pipeline_job_id,
-                    additional_attributes={
-                        "year": event_date.year,
-                        "month": event_date.month,
-                        **(additional_attributes or {}),
-                    },
-                    metrics_producer_delegate=metrics_producer_delegate,
-                )
+        event_type = type(event)
+        if event_type not in metric_factories_for_event_type:
+            metric_factories_for_event_type[event_type] = [
+                MetricFactory.for_result_type(event_type, metric_class)
+                for metric_class in event_to_metric_classes[event_type]
+                if metric_inclusions.get(metric_type_for_metric_class(metric_class))
+            ]
+        metric_factories = metric_factories_for_event_type[event_type]
+        if not metric_factories:
+            continue
 
-                metrics.append(metric)
+        person_attributes = person_characteristics_cache.characteristics_for_age(
+            age_at_date(person, event_date), metrics_producer_delegate
+        )
+        event_attributes = {
+            "year": event_date.year,
+            "month": event_date.month,
+            **(additional_attributes or {}),
+        }
 
-    return metrics
+        for metric_factory in metric_factories:
+            yield metric_factory, event, person_attributes, event_attributes
 
 
 def produce_standard_span_metrics(
@@ -319,9 +590,96 @@ def produce_standard_span_metrics(
     """Produces metrics for pipelines with a standard mapping of span to metric
     type. This first splits the span if a person has a birthdate by that date so that
     we can produce age-based spans within a larger span."""
-    metrics: List[RecidivizMetric] = []
+    created_on = datetime.date.today()
+    return [
+        metric_factory.build(
+            result=span,
+            person_attributes=person_attributes,
+            pipeline_job_id=pipeline_job_id,
+            created_on=created_on,
+            additional_attributes=additional_attributes,
+        )
+        for metric_factory, span, person_attributes in _standard_span_metric_inputs(
+            person,
+            identifier_results,
+            metric_inclusions,
+            person_metadata,
+            event_to_metric_classes,
+            metric_classes_to_producer_delegates,
+        )
+    ]
+
+
+def produce_standard_span_metric_rows(
+    person: StatePerson,
+    identifier_results: List[Span],
+    metric_inclusions: Dict[RecidivizMetricTypeT, bool],
+    person_metadata: PersonMetadata,
+    event_to_metric_classes: Dict[
+        Type[Span],
+        List[Type[RecidivizMetric[RecidivizMetricTypeT]]],
+    ],
+    pipeline_job_id: str,
+    metric_classes_to_producer_delegates: Dict[
+        Type[RecidivizMetric[RecidivizMetricTypeT]],
+        Optional[StateSpecificMetricsProducerDelegate],
+    ],
+    additional_attributes: Optional[Dict[str, Any]] = None,
+) -> List[RecidivizMetricRow]:
+    """Produces the RecidivizMetricRows for the metrics that
+    produce_standard_span_metrics would produce for the same arguments."""
+    created_on = datetime.date.today()
+    return [
+        metric_factory.build_row(
+            result=span,
+            person_attributes=person_attributes,
+            pipeline_job_id=pipeline_job_id,
+            created_on=created_on,
+            additional_attributes=additional_attributes,
+        )
+        for metric_factory, span, person_attributes in _standard_span_metric_inputs(
+            person,
+            identifier_results,
+            metric_inclusions,
+            person_metadata,
+            event_to_metric_classes,
+            metric_classes_to_producer_delegates,
+        )
+    ]
+
+
+def _standard_span_metric_inputs(
+    person: StatePerson,
+    identifier_results: List[Span],
+    metric_inclusions: Dict[RecidivizMetricTypeT, bool],
+    person_metadata: PersonMetadata,
+    event_to_metric_classes: Dict[
+        Type[Span],
+        List[Type[RecidivizMetric[RecidivizMetricTypeT]]],
+    ],
+    metric_classes_to_producer_delegates: Dict[
+        Type[RecidivizMetric[RecidivizMetricTypeT]],
+        Optional[StateSpecificMetricsProducerDelegate],
+    ],
+) -> Iterator[Tuple[MetricFactory, Span, Dict[str, Any]]]:
+    """Yields the MetricFactory, span and person attributes for each metric that
+    should be produced from the |identifier_results|, splitting each span by the
+    person's birthdate."""
+    person_characteristics_cache = PersonCharacteristicsCache(person, person_metadata)
+    metric_factories_for_span_type: Dict[Type[Span], List[MetricFactory]] = {}
 
     for span in identifier_results:
+        span_type = type(span)
+        if span_type not in metric_factories_for_span_type:
+            metric_factories_for_span_type[span_type] = [
+                MetricFactory.for_result_type(span_type, metric_class)
+                for metric_class in event_to_metric_classes[span_type]
+                if metric_inclusions.get(metric_type_for_metric_class(metric_class))
+            ]
+        metric_factories = metric_factories_for_span_type[span_type]
+        if not metric_factories:
+            continue
+
         original_date_range = (
             span.start_date_inclusive,
             span.end_date_exclusive,
@@ -339,27 +697,13 @@ def produce_standard_span_metrics(
             )
             age = age_at_date(person, new_span.start_date_inclusive)
 
-            metric_classes = event_to_metric_classes[type(span)]
-            for metric_class in metric_classes:
-                metric_type = metric_type_for_metric_class(metric_class)
-
-                if metric_inclusions.get(metric_type):
-                    metric = build_metric(
-                        result=new_span,
-                        metric_class=metric_class,
-                        person=person,
-                        person_age=age,
-                        person_metadata=person_metadata,
-                        pipeline_job_id=pipeline_job_id,
-                        metrics_producer_delegate=metric_classes_to_producer_delegates.get(
-                            metric_class
-                        ),
-                        additional_attributes=additional_attributes,
-                    )
-
-                    metrics.append(metric)
-
-    return metrics
+            for metric_factory in metric_factories:
+                yield metric_factory, new_span, person_characteristics_cache.characteristics_for_age(
+                    age,
+                    metric_classes_to_producer_delegates.get(
+                        metric_factory.metric_class
+                    ),
+                )
 
 
 def build_metric(
@@ -375,35 +719,17 @@ def build_metric(
     """Builds a RecidivizMetric of the defined metric_class using the provided
     information.
     """
-    metric_attributes = attr.fields_dict(metric_class).keys()
-
     person_attributes = person_characteristics(
         person, person_age, person_metadata, metrics_producer_delegate
     )
 
-    metric_cls_builder = metric_class.builder()
-
-    # Set pipeline attributes
-    setattr(metric_cls_builder, "job_id", pipeline_job_id)
-    setattr(metric_cls_builder, "created_on", datetime.date.today())
-
-    # Add all demographic and person-level dimensions
-    for attribute, value in person_attributes.items():
-        setattr(metric_cls_builder, attribute, value)
-
-    # Add attributes from the event that are relevant to the metric_class
-    for metric_attribute in metric_attributes:
-        if hasattr(result, metric_attribute):
-            attribute_value = getattr(result, metric_attribute)
-            setattr(metric_cls_builder, metric_attribute, attribute_value)
-
-    # Add any additional attributes not on the event
-    if additional_attributes:
-        for attribute, value in additional_attributes.items():
-            if attribute in metric_attributes:
-                setattr(metric_cls_builder, attribute, value)
-
-    return metric_cls_builder.build()
+    return MetricFactory.for_result_type(type(result), metric_class).build(
+        result=result,
+        person_attributes=person_attributes,
+        pipeline_job_id=pipeline_job_id,
+        created_on=datetime.date.today(),
+        additional_attributes=additional_attributes,
+    )
 
 
 def metric_type_for_metric_class(
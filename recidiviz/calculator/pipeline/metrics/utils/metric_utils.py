@@ -18,7 +18,18 @@
 import abc
 from datetime import date
 from enum import Enum
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 import attr
 from google.cloud import bigquery
@@ -149,4 +160,76 @@ def json_serializable_list_value_handler(key: str, values: List[Any]) -> str:
     return ""
 
 
+class RecidivizMetricRow(NamedTuple):
+    """A RecidivizMetric in the form it is written to BigQuery, built without
+    constructing the RecidivizMetric object itself."""
+
+    # The value of the metric_type of the metric, which determines the table it is
+    # written to
+    metric_type: str
+
+    # The BigQuery-ready value of each column, in the order of the columns in
+    # bq_column_names_for_metric_class for the metric class
+    values: Tuple[Any, ...]
+
+
+_BQ_COLUMN_NAMES_FOR_METRIC_CLASS: Dict[Type[RecidivizMetric], Tuple[str, ...]] = {}
+
+
+def bq_column_names_for_metric_class(
+    metric_class: Type[RecidivizMetric],
+) -> Tuple[str, ...]:
+    """Returns the names of the columns in the BigQuery table for the
+    |metric_class|, in the order of bq_schema_for_metric_table."""
+    if metric_class not in _BQ_COLUMN_NAMES_FOR_METRIC_CLASS:
+        _BQ_COLUMN_NAMES_FOR_METRIC_CLASS[metric_class] = tuple(
+            field.name for field in metric_class.bq_schema_for_metric_table()
+        )
+    return _BQ_COLUMN_NAMES_FOR_METRIC_CLASS[metric_class]
+
+
+def _enum_bq_row_value(_column: str, value: Enum) -> Any:
+    return value.value
+
+
+def _date_bq_row_value(_column: str, value: date) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+# The function converting values of each type into the format required by the
+# BigQuery I/O connector, or None if values of the type are written as they are.
+# Cached by type since Enum subclass checks are expensive.
+_BQ_ROW_VALUE_CONVERTERS: Dict[type, Optional[Callable[[str, Any], Any]]] = {}
+
+
+def bq_row_value(column: str, value: Any) -> Any:
+    """Converts the |value| of a metric's |column| into the format required by the
+    BigQuery I/O connector, matching the conversion done by json_serializable_dict
+    with json_serializable_list_value_handler."""
+    value_type = type(value)
+    if value_type not in _BQ_ROW_VALUE_CONVERTERS:
+        converter: Optional[Callable[[str, Any], Any]] = None
+        if issubclass(value_type, Enum):
+            converter = _enum_bq_row_value
+        elif issubclass(value_type, date):
+            converter = _date_bq_row_value
+        elif issubclass(value_type, list):
+            converter = json_serializable_list_value_handler
+        _BQ_ROW_VALUE_CONVERTERS[value_type] = converter
+
+    converter = _BQ_ROW_VALUE_CONVERTERS[value_type]
+    return converter(column, value) if converter else value
+
+
+def metric_row_for_metric(metric: RecidivizMetric) -> RecidivizMetricRow:
+    """Converts an already built |metric| into a RecidivizMetricRow."""
+    return RecidivizMetricRow(
+        metric_type=metric.metric_type.value,
+        values=tuple(
+            bq_row_value(column, getattr(metric, column))
+            for column in bq_column_names_for_metric_class(type(metric))
+        ),
+    )
+
+
 RecidivizMetricT = TypeVar("RecidivizMetricT", bound=RecidivizMetric)
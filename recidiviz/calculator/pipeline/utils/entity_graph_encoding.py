@@ -0,0 +1,486 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Compact, schema-driven encoding of Entity graphs, used to serialize entities
+between the stages of calculation pipelines.
+
+Entity graphs are pickled attribute by attribute by default, which writes the name
+of every field and the full path of every enum value for every entity. Here the
+fields of each Entity class are instead read in attr field order, so only their
+values are encoded:
+    - Enum values are encoded as their ordinal in the field's Enum class.
+    - Dates are encoded as their proleptic Gregorian ordinal.
+    - References to other entities are encoded as the index of the referenced
+      entity in the graph.
+    - Back edges that can be re-derived from the forward edges of the graph are
+      not encoded at all.
+
+The resulting structure only holds Python primitives and is serialized with
+pickle, which writes primitives compactly and quickly.
+"""
+import datetime
+import importlib
+import pickle
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import attr
+
+from recidiviz.common.attr_utils import (
+    get_enum_cls,
+    get_non_flat_attribute_class_name,
+    is_date,
+    is_list,
+)
+from recidiviz.persistence.entity import entity_utils
+from recidiviz.persistence.entity.base_entity import Entity
+from recidiviz.persistence.entity.entity_utils import SchemaEdgeDirectionChecker
+from recidiviz.persistence.entity.state import entities as state_entities
+
+# Bump this whenever the encoded format changes
+_FORMAT_VERSION = 1
+
+# The classes of the entities at the root of the entity graphs that are passed
+# between pipeline stages. Every other entity in a pipeline element is reachable
+# from one of these, so only these should be encoded as graphs - encoding any other
+# entity in the element would encode the rest of its graph again, and the decoded
+# copies would no longer be shared.
+ENTITY_GRAPH_ROOT_CLASSES: Tuple[Type[Entity], ...] = (state_entities.StatePerson,)
+
+# Stored in place of a reference field whose value is re-derived from the forward
+# edges of the graph when decoding
+_IMPLIED_BACK_EDGE = -1
+
+# The encoded form of a single entity: the index of the entity's class, the encoded
+# values of its fields, and optionally a dictionary of any values that have been
+# stored as they are, keyed by field name
+_EntityRecord = Tuple[Any, ...]
+
+
+@attr.s(frozen=True)
+class _RefField:
+    """A field on an Entity class that references other entities."""
+
+    # The position of the field in the class's fields
+    position: int = attr.ib()
+
+    # Whether the field holds a list of entities
+    is_list: bool = attr.ib()
+
+    # For back edges, the state entity class the field references, if known. Values
+    # of back edge fields that hold exactly the entities of this class that
+    # reference the entity through forward edges are not encoded.
+    back_edge_class: Optional[Type[Entity]] = attr.ib()
+
+
+@attr.s(frozen=True)
+class _EntityClassSchema:
+    """How the fields of a given Entity class are encoded."""
+
+    entity_class: Type[Entity] = attr.ib()
+
+    # The names of all fields on the class, in attr field order
+    field_names: Tuple[str, ...] = attr.ib()
+
+    # Returns the values of all fields on an entity of this class, in field order
+    field_values: Callable[[Entity], Tuple[Any, ...]] = attr.ib()
+
+    # The position, Enum class and member ordinals by member name of each field that
+    # holds an Enum
+    enum_fields: Tuple[Tuple[int, Type[Enum], Dict[str, int]], ...] = attr.ib()
+
+    # The position of each field that holds a date
+    date_fields: Tuple[int, ...] = attr.ib()
+
+    # Fields that reference other entities through forward edges
+    forward_ref_fields: Tuple[_RefField, ...] = attr.ib()
+
+    # Fields that reference other entities through back edges
+    back_ref_fields: Tuple[_RefField, ...] = attr.ib()
+
+    # All fields that reference other entities
+    ref_fields: Tuple[_RefField, ...] = attr.ib()
+
+    @classmethod
+    def for_entity_class(cls, entity_class: Type[Entity]) -> "_EntityClassSchema":
+        """Returns the schema for the |entity_class|, building it the first time the
+        class is encoded or decoded."""
+        if entity_class not in _SCHEMAS:
+            _SCHEMAS[entity_class] = cls._build(entity_class)
+        return _SCHEMAS[entity_class]
+
+    @classmethod
+    def _build(cls, entity_class: Type[Entity]) -> "_EntityClassSchema":
+        """Classifies each field on the |entity_class| by how its values are
+        encoded."""
+        fields = attr.fields(entity_class)  # type: ignore[arg-type]
+        field_names = tuple(field.name for field in fields)
+        state_entity_class = _state_entity_class(entity_class)
+
+        enum_fields: List[Tuple[int, Type[Enum], Dict[str, int]]] = []
+        date_fields: List[int] = []
+        forward_ref_fields: List[_RefField] = []
+        back_ref_fields: List[_RefField] = []
+        for position, field in enumerate(fields):
+            referenced_class_name = get_non_flat_attribute_class_name(field)
+            if referenced_class_name:
+                referenced_class = _state_entity_class_with_name(referenced_class_name)
+                if (
+                    state_entity_class
+                    and referenced_class
+                    and not _direction_checker().is_higher_ranked(
+                        state_entity_class, referenced_class
+                    )
+                ):
+                    back_ref_fields.append(
+                        _RefField(
+                            position=position,
+                            is_list=is_list(field),
+                            back_edge_class=referenced_class,
+                        )
+                    )
+                else:
+                    forward_ref_fields.append(
+                        _RefField(
+                            position=position,
+                            is_list=is_list(field),
+                            back_edge_class=None,
+                        )
+                    )
+                continue
+
+            enum_cls = get_enum_cls(field)
+            if enum_cls:
+                enum_fields.append(
+                    (
+                        position,
+                        enum_cls,
+                        {
+                            member.name: ordinal
+                            for ordinal, member in enumerate(_enum_members(enum_cls))
+                        },
+                    )
+                )
+            elif is_date(field):
+                date_fields.append(position)
+
+        field_values: Callable[[Entity], Tuple[Any, ...]]
+        if len(field_names) == 1:
+
+            def field_values(entity: Entity) -> Tuple[Any, ...]:
+                return (getattr(entity, field_names[0]),)
+
+        else:
+            field_values = attrgetter(*field_names)
+
+        return cls(
+            entity_class=entity_class,
+            field_names=field_names,
+            field_values=field_values,
+            enum_fields=tuple(enum_fields),
+            date_fields=tuple(date_fields),
+            forward_ref_fields=tuple(forward_ref_fields),
+            back_ref_fields=tuple(back_ref_fields),
+            ref_fields=tuple(forward_ref_fields + back_ref_fields),
+        )
+
+
+_SCHEMAS: Dict[Type[Entity], _EntityClassSchema] = {}
+
+# Each Enum class mapped to its members, in ordinal order
+_ENUM_MEMBERS: Dict[Type[Enum], Tuple[Enum, ...]] = {}
+
+# Entity classes by the name they are encoded with
+_ENTITY_CLASSES_BY_ENCODED_NAME: Dict[str, Type[Entity]] = {}
+
+
+def _direction_checker() -> SchemaEdgeDirectionChecker:
+    return SchemaEdgeDirectionChecker.state_direction_checker()
+
+
+def _state_entity_class_with_name(class_name: str) -> Optional[Type[Entity]]:
+    try:
+        return entity_utils.get_entity_class_in_module_with_name(
+            state_entities, class_name
+        )
+    except LookupError:
+        return None
+
+
+def _state_entity_class(entity_class: Type[Entity]) -> Optional[Type[Entity]]:
+    """Returns the class in state/entities.py that |entity_class| is or extends, such
+    as StateIncarcerationPeriod for NormalizedStateIncarcerationPeriod."""
+    for base_class in entity_class.__mro__:
+        state_entity_class = _state_entity_class_with_name(base_class.__name__)
+        if state_entity_class is base_class:
+            return state_entity_class
+    return None
+
+
+def _enum_members(enum_cls: Type[Enum]) -> Tuple[Enum, ...]:
+    if enum_cls not in _ENUM_MEMBERS:
+        _ENUM_MEMBERS[enum_cls] = tuple(enum_cls)
+    return _ENUM_MEMBERS[enum_cls]
+
+
+def _encoded_class_name(entity_class: Type[Entity]) -> str:
+    return f"{entity_class.__module__}:{entity_class.__qualname__}"
+
+
+def _entity_class_for_encoded_name(encoded_name: str) -> Type[Entity]:
+    if encoded_name not in _ENTITY_CLASSES_BY_ENCODED_NAME:
+        module_name, class_name = encoded_name.split(":")
+        entity_class = getattr(importlib.import_module(module_name), class_name)
+        if not issubclass(entity_class, Entity):
+            raise ValueError(f"Encoded class [{encoded_name}] is not an Entity.")
+        _ENTITY_CLASSES_BY_ENCODED_NAME[encoded_name] = entity_class
+    return _ENTITY_CLASSES_BY_ENCODED_NAME[encoded_name]
+
+
+def _add_parent(parents: List[int], parent_index: int) -> None:
+    if not parents or parents[-1] != parent_index:
+        parents.append(parent_index)
+
+
+def encode_entity_graph(root: Entity) -> bytes:
+    """Encodes the |root| entity and every entity reachable from it into bytes that
+    decode_entity_graph can turn back into an identical graph."""
+    if not isinstance(root, Entity):
+        raise ValueError(f"Expected an Entity, found [{type(root)}].")
+
+    # Collect every entity in the graph, in the order that they are encoded, along
+    # with the values of their fields
+    graph_entities: List[Entity] = [root]
+    entity_indices: Dict[int, int] = {id(root): 0}
+    schemas: List[_EntityClassSchema] = []
+    values_by_entity: List[List[Any]] = []
+    while len(schemas) < len(graph_entities):
+        entity = graph_entities[len(schemas)]
+        schema = _EntityClassSchema.for_entity_class(type(entity))
+        values = list(schema.field_values(entity))
+        schemas.append(schema)
+        values_by_entity.append(values)
+        for ref_field in schema.ref_fields:
+            value = values[ref_field.position]
+            if value is None:
+                continue
+            for referenced_entity in value if ref_field.is_list else (value,):
+                if id(referenced_entity) not in entity_indices and isinstance(
+                    referenced_entity, Entity
+                ):
+                    entity_indices[id(referenced_entity)] = len(graph_entities)
+                    graph_entities.append(referenced_entity)
+
+    def _encode_ref(value: Any, is_list_field: bool) -> Any:
+        """Returns the index or indices of the entities in |value|, or raises a
+        KeyError if |value| doesn't hold entities in the graph."""
+        if value is None:
+            return None
+        if is_list_field:
+            if not isinstance(value, list):
+                raise KeyError(value)
+            return tuple(entity_indices[id(referenced)] for referenced in value)
+        if not isinstance(value, Entity):
+            raise KeyError(value)
+        return entity_indices[id(value)]
+
+    class_indices: Dict[Type[Entity], int] = {}
+    raw_values_by_entity: List[Optional[Dict[str, Any]]] = []
+    parents_by_entity: List[List[int]] = [[] for _ in graph_entities]
+    for entity_index, (entity, schema, values) in enumerate(
+        zip(graph_entities, schemas, values_by_entity)
+    ):
+        raw_values: Optional[Dict[str, Any]] = None
+
+        if len(entity.__dict__) != len(values):
+            # Keep any attributes that have been set outside of the attr fields
+            raw_values = {
+                name: value
+                for name, value in entity.__dict__.items()
+                if name not in schema.field_names
+            }
+
+        for position, enum_cls, enum_ordinals in schema.enum_fields:
+            value = values[position]
+            if value is not None:
+                value_type = type(value)
+                if value_type is enum_cls:
+                    # Looked up by name, which is faster to hash than the member
+                    values[position] = enum_ordinals[
+                        value._name_  # pylint: disable=protected-access
+                    ]
+                else:
+                    raw_values = raw_values or {}
+                    raw_values[schema.field_names[position]] = value
+                    values[position] = None
+
+        for position in schema.date_fields:
+            value = values[position]
+            if value is not None:
+                # Datetimes are stored as they are, to keep their time
+                value_type = type(value)
+                if value_type is datetime.date:
+                    values[position] = value.toordinal()
+                else:
+                    raw_values = raw_values or {}
+                    raw_values[schema.field_names[position]] = value
+                    values[position] = None
+
+        for ref_field in schema.forward_ref_fields:
+            position = ref_field.position
+            try:
+                encoded_ref = _encode_ref(values[position], ref_field.is_list)
+            except KeyError:
+                raw_values = raw_values or {}
+                raw_values[schema.field_names[position]] = values[position]
+                values[position] = None
+                continue
+
+            values[position] = encoded_ref
+            if isinstance(encoded_ref, int):
+                _add_parent(parents_by_entity[encoded_ref], entity_index)
+            elif encoded_ref:
+                for referenced_index in encoded_ref:
+                    _add_parent(parents_by_entity[referenced_index], entity_index)
+
+        if schema.entity_class not in class_indices:
+            class_indices[schema.entity_class] = len(class_indices)
+
+        raw_values_by_entity.append(raw_values)
+
+    # Back edges are encoded once every forward edge in the graph is known
+    records: List[_EntityRecord] = []
+    for entity_index, (schema, values, raw_values) in enumerate(
+        zip(schemas, values_by_entity, raw_values_by_entity)
+    ):
+        for ref_field in schema.back_ref_fields:
+            position = ref_field.position
+            try:
+                encoded_ref = _encode_ref(values[position], ref_field.is_list)
+            except KeyError:
+                raw_values = raw_values or {}
+                raw_values[schema.field_names[position]] = values[position]
+                values[position] = None
+                continue
+
+            if encoded_ref not in (None, ()) and ref_field.back_edge_class:
+                implied_ref = tuple(
+                    parent_index
+                    for parent_index in parents_by_entity[entity_index]
+                    if isinstance(
+                        graph_entities[parent_index], ref_field.back_edge_class
+                    )
+                )
+                if (
+                    encoded_ref == implied_ref
+                    if ref_field.is_list
+                    else implied_ref == (encoded_ref,)
+                ):
+                    encoded_ref = _IMPLIED_BACK_EDGE
+            values[position] = encoded_ref
+
+        record: _EntityRecord = (class_indices[schema.entity_class], tuple(values))
+        records.append(record + (raw_values,) if raw_values else record)
+
+    return pickle.dumps(
+        (
+            _FORMAT_VERSION,
+            tuple(_encoded_class_name(cls) for cls in class_indices),
+            tuple(records),
+        ),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def decode_entity_graph(encoded: bytes) -> Entity:
+    """Decodes bytes produced by encode_entity_graph, returning the root entity of
+    the decoded graph."""
+    format_version, encoded_class_names, records = pickle.loads(encoded)
+    if format_version != _FORMAT_VERSION:
+        raise ValueError(
+            f"Unexpected entity graph format version [{format_version}], expected "
+            f"[{_FORMAT_VERSION}]."
+        )
+
+    schemas = [
+        _EntityClassSchema.for_entity_class(
+            _entity_class_for_encoded_name(encoded_class_name)
+        )
+        for encoded_class_name in encoded_class_names
+    ]
+
+    # Create every entity up front so that references can be resolved in one pass.
+    # The entities are hydrated directly rather than through their constructors,
+    # since they were valid when they were encoded.
+    graph_entities: List[Entity] = []
+    for record in records:
+        entity_class = schemas[record[0]].entity_class
+        graph_entities.append(entity_class.__new__(entity_class))
+
+    def _decode_ref(encoded_ref: Any, is_list_field: bool) -> Any:
+        if encoded_ref is None:
+            return None
+        if is_list_field:
+            return [graph_entities[index] for index in encoded_ref]
+        return graph_entities[encoded_ref]
+
+    parents_by_entity: List[List[int]] = [[] for _ in records]
+    implied_back_edges: List[Tuple[int, _EntityClassSchema, _RefField]] = []
+    for entity_index, (entity, record) in enumerate(zip(graph_entities, records)):
+        schema = schemas[record[0]]
+        values = list(record[1])
+
+        for position, enum_cls, _ in schema.enum_fields:
+            if values[position] is not None:
+                values[position] = _enum_members(enum_cls)[values[position]]
+
+        for position in schema.date_fields:
+            if values[position] is not None:
+                values[position] = datetime.date.fromordinal(values[position])
+
+        for ref_field in schema.forward_ref_fields:
+            encoded_ref = values[ref_field.position]
+            if isinstance(encoded_ref, int):
+                _add_parent(parents_by_entity[encoded_ref], entity_index)
+            elif encoded_ref:
+                for referenced_index in encoded_ref:
+                    _add_parent(parents_by_entity[referenced_index], entity_index)
+            values[ref_field.position] = _decode_ref(encoded_ref, ref_field.is_list)
+
+        for ref_field in schema.back_ref_fields:
+            encoded_ref = values[ref_field.position]
+            if encoded_ref == _IMPLIED_BACK_EDGE:
+                implied_back_edges.append((entity_index, schema, ref_field))
+                values[ref_field.position] = None
+            else:
+                values[ref_field.position] = _decode_ref(encoded_ref, ref_field.is_list)
+
+        entity.__dict__.update(zip(schema.field_names, values))
+        if len(record) > 2:
+            entity.__dict__.update(record[2])
+
+    for entity_index, schema, ref_field in implied_back_edges:
+        implied_entities = [
+            graph_entities[parent_index]
+            for parent_index in parents_by_entity[entity_index]
+            if isinstance(graph_entities[parent_index], ref_field.back_edge_class)
+        ]
+        graph_entities[entity_index].__dict__[
+            schema.field_names[ref_field.position]
+        ] = (implied_entities if ref_field.is_list else implied_entities[0])
+
+    return graph_entities[0]
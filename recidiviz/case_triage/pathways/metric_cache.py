@@ -14,10 +14,32 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
-""" Interface for fetching metrics from Pathways Cloud Memorystore, falling back to Cloud SQL """
-from typing import List, Mapping, Union
+""" Interface for fetching metrics from Pathways Cloud Memorystore, falling back to Cloud SQL
+
+Metrics are cached in two tiers: a small in-process LRU cache with a short TTL, in
+front of the shared Redis cache. On a Redis miss, only one request per cache key
+(across all processes) runs the Cloud SQL query; concurrent requests for the same key
+wait for that result to be written rather than running the same query themselves.
+
+Redis entries for a metric live in a versioned key namespace. A per-metric pointer
+records the active namespace and the one it replaced. warm_up() computes all default
+values for a set of metrics concurrently into a fresh namespace, then swaps the
+pointers for all of them in a single transaction, so requests are never served a
+partially refreshed cache. Values only found in the previous namespace are served
+stale while they are recomputed.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent import futures
+from typing import List, Mapping, Optional, Tuple, Union, cast
 
 import attr
+import redis
 from redis import Redis
 
 from recidiviz.case_triage.pathways.dimensions.dimension import Dimension
@@ -25,15 +47,135 @@ from recidiviz.case_triage.pathways.dimensions.dimension_mapping import (
     DimensionOperation,
 )
 from recidiviz.case_triage.pathways.dimensions.time_period import TimePeriod
+from recidiviz.case_triage.pathways.enabled_metrics import ENABLED_METRICS_BY_STATE
 from recidiviz.case_triage.pathways.metric_fetcher import PathwaysMetricFetcher
 from recidiviz.case_triage.pathways.metrics.query_builders.metric_query_builder import (
     FetchMetricParams,
     MetricQueryBuilder,
 )
 from recidiviz.case_triage.util import get_pathways_metric_redis
-from recidiviz.cloud_memorystore import utils as cloud_memorystore_utils
 from recidiviz.common.constants.states import _FakeStateCode
 
+MetricValue = Mapping[
+    str, Union[List[Mapping[str, Union[str, int]]], Mapping[str, Union[str, int]]]
+]
+
+# How long metrics are kept in the in-process cache. Local entries are not invalidated
+# when another process resets the cache, so this bounds how long a process can serve
+# a value that is out of date.
+LOCAL_CACHE_TTL_SECONDS = 30
+LOCAL_CACHE_MAX_ENTRIES = 1000
+
+# How long metrics are kept in Redis. warm_up() rewrites the default values of each
+# metric whenever its data is imported, so this only bounds how long values that are
+# no longer refreshed (e.g. for rarely requested filters) take up memory.
+CACHE_EXPIRY_SECONDS = 60 * 60 * 24 * 7  # 1 week
+
+# How long a request may hold the lock for computing a metric before it expires, and
+# so how long other requests wait for that computation before running it themselves.
+COMPUTE_LOCK_TIMEOUT_SECONDS = 30
+COMPUTE_LOCK_POLL_INTERVAL_SECONDS = 0.05
+
+# Number of metric queries run concurrently during warm_up(). Matches the default
+# SQLAlchemy connection pool size, so that workers don't wait on each other for a
+# connection, and leaves the overflow connections for requests being served meanwhile.
+WARM_UP_MAX_WORKERS = 5
+
+# Number of commands sent to Redis per round trip when writing or deleting entries in
+# bulk.
+REDIS_PIPELINE_BATCH_SIZE = 1000
+
+# Prefix for compressed Redis entries. Entries without this prefix are plain JSON
+# values written by older versions of this cache.
+_COMPRESSED_ENTRY_PREFIX = b"zlib:"
+
+# Fields of the hash that points to a metric's active and previous namespaces
+_ACTIVE_NAMESPACE_FIELD = "active"
+_PREVIOUS_NAMESPACE_FIELD = "previous"
+
+# Namespace that holds entries for metrics that have never been warmed up. Its keys
+# are not versioned, so that entries written by older versions of this cache are
+# still read.
+_UNVERSIONED_NAMESPACE = 0
+
+
+def _encode_entry(value: MetricValue) -> bytes:
+    return _COMPRESSED_ENTRY_PREFIX + zlib.compress(json.dumps(value).encode())
+
+
+def _decode_entry(entry: bytes) -> MetricValue:
+    if not entry.startswith(_COMPRESSED_ENTRY_PREFIX):
+        return json.loads(entry)
+    return json.loads(zlib.decompress(entry[len(_COMPRESSED_ENTRY_PREFIX) :]))
+
+
+def default_params_for(mapper: MetricQueryBuilder) -> List[FetchMetricParams]:
+    """Returns the params of all values of the metric that are computed ahead of time:
+    each group dimension, on its own and filtered to each time period."""
+    default_params = []
+    operable_dimensions = mapper.dimension_mapping_collection.operable_map
+    for dimension in operable_dimensions[DimensionOperation.GROUP]:
+        params = mapper.build_params({"group": dimension})
+        default_params.append(params)
+
+        if Dimension.TIME_PERIOD in operable_dimensions[DimensionOperation.FILTER]:
+            for time_period in TimePeriod:
+                default_params.append(
+                    attr.evolve(
+                        params,
+                        filters={
+                            Dimension.TIME_PERIOD: TimePeriod.period_range(
+                                time_period.value
+                            )
+                        },
+                    )
+                )
+    return default_params
+
+
+class LocalMetricCache:
+    """A thread-safe, in-process LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, MetricValue]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[MetricValue]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: MetricValue) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all PathwaysMetricCache instances created with build()
+_local_metric_cache = LocalMetricCache(
+    max_entries=LOCAL_CACHE_MAX_ENTRIES, ttl_seconds=LOCAL_CACHE_TTL_SECONDS
+)
+
 
 @attr.s(auto_attribs=True)
 class PathwaysMetricCache:
@@ -43,59 +185,285 @@ class PathwaysMetricCache:
     state_code: _FakeStateCode
     metric_fetcher: PathwaysMetricFetcher
     redis: Redis
+    local_cache: LocalMetricCache = attr.Factory(
+        lambda: LocalMetricCache(
+            max_entries=LOCAL_CACHE_MAX_ENTRIES, ttl_seconds=LOCAL_CACHE_TTL_SECONDS
+        )
+    )
 
     def fetch(
         self, mapper: MetricQueryBuilder, params: FetchMetricParams
-    ) -> List[Mapping[str, Union[str, int]]]:
-        return cloud_memorystore_utils.get_or_set_json(
-            self.redis,
-            self.cache_key_for(mapper, params),
-            lambda: self.metric_fetcher.fetch(mapper, params),
+    ) -> MetricValue:
+        local_cache_key = self.cache_key_for(mapper, params)
+        value = self.local_cache.get(local_cache_key)
+        if value is not None:
+            return value
+
+        active_version, previous_version = self._get_namespace_versions(mapper)
+        cache_key = self.cache_key_for(mapper, params, version=active_version)
+        cache_keys = [cache_key]
+        if previous_version is not None:
+            cache_keys.append(
+                self.cache_key_for(mapper, params, version=previous_version)
+            )
+        entry, *previous_entry = self.redis.mget(cache_keys)
+        if entry:
+            value = _decode_entry(entry)
+            self.local_cache.set(local_cache_key, value)
+            return value
+
+        stale_value = (
+            _decode_entry(previous_entry[0])
+            if previous_entry and previous_entry[0]
+            else None
         )
+        return self._compute(mapper, params, cache_key, stale_value)
 
-    def cache_key_for(
-        self, mapper: MetricQueryBuilder, params: FetchMetricParams
-    ) -> str:
+    def _compute(
+        self,
+        mapper: MetricQueryBuilder,
+        params: FetchMetricParams,
+        cache_key: str,
+        stale_value: Optional[MetricValue],
+    ) -> MetricValue:
+        """Computes the metric and stores it in Redis, unless another request is
+        already computing it. In that case, returns the stale value if there is one, or
+        otherwise waits for the other request's result. Stale values are never stored
+        in the local cache."""
+        lock_key = self.lock_key_for(cache_key)
+        lock_token = uuid.uuid4().hex
+        if self.redis.set(
+            lock_key, lock_token, nx=True, px=int(COMPUTE_LOCK_TIMEOUT_SECONDS * 1000)
+        ):
+            try:
+                return self._fetch_and_store(mapper, params, cache_key)
+            finally:
+                self._release_lock(lock_key, lock_token)
+
+        if stale_value is not None:
+            return stale_value
+
+        deadline = time.monotonic() + COMPUTE_LOCK_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(COMPUTE_LOCK_POLL_INTERVAL_SECONDS)
+            entry = self.redis.get(cache_key)
+            if entry:
+                value = _decode_entry(entry)
+                self.local_cache.set(self.cache_key_for(mapper, params), value)
+                return value
+
+        logging.warning(
+            "Timed out waiting for another request to compute [%s], computing it instead",
+            cache_key,
+        )
+        return self._fetch_and_store(mapper, params, cache_key)
+
+    def _fetch_and_store(
+        self,
+        mapper: MetricQueryBuilder,
+        params: FetchMetricParams,
+        cache_key: str,
+    ) -> MetricValue:
+        value = self.metric_fetcher.fetch(mapper, params)
+        self.redis.set(cache_key, _encode_entry(value), ex=CACHE_EXPIRY_SECONDS)
+        self.local_cache.set(self.cache_key_for(mapper, params), value)
+        return value
+
+    def _release_lock(self, lock_key: str, lock_token: str) -> None:
+        """Deletes the lock, unless it has expired and been acquired by another
+        request in the meantime."""
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(lock_key)
+                if pipe.get(lock_key) == lock_token.encode():
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+            except redis.WatchError:
+                pass
+
+    def _get_namespace_versions(
+        self, mapper: MetricQueryBuilder
+    ) -> Tuple[int, Optional[int]]:
+        """Returns the versions of the metric's active and previous namespaces."""
+        active_version, previous_version = self.redis.hmget(
+            self.namespace_key_for(mapper),
+            [_ACTIVE_NAMESPACE_FIELD, _PREVIOUS_NAMESPACE_FIELD],
+        )
         return (
-            f"{self.state_code.value} {mapper.cache_fragment} {params.cache_fragment}"
+            int(active_version)
+            if active_version is not None
+            else _UNVERSIONED_NAMESPACE,
+            int(previous_version) if previous_version is not None else None,
         )
 
+    def cache_key_for(
+        self,
+        mapper: MetricQueryBuilder,
+        params: FetchMetricParams,
+        version: int = _UNVERSIONED_NAMESPACE,
+    ) -> str:
+        return f"{self.cache_key_prefix_for(mapper, version)}{params.cache_fragment}"
+
+    def cache_key_prefix_for(
+        self, mapper: MetricQueryBuilder, version: int = _UNVERSIONED_NAMESPACE
+    ) -> str:
+        if version == _UNVERSIONED_NAMESPACE:
+            return f"{self.state_code.value} {mapper.cache_fragment} "
+        return f"{self.state_code.value} {mapper.cache_fragment} v{version} "
+
+    def namespace_key_for(self, mapper: MetricQueryBuilder) -> str:
+        return f"namespace {self.state_code.value} {mapper.cache_fragment}"
+
+    @property
+    def namespace_version_key(self) -> str:
+        return f"namespace_version {self.state_code.value}"
+
+    @staticmethod
+    def lock_key_for(cache_key: str) -> str:
+        return f"lock {cache_key}"
+
     def purge_cache_for_mapper(self, mapper: MetricQueryBuilder) -> None:
-        cache_key_pattern = f"{self.state_code.value} {mapper.cache_fragment}*"
-        pipe = self.redis.pipeline()
+        self._delete_keys_matching(f"{self.state_code.value} {mapper.cache_fragment} *")
+        self.local_cache.delete_prefix(self.cache_key_prefix_for(mapper))
 
-        for key in self.redis.scan_iter(cache_key_pattern):
-            pipe.delete(key)
+    def _delete_namespace(self, mapper: MetricQueryBuilder, version: int) -> None:
+        prefix = self.cache_key_prefix_for(mapper, version)
+        # Unversioned keys always start with the params' cache fragment, which keeps
+        # them from matching the keys of versioned namespaces.
+        self._delete_keys_matching(
+            f"{prefix}filters=*" if version == _UNVERSIONED_NAMESPACE else f"{prefix}*"
+        )
 
+    def _delete_keys_matching(self, pattern: str) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for key in self.redis.scan_iter(pattern, count=REDIS_PIPELINE_BATCH_SIZE):
+            pipe.unlink(key)
+            if len(pipe) >= REDIS_PIPELINE_BATCH_SIZE:
+                pipe.execute()
         pipe.execute()
 
-    def reset_cache(self, mapper: MetricQueryBuilder) -> None:
-        self.purge_cache_for_mapper(mapper)
-        self.initialize_cache(mapper)
+    def warm_up(
+        self,
+        mappers: Optional[List[MetricQueryBuilder]] = None,
+        max_workers: int = WARM_UP_MAX_WORKERS,
+    ) -> None:
+        """Computes the default values of the given metrics (by default, all metrics
+        enabled for the state) concurrently, and writes them to a new namespace. Once
+        all values have been computed, the metrics are switched over to the new
+        namespace at once. If any value fails to compute, the metrics keep using their
+        current namespace."""
+        if mappers is None:
+            mappers = ENABLED_METRICS_BY_STATE.get(self.state_code, [])
+        if not mappers:
+            return
 
-    def initialize_cache(self, mapper: MetricQueryBuilder) -> None:
+        version = self.redis.incr(self.namespace_version_key)
+        # Create the session factory up front so that workers don't race to create
+        # it, and all share the same connection pool.
+        _ = self.metric_fetcher.database_session
 
-        operable_dimensions = mapper.dimension_mapping_collection.operable_map
-        for dimension in operable_dimensions[DimensionOperation.GROUP]:
-            params = mapper.build_params({"group": dimension})
+        try:
+            self._write_default_values(mappers, version, max_workers)
+        except Exception:
+            for mapper in mappers:
+                self._delete_namespace(mapper, version)
+            raise
 
-            self.fetch(
-                mapper=mapper,
-                params=attr.evolve(params, group=dimension),
-            )
+        replaced_versions = self._activate_namespace(mappers, version)
+        for mapper in mappers:
+            self.local_cache.delete_prefix(self.cache_key_prefix_for(mapper))
+        for mapper, replaced_version in zip(mappers, replaced_versions):
+            if replaced_version is not None:
+                self._delete_namespace(mapper, replaced_version)
 
-            if Dimension.TIME_PERIOD in operable_dimensions[DimensionOperation.FILTER]:
-                for time_period in TimePeriod:
-                    params = attr.evolve(
-                        params,
-                        filters={
-                            Dimension.TIME_PERIOD: TimePeriod.period_range(
-                                time_period.value
-                            )
-                        },
+    def _write_default_values(
+        self, mappers: List[MetricQueryBuilder], version: int, max_workers: int
+    ) -> None:
+        """Computes the default values of the metrics on a pool of worker threads,
+        writing them to Redis in batches as they complete."""
+        pipe = self.redis.pipeline(transaction=False)
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            cache_key_futures = {
+                executor.submit(
+                    self.metric_fetcher.fetch, mapper, params
+                ): self.cache_key_for(mapper, params, version=version)
+                for mapper in mappers
+                for params in default_params_for(mapper)
+            }
+            try:
+                for future in futures.as_completed(cache_key_futures):
+                    pipe.set(
+                        cache_key_futures[future],
+                        _encode_entry(future.result()),
+                        ex=CACHE_EXPIRY_SECONDS,
                     )
+                    if len(pipe) >= REDIS_PIPELINE_BATCH_SIZE:
+                        pipe.execute()
+            except Exception:
+                for future in cache_key_futures:
+                    future.cancel()
+                raise
+        pipe.execute()
 
-                    self.fetch(mapper=mapper, params=params)
+    def _activate_namespace(
+        self, mappers: List[MetricQueryBuilder], version: int
+    ) -> List[Optional[int]]:
+        """Atomically makes the namespace with the given version the active namespace
+        for all of the metrics. Returns, for each metric, the version of the namespace
+        that is no longer referenced, if any."""
+        namespace_keys = [self.namespace_key_for(mapper) for mapper in mappers]
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(*namespace_keys)
+                    # Commands run immediately while watching, before multi()
+                    current_versions = [
+                        cast(
+                            List[Optional[bytes]],
+                            pipe.hmget(
+                                namespace_key,
+                                [_ACTIVE_NAMESPACE_FIELD, _PREVIOUS_NAMESPACE_FIELD],
+                            ),
+                        )
+                        for namespace_key in namespace_keys
+                    ]
+                    pipe.multi()
+                    for namespace_key, (active_version, _) in zip(
+                        namespace_keys, current_versions
+                    ):
+                        pipe.hset(
+                            namespace_key,
+                            mapping={
+                                _ACTIVE_NAMESPACE_FIELD: version,
+                                _PREVIOUS_NAMESPACE_FIELD: int(
+                                    active_version or _UNVERSIONED_NAMESPACE
+                                ),
+                            },
+                        )
+                    pipe.execute()
+                    break
+                except redis.WatchError:
+                    continue
+
+        return [
+            int(previous_version) if previous_version is not None else None
+            for _, previous_version in current_versions
+        ]
+
+    def reset_cache(
+        self, mapper: MetricQueryBuilder, stale_while_revalidate: bool = True
+    ) -> None:
+        """Recomputes the default cached values for the metric. If
+        |stale_while_revalidate| is set, existing entries continue to be served until
+        they are recomputed, rather than being deleted up front."""
+        if not stale_while_revalidate:
+            self.purge_cache_for_mapper(mapper)
+        self.warm_up([mapper])
+
+    def initialize_cache(self, mapper: MetricQueryBuilder) -> None:
+        for params in default_params_for(mapper):
+            self.fetch(mapper=mapper, params=params)
 
     @classmethod
     def build(cls, state_code: _FakeStateCode) -> "PathwaysMetricCache":
@@ -103,4 +471,5 @@ class PathwaysMetricCache:
             state_code=state_code,
             metric_fetcher=PathwaysMetricFetcher(state_code=state_code),
             redis=get_pathways_metric_redis(),
+            local_cache=_local_metric_cache,
         )
@@ -15,12 +15,45 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """ Utils for working with Redis """
-import json
 import time
-from datetime import datetime, timedelta
-from typing import Any, Callable, Iterator, List, Set
+from datetime import timedelta
+from typing import Iterator, List, Optional, Set
 
 import redis
+from opencensus.stats import aggregation, measure, view
+
+from recidiviz.utils import monitoring
+
+# Number of EXISTS commands sent to Redis per round trip
+EXISTS_PIPELINE_BATCH_SIZE = 1000
+
+m_await_duration_s = measure.MeasureFloat(
+    "cloud_memorystore/await_redis_keys/duration",
+    "The time spent waiting for Redis keys to exist",
+    "s",
+)
+m_await_polls = measure.MeasureInt(
+    "cloud_memorystore/await_redis_keys/polls",
+    "The number of times Redis was checked for keys before they all existed",
+    "1",
+)
+
+await_duration_view = view.View(
+    "recidiviz/cloud_memorystore/await_redis_keys/duration",
+    "The distribution of the time spent waiting for Redis keys",
+    [monitoring.TagKey.STATUS],
+    m_await_duration_s,
+    aggregation.DistributionAggregation(monitoring.exponential_buckets(0.1, 2, 12)),
+)
+await_polls_view = view.View(
+    "recidiviz/cloud_memorystore/await_redis_keys/polls",
+    "The distribution of the number of polls for Redis keys",
+    [monitoring.TagKey.STATUS],
+    m_await_polls,
+    aggregation.DistributionAggregation(monitoring.exponential_buckets(1, 2, 10)),
+)
+
+monitoring.register_views([await_duration_view, await_polls_view])
 
 
 class RedisKeyTimeoutError(TimeoutError):
@@ -30,36 +63,96 @@ class RedisKeyTimeoutError(TimeoutError):
         super().__init__(self.message)
 
 
+def _existing_keys(cache: redis.Redis, keys: Set[str]) -> Set[str]:
+    """Returns the subset of |keys| that exist, checking for them with pipelined
+    EXISTS commands rather than scanning the keyspace."""
+    existing_keys: Set[str] = set()
+    sorted_keys = sorted(keys)
+    for i in range(0, len(sorted_keys), EXISTS_PIPELINE_BATCH_SIZE):
+        batch = sorted_keys[i : i + EXISTS_PIPELINE_BATCH_SIZE]
+        pipe = cache.pipeline(transaction=False)
+        for key in batch:
+            pipe.exists(key)
+        existing_keys.update(
+            key for key, exists in zip(batch, pipe.execute()) if exists
+        )
+    return existing_keys
+
+
+def _keyspace_channel(cache: redis.Redis, key: str) -> str:
+    db = cache.connection_pool.connection_kwargs.get("db", 0)
+    return f"__keyspace@{db}__:{key}"
+
+
+def notify_redis_keys_set(cache: redis.Redis, completion_channel: str) -> None:
+    """Wakes up callers of await_redis_keys() that are waiting on |completion_channel|.
+    Should be called once the keys they are waiting for have been written."""
+    cache.publish(completion_channel, "set")
+
+
 def await_redis_keys(
     cache: redis.Redis,
     required_keys: List[str],
     timeout_timedelta: timedelta = timedelta(minutes=2),
+    poll_interval: timedelta = timedelta(seconds=1),
+    completion_channel: Optional[str] = None,
+    use_keyspace_notifications: bool = False,
 ) -> Iterator[Set[str]]:
     """Waits for a list of Redis keys to exist before returning
     Yields the list of remaining keys so the caller can track progress
+
+    Only the remaining keys are checked on each poll. Between polls, if
+    |completion_channel| is set, we wake up as soon as a message is published to it
+    (see notify_redis_keys_set()). If |use_keyspace_notifications| is set, we also wake
+    up whenever one of the remaining keys is modified. This requires keyspace
+    notifications to be enabled on the Redis instance (notify-keyspace-events).
+    Messages are only used to wake up early, so polling continues to work if they
+    are missed or notifications are disabled.
     """
+    start = time.monotonic()
+    deadline = start + timeout_timedelta.total_seconds()
     remaining_keys = set(required_keys)
-    timeout = datetime.now() + timeout_timedelta
+    polls = 0
 
-    while remaining_keys and datetime.now() <= timeout:
-        for key in cache.scan_iter():
-            remaining_keys.discard(key.decode("utf-8"))
+    pubsub = None
+    channels = []
+    if completion_channel:
+        channels.append(completion_channel)
+    if use_keyspace_notifications:
+        channels.extend(_keyspace_channel(cache, key) for key in remaining_keys)
+    if channels:
+        # Subscribe before checking for the keys so that no signal is missed
+        pubsub = cache.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*channels)
 
-        yield remaining_keys
+    try:
+        while remaining_keys and time.monotonic() <= deadline:
+            polls += 1
+            remaining_keys -= _existing_keys(cache, remaining_keys)
 
-        time.sleep(1)
+            yield remaining_keys
+
+            if not remaining_keys:
+                break
+            wait_seconds = max(
+                min(poll_interval.total_seconds(), deadline - time.monotonic()), 0
+            )
+            if pubsub is not None:
+                # Returns as soon as a message is published, or after the timeout
+                if pubsub.get_message(timeout=wait_seconds):
+                    # Drain any other signals received in the meantime
+                    while pubsub.get_message():
+                        pass
+            else:
+                time.sleep(wait_seconds)
+    finally:
+        if pubsub is not None:
+            pubsub.close()
+        with monitoring.measurements(
+            {monitoring.TagKey.STATUS: "TIMEOUT" if remaining_keys else "COMPLETE"}
+        ) as measurements:
+            measurements.measure_float_put(m_await_duration_s, time.monotonic() - start)
+            measurements.measure_int_put(m_await_polls, polls)
 
     if remaining_keys:
         raise RedisKeyTimeoutError(missing_keys=list(remaining_keys))
-
-
-def get_or_set_json(cache: redis.Redis, cache_key: str, fetch_value: Callable) -> Any:
-    cached_value = cache.get(cache_key)
-
-    if cached_value:
-        return json.loads(cached_value)
-
-    cached_value = fetch_value()
-    cache.set(cache_key, json.dumps(cached_value))
-
-    return cached_value
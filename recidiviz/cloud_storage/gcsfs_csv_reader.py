@@ -16,8 +16,11 @@
 # =============================================================================
 """Streaming read functionality for Google Cloud Storage CSV files."""
 import abc
+import codecs
 import csv
+import logging
 from contextlib import contextmanager
+from enum import Enum
 from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
 
 import pandas as pd
@@ -42,6 +45,32 @@ COMMON_RAW_FILE_ENCODINGS = [
     ISO_8859_1_ENCODING,
 ]
 
+# Number of bytes at the start of the file decoded by EncodingDetectionMode.SAMPLE
+DEFAULT_ENCODING_SAMPLE_SIZE_BYTES = 1024 * 1024
+
+# Size of the blocks the file is read in while checking encodings
+_ENCODING_DETECTION_BLOCK_SIZE_BYTES = 1024 * 1024
+
+
+class EncodingDetectionMode(Enum):
+    """Controls how GcsfsCsvReader.streaming_read() narrows down the list of encodings
+    to try before doing the (expensive) pandas read of a file.
+    """
+
+    # Try each encoding in order with a full pandas read, falling back to the next
+    # encoding if we hit a decode error partway through the file.
+    NONE = "NONE"
+
+    # Decode a window at the start of the file with each candidate encoding and skip
+    # encodings that cannot decode it. An encoding may still fail later in the file,
+    # in which case we fall back to the next remaining candidate.
+    SAMPLE = "SAMPLE"
+
+    # Stream the whole file through an incremental decoder for each candidate
+    # encoding, without parsing it. The first encoding that decodes the whole file is
+    # guaranteed to succeed, so the pandas read happens exactly once.
+    VALIDATE_FULL_FILE = "VALIDATE_FULL_FILE"
+
 
 class GcsfsCsvReaderDelegate:
     """A delegate for handling various events that happen during a GcsfsCsvReader streaming_read() call."""
@@ -102,7 +131,7 @@ class GcsfsCsvReader:
 
     @contextmanager
     def _file_pointer_for_path(
-        self, path: GcsfsFilePath, encoding: str
+        self, path: GcsfsFilePath, encoding: Optional[str]
     ) -> Iterator[TextIO]:
         """Returns a file pointer for the given path."""
 
@@ -154,6 +183,48 @@ class GcsfsCsvReader:
 
         return preprocessed_fp, encoding, kwargs
 
+    def get_decodable_encodings(
+        self,
+        path: GcsfsFilePath,
+        encodings_to_try: List[str],
+        max_bytes: Optional[int],
+    ) -> List[str]:
+        """Returns the subset of |encodings_to_try| (in the same order) that can decode
+        the first |max_bytes| bytes of the file at |path|, or the entire file if
+        |max_bytes| is None. Reads the file as a byte stream in a single pass, feeding
+        each block to an incremental decoder per encoding, and stops early once no
+        candidate encodings remain.
+        """
+        decoders: Dict[str, codecs.IncrementalDecoder] = {}
+        for encoding in encodings_to_try:
+            try:
+                decoders[encoding] = codecs.getincrementaldecoder(encoding)()
+            except LookupError:
+                logging.warning("Unknown encoding [%s], skipping.", encoding)
+
+        with self._file_pointer_for_path(path, encoding=None) as fp:
+            bytes_read = 0
+            while decoders:
+                block_size = _ENCODING_DETECTION_BLOCK_SIZE_BYTES
+                if max_bytes is not None:
+                    block_size = min(block_size, max_bytes - bytes_read)
+                    if block_size <= 0:
+                        # We have decoded the full sample - a multi-byte character
+                        # may be truncated at the end of the window, which is fine.
+                        break
+                block = fp.buffer.read(block_size)
+                at_eof = not block
+                for encoding, decoder in list(decoders.items()):
+                    try:
+                        decoder.decode(block, final=at_eof)
+                    except UnicodeError:
+                        del decoders[encoding]
+                if at_eof:
+                    break
+                bytes_read += len(block)
+
+        return [encoding for encoding in encodings_to_try if encoding in decoders]
+
     def streaming_read(
         self,
         path: GcsfsFilePath,
@@ -161,8 +232,10 @@ class GcsfsCsvReader:
         chunk_size: int,
         encodings_to_try: Optional[List[str]] = None,
         dtype: Optional[Any] = str,
+        encoding_detection_mode: EncodingDetectionMode = EncodingDetectionMode.NONE,
+        encoding_sample_size_bytes: int = DEFAULT_ENCODING_SAMPLE_SIZE_BYTES,
         **kwargs: Any,
-    ) -> None:
+    ) -> str:
         """
         Performs a streaming read of the CSV at the provided path. Will attempt to decode file with multiple encoding
         types. For large files, this allows us to read and process the whole file without ever storing the whole file in
@@ -174,14 +247,43 @@ class GcsfsCsvReader:
             chunk_size: The max number of rows each chunk of the CSV should have.
             encodings_to_try: If provided, the ordered list of file encodings we should try for the given file.
             dtype: The data type for values
-            wrapper: If provided and true, use wrapper function when calling the helper function in direct_ingest_utils
+            encoding_detection_mode: How to narrow down |encodings_to_try| before
+                reading the file with pandas. See EncodingDetectionMode.
+            encoding_sample_size_bytes: The number of bytes decoded when
+                |encoding_detection_mode| is SAMPLE.
             kwargs: Key-value args passed through to the pandas read_csv() call.
+
+        Returns the encoding in |encodings_to_try| that the file was successfully read
+        with.
         """
 
         if not encodings_to_try:
             encodings_to_try = COMMON_RAW_FILE_ENCODINGS
 
-        for encoding in encodings_to_try:
+        if encoding_detection_mode != EncodingDetectionMode.NONE:
+            decodable_encodings = self.get_decodable_encodings(
+                path,
+                encodings_to_try,
+                max_bytes=(
+                    encoding_sample_size_bytes
+                    if encoding_detection_mode == EncodingDetectionMode.SAMPLE
+                    else None
+                ),
+            )
+            logging.info(
+                "Encodings that can decode [%s] in mode [%s]: %s",
+                path.abs_path(),
+                encoding_detection_mode.value,
+                decodable_encodings,
+            )
+            if not decodable_encodings:
+                raise ValueError(
+                    f"Unable to read path [{path.abs_path()}] for any of these encodings: {encodings_to_try}"
+                )
+            encodings_to_try = decodable_encodings
+
+        for file_encoding in encodings_to_try:
+            encoding = file_encoding
             delegate.on_start_read_with_encoding(encoding)
             try:
                 with self._file_pointer_for_path(path, encoding=encoding) as fp:
@@ -220,7 +322,7 @@ class GcsfsCsvReader:
                             break
 
                     delegate.on_file_read_success(encoding)
-                    return
+                    return file_encoding
             except UnicodeError as e:
                 should_throw = delegate.on_unicode_decode_error(encoding, e)
                 if should_throw:
@@ -18,14 +18,25 @@
 
 import abc
 import csv
+import io
 import logging
-from typing import List, Optional
+from concurrent import futures
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import attr
 import pandas as pd
+import pyarrow as pa
+from pyarrow import parquet as pq
 
-from recidiviz.cloud_storage.gcs_file_system import GCSFileSystem
+from recidiviz.cloud_storage.gcs_file_system import (
+    GCSFileSystem,
+    generate_random_temp_path,
+)
 from recidiviz.cloud_storage.gcsfs_csv_reader import GcsfsCsvReaderDelegate
 from recidiviz.cloud_storage.gcsfs_path import GcsfsFilePath
+from recidiviz.common.io.local_file_contents_handle import LocalFileContentsHandle
+from recidiviz.utils import structured_logging
 
 
 class SimpleGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
@@ -69,25 +80,157 @@ class ReadOneGcsfsCsvReaderDelegate(SimpleGcsfsCsvReaderDelegate):
         return False
 
 
+class ChunkFileFormat(Enum):
+    """The file format that SplittingGcsfsCsvReaderDelegate writes chunks out in."""
+
+    CSV = "CSV"
+
+    # Snappy-compressed Parquet. String (object) columns are always written with an
+    # explicit string type, so values are never re-parsed by the consumer, and
+    # embedded newlines / quotes do not need any escaping.
+    PARQUET = "PARQUET"
+
+
+def serialize_chunk_to_csv(df: pd.DataFrame, include_header: bool) -> str:
+    # We cannot use QUOTE_ALL as it results in empty values being written as "" in our temp file csv.
+    # When uploading the temp file to BQ this results in empty strings being uploaded instead of NULLs.
+    quoting = csv.QUOTE_MINIMAL
+    return df.to_csv(header=include_header, index=False, quoting=quoting)
+
+
+def _parquet_type_for_column(column: pd.Series) -> pa.DataType:
+    if pd.api.types.is_object_dtype(column.dtype):
+        return pa.string()
+    if pd.api.types.is_datetime64_dtype(column.dtype):
+        # BigQuery does not support nanosecond precision timestamps
+        return pa.timestamp("us")
+    return pa.from_numpy_dtype(column.dtype)
+
+
+def serialize_chunk_to_parquet(df: pd.DataFrame) -> bytes:
+    schema = pa.schema(
+        [(name, _parquet_type_for_column(df[name])) for name in df.columns]
+    )
+    # Match the CSV output, where empty values are written unquoted and loaded into BQ
+    # as NULLs rather than as empty strings. The index is reset because chunks are
+    # serialized on worker threads, where pyarrow may read a column as a plain
+    # sequence (by index label) rather than as a pandas Series.
+    df = df.reset_index(drop=True).apply(
+        lambda column: column.mask(column == "", None)
+        if pd.api.types.is_object_dtype(column.dtype)
+        else column
+    )
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="snappy", coerce_timestamps="us")
+    return buffer.getvalue()
+
+
+def _transform_and_serialize_chunk(
+    transform_fn: Callable[[pd.DataFrame], pd.DataFrame],
+    df: pd.DataFrame,
+    include_header: bool,
+    output_format: ChunkFileFormat,
+) -> Tuple[int, List[str], Union[str, bytes]]:
+    """Transforms a chunk and serializes it to |output_format|. Returns the number of
+    rows and the columns of the transformed chunk, along with the serialized contents.
+    Defined at module level so that it can be run in a process pool.
+    """
+    transformed_df = transform_fn(df)
+    contents: Union[str, bytes]
+    if output_format == ChunkFileFormat.CSV:
+        contents = serialize_chunk_to_csv(transformed_df, include_header)
+    elif output_format == ChunkFileFormat.PARQUET:
+        contents = serialize_chunk_to_parquet(transformed_df)
+    else:
+        raise ValueError(f"Unexpected output format: [{output_format}]")
+    return (
+        transformed_df.shape[0],
+        list(transformed_df.columns.values),
+        contents,
+    )
+
+
+@attr.s(frozen=True, kw_only=True)
+class _ChunkOutput:
+    """The result of transforming and uploading a single chunk."""
+
+    chunk_num: int = attr.ib()
+    # None if the transformed chunk had no rows and nothing was uploaded
+    output_path: Optional[GcsfsFilePath] = attr.ib()
+    columns: List[str] = attr.ib()
+
+
 class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
     """An implementation of the GcsfsCsvReaderDelegate that uploads each CSV chunk to a separate Google Cloud Storage
     path.
+
+    If |max_in_flight_chunks| is greater than 0, chunks are transformed and uploaded on
+    a pool of that many threads while the reader parses subsequent chunks. At most
+    |max_in_flight_chunks| chunks are held in memory waiting to be transformed or
+    uploaded at any time - the reader blocks once that limit is reached. If
+    |num_transform_processes| is also greater than 0 and the delegate sets
+    |picklable_transform_fn|, transforms and serialization run in a process pool of
+    that size. Output paths are always reported in chunk
+    order, and if the read is restarted with a new encoding, all in-flight work is
+    finished and its outputs deleted before the next read starts.
+
+    Chunks are written as CSV by default, or as Parquet if |output_format| is
+    ChunkFileFormat.PARQUET (in which case |include_header| is ignored).
     """
 
-    def __init__(self, path: GcsfsFilePath, fs: GCSFileSystem, include_header: bool):
+    def __init__(
+        self,
+        path: GcsfsFilePath,
+        fs: GCSFileSystem,
+        include_header: bool,
+        max_in_flight_chunks: int = 0,
+        num_transform_processes: int = 0,
+        output_format: ChunkFileFormat = ChunkFileFormat.CSV,
+    ):
         self.path = path
         self.fs = fs
         self.include_header = include_header
+        self.output_format = output_format
+        self.max_in_flight_chunks = max_in_flight_chunks
+        self.num_transform_processes = num_transform_processes
 
         self.output_paths: List[GcsfsFilePath] = []
         self.output_columns: Optional[List[str]] = None
 
+        # A picklable function equivalent to transform_dataframe(), if there is one,
+        # so that transforms can be run in a process pool when num_transform_processes
+        # is set. Subclasses may set this in their constructor - if it is None,
+        # transforms run on the upload threads.
+        self.picklable_transform_fn: Optional[
+            Callable[[pd.DataFrame], pd.DataFrame]
+        ] = None
+
+        # Only used when max_in_flight_chunks > 0
+        self._upload_executor: Optional[futures.ThreadPoolExecutor] = None
+        self._transform_executor: Optional[futures.ProcessPoolExecutor] = None
+        self._in_flight_chunks: Dict[futures.Future, int] = {}
+        self._chunk_outputs: Dict[int, _ChunkOutput] = {}
+
+    @property
+    def _is_pipelined(self) -> bool:
+        return self.max_in_flight_chunks > 0
+
     def on_start_read_with_encoding(self, encoding: str) -> None:
         logging.info(
             "Attempting to do chunked upload of [%s] with encoding [%s]",
             self.path.abs_path(),
             encoding,
         )
+        if not self._is_pipelined:
+            return
+        self._upload_executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_in_flight_chunks
+        )
+        if self.num_transform_processes > 0 and self.picklable_transform_fn:
+            self._transform_executor = futures.ProcessPoolExecutor(
+                max_workers=self.num_transform_processes
+            )
 
     def on_file_stream_normalization(
         self, old_encoding: str, new_encoding: str
@@ -103,9 +246,37 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             "Loaded DataFrame chunk [%d] has [%d] rows", chunk_num, df.shape[0]
         )
 
-        transformed_df = self.transform_dataframe(df)
+        if self._is_pipelined:
+            self._submit_chunk(chunk_num, df)
+            return True
+
+        chunk_output = self._transform_and_upload_chunk(chunk_num, df)
+        if chunk_output.output_path is None:
+            return True
+
+        self._check_columns(chunk_output)
+        self.output_paths.append(chunk_output.output_path)
+        return True
+
+    def _transform_and_upload_chunk(
+        self, chunk_num: int, df: pd.DataFrame
+    ) -> _ChunkOutput:
+        """Transforms the chunk and uploads it to its output path, if it has any rows
+        after transformation.
+        """
+        if self._transform_executor and self.picklable_transform_fn:
+            num_rows, columns, contents = self._transform_executor.submit(
+                _transform_and_serialize_chunk,
+                self.picklable_transform_fn,
+                df,
+                self.include_header,
+                self.output_format,
+            ).result()
+        else:
+            num_rows, columns, contents = _transform_and_serialize_chunk(
+                self.transform_dataframe, df, self.include_header, self.output_format
+            )
 
-        num_rows = transformed_df.shape[0]
         logging.info(
             "Transformed DataFrame chunk [%d] has [%d] rows", chunk_num, num_rows
         )
@@ -113,7 +284,7 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             logging.info(
                 "Skipping output for chunk [%s] - no data in chunk.", chunk_num
             )
-            return True
+            return _ChunkOutput(chunk_num=chunk_num, output_path=None, columns=columns)
 
         output_path = self.get_output_path(chunk_num=chunk_num)
 
@@ -122,32 +293,120 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             chunk_num,
             output_path.abs_path(),
         )
+        self._upload_contents(output_path, contents)
+        logging.info("Done writing to output path")
+        return _ChunkOutput(
+            chunk_num=chunk_num, output_path=output_path, columns=columns
+        )
 
-        # We cannot use QUOTE_ALL as it results in empty values being written as "" in our temp file csv.
-        # When uploading the temp file to BQ this results in empty strings being uploaded instead of NULLs.
-        quoting = csv.QUOTE_MINIMAL
-        self.fs.upload_from_string(
+    def _upload_contents(
+        self, output_path: GcsfsFilePath, contents: Union[str, bytes]
+    ) -> None:
+        if isinstance(contents, str):
+            self.fs.upload_from_string(output_path, contents, "text/csv")
+            return
+
+        local_file_path = generate_random_temp_path()
+        with open(local_file_path, "wb") as f:
+            f.write(contents)
+        # The local file is cleaned up when the handle is garbage collected
+        self.fs.upload_from_contents_handle_stream(
             output_path,
-            transformed_df.to_csv(
-                header=self.include_header, index=False, quoting=quoting
-            ),
-            "text/csv",
+            LocalFileContentsHandle(local_file_path, cleanup_file=True),
+            "application/octet-stream",
         )
-        logging.info("Done writing to output path")
 
-        columns_as_list = list(transformed_df.columns.values)
+    def _check_columns(self, chunk_output: _ChunkOutput) -> None:
         if self.output_columns is None:
-            self.output_columns = columns_as_list
+            self.output_columns = chunk_output.columns
 
-        if columns_as_list != self.output_columns:
+        if chunk_output.columns != self.output_columns:
             raise ValueError(
-                f"Found columns written to [{output_path}] that don't match previous "
-                f"columns. Found columns: {columns_as_list}. Previous columns: "
+                f"Found columns written to [{chunk_output.output_path}] that don't match previous "
+                f"columns. Found columns: {chunk_output.columns}. Previous columns: "
                 f"{self.output_columns}."
             )
 
-        self.output_paths.append(output_path)
-        return True
+    def _submit_chunk(self, chunk_num: int, df: pd.DataFrame) -> None:
+        """Submits the chunk for transformation and upload, first blocking until there
+        is room for another in-flight chunk.
+        """
+        if not self._upload_executor:
+            raise ValueError("Expected upload executor to be started.")
+        while len(self._in_flight_chunks) >= self.max_in_flight_chunks:
+            self._collect_completed_chunks(return_when=futures.FIRST_COMPLETED)
+
+        future = self._upload_executor.submit(
+            structured_logging.with_context(self._transform_and_upload_chunk),
+            chunk_num,
+            df,
+        )
+        self._in_flight_chunks[future] = chunk_num
+
+    def _collect_completed_chunks(self, return_when: str) -> None:
+        """Waits for in-flight chunks to complete and records their outputs. Raises the
+        first exception encountered, if any.
+        """
+        done, _ = futures.wait(self._in_flight_chunks, return_when=return_when)
+        error: Optional[BaseException] = None
+        for future in done:
+            chunk_num = self._in_flight_chunks.pop(future)
+            if future.cancelled():
+                continue
+            if future.exception():
+                error = error or future.exception()
+                continue
+            self._chunk_outputs[chunk_num] = future.result()
+        if error:
+            raise error
+
+    def _finish_in_flight_chunks(self) -> None:
+        """Waits for all in-flight chunks to finish, then populates output_paths and
+        output_columns in chunk order.
+        """
+        self._collect_completed_chunks(return_when=futures.ALL_COMPLETED)
+        chunk_outputs = [
+            self._chunk_outputs[chunk_num] for chunk_num in sorted(self._chunk_outputs)
+        ]
+        self._shutdown_executors()
+
+        uploaded_chunk_outputs = [c for c in chunk_outputs if c.output_path is not None]
+        # Record all paths before checking columns so that they are all cleaned up if
+        # the check fails.
+        self.output_paths.extend(
+            c.output_path for c in uploaded_chunk_outputs if c.output_path is not None
+        )
+        for chunk_output in uploaded_chunk_outputs:
+            self._check_columns(chunk_output)
+
+    def _abandon_in_flight_chunks(self) -> None:
+        """Waits for any in-flight chunks to stop, ignoring errors, so that all
+        successfully uploaded outputs can be cleaned up.
+        """
+        for future in self._in_flight_chunks:
+            future.cancel()
+        try:
+            self._collect_completed_chunks(return_when=futures.ALL_COMPLETED)
+        except Exception:
+            # We are already handling a failure - outputs from any chunks that did
+            # complete have still been recorded for clean up.
+            pass
+        self.output_paths.extend(
+            chunk_output.output_path
+            for chunk_output in self._chunk_outputs.values()
+            if chunk_output.output_path is not None
+        )
+        self._shutdown_executors()
+
+    def _shutdown_executors(self) -> None:
+        if self._upload_executor:
+            self._upload_executor.shutdown(wait=True)
+            self._upload_executor = None
+        if self._transform_executor:
+            self._transform_executor.shutdown(wait=True)
+            self._transform_executor = None
+        self._in_flight_chunks.clear()
+        self._chunk_outputs.clear()
 
     def on_unicode_decode_error(self, encoding: str, e: UnicodeError) -> bool:
         logging.info(
@@ -156,15 +415,21 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             encoding,
         )
         logging.exception(e)
+        if self._is_pipelined:
+            self._abandon_in_flight_chunks()
         self._delete_temp_output_paths()
         return False
 
     def on_exception(self, encoding: str, e: Exception) -> bool:
         logging.error("Failed to upload to GCS - cleaning up temp paths")
+        if self._is_pipelined:
+            self._abandon_in_flight_chunks()
         self._delete_temp_output_paths()
         return True
 
     def on_file_read_success(self, encoding: str) -> None:
+        if self._is_pipelined:
+            self._finish_in_flight_chunks()
         logging.info(
             "Successfully read file [%s] with encoding [%s]",
             self.path.abs_path(),
@@ -17,7 +17,7 @@
 """Logic for Attr objects that can be built with a Builder."""
 import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, Optional, Set, Type, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, TypeVar
 
 import attr
 from more_itertools import one
@@ -75,10 +75,15 @@ def _get_class_structure_reference() -> Dict[Type, Dict[str, CachedAttributeInfo
     return _class_structure_reference
 
 
+# Cached functions that build a given BuildableAttr class from a dictionary
+_build_from_dictionary_fns: Dict[Type, Callable[[Dict[str, Any]], Any]] = {}
+
+
 @environment.test_only
 def _clear_class_structure_reference() -> None:
     global _class_structure_reference
     _class_structure_reference = None
+    _build_from_dictionary_fns.clear()
 
 
 def _attribute_field_type_reference_for_class(
@@ -252,6 +257,136 @@ def _map_attr_to_type_for_class(
     return attr_field_types
 
 
+def _build_from_dictionary_fn_for_class(
+    cls: Type["BuildableAttr"],
+) -> Callable[[Dict[str, Any]], Any]:
+    """Returns a function that builds an instance of the given BuildableAttr class from
+    a dictionary, as described in BuildableAttr.build_from_dictionary.
+
+    Creates the function from the attribute field type reference for the class if one
+    has not yet been cached. The function extracts each field's value with a function
+    chosen for the field type ahead of time, and constructs the class directly instead
+    of going through a Builder.
+    """
+    build_from_dictionary_fn = _build_from_dictionary_fns.get(cls)
+    if build_from_dictionary_fn:
+        return build_from_dictionary_fn
+
+    field_value_extractors: List[
+        Tuple[str, Optional[Callable[[Dict[str, Any]], Any]]]
+    ] = []
+    for field, cached_attribute_info in _attribute_field_type_reference_for_class(
+        cls
+    ).items():
+        field_type = cached_attribute_info.field_type
+        if field_type == BuildableAttrFieldType.FORWARD_REF:
+            field_value_extractors.append((field, _raise_forward_ref_in_dict))
+        elif field_type == BuildableAttrFieldType.ENUM:
+            field_value_extractors.append(
+                (
+                    field,
+                    _enum_value_extractor(cls, field, cached_attribute_info.enum_cls),
+                )
+            )
+        elif field_type == BuildableAttrFieldType.DATE:
+            field_value_extractors.append((field, _date_value_extractor(cls, field)))
+        else:
+            field_value_extractors.append((field, None))
+
+    all_fields = attr.fields_dict(cls)  # type: ignore[arg-type]
+    required_fields = set(all_fields.keys())
+    fields_with_defaults = {
+        field
+        for field, attribute in all_fields.items()
+        if attribute.default is not attr.NOTHING
+    }
+    fields_without_defaults = required_fields - fields_with_defaults
+
+    def build_from_dictionary(build_dict: Dict[str, Any]) -> Any:
+        fields: Dict[str, Any] = {}
+        for field, extract_value in field_value_extractors:
+            if field in build_dict:
+                fields[field] = (
+                    extract_value(build_dict) if extract_value else build_dict[field]
+                )
+
+        if not fields_without_defaults.issubset(fields):
+            raise BuilderException(
+                cls, required_fields, set(fields) | fields_with_defaults
+            )
+
+        return cls(**fields)
+
+    _build_from_dictionary_fns[cls] = build_from_dictionary
+    return build_from_dictionary
+
+
+def _raise_forward_ref_in_dict(build_dict: Dict[str, Any]) -> None:
+    # TODO(#1886): Implement detection of non-ForwardRefs
+    #  ForwardRef fields are expected to be references to other
+    #  BuildableAttrs
+    raise ValueError(
+        "build_dict should be a dictionary of "
+        "flat values. Should not contain any "
+        f"ForwardRef fields: {build_dict}"
+    )
+
+
+def _enum_value_extractor(
+    cls: Type["BuildableAttr"], field: str, enum_cls: Optional[Type[Enum]]
+) -> Callable[[Dict[str, Any]], Optional[Enum]]:
+    """Returns a function that extracts the value of the enum |field| from a
+    dictionary. Strings matching the value of an enum member are looked up directly,
+    and all other values are extracted with cls.extract_enum_value."""
+    if not enum_cls:
+
+        def raise_missing_enum_cls(_build_dict: Dict[str, Any]) -> None:
+            raise ValueError(f"Expected Enum class for enum field {field}.")
+
+        return raise_missing_enum_cls
+
+    field_enum_cls: Type[Enum] = enum_cls
+    members_by_value = {
+        member.value: member
+        for member in field_enum_cls
+        if isinstance(member.value, str)
+    }
+
+    def extract_enum_value(build_dict: Dict[str, Any]) -> Optional[Enum]:
+        value = build_dict[field]
+        if isinstance(value, str):
+            member = members_by_value.get(value)
+            if member is not None:
+                return member
+        return cls.extract_enum_value(field_enum_cls, build_dict, field)
+
+    return extract_enum_value
+
+
+def _date_value_extractor(
+    cls: Type["BuildableAttr"], field: str
+) -> Callable[[Dict[str, Any]], Optional[datetime.date]]:
+    """Returns a function that extracts the value of the date |field| from a
+    dictionary. Strings in the format 'YYYY-MM-DD' are parsed directly, and all other
+    values are extracted with cls.extract_date_value."""
+
+    def extract_date_value(build_dict: Dict[str, Any]) -> Optional[datetime.date]:
+        value = build_dict[field]
+        if (
+            isinstance(value, str)
+            and len(value) == 10
+            and value[4] == "-"
+            and value[7] == "-"
+        ):
+            try:
+                return datetime.date.fromisoformat(value)
+            except ValueError:
+                pass
+        return cls.extract_date_value(build_dict, field)
+
+    return extract_date_value
+
+
 class DefaultableAttr:
     """Mixin to add method to attr class that creates default object"""
 
@@ -381,37 +516,7 @@ class BuildableAttr:
         if not build_dict:
             raise ValueError("build_dict cannot be empty")
 
-        cls_builder = cls.builder()
-
-        attributes_and_types = _attribute_field_type_reference_for_class(cls)
-        for field, cached_attribute_info in attributes_and_types.items():
-            field_type = cached_attribute_info.field_type
-            if field in build_dict:
-                if field_type == BuildableAttrFieldType.FORWARD_REF:
-                    # TODO(#1886): Implement detection of non-ForwardRefs
-                    #  ForwardRef fields are expected to be references to other
-                    #  BuildableAttrs
-                    raise ValueError(
-                        "build_dict should be a dictionary of "
-                        "flat values. Should not contain any "
-                        f"ForwardRef fields: {build_dict}"
-                    )
-                if field_type == BuildableAttrFieldType.ENUM:
-                    type_cls = cached_attribute_info.enum_cls
-                    if not type_cls:
-                        raise ValueError(f"Expected Enum class for enum field {field}.")
-
-                    value: Optional[Any] = cls.extract_enum_value(
-                        type_cls, build_dict, field
-                    )
-                elif field_type == BuildableAttrFieldType.DATE:
-                    value = cls.extract_date_value(build_dict, field)
-                else:
-                    value = build_dict.get(field)
-
-                setattr(cls_builder, field, value)
-
-        return cls_builder.build()
+        return _build_from_dictionary_fn_for_class(cls)(build_dict)
 
     @classmethod
     def extract_enum_value(
@@ -17,15 +17,19 @@
 """Client wrapper for interacting with Firestore."""
 import abc
 import logging
+import time
+from concurrent import futures
 from datetime import datetime
-from typing import Dict, Optional, Union
+from types import TracebackType
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type, Union
 
 from google.cloud import firestore
 from google.cloud.firestore_v1.collection import CollectionReference
 from google.cloud.firestore_v1.document import DocumentReference
 from google.cloud.firestore_v1.query import Query
+from opencensus.stats import aggregation, measure, view
 
-from recidiviz.utils import metadata
+from recidiviz.utils import metadata, monitoring
 from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION
 
 FIRESTORE_STAGING_PROJECT_ID = "recidiviz-dashboard-staging"
@@ -33,6 +37,125 @@ FIRESTORE_PRODUCTION_PROJECT_ID = "recidiviz-dashboard-production"
 
 FIRESTORE_DELETE_BATCH_SIZE = 400
 
+# Maximum number of write batches being built or committed at once by a
+# FirestoreBatchCommitter
+FIRESTORE_MAX_IN_FLIGHT_BATCHES = 8
+
+m_documents = measure.MeasureInt(
+    "firestore/documents",
+    "Number of documents written to or deleted from Firestore",
+    "1",
+)
+m_batch_commit_duration_s = measure.MeasureFloat(
+    "firestore/batch_commit_duration",
+    "The time it took to commit a Firestore write batch",
+    "s",
+)
+
+documents_view = view.View(
+    "recidiviz/firestore/documents",
+    "Sum of the documents written to or deleted from Firestore, by collection",
+    [monitoring.TagKey.FIRESTORE_COLLECTION, monitoring.TagKey.FIRESTORE_OPERATION],
+    m_documents,
+    aggregation.SumAggregation(),
+)
+batch_commit_duration_view = view.View(
+    "recidiviz/firestore/batch_commit_duration",
+    "The distribution of Firestore write batch commit durations, by collection",
+    [monitoring.TagKey.FIRESTORE_COLLECTION, monitoring.TagKey.FIRESTORE_OPERATION],
+    m_batch_commit_duration_s,
+    aggregation.DistributionAggregation(monitoring.exponential_buckets(0.05, 2, 10)),
+)
+
+monitoring.register_views([documents_view, batch_commit_duration_view])
+
+
+class FirestoreBatchCommitter:
+    """Builds and commits Firestore write batches on a pool of worker threads, with at
+    most |max_in_flight| batches in flight at once. submit() blocks while the pool is
+    full, so callers can stream their input without holding all of it in memory.
+
+    Must be used as a context manager. On exit, waits for all submitted batches and
+    raises the first error encountered, if any.
+    """
+
+    def __init__(
+        self,
+        collection_path: str,
+        operation: str,
+        max_in_flight: int = FIRESTORE_MAX_IN_FLIGHT_BATCHES,
+    ) -> None:
+        self.collection_path = collection_path
+        self.operation = operation
+        self.max_in_flight = max_in_flight
+        self.document_count = 0
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_in_flight)
+        self._in_flight: Set[futures.Future] = set()
+        self._start = time.perf_counter()
+
+    def __enter__(self) -> "FirestoreBatchCommitter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        try:
+            if exc_type is None:
+                self._collect(futures.wait(self._in_flight).done)
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._in_flight = set()
+
+        elapsed_seconds = time.perf_counter() - self._start
+        logging.info(
+            '%d documents %s in collection "%s" in %.1f seconds (%.0f documents/second)',
+            self.document_count,
+            self.operation,
+            self.collection_path,
+            elapsed_seconds,
+            self.document_count / elapsed_seconds if elapsed_seconds else 0,
+        )
+
+    def submit(
+        self, build_batch: Callable[[], Tuple[firestore.WriteBatch, int]]
+    ) -> None:
+        """Schedules |build_batch| to run on a worker thread, then commits the batch it
+        returns. |build_batch| returns the batch and the number of documents in it."""
+        if len(self._in_flight) >= self.max_in_flight:
+            done, self._in_flight = futures.wait(
+                self._in_flight, return_when=futures.FIRST_COMPLETED
+            )
+            self._collect(done)
+        self._in_flight.add(self._executor.submit(self._build_and_commit, build_batch))
+
+    def _collect(self, done: Set[futures.Future]) -> None:
+        for future in done:
+            self.document_count += future.result()
+
+    def _build_and_commit(
+        self, build_batch: Callable[[], Tuple[firestore.WriteBatch, int]]
+    ) -> int:
+        batch, document_count = build_batch()
+        if not document_count:
+            return 0
+
+        start = time.perf_counter()
+        batch.commit()
+        with monitoring.measurements(
+            {
+                monitoring.TagKey.FIRESTORE_COLLECTION: self.collection_path,
+                monitoring.TagKey.FIRESTORE_OPERATION: self.operation,
+            }
+        ) as measurements:
+            measurements.measure_int_put(m_documents, document_count)
+            measurements.measure_float_put(
+                m_batch_commit_duration_s, time.perf_counter() - start
+            )
+        return document_count
+
 
 class FirestoreClient(abc.ABC):
     """Interface for a wrapper around the Google Cloud Firestore API."""
@@ -113,7 +236,7 @@ class FirestoreClientImpl(FirestoreClient):
     def delete_collection(self, collection_path: str) -> None:
         logging.info('Deleting collection "%s"', collection_path)
         collection = self.get_collection(collection_path)
-        total_docs_deleted = self._delete_documents_batch(collection)
+        total_docs_deleted = self._delete_documents(collection_path, collection)
         logging.info(
             'Deleted %d documents from collection "%s"',
             total_docs_deleted,
@@ -134,10 +257,11 @@ class FirestoreClientImpl(FirestoreClient):
             collection_path,
         )
         collection = self.get_collection(collection_path)
-        total_docs_deleted = self._delete_documents_batch(
+        total_docs_deleted = self._delete_documents(
+            collection_path,
             collection.where("stateCode", "==", state_code).where(
                 timestamp_field, "<", cutoff
-            )
+            ),
         )
         logging.info(
             '[%s] Deleted %d documents from collection "%s"',
@@ -146,20 +270,31 @@ class FirestoreClientImpl(FirestoreClient):
             collection_path,
         )
 
-    def _delete_documents_batch(
-        self, query: Union[CollectionReference, Query], deleted_so_far: int = 0
+    def _delete_documents(
+        self, collection_path: str, query: Union[CollectionReference, Query]
     ) -> int:
-        batch = self.batch()
-        docs = query.limit(FIRESTORE_DELETE_BATCH_SIZE).stream()
-        deleted_count = 0
-
-        for doc in docs:
-            batch.delete(doc.reference)
-            deleted_count += 1
+        """Deletes all documents matching the query. Document references are read in
+        a single stream, without any of the documents' fields, and are deleted in
+        batches that are committed concurrently as the stream is read."""
+        with FirestoreBatchCommitter(collection_path, "deleted") as committer:
+            references: List[DocumentReference] = []
+            for doc in query.select([]).stream():
+                references.append(doc.reference)
+                if len(references) >= FIRESTORE_DELETE_BATCH_SIZE:
+                    committer.submit(self._delete_batch_builder(references))
+                    references = []
+            if references:
+                committer.submit(self._delete_batch_builder(references))
 
-        batch.commit()
+        return committer.document_count
 
-        if deleted_count >= FIRESTORE_DELETE_BATCH_SIZE:
-            return self._delete_documents_batch(query, deleted_so_far + deleted_count)
+    def _delete_batch_builder(
+        self, references: List[DocumentReference]
+    ) -> Callable[[], Tuple[firestore.WriteBatch, int]]:
+        def build_batch() -> Tuple[firestore.WriteBatch, int]:
+            batch = self.batch()
+            for reference in references:
+                batch.delete(reference)
+            return batch, len(references)
 
-        return deleted_so_far + deleted_count
+        return build_batch
@@ -118,6 +118,10 @@ from recidiviz.persistence.database.sqlalchemy_database_key import SQLAlchemyDat
 from recidiviz.utils import environment, trace
 from recidiviz.utils.yaml_dict import YAMLDict
 
+# The max number of raw data chunks that may be transformed / uploaded to temporary GCS
+# files at once while the rest of the file is still being parsed.
+RAW_DATA_IMPORT_MAX_IN_FLIGHT_CHUNKS = 4
+
 
 class BaseDirectIngestController:
     """Parses and persists individual-level info from direct ingest partners."""
@@ -173,6 +177,7 @@ class BaseDirectIngestController:
             fs=self.fs,
             temp_output_directory_path=self.temp_output_directory_path,
             big_query_client=big_query_client,
+            max_in_flight_upload_chunks=RAW_DATA_IMPORT_MAX_IN_FLIGHT_CHUNKS,
         )
 
         view_collector = DirectIngestPreProcessedIngestViewCollector(
@@ -0,0 +1,486 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Compiles a parsed ingest view manifest AST (see ingest_view_manifest.py) into a
+tree of flat evaluation functions that can be applied to many rows.
+
+Walking the manifest AST via ManifestNode.build_from_row() does a lot of repeated work
+for every row: attribute lookups on every node, isinstance() checks, constructing a new
+StrictEnumParser for every enum value, etc. Compilation does that work once per
+manifest - column names, literal values and child evaluators are bound into closures
+and enum parse results are cached by raw text - so that evaluating a row only does the
+work that actually depends on the row's values.
+
+Compiled manifests produce results that are identical to the interpreted
+ManifestNode.build_from_row() and raise the same errors for bad input.
+"""
+import functools
+import json
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple
+
+from recidiviz.common.constants.strict_enum_parser import StrictEnumParser
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
+    AndConditionManifest,
+    BooleanConditionManifest,
+    BooleanLiteralManifest,
+    ConcatenatedStringsManifest,
+    ContainsConditionManifest,
+    CustomFunctionManifest,
+    DirectMappingFieldManifest,
+    EntityTreeManifest,
+    EnumLiteralFieldManifest,
+    EnumMappingManifest,
+    EnvPropertyManifest,
+    EqualsConditionManifest,
+    ExpandableListItemManifest,
+    InvertConditionManifest,
+    IsNullConditionManifest,
+    JSONExtractKeyManifest,
+    ListRelationshipFieldManifest,
+    ManifestNode,
+    OrConditionManifest,
+    PersonNameManifest,
+    PhysicalAddressManifest,
+    SerializedJSONDictFieldManifest,
+    SplitCommaSeparatedListManifest,
+    SplitJSONListManifest,
+    StringLiteralFieldManifest,
+    VariableManifestNode,
+)
+from recidiviz.persistence.entity.entity_deserialize import EntityT
+
+# A function that produces the value of a single manifest node for an input row.
+RowEvaluator = Callable[[Dict[str, str]], Any]
+
+# Maximum number of distinct raw text values we will cache parse results for in a
+# single enum mapping. Most enum columns have a handful of distinct values, but we
+# bound this in case a manifest maps a free text column.
+ENUM_PARSE_CACHE_MAX_SIZE = 10000
+
+
+class CompiledEntityTreeManifest(Generic[EntityT]):
+    """A compiled version of an EntityTreeManifest that can be used to convert ingest
+    view rows into hydrated entity trees.
+    """
+
+    def __init__(self, manifest: EntityTreeManifest[EntityT]) -> None:
+        self.manifest = manifest
+        self._evaluate: Callable[
+            [Dict[str, str]], Optional[EntityT]
+        ] = _ManifestCompiler().compile(manifest)
+
+    def build_from_row(self, row: Dict[str, str]) -> Optional[EntityT]:
+        """Builds a recursively hydrated entity from the given input row. Equivalent to
+        EntityTreeManifest.build_from_row().
+        """
+        return self._evaluate(row)
+
+    def build_from_rows(
+        self, rows: Iterable[Dict[str, str]]
+    ) -> List[Optional[EntityT]]:
+        """Builds a recursively hydrated entity for each of the given input rows, in
+        order.
+        """
+        evaluate = self._evaluate
+        return [evaluate(row) for row in rows]
+
+
+class _ManifestCompiler:
+    """Converts each node in a manifest AST into a RowEvaluator. Nodes that are
+    referenced from multiple places in the tree (e.g. variables) are only compiled
+    once.
+    """
+
+    def __init__(self) -> None:
+        self._compiled_by_node_id: Dict[int, RowEvaluator] = {}
+        self._compile_fns: Dict[type, Callable[[Any], RowEvaluator]] = {
+            VariableManifestNode: self._compile_variable,
+            EntityTreeManifest: self._compile_entity_tree,
+            SplitCommaSeparatedListManifest: self._compile_split_comma_separated_list,
+            SplitJSONListManifest: self._compile_split_json_list,
+            ExpandableListItemManifest: self._compile_expandable_list_item,
+            ListRelationshipFieldManifest: self._compile_list_relationship_field,
+            DirectMappingFieldManifest: self._compile_direct_mapping,
+            StringLiteralFieldManifest: self._compile_string_literal,
+            EnumLiteralFieldManifest: self._compile_enum_literal,
+            EnumMappingManifest: self._compile_enum_mapping,
+            CustomFunctionManifest: self._compile_custom_function,
+            SerializedJSONDictFieldManifest: self._compile_serialized_json_dict,
+            JSONExtractKeyManifest: self._compile_json_extract_key,
+            ConcatenatedStringsManifest: self._compile_concatenated_strings,
+            PhysicalAddressManifest: self._compile_physical_address,
+            PersonNameManifest: self._compile_person_name,
+            ContainsConditionManifest: self._compile_contains_condition,
+            IsNullConditionManifest: self._compile_is_null_condition,
+            EqualsConditionManifest: self._compile_equals_condition,
+            AndConditionManifest: self._compile_and_condition,
+            OrConditionManifest: self._compile_or_condition,
+            InvertConditionManifest: self._compile_invert_condition,
+            BooleanLiteralManifest: self._compile_boolean_literal,
+            EnvPropertyManifest: self._compile_env_property,
+            BooleanConditionManifest: self._compile_boolean_condition,
+        }
+
+    def compile(self, node: ManifestNode) -> RowEvaluator:
+        node_id = id(node)
+        if node_id not in self._compiled_by_node_id:
+            compile_fn = self._compile_fns.get(type(node))
+            # Fall back to interpreting any node types we don't know how to compile
+            # (e.g. subclasses defined in tests).
+            self._compiled_by_node_id[node_id] = (
+                compile_fn(node) if compile_fn else node.build_from_row
+            )
+        return self._compiled_by_node_id[node_id]
+
+    def _compile_all(self, nodes: Iterable[ManifestNode]) -> Tuple[RowEvaluator, ...]:
+        return tuple(self.compile(node) for node in nodes)
+
+    def _compile_variable(self, node: VariableManifestNode) -> RowEvaluator:
+        return self.compile(node.value_manifest)
+
+    def _compile_entity_tree(self, node: EntityTreeManifest) -> RowEvaluator:
+        common_args = node.common_args
+        field_evaluators = tuple(
+            (field_name, self.compile(field_manifest))
+            for field_name, field_manifest in node.field_manifests.items()
+        )
+        deserialize = node.entity_factory_cls.deserialize
+        entity_cls = node.entity_cls
+        filter_predicate = node.filter_predicate
+
+        def build(row: Dict[str, str]) -> Any:
+            args = common_args.copy()
+            for field_name, evaluate in field_evaluators:
+                field_value = evaluate(row)
+                if field_value is not None:
+                    args[field_name] = field_value
+
+            entity = deserialize(**args)
+
+            if not isinstance(entity, entity_cls):
+                raise ValueError(f"Unexpected type for entity: [{type(entity)}]")
+
+            if filter_predicate and filter_predicate(entity):
+                return None
+
+            return entity
+
+        return build
+
+    @staticmethod
+    def _compile_split_comma_separated_list(
+        node: SplitCommaSeparatedListManifest,
+    ) -> RowEvaluator:
+        column_name = node.column_name
+        delimiter = node.DEFAULT_LIST_VALUE_DELIMITER
+
+        def build(row: Dict[str, str]) -> List[str]:
+            column_value = row[column_name]
+            if not column_value:
+                return []
+            return column_value.split(delimiter)
+
+        return build
+
+    @staticmethod
+    def _compile_split_json_list(node: SplitJSONListManifest) -> RowEvaluator:
+        column_name = node.column_name
+
+        def build(row: Dict[str, str]) -> List[str]:
+            column_value = row[column_name]
+            if not column_value:
+                return []
+            return [json.dumps(item) for item in json.loads(column_value)]
+
+        return build
+
+    def _compile_expandable_list_item(
+        self, node: ExpandableListItemManifest
+    ) -> RowEvaluator:
+        build_values = self.compile(node.values_manifest)
+        build_child = self.compile(node.child_entity_manifest)
+        loop_value_name = node.FOREACH_LOOP_VALUE_NAME
+
+        def build(row: Dict[str, str]) -> List[Any]:
+            values = build_values(row)
+            if values is None:
+                raise ValueError("Unexpected null list value.")
+
+            if loop_value_name in row:
+                raise ValueError(
+                    f"Unexpected {loop_value_name} key value in row: {row}. "
+                    f"Nested loops not supported."
+                )
+
+            result = []
+            for value in values:
+                row[loop_value_name] = value
+                entity = build_child(row)
+                del row[loop_value_name]
+                if entity:
+                    result.append(entity)
+            return result
+
+        return build
+
+    def _compile_list_relationship_field(
+        self, node: ListRelationshipFieldManifest
+    ) -> RowEvaluator:
+        child_evaluators = tuple(
+            (
+                isinstance(child_manifest, ExpandableListItemManifest),
+                self.compile(child_manifest),
+            )
+            for child_manifest in node.child_manifests
+        )
+
+        def build(row: Dict[str, str]) -> List[Any]:
+            child_entities = []
+            for is_expandable, build_child in child_evaluators:
+                if is_expandable:
+                    child_entities.extend(build_child(row))
+                else:
+                    child_entity = build_child(row)
+                    if child_entity:
+                        child_entities.append(child_entity)
+            return child_entities
+
+        return build
+
+    @staticmethod
+    def _compile_direct_mapping(node: DirectMappingFieldManifest) -> RowEvaluator:
+        mapped_column = node.mapped_column
+
+        def build(row: Dict[str, str]) -> str:
+            return row[mapped_column]
+
+        return build
+
+    @staticmethod
+    def _compile_literal(value: Any) -> RowEvaluator:
+        def build(_row: Dict[str, str]) -> Any:
+            return value
+
+        return build
+
+    def _compile_string_literal(self, node: StringLiteralFieldManifest) -> RowEvaluator:
+        return self._compile_literal(node.literal_value)
+
+    def _compile_enum_literal(self, node: EnumLiteralFieldManifest) -> RowEvaluator:
+        return self._compile_literal(node.enum_value)
+
+    def _compile_boolean_literal(self, node: BooleanLiteralManifest) -> RowEvaluator:
+        return self._compile_literal(node.value)
+
+    @staticmethod
+    def _compile_env_property(node: EnvPropertyManifest) -> RowEvaluator:
+        # The value depends on the parsing job rather than the row, so it must be
+        # looked up at evaluation time.
+        return node.build_from_row
+
+    def _compile_enum_mapping(self, node: EnumMappingManifest) -> RowEvaluator:
+        build_raw_text = self.compile(node.raw_text_field_manifest)
+        enum_cls = node.enum_cls
+        enum_overrides = node.enum_overrides
+
+        # Raw text values that fail to parse raise and are therefore never cached, so
+        # every row with an unmapped value still fails.
+        @functools.lru_cache(maxsize=ENUM_PARSE_CACHE_MAX_SIZE)
+        def parse(raw_text: Optional[str]) -> Any:
+            return StrictEnumParser(
+                raw_text=raw_text,
+                enum_cls=enum_cls,
+                enum_overrides=enum_overrides,
+            ).parse()
+
+        def build(row: Dict[str, str]) -> Any:
+            return parse(build_raw_text(row))
+
+        return build
+
+    def _compile_custom_function(self, node: CustomFunctionManifest) -> RowEvaluator:
+        function = node.function
+        kwarg_evaluators = tuple(
+            (key, self.compile(manifest))
+            for key, manifest in node.kwarg_manifests.items()
+        )
+
+        def build(row: Dict[str, str]) -> Any:
+            return function(
+                **{key: evaluate(row) for key, evaluate in kwarg_evaluators}
+            )
+
+        return build
+
+    def _compile_serialized_json_dict(
+        self, node: SerializedJSONDictFieldManifest
+    ) -> RowEvaluator:
+        key_evaluators = tuple(
+            (key, self.compile(manifest))
+            for key, manifest in node.key_to_manifest_map.items()
+        )
+        drop_all_empty = node.drop_all_empty
+
+        def build(row: Dict[str, str]) -> Optional[str]:
+            result_dict = {key: evaluate(row) for key, evaluate in key_evaluators}
+            if drop_all_empty and not any(result_dict.values()):
+                return None
+            return json.dumps(result_dict, sort_keys=True)
+
+        return build
+
+    def _compile_json_extract_key(self, node: JSONExtractKeyManifest) -> RowEvaluator:
+        build_json = self.compile(node.json_manifest)
+        json_key = node.json_key
+
+        def build(row: Dict[str, str]) -> str:
+            json_str = build_json(row)
+            if json_str is None:
+                raise ValueError(f"Expected nonnull JSON string for row: {row}")
+            return json.loads(json_str)[json_key]
+
+        return build
+
+    def _compile_concatenated_strings(
+        self, node: ConcatenatedStringsManifest
+    ) -> RowEvaluator:
+        value_evaluators = self._compile_all(node.value_manifests)
+        separator = node.separator
+        null_value = str(None).upper() if node.include_nulls else None
+
+        def build(row: Dict[str, str]) -> str:
+            values = []
+            for evaluate in value_evaluators:
+                value = evaluate(row)
+                if value:
+                    values.append(value)
+                elif null_value:
+                    values.append(null_value)
+            return separator.join(values)
+
+        return build
+
+    def _compile_physical_address(self, node: PhysicalAddressManifest) -> RowEvaluator:
+        build_address_1 = self.compile(node.address_1_manifest)
+        build_address_2 = self.compile(node.address_2_manifest)
+        build_city = self.compile(node.city_manifest)
+        build_state = self.compile(node.state_manifest)
+        build_zip = self.compile(node.zip_manifest)
+
+        def build(row: Dict[str, str]) -> str:
+            state_and_zip_parts = [build_state(row), build_zip(row)]
+            address_parts = [
+                build_address_1(row),
+                build_address_2(row),
+                build_city(row),
+                " ".join([s for s in state_and_zip_parts if s]),
+            ]
+            return ", ".join([s for s in address_parts if s])
+
+        return build
+
+    def _compile_person_name(self, node: PersonNameManifest) -> RowEvaluator:
+        return self.compile(node.name_json_manifest)
+
+    def _compile_contains_condition(
+        self, node: ContainsConditionManifest
+    ) -> RowEvaluator:
+        build_value = self.compile(node.value_manifest)
+
+        literal_manifests = [
+            m
+            for m in node.options_manifests
+            if isinstance(m, StringLiteralFieldManifest)
+        ]
+        if len(literal_manifests) == len(node.options_manifests):
+            literal_options = frozenset(m.literal_value for m in literal_manifests)
+
+            def build_with_literal_options(row: Dict[str, str]) -> bool:
+                return build_value(row) in literal_options
+
+            return build_with_literal_options
+
+        option_evaluators = self._compile_all(node.options_manifests)
+
+        def build(row: Dict[str, str]) -> bool:
+            value = build_value(row)
+            return value in {evaluate(row) for evaluate in option_evaluators}
+
+        return build
+
+    def _compile_is_null_condition(self, node: IsNullConditionManifest) -> RowEvaluator:
+        build_value = self.compile(node.value_manifest)
+
+        def build(row: Dict[str, str]) -> bool:
+            return not bool(build_value(row))
+
+        return build
+
+    def _compile_equals_condition(self, node: EqualsConditionManifest) -> RowEvaluator:
+        build_first_value, *other_value_evaluators = self._compile_all(
+            node.value_manifests
+        )
+
+        def build(row: Dict[str, str]) -> bool:
+            first_value = build_first_value(row)
+            return all(
+                first_value == evaluate(row) for evaluate in other_value_evaluators
+            )
+
+        return build
+
+    def _compile_and_condition(self, node: AndConditionManifest) -> RowEvaluator:
+        condition_evaluators = self._compile_all(node.condition_manifests)
+
+        def build(row: Dict[str, str]) -> bool:
+            return all(evaluate(row) for evaluate in condition_evaluators)
+
+        return build
+
+    def _compile_or_condition(self, node: OrConditionManifest) -> RowEvaluator:
+        condition_evaluators = self._compile_all(node.condition_manifests)
+
+        def build(row: Dict[str, str]) -> bool:
+            return any(evaluate(row) for evaluate in condition_evaluators)
+
+        return build
+
+    def _compile_invert_condition(self, node: InvertConditionManifest) -> RowEvaluator:
+        build_condition = self.compile(node.condition_manifest)
+
+        def build(row: Dict[str, str]) -> bool:
+            return not build_condition(row)
+
+        return build
+
+    def _compile_boolean_condition(
+        self, node: BooleanConditionManifest
+    ) -> RowEvaluator:
+        build_condition = self.compile(node.condition_manifest)
+        build_then = self.compile(node.then_manifest)
+        build_else = self.compile(node.else_manifest) if node.else_manifest else None
+
+        def build(row: Dict[str, str]) -> Any:
+            condition = build_condition(row)
+            if condition is None:
+                raise ValueError("Condition manifest should not return None.")
+            if condition:
+                return build_then(row)
+            if not build_else:
+                return None
+            return build_else(row)
+
+        return build
@@ -20,14 +20,17 @@ tree.
 """
 
 import abc
+import contextlib
 import json
 import re
+import threading
 from enum import Enum
 from typing import (
     Any,
     Callable,
     Dict,
     Generic,
+    Iterator,
     List,
     Optional,
     Set,
@@ -65,6 +68,32 @@ ManifestNodeT = TypeVar("ManifestNodeT")
 ENV_PROPERTY_KEY = "$env"
 
 
+class _EnvPropertyValues(threading.local):
+    """Values of $env properties for the parsing job currently being evaluated on
+    this thread, keyed by property name. Parsed manifests may be shared between
+    parsing jobs, so property values (e.g. the results update datetime) are read from
+    here when rows are evaluated rather than being built into the manifest.
+    """
+
+    values: Optional[Dict[str, Any]] = None
+
+
+_env_property_values = _EnvPropertyValues()
+
+
+@contextlib.contextmanager
+def env_property_values(values: Dict[str, Union[bool, str]]) -> Iterator[None]:
+    """Context manager that sets the values of $env properties for all manifest
+    evaluation done on this thread inside the context.
+    """
+    previous_values = _env_property_values.values
+    _env_property_values.values = values
+    try:
+        yield
+    finally:
+        _env_property_values.values = previous_values
+
+
 @attr.s(kw_only=True)
 class ManifestNode(Generic[ManifestNodeT]):
     """Abstract interface for all nodes in the manifest abstract syntax tree. Subclasses
@@ -113,6 +142,15 @@ class ManifestNode(Generic[ManifestNodeT]):
         children = self.child_manifest_nodes()
         return {var for child in children for var in child.variables_referenced()}
 
+    def env_properties_referenced(self) -> Set[str]:
+        """Returns a set of $env properties that this node references. Should not be
+        overridden by subclasses other than the EnvPropertyManifest
+        """
+        children = self.child_manifest_nodes()
+        return {
+            prop for child in children for prop in child.env_properties_referenced()
+        }
+
     @abc.abstractmethod
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         """Should be implemented by subclasses to return a list of child ManifestNodes
@@ -1765,6 +1803,44 @@ class BooleanLiteralManifest(ManifestNode[bool]):
         return set()
 
 
+@attr.s(kw_only=True)
+class EnvPropertyManifest(ManifestNode[ManifestNodeT]):
+    """Manifest that returns the value of an environment or other metadata property
+    associated with the parsing job (see
+    IngestViewResultsParserDelegate.get_env_property()). The value is the same for
+    every row in a given job and is read from env_property_values() at evaluation
+    time.
+    """
+
+    property_name: str = attr.ib()
+
+    # The value of the property for the delegate this manifest was built with, used
+    # when no value is set via env_property_values().
+    default_value: ManifestNodeT = attr.ib()
+
+    @property
+    def result_type(self) -> Type[ManifestNodeT]:
+        return type(self.default_value)
+
+    def additional_field_manifests(self, field_name: str) -> Dict[str, "ManifestNode"]:
+        return {}
+
+    def build_from_row(self, row: Dict[str, str]) -> ManifestNodeT:
+        values = _env_property_values.values
+        if values is None:
+            return self.default_value
+        return values[self.property_name]
+
+    def child_manifest_nodes(self) -> List["ManifestNode"]:
+        return []
+
+    def columns_referenced(self) -> Set[str]:
+        return set()
+
+    def env_properties_referenced(self) -> Set[str]:
+        return {self.property_name}
+
+
 @attr.s(kw_only=True)
 class BooleanConditionManifest(ManifestNode[ManifestNodeT]):
     """Manifest node that evaluates one of two child manifest nodes based on the result
@@ -2183,10 +2259,10 @@ def build_manifest_from_raw(
         if manifest_node_name == ENV_PROPERTY_KEY:
             property_name = raw_field_manifest.pop(ENV_PROPERTY_KEY, str)
             env_property = delegate.get_env_property(property_name=property_name)
-            if isinstance(env_property, bool):
-                return BooleanLiteralManifest(value=env_property)
-            if isinstance(env_property, str):
-                return StringLiteralFieldManifest(literal_value=env_property)
+            if isinstance(env_property, (bool, str)):
+                return EnvPropertyManifest(
+                    property_name=property_name, default_value=env_property
+                )
             raise ValueError(
                 f"Unexpected env property value type [{type(env_property)}] for "
                 f"property [{property_name}]"
@@ -0,0 +1,225 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""A process-wide cache for ingest view manifests, so that we don't have to re-read,
+re-validate and rebuild a manifest every time we construct an IngestViewResultsParser.
+
+All entries are keyed by a hash of the manifest file contents. The hash for a given
+path is recomputed whenever the file's mtime or size changes, so edits to a manifest
+are always picked up.
+
+The cache holds two kinds of entries:
+  1) The raw YAML contents of the manifest, along with the set of JSON schema versions
+     the contents have already been validated against. These do not depend on the
+     parser delegate. If a disk cache directory is configured, these are also
+     persisted to disk so that new processes can skip the YAML parse and schema
+     validation.
+  2) Fully parsed manifests, which are only cached for delegates that return a
+     non-null IngestViewResultsParserDelegate.get_manifest_cache_key(), since the
+     parsed manifest may depend on delegate state (e.g. entity and enum classes). At
+     most MAX_PARSED_MANIFESTS of these are held, evicting the least recently used.
+"""
+import collections
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+import attr
+
+from recidiviz.utils.yaml_dict import YAMLDict, YAMLDictType
+
+# If set, raw manifest contents are persisted as pickle files in this directory.
+INGEST_VIEW_MANIFEST_CACHE_DIR_ENV_VAR = "INGEST_VIEW_MANIFEST_CACHE_DIR"
+
+# Maximum number of parsed manifests held in memory. This comfortably fits every
+# ingest view manifest for every region.
+MAX_PARSED_MANIFESTS = 2000
+
+
+@attr.s(frozen=True, kw_only=True)
+class _FileStat:
+    mtime_ns: int = attr.ib()
+    size: int = attr.ib()
+
+
+@attr.s(kw_only=True)
+class _RawManifestEntry:
+    raw_yaml: YAMLDictType = attr.ib()
+    # JSON schema versions these contents have been validated against
+    validated_schema_versions: Set[str] = attr.ib(factory=set)
+
+
+class IngestViewManifestCache:
+    """A thread-safe cache of ingest view manifest contents and parsed manifests. See
+    the module docstring for details.
+    """
+
+    def __init__(
+        self,
+        disk_cache_dir: Optional[str] = None,
+        max_parsed_manifests: int = MAX_PARSED_MANIFESTS,
+    ) -> None:
+        self._disk_cache_dir = disk_cache_dir
+        self._max_parsed_manifests = max_parsed_manifests
+        self._lock = threading.Lock()
+        self._content_hash_by_path: Dict[str, Tuple[_FileStat, str]] = {}
+        self._raw_entries: Dict[str, _RawManifestEntry] = {}
+        self._parsed_manifests: "collections.OrderedDict[Tuple[str, Hashable], Any]" = (
+            collections.OrderedDict()
+        )
+
+    def content_hash(self, manifest_path: str) -> str:
+        """Returns a hash of the contents of the manifest at the given path. Only
+        re-reads the file if it has changed since the last call.
+        """
+        stat = os.stat(manifest_path)
+        file_stat = _FileStat(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        with self._lock:
+            cached = self._content_hash_by_path.get(manifest_path)
+        if cached and cached[0] == file_stat:
+            return cached[1]
+
+        with open(manifest_path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        with self._lock:
+            self._content_hash_by_path[manifest_path] = (file_stat, content_hash)
+        return content_hash
+
+    def load_manifest_dict(self, manifest_path: str, content_hash: str) -> YAMLDict:
+        """Returns a YAMLDict with the contents of the manifest at the given path. The
+        returned YAMLDict is a copy and may be freely modified by the caller.
+        """
+        entry = self._get_raw_entry(content_hash)
+        if entry is None:
+            entry = self._load_raw_entry_from_disk(content_hash)
+            if entry is None:
+                entry = _RawManifestEntry(
+                    raw_yaml=YAMLDict.from_path(manifest_path).get()
+                )
+                self._write_raw_entry_to_disk(content_hash, entry)
+            with self._lock:
+                entry = self._raw_entries.setdefault(content_hash, entry)
+        return YAMLDict(copy.deepcopy(entry.raw_yaml))
+
+    def is_schema_validated(self, content_hash: str, schema_version: str) -> bool:
+        entry = self._get_raw_entry(content_hash)
+        return entry is not None and schema_version in entry.validated_schema_versions
+
+    def mark_schema_validated(self, content_hash: str, schema_version: str) -> None:
+        entry = self._get_raw_entry(content_hash)
+        if entry is None:
+            raise ValueError(
+                f"Cannot mark manifest with hash [{content_hash}] as validated - "
+                f"contents were never loaded."
+            )
+        with self._lock:
+            entry.validated_schema_versions.add(schema_version)
+        self._write_raw_entry_to_disk(content_hash, entry)
+
+    def get_parsed_manifest(self, content_hash: str, cache_key: Hashable) -> Any:
+        key = (content_hash, cache_key)
+        with self._lock:
+            parsed_manifest = self._parsed_manifests.get(key)
+            if parsed_manifest is not None:
+                self._parsed_manifests.move_to_end(key)
+            return parsed_manifest
+
+    def set_parsed_manifest(
+        self, content_hash: str, cache_key: Hashable, parsed_manifest: Any
+    ) -> None:
+        key = (content_hash, cache_key)
+        with self._lock:
+            self._parsed_manifests[key] = parsed_manifest
+            self._parsed_manifests.move_to_end(key)
+            while len(self._parsed_manifests) > self._max_parsed_manifests:
+                self._parsed_manifests.popitem(last=False)
+
+    def clear(self) -> None:
+        """Clears all in-memory entries. Does not clear the disk cache."""
+        with self._lock:
+            self._content_hash_by_path.clear()
+            self._raw_entries.clear()
+            self._parsed_manifests.clear()
+
+    def _get_raw_entry(self, content_hash: str) -> Optional[_RawManifestEntry]:
+        with self._lock:
+            return self._raw_entries.get(content_hash)
+
+    def _disk_cache_path(self, content_hash: str) -> Optional[str]:
+        if not self._disk_cache_dir:
+            return None
+        return os.path.join(self._disk_cache_dir, f"{content_hash}.pickle")
+
+    def _load_raw_entry_from_disk(
+        self, content_hash: str
+    ) -> Optional[_RawManifestEntry]:
+        path = self._disk_cache_path(content_hash)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                raw_yaml, validated_schema_versions = pickle.load(f)
+        except Exception as e:
+            # A corrupt or incompatible cache file is not fatal - we just re-read the
+            # manifest from source.
+            logging.warning(
+                "Could not load cached manifest contents from [%s]: %s", path, e
+            )
+            return None
+        return _RawManifestEntry(
+            raw_yaml=raw_yaml, validated_schema_versions=set(validated_schema_versions)
+        )
+
+    def _write_raw_entry_to_disk(
+        self, content_hash: str, entry: _RawManifestEntry
+    ) -> None:
+        path = self._disk_cache_path(content_hash)
+        if not path:
+            return
+        with self._lock:
+            contents = (entry.raw_yaml, sorted(entry.validated_schema_versions))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file then rename so that concurrent readers never see a
+            # partially written file.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(contents, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(
+                "Could not write cached manifest contents to [%s]: %s", path, e
+            )
+
+
+_manifest_cache: Optional[IngestViewManifestCache] = None
+_manifest_cache_lock = threading.Lock()
+
+
+def get_ingest_view_manifest_cache() -> IngestViewManifestCache:
+    """Returns the process-wide manifest cache."""
+    global _manifest_cache
+    with _manifest_cache_lock:
+        if _manifest_cache is None:
+            _manifest_cache = IngestViewManifestCache(
+                disk_cache_dir=os.environ.get(INGEST_VIEW_MANIFEST_CACHE_DIR_ENV_VAR)
+            )
+        return _manifest_cache
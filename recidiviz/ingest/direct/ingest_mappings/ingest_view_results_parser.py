@@ -18,37 +18,60 @@
 manifest file for this ingest view.
 """
 import os
-from typing import Dict, Iterator, List, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+import attr
 from more_itertools import one
 
 from recidiviz.common.common_utils import bidirectional_set_difference
 from recidiviz.ingest.direct.ingest_mappings import yaml_schema
+from recidiviz.ingest.direct.ingest_mappings.compiled_ingest_view_manifest import (
+    CompiledEntityTreeManifest,
+)
 from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
     EntityTreeManifest,
     EntityTreeManifestFactory,
     VariableManifestNode,
     build_manifest_from_raw_typed,
+    env_property_values,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_cache import (
+    IngestViewManifestCache,
+    get_ingest_view_manifest_cache,
 )
 from recidiviz.ingest.direct.ingest_mappings.ingest_view_results_parser_delegate import (
     IngestViewResultsParserDelegate,
 )
 from recidiviz.persistence.entity.base_entity import Entity
 from recidiviz.utils import environment
-from recidiviz.utils.yaml_dict import YAMLDict
 
 # This key tracks the version number for the actual mappings manifest structure,
 # allowing us to gate any breaking changes in the file syntax etc.
 MANIFEST_LANGUAGE_VERSION_KEY = "manifest_language"
 
 
+@attr.s(frozen=True, kw_only=True)
+class _ParsedManifest:
+    output_manifest: EntityTreeManifest = attr.ib()
+    input_columns: Set[str] = attr.ib()
+    compiled_manifest: CompiledEntityTreeManifest = attr.ib()
+    # Names of the $env properties referenced by the manifest, whose values are
+    # provided by the parser delegate for each parse.
+    env_properties: Set[str] = attr.ib()
+
+
 class IngestViewResultsParser:
     """Class that parses ingest view query results into entities based on the manifest
     file for this ingest view.
     """
 
-    def __init__(self, delegate: IngestViewResultsParserDelegate):
+    def __init__(
+        self,
+        delegate: IngestViewResultsParserDelegate,
+        manifest_cache: Optional[IngestViewManifestCache] = None,
+    ):
         self.delegate = delegate
+        self.manifest_cache = manifest_cache or get_ingest_view_manifest_cache()
 
     def parse(
         self, *, ingest_view_name: str, contents_iterator: Iterator[Dict[str, str]]
@@ -58,14 +81,24 @@ class IngestViewResultsParser:
         """
 
         manifest_path = self.delegate.get_ingest_view_manifest_path(ingest_view_name)
-        output_manifest, expected_input_columns = self.parse_manifest(manifest_path)
+        parsed_manifest = self._get_parsed_manifest(manifest_path)
+        compiled_manifest = parsed_manifest.compiled_manifest
+        expected_input_columns = parsed_manifest.input_columns
+        env_properties = {
+            property_name: self.delegate.get_env_property(property_name)
+            for property_name in parsed_manifest.env_properties
+        }
         result = []
-        for i, row in enumerate(contents_iterator):
-            self._validate_row_columns(i, row, expected_input_columns)
-            output_tree = output_manifest.build_from_row(row)
-            if not output_tree:
-                raise ValueError("Unexpected null output tree for row.")
-            result.append(output_tree)
+        with env_property_values(env_properties):
+            for i, row in enumerate(contents_iterator):
+                # Comparing the keys view directly avoids building a new set for every
+                # row in the common case where the columns match.
+                if row.keys() != expected_input_columns:
+                    self._validate_row_columns(i, row, expected_input_columns)
+                output_tree = compiled_manifest.build_from_row(row)
+                if not output_tree:
+                    raise ValueError("Unexpected null output tree for row.")
+                result.append(output_tree)
         return result
 
     @staticmethod
@@ -95,7 +128,46 @@ class IngestViewResultsParser:
         for the output, as well as the set of expected input columns for any CSVs we use
         this manifest to parse.
         """
-        manifest_dict = YAMLDict.from_path(manifest_path)
+        parsed_manifest = self._get_parsed_manifest(manifest_path)
+        return parsed_manifest.output_manifest, set(parsed_manifest.input_columns)
+
+    def _get_parsed_manifest(self, manifest_path: str) -> _ParsedManifest:
+        """Returns the parsed manifest at the provided path, reusing a previously parsed
+        version of the same manifest contents if the delegate allows it.
+        """
+        content_hash = self.manifest_cache.content_hash(manifest_path)
+        cache_key = self.delegate.get_manifest_cache_key()
+        if cache_key is not None:
+            parsed_manifest = self.manifest_cache.get_parsed_manifest(
+                content_hash, cache_key
+            )
+            if parsed_manifest:
+                return parsed_manifest
+
+        output_manifest, input_columns = self._parse_manifest_contents(
+            manifest_path, content_hash
+        )
+        parsed_manifest = _ParsedManifest(
+            output_manifest=output_manifest,
+            input_columns=input_columns,
+            compiled_manifest=CompiledEntityTreeManifest(output_manifest),
+            env_properties=output_manifest.env_properties_referenced(),
+        )
+        if cache_key is not None:
+            self.manifest_cache.set_parsed_manifest(
+                content_hash, cache_key, parsed_manifest
+            )
+        return parsed_manifest
+
+    def _parse_manifest_contents(
+        self, manifest_path: str, content_hash: str
+    ) -> Tuple[EntityTreeManifest, Set[str]]:
+        """Builds and validates the manifest AST from the contents of the manifest at
+        the provided path, returning the AST and the set of expected input columns.
+        """
+        manifest_dict = self.manifest_cache.load_manifest_dict(
+            manifest_path, content_hash
+        )
 
         # Don't pop manifest version key, otherwise schema won't validate
         version = manifest_dict.peek(MANIFEST_LANGUAGE_VERSION_KEY, str)
@@ -162,13 +234,18 @@ class IngestViewResultsParser:
         # from crashes in the EntityTreeManifestFactory.from_raw_manifest() call.
         # However, we still want to do this validation so that we don't forget to add
         # JSON schema (and therefore IDE) support for new features in the language.
-        if not environment.in_gcp():
+        if not environment.in_gcp() and not self.manifest_cache.is_schema_validated(
+            content_hash, version
+        ):
             # Run schema validation in tests / CI
-            YAMLDict.from_path(manifest_path).validate(
+            self.manifest_cache.load_manifest_dict(
+                manifest_path, content_hash
+            ).validate(
                 json_schema_path=os.path.join(
                     os.path.dirname(yaml_schema.__file__), version, "schema.json"
                 )
             )
+            self.manifest_cache.mark_schema_validated(content_hash, version)
 
         return output_manifest, set(input_columns)
 
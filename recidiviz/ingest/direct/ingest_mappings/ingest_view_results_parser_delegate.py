@@ -23,7 +23,7 @@ import datetime
 import os
 from enum import Enum
 from types import ModuleType
-from typing import Callable, Dict, List, Optional, Type, Union
+from typing import Callable, Dict, Hashable, List, Optional, Type, Union
 
 from recidiviz.common.constants import state as state_constants
 from recidiviz.common.module_collector_mixin import ModuleCollectorMixin
@@ -100,6 +100,16 @@ class IngestViewResultsParserDelegate:
         EntityTreeManifest from the result.
         """
 
+    def get_manifest_cache_key(self) -> Optional[Hashable]:
+        """Returns a key that uniquely identifies all delegate state that may be used
+        while building a manifest, or None if manifests built with this delegate should
+        not be cached. Parsers with delegates that return the same key will share
+        parsed manifests for identical manifest file contents. Values returned by
+        get_env_property() do not need to be part of the key since they are read from
+        the parsing delegate each time results are parsed.
+        """
+        return None
+
 
 _INGEST_VIEW_MANIFESTS_SUBDIR = "ingest_mappings"
 
@@ -258,3 +268,6 @@ class IngestViewResultsParserDelegateImpl(
 
             return state_person_alias_filter_predicate
         return None
+
+    def get_manifest_cache_key(self) -> Optional[Hashable]:
+        return self.region.region_code, self.schema_type
@@ -17,6 +17,7 @@
 """Classes for performing direct ingest raw file imports to BigQuery."""
 import csv
 import datetime
+import functools
 import logging
 import os
 import re
@@ -25,19 +26,23 @@ from types import ModuleType
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import attr
+import numpy as np
 import pandas as pd
 from google.api_core.exceptions import BadRequest
 from google.cloud import bigquery
 from more_itertools import one
+from opencensus.stats import aggregation, measure, view
 
 from recidiviz.big_query.big_query_client import BigQueryClient
 from recidiviz.big_query.big_query_utils import normalize_column_name_for_bq
 from recidiviz.cloud_storage.gcsfs_csv_reader import (
     COMMON_RAW_FILE_ENCODINGS,
     UTF_8_ENCODING,
+    EncodingDetectionMode,
     GcsfsCsvReader,
 )
 from recidiviz.cloud_storage.gcsfs_csv_reader_delegates import (
+    ChunkFileFormat,
     ReadOneGcsfsCsvReaderDelegate,
     SplittingGcsfsCsvReaderDelegate,
 )
@@ -60,9 +65,40 @@ from recidiviz.ingest.direct.types.direct_ingest_constants import (
     UPDATE_DATETIME_COL_NAME,
 )
 from recidiviz.persistence.entity.operations.entities import DirectIngestRawFileMetadata
-from recidiviz.utils import environment
+from recidiviz.utils import environment, monitoring
 from recidiviz.utils.yaml_dict import YAMLDict
 
+m_raw_data_encoding_fallbacks = measure.MeasureInt(
+    "ingest/raw_data/encoding_fallback_count",
+    "Number of raw data imports that were not read with the configured encoding for "
+    "the file",
+    "1",
+)
+
+raw_data_encoding_fallbacks_view = view.View(
+    "recidiviz/ingest/raw_data/encoding_fallback_count",
+    "The sum of raw data imports that fell back to a different encoding than the "
+    "configured one, by region and file tag",
+    [monitoring.TagKey.REGION, monitoring.TagKey.RAW_DATA_FILE_TAG],
+    m_raw_data_encoding_fallbacks,
+    aggregation.SumAggregation(),
+)
+
+monitoring.register_views([raw_data_encoding_fallbacks_view])
+
+# Applies str.strip() element-wise to an object array
+_strip_str_ufunc = np.frompyfunc(str.strip, 1, 1)
+
+_TEMP_FILE_EXTENSION_BY_CHUNK_FILE_FORMAT = {
+    ChunkFileFormat.CSV: "csv",
+    ChunkFileFormat.PARQUET: "parquet",
+}
+
+_BIG_QUERY_SOURCE_FORMAT_BY_CHUNK_FILE_FORMAT = {
+    ChunkFileFormat.CSV: bigquery.SourceFormat.CSV,
+    ChunkFileFormat.PARQUET: bigquery.SourceFormat.PARQUET,
+}
+
 DATETIME_SQL_REGEX = re.compile(
     r"SAFE.PARSE_(TIMESTAMP|DATE|DATETIME)\(.*{col_name}.*\)"
 )
@@ -230,6 +266,14 @@ class DirectIngestRawFileConfig:
     # are defined in, as the column names. By default, False.
     infer_columns_from_config: bool = attr.ib()
 
+    # Determines how much of the file we decode up front to rule out encodings
+    # before doing the full parse / upload of the file. By default, NONE, i.e. we
+    # read the file with the configured encoding and only fall back to other
+    # encodings if that read fails.
+    encoding_detection_mode: EncodingDetectionMode = attr.ib(
+        default=EncodingDetectionMode.NONE
+    )
+
     # A comma-separated string representation of the primary keys
     primary_key_str: str = attr.ib()
 
@@ -313,6 +357,7 @@ class DirectIngestRawFileConfig:
         default_ignore_quotes: bool,
         default_always_historical_export: bool,
         default_infer_columns_from_config: Optional[bool],
+        default_encoding_detection_mode: Optional[EncodingDetectionMode],
         file_config_dict: YAMLDict,
         yaml_filename: str,
     ) -> "DirectIngestRawFileConfig":
@@ -351,6 +396,9 @@ class DirectIngestRawFileConfig:
         infer_columns_from_config = file_config_dict.pop_optional(
             "infer_columns_from_config", bool
         )
+        encoding_detection_mode = file_config_dict.pop_optional(
+            "encoding_detection_mode", str
+        )
 
         if len(file_config_dict) > 0:
             raise ValueError(
@@ -408,6 +456,13 @@ class DirectIngestRawFileConfig:
                 if default_infer_columns_from_config is not None
                 else False
             ),
+            encoding_detection_mode=EncodingDetectionMode(encoding_detection_mode)
+            if encoding_detection_mode is not None
+            else (
+                default_encoding_detection_mode
+                if default_encoding_detection_mode is not None
+                else EncodingDetectionMode.NONE
+            ),
         )
 
 
@@ -434,6 +489,10 @@ class DirectIngestRawFileDefaultConfig:
     default_infer_columns_from_config: Optional[bool] = attr.ib(
         default=None, validator=attr_validators.is_opt_bool
     )
+    # The default setting for how to detect the encoding of raw files from this region
+    default_encoding_detection_mode: Optional[EncodingDetectionMode] = attr.ib(
+        default=None
+    )
 
 
 @attr.s
@@ -472,6 +531,9 @@ class DirectIngestRegionRawFileConfig:
         default_infer_columns_from_config = default_contents.pop_optional(
             "default_infer_columns_from_config", bool
         )
+        default_encoding_detection_mode = default_contents.pop_optional(
+            "default_encoding_detection_mode", str
+        )
 
         return DirectIngestRawFileDefaultConfig(
             filename=self.default_config_filename,
@@ -481,6 +543,11 @@ class DirectIngestRegionRawFileConfig:
             default_ignore_quotes=default_ignore_quotes,
             default_infer_columns_from_config=default_infer_columns_from_config,
             default_always_historical_export=default_always_historical_export,
+            default_encoding_detection_mode=EncodingDetectionMode(
+                default_encoding_detection_mode
+            )
+            if default_encoding_detection_mode is not None
+            else None,
         )
 
     def _region_ingest_dir(self) -> str:
@@ -550,6 +617,7 @@ class DirectIngestRegionRawFileConfig:
                 default_config.default_ignore_quotes,
                 default_config.default_always_historical_export,
                 default_config.default_infer_columns_from_config,
+                default_config.default_encoding_detection_mode,
                 yaml_contents,
                 filename,
             )
@@ -590,6 +658,9 @@ class DirectIngestRawFileImportManager:
         region_raw_file_config: Optional[DirectIngestRegionRawFileConfig] = None,
         sandbox_dataset_prefix: Optional[str] = None,
         allow_incomplete_configs: bool = False,
+        max_in_flight_upload_chunks: int = 0,
+        num_transform_processes: int = 0,
+        temp_file_format: ChunkFileFormat = ChunkFileFormat.CSV,
     ):
 
         self.region = region
@@ -605,6 +676,15 @@ class DirectIngestRawFileImportManager:
             )
         )
         self.allow_incomplete_configs = allow_incomplete_configs
+        # If > 0, chunks are transformed and uploaded to temp GCS paths concurrently
+        # with parsing, with at most this many chunks in flight at a time.
+        self.max_in_flight_upload_chunks = max_in_flight_upload_chunks
+        # If > 0 (and max_in_flight_upload_chunks > 0), chunk transforms are run in a
+        # process pool of this size.
+        self.num_transform_processes = num_transform_processes
+        # The format of the temp files we split the raw file into before loading
+        # them into BigQuery.
+        self.temp_file_format = temp_file_format
         self.csv_reader = GcsfsCsvReader(fs)
         self.raw_table_migrations = DirectIngestRawTableMigrationCollector(
             region_code=self.region.region_code,
@@ -676,14 +756,22 @@ class DirectIngestRawFileImportManager:
         columns = self._get_validated_columns(path, file_config)
 
         delegate = DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
-            path, self.fs, file_metadata, self.temp_output_directory_path
+            path,
+            self.fs,
+            file_metadata,
+            self.temp_output_directory_path,
+            max_in_flight_chunks=self.max_in_flight_upload_chunks,
+            num_transform_processes=self.num_transform_processes,
+            output_format=self.temp_file_format,
         )
 
-        self.csv_reader.streaming_read(
+        encodings_to_try = file_config.encodings_to_try()
+        encoding = self.csv_reader.streaming_read(
             path,
             delegate=delegate,
             chunk_size=file_config.import_chunk_size_rows,
-            encodings_to_try=file_config.encodings_to_try(),
+            encodings_to_try=encodings_to_try,
+            encoding_detection_mode=file_config.encoding_detection_mode,
             index_col=False,
             header=0 if not file_config.infer_columns_from_config else None,
             names=columns,
@@ -691,6 +779,21 @@ class DirectIngestRawFileImportManager:
             **self._common_read_csv_kwargs(file_config),
         )
 
+        if encoding != encodings_to_try[0]:
+            logging.warning(
+                "Read [%s] with encoding [%s] instead of configured encoding [%s]",
+                path.abs_path(),
+                encoding,
+                encodings_to_try[0],
+            )
+            with monitoring.measurements(
+                {
+                    monitoring.TagKey.REGION: self.region.region_code,
+                    monitoring.TagKey.RAW_DATA_FILE_TAG: parts.file_tag,
+                }
+            ) as measurements:
+                measurements.measure_int_put(m_raw_data_encoding_fallbacks, 1)
+
         return delegate.output_paths, delegate.output_columns
 
     def _delete_conflicting_contents_from_bigquery(
@@ -739,6 +842,9 @@ class DirectIngestRawFileImportManager:
                     columns
                 ),
                 write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                source_format=_BIG_QUERY_SOURCE_FORMAT_BY_CHUNK_FILE_FORMAT[
+                    self.temp_file_format
+                ],
             )
         except Exception as e:
             logging.error("Failed to start load job - cleaning up temp paths")
@@ -954,57 +1060,85 @@ class DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
         fs: DirectIngestGCSFileSystem,
         file_metadata: DirectIngestRawFileMetadata,
         temp_output_directory_path: GcsfsDirectoryPath,
+        max_in_flight_chunks: int = 0,
+        num_transform_processes: int = 0,
+        output_format: ChunkFileFormat = ChunkFileFormat.CSV,
     ):
 
-        super().__init__(path, fs, include_header=False)
+        super().__init__(
+            path,
+            fs,
+            include_header=False,
+            max_in_flight_chunks=max_in_flight_chunks,
+            num_transform_processes=num_transform_processes,
+            output_format=output_format,
+        )
         self.file_metadata = file_metadata
         self.temp_output_directory_path = temp_output_directory_path
+        self.picklable_transform_fn = functools.partial(
+            transform_raw_data_chunk,
+            file_id=self.file_metadata.file_id,
+            utc_upload_datetime=filename_parts_from_path(self.path).utc_upload_datetime,
+        )
 
     def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        # Stripping white space from all fields
-        df = df.applymap(lambda x: x.strip())
-
-        num_rows_before_filter = df.shape[0]
-
-        # Filter out rows where ALL values are null / empty string. Solution largely
-        # copied from https://stackoverflow.com/a/41401892.
-        df = df[~pd.isnull(df.applymap(lambda x: None if x == "" else x)).all(axis=1)]
-
-        num_rows_after_filter = df.shape[0]
-        if num_rows_before_filter > num_rows_after_filter:
-            logging.error(
-                "Filtered out [%s] rows that contained only empty/null values",
-                num_rows_before_filter - num_rows_after_filter,
-            )
-
-        augmented_df = self._augment_raw_data_with_metadata_columns(
-            path=self.path, file_metadata=self.file_metadata, raw_data_df=df
+        return transform_raw_data_chunk(
+            df,
+            file_id=self.file_metadata.file_id,
+            utc_upload_datetime=filename_parts_from_path(self.path).utc_upload_datetime,
         )
-        return augmented_df
 
     def get_output_path(self, chunk_num: int) -> GcsfsFilePath:
         name, _extension = os.path.splitext(self.path.file_name)
 
+        extension = _TEMP_FILE_EXTENSION_BY_CHUNK_FILE_FORMAT[self.output_format]
         return GcsfsFilePath.from_directory_and_file_name(
-            self.temp_output_directory_path, f"temp_{name}_{chunk_num}.csv"
+            self.temp_output_directory_path, f"temp_{name}_{chunk_num}.{extension}"
         )
 
-    @staticmethod
-    def _augment_raw_data_with_metadata_columns(
-        path: GcsfsFilePath,
-        file_metadata: DirectIngestRawFileMetadata,
-        raw_data_df: pd.DataFrame,
-    ) -> pd.DataFrame:
-        """Add file_id and update_datetime columns to all rows in the dataframe."""
 
-        parts = filename_parts_from_path(path)
+def transform_raw_data_chunk(
+    df: pd.DataFrame, file_id: int, utc_upload_datetime: datetime.datetime
+) -> pd.DataFrame:
+    """Strips whitespace from a chunk of raw data, filters out empty rows and adds
+    file_id and update_datetime columns to all remaining rows.
+    """
+    num_rows_before_filter = df.shape[0]
 
-        return augment_raw_data_df_with_metadata_columns(
-            raw_data_df=raw_data_df,
-            file_id=file_metadata.file_id,
-            utc_upload_datetime=parts.utc_upload_datetime,
+    df = strip_whitespace_and_filter_empty_rows(df)
+
+    num_rows_after_filter = df.shape[0]
+    if num_rows_before_filter > num_rows_after_filter:
+        logging.error(
+            "Filtered out [%s] rows that contained only empty/null values",
+            num_rows_before_filter - num_rows_after_filter,
         )
 
+    return augment_raw_data_df_with_metadata_columns(
+        raw_data_df=df,
+        file_id=file_id,
+        utc_upload_datetime=utc_upload_datetime,
+    )
+
+
+def strip_whitespace_and_filter_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Strips leading/trailing whitespace from all values in a raw data chunk and
+    filters out rows where ALL values are empty strings.
+
+    All values must be strings (i.e. the chunk was read with dtype=str and
+    keep_default_na=False). Strips every cell in a single ufunc pass over the
+    underlying array and finds empty rows with a single boolean reduction, rather than
+    going through DataFrame.applymap(), which has significant per-cell overhead on
+    chunks of hundreds of thousands of rows by dozens of columns.
+    """
+    values = _strip_str_ufunc(df.to_numpy(dtype=object))
+    is_non_empty_row = ~(values == "").all(axis=1)
+    return pd.DataFrame(
+        values[is_non_empty_row],
+        index=df.index[is_non_empty_row],
+        columns=df.columns,
+    )
+
 
 def augment_raw_data_df_with_metadata_columns(
     raw_data_df: pd.DataFrame,
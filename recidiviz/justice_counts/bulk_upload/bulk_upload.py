@@ -23,6 +23,7 @@ import datetime
 import itertools
 import logging
 import os
+import time
 from collections import defaultdict
 from itertools import groupby
 from typing import Any, Dict, List, Optional, Set, Tuple, Type
@@ -34,6 +35,7 @@ from recidiviz.common.text_analysis import TextAnalyzer, TextMatchingConfigurati
 from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import (
     fuzzy_match_against_options,
 )
+from recidiviz.justice_counts.bulk_upload.bulk_upload_plan import BulkUploadPlan
 from recidiviz.justice_counts.dimensions.base import DimensionBase
 from recidiviz.justice_counts.exceptions import (
     BulkUploadMessageType,
@@ -51,7 +53,6 @@ from recidiviz.justice_counts.report import ReportInterface
 from recidiviz.persistence.database.schema.justice_counts import schema
 from recidiviz.persistence.database.schema.justice_counts.schema import (
     ReportingFrequency,
-    ReportStatus,
 )
 
 MONTH_NAMES = list(calendar.month_name)
@@ -79,9 +80,33 @@ class BulkUploader:
         user_account: schema.UserAccount,
     ) -> Dict[str, Exception]:
         """Iterate through all CSV files in the given directory and upload them
-        to the Justice Counts database using the `upload_csv` method defined below.
+        to the Justice Counts database in a single transaction. See `plan_directory`.
+        """
+        plan, filename_to_error = self.plan_directory(
+            session=session,
+            directory=directory,
+            agency_id=agency_id,
+            system=system,
+            user_account=user_account,
+        )
+        self._apply_plan(session=session, plan=plan)
+        return filename_to_error
+
+    def plan_directory(
+        self,
+        session: Session,
+        directory: str,
+        agency_id: int,
+        system: schema.System,
+        user_account: schema.UserAccount,
+    ) -> Tuple[BulkUploadPlan, Dict[str, Exception]]:
+        """Iterate through all CSV files in the given directory and compute the
+        changes they make to the agency's reports, without saving them.
         If an error is encountered on a particular file, log it and continue.
         """
+        plan = BulkUploadPlan(
+            session=session, agency_id=agency_id, user_account=user_account
+        )
         filename_to_error = {}
 
         # Sort so that we process e.g. caseloads before caseloads_by_gender.
@@ -95,19 +120,18 @@ class BulkUploader:
             filepath = os.path.join(directory, filename)
             logging.info("Uploading %s", filename)
             try:
-                self.upload_csv(
-                    session=session,
-                    filename=filepath,
-                    agency_id=agency_id,
+                self._plan_rows(
+                    plan=plan,
                     system=system,
-                    user_account=user_account,
+                    rows=self._read_csv_rows(filepath),
+                    filename=filepath,
                 )
             except Exception as e:
                 if self.catch_errors:
                     filename_to_error[filename] = e
                 else:
                     raise e
-        return filename_to_error
+        return plan, filename_to_error
 
     def get_sheet_to_preingest_messages(
         self,
@@ -187,7 +211,28 @@ class BulkUploader:
         user_account: schema.UserAccount,
     ) -> Dict[str, Exception]:
         """Iterate through all tabs in an Excel spreadsheet and upload them
-        to the Justice Counts database using the `upload_rows` method defined below.
+        to the Justice Counts database in a single transaction. See `plan_excel`.
+        """
+        plan, sheet_to_error = self.plan_excel(
+            session=session,
+            xls=xls,
+            agency_id=agency_id,
+            system=system,
+            user_account=user_account,
+        )
+        self._apply_plan(session=session, plan=plan)
+        return sheet_to_error
+
+    def plan_excel(
+        self,
+        session: Session,
+        xls: pd.ExcelFile,
+        agency_id: int,
+        system: schema.System,
+        user_account: schema.UserAccount,
+    ) -> Tuple[BulkUploadPlan, Dict[str, Exception]]:
+        """Iterate through all tabs in an Excel spreadsheet and compute the changes
+        they make to the agency's reports, without saving them.
         If an error is encountered on a particular tab, log it and continue.
         """
         # Sort so that we process e.g. caseloads before caseloads_by_gender.
@@ -212,28 +257,31 @@ class BulkUploader:
             expected_aggregate_sheetnames=expected_aggregate_sheetnames,
         )
 
+        plan = BulkUploadPlan(
+            session=session, agency_id=agency_id, user_account=user_account
+        )
         for sheet_name in actual_sheetnames:
             logging.info("Uploading %s", sheet_name)
             try:
+                start = time.perf_counter()
                 df = pd.read_excel(xls, sheet_name=sheet_name)
                 # Drop any rows that contain any NaN values
                 df = df.dropna(axis=0, how="any", subset="value")
                 # Convert dataframe to a list of dictionaries
                 rows = df.to_dict("records")
-                self._upload_rows(
-                    session=session,
+                plan.timings.parse_seconds += time.perf_counter() - start
+                self._plan_rows(
+                    plan=plan,
                     system=system,
                     rows=rows,
                     filename=sheet_name,
-                    agency_id=agency_id,
-                    user_account=user_account,
                 )
             except Exception as e:
                 if self.catch_errors:
                     sheet_to_error[sheet_name] = e
                 else:
                     raise e
-        return sheet_to_error
+        return plan, sheet_to_error
 
     def upload_csv(
         self,
@@ -244,48 +292,66 @@ class BulkUploader:
         user_account: schema.UserAccount,
     ) -> None:
         """Uploads a CSV file containing data for a particular metric.
-        Core functionality is handled by the `upload_rows` method below.
+        Core functionality is handled by the `_plan_rows` method below.
         """
-        with open(filename, "r", encoding="utf-8") as csvfile:
-            rows = list(csv.DictReader(csvfile))
+        plan = BulkUploadPlan(
+            session=session, agency_id=agency_id, user_account=user_account
+        )
 
         # TODO(#13731): Save raw CSV file in GCS
 
-        self._upload_rows(
-            session=session,
+        self._plan_rows(
+            plan=plan,
             system=system,
-            rows=rows,
+            rows=self._read_csv_rows(filename),
             filename=filename,
-            agency_id=agency_id,
-            user_account=user_account,
         )
+        self._apply_plan(session=session, plan=plan)
 
-    def _upload_rows(
+    def _read_csv_rows(self, filename: str) -> List[Dict[str, Any]]:
+        with open(filename, "r", encoding="utf-8") as csvfile:
+            return list(csv.DictReader(csvfile))
+
+    def _apply_plan(self, session: Session, plan: BulkUploadPlan) -> None:
+        plan.apply(session)
+        logging.info(
+            "Bulk upload for agency %d took %.2fs to load existing reports, %.2fs to "
+            "parse, %.2fs to plan and %.2fs to apply changes",
+            plan.agency_id,
+            plan.timings.load_seconds,
+            plan.timings.parse_seconds,
+            plan.timings.plan_seconds,
+            plan.timings.apply_seconds,
+        )
+
+    def _plan_rows(
         self,
-        session: Session,
+        plan: BulkUploadPlan,
         system: schema.System,
         rows: List[Dict[str, Any]],
         filename: str,
-        agency_id: int,
-        user_account: schema.UserAccount,
     ) -> None:
         """Generally, a file will only contain metrics for one system. In the case
         of supervision, the file could contain metrics for supervision, parole, or
         probation. This is indicated by the `system` column. In this case, we break
-        up the rows by system, and then ingest one system at a time."""
+        up the rows by system, and then ingest one system at a time.
+
+        The file's changes are only added to the plan if the whole file is planned
+        without errors."""
         system_to_rows = self._get_system_to_rows(system=system, rows=rows)
-        for current_system, current_rows in system_to_rows.items():
-            # Based on the system and the name of the CSV file, determine which
-            # Justice Counts metric this file contains data for
-            metricfile = self._get_metricfile(filename=filename, system=current_system)
-
-            self._upload_rows_for_metricfile(
-                session=session,
-                rows=current_rows,
-                metricfile=metricfile,
-                agency_id=agency_id,
-                user_account=user_account,
-            )
+        with plan.staged_changes():
+            for current_system, current_rows in system_to_rows.items():
+                # Based on the system and the name of the CSV file, determine which
+                # Justice Counts metric this file contains data for
+                metricfile = self._get_metricfile(
+                    filename=filename, system=current_system
+                )
+
+                self._plan_rows_for_metricfile(
+                    plan=plan,
+                    rows=current_rows,
+                    metricfile=metricfile,
+                )
 
     def _get_system_to_rows(
         self, system: schema.System, rows: List[Dict[str, Any]]
@@ -317,21 +383,19 @@ class BulkUploader:
             system_to_rows[system] = rows
         return system_to_rows
 
-    def _upload_rows_for_metricfile(
+    def _plan_rows_for_metricfile(
         self,
-        session: Session,
+        plan: BulkUploadPlan,
         rows: List[Dict[str, Any]],
         metricfile: MetricFile,
-        agency_id: int,
-        user_account: schema.UserAccount,
     ) -> None:
         """Takes as input a set of rows (originating from a CSV or Excel spreadsheet tab)
         in the format of a list of dictionaries, i.e. [{"column_name": <column_value>} ... ].
         The rows should be formatted according to the technical specification, and contain
         data for a particular metric across multiple time periods.
 
-        Uploads this data into the Justice Counts database by breaking it up into Report objects,
-        and either updating existing reports or creating new ones.
+        Adds this data to the plan by breaking it up into Report objects, and either
+        updating existing reports or creating new ones.
 
         A simplified version of the expected format:
         year | month | value | offense_type
@@ -346,74 +410,45 @@ class BulkUploader:
         The filename is assumed to be of the format "metric_name.csv", where metric_name
         corresponds to one of the MetricFile objects in bulk_upload_helpers.py.
         """
-        reports = ReportInterface.get_reports_by_agency_id(session, agency_id=agency_id)
-
-        # Step 1: Group any existing reports for this agency by time range.
-        reports_sorted_by_time_range = sorted(
-            reports, key=lambda x: (x.date_range_start, x.date_range_end)
-        )
-        reports_by_time_range = {
-            k: list(v)
-            for k, v in groupby(
-                reports_sorted_by_time_range,
-                key=lambda x: (x.date_range_start, x.date_range_end),
-            )
-        }
-
+        start = time.perf_counter()
         metric_definition = metricfile.definition
         reporting_frequency = metric_definition.reporting_frequency
 
         # TODO(#13731): Make sure there are no unexpected columns in the file
 
-        # Step 2: Group the rows in this file by time range.
+        # Step 1: Group the rows in this file by time range.
         (rows_by_time_range, time_range_to_year_month,) = self._get_rows_by_time_range(
             rows=rows, reporting_frequency=reporting_frequency
         )
 
-        # Step 3: For each time range represented in the file, convert the
-        # reported data into a MetricInterface object. If a report already
-        # exists for this time range, update it with the MetricInterface.
-        # Else, create a new report and add the MetricInterface.
-        for time_range, rows_for_this_time_range in rows_by_time_range.items():
-            existing_report = reports_by_time_range.get(time_range)
-            if existing_report is not None:
-                if len(existing_report) != 1:
-                    raise ValueError(
-                        f"Found {len(existing_report)} reports with time range {time_range}."
-                    )
-                report = existing_report[0]
-            else:  # existing report is None, so create the report
-                year, month = time_range_to_year_month[time_range]
-                report = ReportInterface.create_report(
-                    session=session,
-                    agency_id=agency_id,
-                    user_account_id=user_account.id,
-                    year=year,
-                    month=month,
-                    frequency=reporting_frequency.value,
-                )
-                reports_by_time_range[time_range] = [report]
-
-            report_metric = self._get_report_metric(
+        # Step 2: For each time range represented in the file, convert the
+        # reported data into a MetricInterface object. We do this for all time
+        # ranges before changing any reports, so that a parse error doesn't leave
+        # the file partially applied.
+        time_range_to_report_metric = {
+            time_range: self._get_report_metric(
                 metricfile=metricfile,
                 time_range=time_range,
                 rows_for_this_time_range=rows_for_this_time_range,
             )
-
-            ReportInterface.add_or_update_metric(
-                session=session,
-                report=report,
+            for time_range, rows_for_this_time_range in rows_by_time_range.items()
+        }
+        plan_start = time.perf_counter()
+        plan.timings.parse_seconds += plan_start - start
+
+        # Step 3: If a report already exists for this time range, update it with the
+        # MetricInterface. Else, create a new report and add the MetricInterface.
+        for time_range, report_metric in time_range_to_report_metric.items():
+            year, month = time_range_to_year_month[time_range]
+            plan.add_or_update_metric(
+                time_range=time_range,
+                year=year,
+                month=month,
+                frequency=reporting_frequency,
                 report_metric=report_metric,
-                user_account=user_account,
                 use_existing_aggregate_value=metricfile.disaggregation is not None,
             )
-
-            ReportInterface.update_report_metadata(
-                session=session,
-                report=report,
-                editor_id=user_account.id,
-                status=ReportStatus.DRAFT.value,
-            )
+        plan.timings.plan_seconds += time.perf_counter() - plan_start
 
     def _get_metricfile(self, filename: str, system: schema.System) -> MetricFile:
         try:
@@ -0,0 +1,464 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Computes the changes that a bulk upload makes to an agency's reports in memory,
+so that they can be reviewed before being saved (a dry run), or applied to the
+database all at once in a single transaction.
+
+All of the agency's reports and report datapoints are loaded up front, and each
+uploaded metric is applied to this in-memory copy with the same semantics as
+ReportInterface.add_or_update_metric. Applying the plan then issues bulk inserts and
+updates, rather than querying for and flushing each datapoint individually.
+"""
+import contextlib
+import datetime
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import attr
+from sqlalchemy.orm import Session
+
+from recidiviz.common.constants.justice_counts import ContextKey, ValueType
+from recidiviz.justice_counts.dimensions.base import DimensionBase
+from recidiviz.justice_counts.dimensions.dimension_registry import (
+    DIMENSION_IDENTIFIER_TO_DIMENSION,
+)
+from recidiviz.justice_counts.exceptions import JusticeCountsServerError
+from recidiviz.justice_counts.metrics.metric_definition import ReportingFrequency
+from recidiviz.justice_counts.metrics.metric_interface import MetricInterface
+from recidiviz.justice_counts.metrics.metric_registry import METRIC_KEY_TO_METRIC
+from recidiviz.justice_counts.report import ReportInterface
+from recidiviz.persistence.database.schema.justice_counts import schema
+
+TimeRange = Tuple[datetime.date, datetime.date]
+
+# Identifies a datapoint within a report: (metric definition key, context key,
+# sorted dimension identifier to member items)
+DatapointKey = Tuple[str, Optional[str], Optional[Tuple[Tuple[str, str], ...]]]
+
+
+def _datapoint_key(
+    metric_definition_key: str,
+    context_key: Optional[str],
+    dimension_identifier_to_member: Optional[Dict[str, str]],
+) -> DatapointKey:
+    return (
+        metric_definition_key,
+        context_key,
+        tuple(sorted(dimension_identifier_to_member.items()))
+        if dimension_identifier_to_member
+        else None,
+    )
+
+
+@attr.define
+class DatapointChange:
+    """A datapoint that the bulk upload will create or whose value it will change."""
+
+    date_range_start: datetime.date
+    date_range_end: datetime.date
+    metric_definition_key: str
+    context_key: Optional[str]
+    dimension_identifier_to_member: Optional[Dict[str, str]]
+    old_value: Optional[str]
+    new_value: Optional[str]
+    # None if the datapoint does not exist yet
+    datapoint_id: Optional[int]
+
+
+@attr.define
+class BulkUploadTimings:
+    """Time spent in each phase of a bulk upload."""
+
+    load_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    plan_seconds: float = 0.0
+    apply_seconds: float = 0.0
+
+
+@attr.frozen
+class _PlannedDatapoint:
+    metric_definition_key: str
+    context_key: Optional[str]
+    value_type: Optional[ValueType]
+    dimension_identifier_to_member: Optional[Dict[str, str]]
+    value: Optional[str]
+    existing: Optional[schema.Datapoint] = None
+
+
+@attr.define
+class _PlannedReport:
+    report: schema.Report
+    is_new: bool
+    datapoints: Dict[DatapointKey, _PlannedDatapoint] = attr.field(factory=dict)
+    is_modified: bool = False
+
+    def copy(self) -> "_PlannedReport":
+        # Planned datapoints are immutable, so the copy can share them
+        return _PlannedReport(
+            report=self.report,
+            is_new=self.is_new,
+            datapoints=dict(self.datapoints),
+            is_modified=self.is_modified,
+        )
+
+
+class BulkUploadPlan:
+    """The set of report and datapoint changes made by a bulk upload for an agency."""
+
+    def __init__(
+        self, session: Session, agency_id: int, user_account: schema.UserAccount
+    ) -> None:
+        self.agency_id = agency_id
+        self.user_account = user_account
+        self.timings = BulkUploadTimings()
+
+        start = time.perf_counter()
+        reports_by_time_range: Dict[TimeRange, List[schema.Report]] = defaultdict(list)
+        for report in ReportInterface.get_reports_by_agency_id(
+            session, agency_id=agency_id
+        ):
+            reports_by_time_range[
+                (report.date_range_start, report.date_range_end)
+            ].append(report)
+        self._reports_by_time_range: Dict[TimeRange, List[schema.Report]] = dict(
+            reports_by_time_range
+        )
+
+        report_ids = [
+            report.id
+            for reports in self._reports_by_time_range.values()
+            for report in reports
+        ]
+        self._existing_datapoints_by_report_id: Dict[
+            int, Dict[DatapointKey, schema.Datapoint]
+        ] = defaultdict(dict)
+        if report_ids:
+            for datapoint in (
+                session.query(schema.Datapoint)
+                .filter(schema.Datapoint.report_id.in_(report_ids))
+                .order_by(schema.Datapoint.id)
+            ):
+                self._existing_datapoints_by_report_id[datapoint.report_id].setdefault(
+                    _datapoint_key(
+                        datapoint.metric_definition_key,
+                        datapoint.context_key,
+                        datapoint.dimension_identifier_to_member,
+                    ),
+                    datapoint,
+                )
+
+        self._planned_reports: Dict[TimeRange, _PlannedReport] = {}
+        # Changes made inside staged_changes(), which are only merged into
+        # _planned_reports if no error is raised.
+        self._staged_reports: Optional[Dict[TimeRange, _PlannedReport]] = None
+        self.timings.load_seconds = time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def staged_changes(self) -> Iterator[None]:
+        """Stages all changes made to the plan inside the context, and only merges
+        them into the plan if the context exits without raising. Used so that an error
+        partway through an uploaded file does not leave the plan with only some of
+        that file's changes."""
+        if self._staged_reports is not None:
+            raise ValueError("Cannot stage changes while changes are already staged.")
+        self._staged_reports = {}
+        try:
+            yield
+            self._planned_reports.update(self._staged_reports)
+        finally:
+            self._staged_reports = None
+
+    def _get_planned_report(
+        self,
+        time_range: TimeRange,
+        year: int,
+        month: int,
+        frequency: ReportingFrequency,
+    ) -> _PlannedReport:
+        """Returns the planned report for the time range, starting from the agency's
+        existing report for that time range if there is one. If changes are being
+        staged, the returned report is a staged copy."""
+        planned_reports = (
+            self._planned_reports
+            if self._staged_reports is None
+            else self._staged_reports
+        )
+        planned_report = planned_reports.get(time_range)
+        if planned_report is not None:
+            return planned_report
+
+        unstaged_report = self._planned_reports.get(time_range)
+        existing_reports = self._reports_by_time_range.get(time_range)
+        if unstaged_report is not None:
+            planned_report = unstaged_report.copy()
+        elif existing_reports is not None:
+            if len(existing_reports) != 1:
+                raise ValueError(
+                    f"Found {len(existing_reports)} reports with time range {time_range}."
+                )
+            planned_report = _PlannedReport(report=existing_reports[0], is_new=False)
+        else:
+            planned_report = _PlannedReport(
+                report=ReportInterface.create_report_object(
+                    agency_id=self.agency_id,
+                    user_account_id=self.user_account.id,
+                    year=year,
+                    month=month,
+                    frequency=frequency.value,
+                ),
+                is_new=True,
+            )
+        planned_reports[time_range] = planned_report
+        return planned_report
+
+    def add_or_update_metric(
+        self,
+        time_range: TimeRange,
+        year: int,
+        month: int,
+        frequency: ReportingFrequency,
+        report_metric: MetricInterface,
+        use_existing_aggregate_value: bool = False,
+    ) -> None:
+        """Adds the metric to the report for the given time range, or updates it if
+        it is already on the report. Follows the same rules as
+        ReportInterface.add_or_update_metric, which this replaces for bulk uploads.
+        """
+        planned_report = self._get_planned_report(
+            time_range=time_range, year=year, month=month, frequency=frequency
+        )
+        planned_report.is_modified = True
+        metric_definition = METRIC_KEY_TO_METRIC[report_metric.key]
+
+        if not use_existing_aggregate_value or report_metric.value is not None:
+            self._set_datapoint(
+                planned_report=planned_report,
+                metric_definition_key=metric_definition.key,
+                value=report_metric.value,
+                use_existing_aggregate_value=use_existing_aggregate_value,
+            )
+
+        all_dimensions_to_values: Dict[DimensionBase, Any] = {}
+        for reported_aggregated_dimension in report_metric.aggregated_dimensions:
+            if reported_aggregated_dimension.dimension_to_value:
+                all_dimensions_to_values.update(
+                    reported_aggregated_dimension.dimension_to_value
+                )
+
+        for aggregated_dimension in metric_definition.aggregated_dimensions or []:
+            for d in DIMENSION_IDENTIFIER_TO_DIMENSION[
+                aggregated_dimension.dimension.dimension_identifier()
+            ]:
+                if d not in all_dimensions_to_values:
+                    continue
+                self._set_datapoint(
+                    planned_report=planned_report,
+                    metric_definition_key=metric_definition.key,
+                    value=all_dimensions_to_values[d],
+                    dimension=d,
+                )
+
+        context_key_to_value = {
+            context.key: context.value for context in report_metric.contexts
+        }
+        for context in metric_definition.contexts or []:
+            if context.key not in context_key_to_value:
+                continue
+            self._set_datapoint(
+                planned_report=planned_report,
+                metric_definition_key=metric_definition.key,
+                value=context_key_to_value[context.key],
+                context_key=context.key,
+                value_type=context.value_type,
+            )
+
+    def _set_datapoint(
+        self,
+        planned_report: _PlannedReport,
+        metric_definition_key: str,
+        value: Any,
+        context_key: Optional[ContextKey] = None,
+        value_type: Optional[ValueType] = None,
+        dimension: Optional[DimensionBase] = None,
+        use_existing_aggregate_value: bool = False,
+    ) -> None:
+        """Sets the value of a datapoint on the planned report. See
+        DatapointInterface.add_datapoint."""
+        report = planned_report.report
+        # Don't save invalid datapoint values when publishing
+        if (
+            report.status == schema.ReportStatus.PUBLISHED
+            and value is not None
+            and (value_type is None or value_type == ValueType.NUMBER)
+        ):
+            try:
+                float(value)
+            except ValueError as e:
+                raise JusticeCountsServerError(
+                    code="invalid_datapoint_value",
+                    description=(
+                        "Datapoint represents a float value, but is a string. "
+                        f"Datapoint ID: {report.id}, value: {value}"
+                    ),
+                ) from e
+
+        dimension_identifier_to_member = (
+            {dimension.dimension_identifier(): dimension.dimension_name}
+            if dimension
+            else None
+        )
+        key = _datapoint_key(
+            metric_definition_key,
+            context_key.value if context_key else None,
+            dimension_identifier_to_member,
+        )
+        planned_datapoint = planned_report.datapoints.get(key)
+        if planned_datapoint is None:
+            existing = (
+                self._existing_datapoints_by_report_id.get(report.id, {}).get(key)
+                if not planned_report.is_new
+                else None
+            )
+            planned_datapoint = _PlannedDatapoint(
+                metric_definition_key=metric_definition_key,
+                context_key=context_key.value if context_key else None,
+                value_type=value_type,
+                dimension_identifier_to_member=dimension_identifier_to_member,
+                value=existing.value if existing is not None else None,
+                existing=existing,
+            )
+
+        new_value = str(value) if value is not None else None
+        # The current value reflects both what is in the database and any changes
+        # made earlier in this upload, e.g. by a sheet with the aggregate values.
+        if (
+            use_existing_aggregate_value
+            and planned_datapoint.value is not None
+            and abs(float(planned_datapoint.value) - value) > 1
+        ):
+            logging.warning(
+                "`use_existing_aggregate_value` was specified, but the aggregate "
+                "value either read or inferred from incoming data (%s) does not "
+                "match the existing aggregate value (%s). The datapoint will keep the "
+                "existing aggregate value",
+                value,
+                planned_datapoint.value,
+            )
+            new_value = planned_datapoint.value
+        planned_report.datapoints[key] = attr.evolve(planned_datapoint, value=new_value)
+
+    @property
+    def new_report_time_ranges(self) -> List[TimeRange]:
+        return sorted(
+            time_range
+            for time_range, planned_report in self._planned_reports.items()
+            if planned_report.is_new
+        )
+
+    @property
+    def changes(self) -> List[DatapointChange]:
+        """Returns all datapoints that will be created, or whose value will change,
+        when the plan is applied."""
+        changes = []
+        for time_range, planned_report in sorted(self._planned_reports.items()):
+            for planned_datapoint in planned_report.datapoints.values():
+                existing = planned_datapoint.existing
+                if existing is not None and existing.value == planned_datapoint.value:
+                    continue
+                changes.append(
+                    DatapointChange(
+                        date_range_start=time_range[0],
+                        date_range_end=time_range[1],
+                        metric_definition_key=planned_datapoint.metric_definition_key,
+                        context_key=planned_datapoint.context_key,
+                        dimension_identifier_to_member=planned_datapoint.dimension_identifier_to_member,
+                        old_value=existing.value if existing is not None else None,
+                        new_value=planned_datapoint.value,
+                        datapoint_id=existing.id if existing is not None else None,
+                    )
+                )
+        return changes
+
+    def apply(self, session: Session) -> None:
+        """Saves all planned changes to the database in a single transaction."""
+        start = time.perf_counter()
+        new_reports = [
+            planned_report.report
+            for planned_report in self._planned_reports.values()
+            if planned_report.is_new
+        ]
+        session.add_all(new_reports)
+        # Assigns ids to the new reports
+        session.flush()
+
+        current_time = datetime.datetime.now(tz=datetime.timezone.utc)
+        new_datapoints = []
+        updated_datapoints = []
+        datapoint_histories = []
+        for planned_report in self._planned_reports.values():
+            report = planned_report.report
+            for planned_datapoint in planned_report.datapoints.values():
+                existing = planned_datapoint.existing
+                if existing is None:
+                    new_datapoints.append(
+                        {
+                            "value": planned_datapoint.value,
+                            "report_id": report.id,
+                            "metric_definition_key": planned_datapoint.metric_definition_key,
+                            "context_key": planned_datapoint.context_key,
+                            "value_type": planned_datapoint.value_type,
+                            "start_date": report.date_range_start,
+                            "end_date": report.date_range_end,
+                            "dimension_identifier_to_member": planned_datapoint.dimension_identifier_to_member,
+                        }
+                    )
+                elif existing.value != planned_datapoint.value:
+                    updated_datapoints.append(
+                        {"id": existing.id, "value": planned_datapoint.value}
+                    )
+                    datapoint_histories.append(
+                        {
+                            "datapoint_id": existing.id,
+                            "user_account_id": self.user_account.id,
+                            "timestamp": current_time,
+                            "old_value": existing.value,
+                            "new_value": planned_datapoint.value,
+                        }
+                    )
+
+            if planned_report.is_modified:
+                ReportInterface.set_report_metadata(
+                    report=report,
+                    editor_id=self.user_account.id,
+                    status=schema.ReportStatus.DRAFT.value,
+                )
+
+        session.bulk_insert_mappings(schema.Datapoint, new_datapoints)
+        session.bulk_update_mappings(schema.Datapoint, updated_datapoints)
+        session.bulk_insert_mappings(schema.DatapointHistory, datapoint_histories)
+        session.commit()
+        self.timings.apply_seconds = time.perf_counter() - start
+        logging.info(
+            "Bulk upload for agency %d: created %d reports and %d datapoints, "
+            "updated %d datapoints",
+            self.agency_id,
+            len(new_reports),
+            len(new_datapoints),
+            len(updated_datapoints),
+        )
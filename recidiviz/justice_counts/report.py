@@ -87,6 +87,20 @@ class ReportInterface:
         editor_id: int,
         status: Optional[str] = None,
     ) -> schema.Report:
+        ReportInterface.set_report_metadata(
+            report=report, editor_id=editor_id, status=status
+        )
+        session.commit()
+        return report
+
+    @staticmethod
+    def set_report_metadata(
+        report: schema.Report,
+        editor_id: int,
+        status: Optional[str] = None,
+    ) -> None:
+        """Updates the report's status and last modified info in place, without
+        committing."""
         if status and report.status.value != status:
             report.status = schema.ReportStatus[status]
 
@@ -100,9 +114,6 @@ class ReportInterface:
 
         report.last_modified_at = datetime.datetime.now(tz=datetime.timezone.utc)
 
-        session.commit()
-        return report
-
     @staticmethod
     def _get_report_instance(
         report_type: str,
@@ -26,14 +26,16 @@ dataset and an ordered list of possible values for each dimension. With the mani
 the data point with a given set of dimensions resides in the array.
 """
 
+import array
 import gzip
 import io
 import json
 import logging
 from concurrent import futures
-from typing import Any, Callable, Dict, List, Sequence, Set, Tuple, Union
+from typing import Any, Dict, List, Sequence, Tuple, Union
 
 import attr
+import numpy
 from google.cloud import bigquery, storage
 
 from recidiviz.big_query.big_query_client import BigQueryClient
@@ -166,27 +168,19 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         dimension_keys = export_view.dimensions
         value_keys = sorted(list(set(all_keys) - set(dimension_keys)))
 
-        # Look at all records to identify full range of values for each dimension
-        dimension_values_by_key: Dict[str, Set[str]] = _initialize_dimension_manifest(
-            dimension_keys
-        )
-        assemble_manifest_fn = _gen_assemble_manifest(dimension_values_by_key)
+        # Build the dimension manifest and the compact matrix in a single pass over the
+        # query results
+        matrix_builder = _CompactMatrixBuilder(dimension_keys, value_keys)
         self.bq_client.paged_read_and_process(
-            query_job, QUERY_PAGE_SIZE, assemble_manifest_fn
+            query_job, QUERY_PAGE_SIZE, matrix_builder.add_rows
         )
         logging.info(
-            "Produced dictionary-based manifest for view: %s", export_view.view_id
-        )
-        logging.debug(
-            "Dictionary-based manifest for view %s: %s",
-            export_view.view_id,
-            dimension_values_by_key,
+            "Finished paged read and process for view: %s", export_view.view_id
         )
 
-        # Transform dimension ranges into list of tuples first ordered by dimension key and internally by values
-        dimension_manifest: List[
-            Tuple[str, List[str]]
-        ] = transform_manifest_to_order_enforced_form(dimension_values_by_key)
+        # Order the manifest by dimension key and internally by values, and remap the
+        # dimension indexes in the matrix to match
+        dimension_manifest, data_values = matrix_builder.build()
         logging.info(
             "Produced ordered dimension manifest for view: %s", export_view.view_id
         )
@@ -196,22 +190,6 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
             dimension_manifest,
         )
 
-        # Allocate an array with nested arrays for each dimension and value key
-        data_values: List[List[Any]] = [
-            [] for _ in range(len(dimension_keys) + len(value_keys))
-        ]
-
-        # For each data point, set its numeric values in the spot determined by its dimensional combination
-        place_value_in_matrix_fn = _gen_place_in_compact_matrix(
-            data_values, value_keys, dimension_manifest
-        )
-        self.bq_client.paged_read_and_process(
-            query_job, QUERY_PAGE_SIZE, place_value_in_matrix_fn
-        )
-        logging.info(
-            "Finished paged read and process for view: %s", export_view.view_id
-        )
-
         # Return the array and the dimensional manifest
         return OptimizedMetricRepresentation(
             value_matrix=data_values,
@@ -306,117 +284,77 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         return out.getvalue()
 
 
-def _initialize_dimension_manifest(
-    dimension_keys: Tuple[str, ...]
-) -> Dict[str, Set[str]]:
-    """Initializes an empty dictionary-based dimension manifest.
-
-    Each of the given keys will be put in the dictionary with an empty set as its value.
-    """
-    dimension_values_by_key: Dict[str, Set[str]] = {}
-
-    for key in dimension_keys:
-        dimension_values_by_key[key.lower()] = set()
-
-    return dimension_values_by_key
-
+class _CompactMatrixBuilder:
+    """Builds the dimension manifest and compact value matrix for a dataset in a
+    single pass over its rows.
 
-def _gen_assemble_manifest(
-    dimension_values_by_key: Dict[str, Set[str]]
-) -> Callable[[List[bigquery.table.Row]], None]:
-    """Generates and returns a function which will take a given result set row from BigQuery and update the given
-    mapping of dimension keys to sets of possible values."""
+    As rows are added, each distinct normalized value for a dimension is assigned an
+    index in the order it is first seen, via a dictionary lookup. Those indexes are
+    stored in compact integer arrays and the data values in one list per value key.
+    Once all rows have been added, build() sorts the values for each dimension and
+    remaps the stored indexes to positions in the sorted manifest.
 
-    def _assemble_by_row(rows: List[bigquery.table.Row]) -> None:
-        for row in rows:
-            add_to_dimension_manifest(dict(row), dimension_values_by_key)
-
-    return _assemble_by_row
-
-
-def add_to_dimension_manifest(
-    data_point: Dict[str, Any], dimension_values_by_key: Dict[str, Set[str]]
-) -> Dict[str, Set[str]]:
-    """Updates the given dictionary-based dimension manifest with the dimensional contents of the given data point,
-    i.e. ensures that any new values for any dimensions in the data point are included in the manifest."""
-    for key in dimension_values_by_key.keys():
-        dimension_value = data_point[key]
-        normalized_value = _normalize_dimension_value(dimension_value)
-        dimension_values_by_key[key].add(normalized_value)
-
-    return dimension_values_by_key
-
-
-def transform_manifest_to_order_enforced_form(
-    dimension_values_by_key: Dict[str, Set[str]]
-) -> List[Tuple[str, List[str]]]:
-    """Transforms the dictionary version of the dimension manifest into list-based one which enforces ordering for
-    both dimension keys and dimension values per key."""
-    dimension_manifest: List[Tuple[str, List[str]]] = []
-    for dimension_key in sorted(dimension_values_by_key.keys()):
-        sorted_values = sorted(dimension_values_by_key[dimension_key])
-        dimension_manifest.append((dimension_key, sorted_values))
-
-    return dimension_manifest
-
-
-def get_row_values(data_point: Dict[str, Any], value_keys: List[str]) -> List[Any]:
-    """Returns the actual values in the data point, i.e. the values that are not dimensions."""
-    return [data_point.get(vk, DEFAULT_DATA_VALUE) for vk in value_keys]
+    The resulting compact matrix has one array per dimension key followed by one
+    array per value key, with dimension keys in alphabetical order. Each array has one
+    entry per row: a row's entry in a dimension array is the index of its value for
+    that dimension in the dimension manifest, and its entry in a value array is that
+    value itself.
+    """
 
+    def __init__(self, dimension_keys: Sequence[str], value_keys: List[str]) -> None:
+        self._dimension_keys: List[str] = sorted(
+            {key.lower() for key in dimension_keys}
+        )
+        self._value_keys = value_keys
+        self._value_indexes: List[Dict[str, int]] = [{} for _ in self._dimension_keys]
+        self._dimension_columns: List[array.array] = [
+            array.array("q") for _ in self._dimension_keys
+        ]
+        self._value_columns: List[List[Any]] = [[] for _ in value_keys]
 
-def _gen_place_in_compact_matrix(
-    data_values: List[List[Any]],
-    value_keys: List[str],
-    dimension_manifest: List[Tuple[str, List[str]]],
-) -> Callable[[List[bigquery.table.Row]], None]:
-    def _place_by_row(rows: List[bigquery.table.Row]) -> None:
+    def add_rows(self, rows: List[bigquery.table.Row]) -> None:
+        dimensions = list(
+            zip(self._dimension_keys, self._value_indexes, self._dimension_columns)
+        )
+        values = list(zip(self._value_keys, self._value_columns))
         for row in rows:
-            data_point = dict(row)
-            place_in_compact_matrix(
-                data_point, data_values, value_keys, dimension_manifest
+            for key, value_indexes, column in dimensions:
+                normalized_value = _normalize_dimension_value(row[key])
+                value_index = value_indexes.get(normalized_value)
+                if value_index is None:
+                    value_index = len(value_indexes)
+                    value_indexes[normalized_value] = value_index
+                column.append(value_index)
+            for key, value_column in values:
+                value_column.append(row.get(key, DEFAULT_DATA_VALUE))
+
+    def build(self) -> Tuple[List[Tuple[str, List[str]]], List[List[Any]]]:
+        """Returns the ordered dimension manifest and the value matrix for all rows
+        added so far."""
+        dimension_manifest: List[Tuple[str, List[str]]] = []
+        data_values: List[List[Any]] = []
+        for key, value_indexes, column in zip(
+            self._dimension_keys, self._value_indexes, self._dimension_columns
+        ):
+            sorted_values = sorted(value_indexes)
+            dimension_manifest.append((key, sorted_values))
+
+            # Maps the first-seen index of each value to its index in sorted order
+            sorted_index_by_seen_index = numpy.empty(
+                len(sorted_values), dtype=numpy.int64
+            )
+            for sorted_index, value in enumerate(sorted_values):
+                sorted_index_by_seen_index[value_indexes[value]] = sorted_index
+            data_values.append(
+                sorted_index_by_seen_index[
+                    numpy.frombuffer(column, dtype=numpy.int64)
+                ].tolist()
+                if column
+                else []
             )
 
-    return _place_by_row
-
-
-def place_in_compact_matrix(
-    data_point: Dict[str, Any],
-    data_values: List[List[Any]],
-    value_keys: List[str],
-    dimension_manifest: List[Tuple[str, List[str]]],
-) -> None:
-    """Places the given data point within the compact matrix representation of the dataset.
-
-    The compact matrix is composed of an array of arrays: one for each dimension key and for each value key. They are
-    ordered in alphabetical order of each dimension key and then in alphabetical order of each value key. Each
-    internal array should be the same length: for each non-empty data point in the dataset, there will be a value
-    in each array at the same index. A data point's value in a given dimensional array will be the index of that
-    data point's value for the dimension within the dimension manifest. Its value in a given value array will simply
-    be that particular value.
-    """
-    for i, manifest_kv in enumerate(dimension_manifest):
-        dimension_key = manifest_kv[0].lower()
-        dimension_values = manifest_kv[1]
-
-        dimension_value = data_point.get(dimension_key, None)
-        normalized_value = _normalize_dimension_value(dimension_value)
-
-        try:
-            value_index = dimension_values.index(normalized_value)
-        except ValueError as e:
-            raise KeyError(
-                f"Dimension of [{dimension_key}: {dimension_value}] not found in dimension manifest: "
-                f"[{dimension_manifest}]. This indicates that either the manifest was not constructed from "
-                "a dataset containing the given data point or a bug in the optimized view exporter. "
-                f"Data point: {data_point}"
-            ) from e
-
-        data_values[i].append(value_index)
-
-    row_values = get_row_values(data_point, value_keys)
-    for i, value in enumerate(row_values):
-        data_values[len(dimension_manifest) + i].append(value)
+        data_values.extend(self._value_columns)
+        return dimension_manifest, data_values
 
 
 def _normalize_dimension_value(dimension_value: Any) -> str:
@@ -61,6 +61,7 @@ from recidiviz.persistence.entity_matching.state.state_ingested_tree_merger impo
 )
 from recidiviz.persistence.entity_matching.state.state_matching_utils import (
     EntityFieldType,
+    EntityTreeMatchIndex,
     add_child_to_entity,
     convert_to_placeholder,
     db_id_or_object_id,
@@ -118,6 +119,10 @@ class StateEntityMatcher(BaseEntityMatcher):
         # their external ids.
         self.db_person_cache: Dict[str, List[EntityTree]] = defaultdict(list)
 
+        # Indexes over the lists of DB trees currently being matched against in
+        # _match_entity_trees(), keyed by the id() of the list.
+        self.db_tree_match_indexes: Dict[int, EntityTreeMatchIndex] = {}
+
         # Set of class types in the ingested objects that are not placeholders
         self.non_placeholder_ingest_types: Set[Type[DatabaseEntity]] = set()
 
@@ -563,28 +568,36 @@ class StateEntityMatcher(BaseEntityMatcher):
         individual_match_results: List[IndividualMatchResult] = []
         matched_entities_by_db_id: Dict[int, List[DatabaseEntity]] = {}
         error_count = 0
-        for ingested_entity_tree in ingested_entity_trees:
-            try:
-                match_result = self._match_entity_tree(
-                    ingested_entity_tree=ingested_entity_tree,
-                    db_entity_trees=db_entity_trees,
-                    matched_entities_by_db_ids=matched_entities_by_db_id,
-                    root_entity_cls=root_entity_cls,
-                )
-                individual_match_results.append(match_result)
-                error_count += match_result.error_count
-            except EntityMatchingError as e:
-                if isinstance(ingested_entity_tree.entity, root_entity_cls):
-                    ingested_entity = ingested_entity_tree.entity
-                    logging.exception(
-                        "Found error while matching ingested entity %s with root entity class %s.",
-                        e.entity_name,
-                        ingested_entity.get_entity_name(),
+        match_index = EntityTreeMatchIndex(db_entity_trees)
+        self.db_tree_match_indexes[id(db_entity_trees)] = match_index
+        try:
+            for ingested_entity_tree in ingested_entity_trees:
+                try:
+                    match_result = self._match_entity_tree(
+                        ingested_entity_tree=ingested_entity_tree,
+                        db_entity_trees=db_entity_trees,
+                        matched_entities_by_db_ids=matched_entities_by_db_id,
+                        root_entity_cls=root_entity_cls,
                     )
-                    increment_error(e.entity_name)
-                    error_count += 1
-                else:
-                    raise e
+                    individual_match_results.append(match_result)
+                    error_count += match_result.error_count
+                    # Merging may have changed the fields we index DB entities on
+                    for merged_entity_tree in match_result.merged_entity_trees:
+                        match_index.update_entity(merged_entity_tree.entity)
+                except EntityMatchingError as e:
+                    if isinstance(ingested_entity_tree.entity, root_entity_cls):
+                        ingested_entity = ingested_entity_tree.entity
+                        logging.exception(
+                            "Found error while matching ingested entity %s with root entity class %s.",
+                            e.entity_name,
+                            ingested_entity.get_entity_name(),
+                        )
+                        increment_error(e.entity_name)
+                        error_count += 1
+                    else:
+                        raise e
+        finally:
+            del self.db_tree_match_indexes[id(db_entity_trees)]
 
         # Keep track of even unmatched DB entities, as the parent of this entity
         # layer must know about all of its children (even the unmatched ones).
@@ -1119,6 +1132,10 @@ class StateEntityMatcher(BaseEntityMatcher):
         db_match_candidates = db_entity_trees
         if isinstance(ingested_entity_tree.entity, schema.StatePerson):
             db_match_candidates = self.get_cached_matches(ingested_entity_tree.entity)
+        elif id(db_entity_trees) in self.db_tree_match_indexes:
+            db_match_candidates = self.db_tree_match_indexes[
+                id(db_entity_trees)
+            ].get_candidates(ingested_entity_tree)
 
         # Entities that can have multiple external IDs need special casing to
         # handle the fact that multiple DB entities could match the provided
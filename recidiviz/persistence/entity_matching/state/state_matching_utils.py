@@ -17,7 +17,7 @@
 """State specific utils for entity matching. Utils in this file are generic to any DatabaseEntity."""
 import logging
 from enum import Enum
-from typing import List, Optional, Sequence, Set, Type, cast
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Type, cast
 
 from recidiviz.common.common_utils import check_all_objs_have_type
 from recidiviz.common.constants.state import enum_canonical_strings
@@ -40,6 +40,16 @@ from recidiviz.persistence.entity.entity_utils import (
 from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
 from recidiviz.persistence.errors import EntityMatchingError
 
+# Entity classes that is_match() compares using all flat fields when neither entity
+# has an external id.
+_FLAT_FIELD_MATCH_CLASSES = (
+    schema.StateSupervisionViolationResponseDecisionEntry,
+    schema.StateSupervisionViolatedConditionEntry,
+    schema.StateSupervisionViolationTypeEntry,
+    schema.StateSupervisionCaseTypeEntry,
+    schema.StateTaskDeadline,
+)
+
 
 def is_match(
     ingested_entity: EntityTree,
@@ -120,16 +130,7 @@ def _is_match(
         db_entity = cast(schema.StatePersonEthnicity, db_entity)
         return ingested_entity.ethnicity == db_entity.ethnicity
 
-    if isinstance(
-        ingested_entity,
-        (
-            schema.StateSupervisionViolationResponseDecisionEntry,
-            schema.StateSupervisionViolatedConditionEntry,
-            schema.StateSupervisionViolationTypeEntry,
-            schema.StateSupervisionCaseTypeEntry,
-            schema.StateTaskDeadline,
-        ),
-    ):
+    if isinstance(ingested_entity, _FLAT_FIELD_MATCH_CLASSES):
         return _base_entity_match(
             ingested_entity, db_entity, skip_fields=set(), field_index=field_index
         )
@@ -145,6 +146,86 @@ def _is_match(
     return ingested_entity.get_external_id() == db_entity.get_external_id()
 
 
+def _match_index_key(entity: DatabaseEntity) -> Optional[Hashable]:
+    """Returns a key such that is_match() can only return True for two entities of
+    the same class if they have the same key. Returns None if there is no such key for
+    this entity (e.g. for placeholders), in which case it must be compared against
+    every candidate.
+    """
+    if isinstance(entity, (schema.StatePerson, _FLAT_FIELD_MATCH_CLASSES)):
+        return None
+
+    cls = entity.__class__
+    state_code = entity.get_field("state_code")
+    if isinstance(entity, schema.StatePersonExternalId):
+        return cls, state_code, entity.external_id, entity.id_type
+    if isinstance(entity, schema.StatePersonAlias):
+        return cls, state_code, entity.full_name
+    if isinstance(entity, schema.StatePersonRace):
+        return cls, state_code, entity.race
+    if isinstance(entity, schema.StatePersonEthnicity):
+        return cls, state_code, entity.ethnicity
+
+    external_id = entity.get_external_id()
+    if external_id is None:
+        return None
+    return cls, state_code, external_id
+
+
+class EntityTreeMatchIndex:
+    """Index over a list of DB EntityTrees of a single class that allows us to find
+    the candidates that might match an ingested entity via is_match() without
+    comparing against every DB entity. For most classes, entities are indexed by
+    external id. Lookups for ingested entities that can't be indexed (e.g.
+    placeholders) return all DB trees.
+
+    If the fields that determine the key of a DB entity change (e.g. when ingested
+    information is merged onto it), update_entity() must be called so the entity can
+    be re-indexed.
+    """
+
+    def __init__(self, db_entity_trees: List[EntityTree]) -> None:
+        self.db_entity_trees = db_entity_trees
+        self._tree_position_by_entity_id: Dict[int, int] = {}
+        self._key_by_tree_position: Dict[int, Optional[Hashable]] = {}
+        self._tree_positions_by_key: Dict[Hashable, Set[int]] = {}
+        for position, tree in enumerate(db_entity_trees):
+            self._tree_position_by_entity_id[id(tree.entity)] = position
+            self._add(position, _match_index_key(tree.entity))
+
+    def _add(self, position: int, key: Optional[Hashable]) -> None:
+        self._key_by_tree_position[position] = key
+        if key is not None:
+            self._tree_positions_by_key.setdefault(key, set()).add(position)
+
+    def update_entity(self, entity: DatabaseEntity) -> None:
+        """Re-indexes the given DB entity. Does nothing if the entity is not one of
+        the indexed DB entities.
+        """
+        position = self._tree_position_by_entity_id.get(id(entity))
+        if position is None:
+            return
+        new_key = _match_index_key(entity)
+        old_key = self._key_by_tree_position[position]
+        if new_key == old_key:
+            return
+        if old_key is not None:
+            self._tree_positions_by_key[old_key].discard(position)
+        self._add(position, new_key)
+
+    def get_candidates(self, ingested_entity_tree: EntityTree) -> List[EntityTree]:
+        """Returns the DB trees that might match the provided ingested tree, in the
+        same relative order as the original list of DB trees.
+        """
+        key = _match_index_key(ingested_entity_tree.entity)
+        if key is None:
+            return self.db_entity_trees
+        return [
+            self.db_entity_trees[position]
+            for position in sorted(self._tree_positions_by_key.get(key, ()))
+        ]
+
+
 def nonnull_fields_entity_match(
     ingested_entity: EntityTree,
     db_entity: EntityTree,
@@ -196,10 +196,13 @@ class TestApplicationDataImportRoutes(TestCase):
             )
             mock_redis.assert_called()
             mock_metric_cache.assert_called_with(
-                state_code=StateCode.US_XX, metric_fetcher=ANY, redis=ANY
+                state_code=StateCode.US_XX,
+                metric_fetcher=ANY,
+                redis=ANY,
+                local_cache=ANY,
             )
-            mock_metric_cache.return_value.reset_cache.assert_called_with(
-                ALL_METRICS_BY_NAME["LibertyToPrisonTransitionsCount"]
+            mock_metric_cache.return_value.warm_up.assert_called_with(
+                [ALL_METRICS_BY_NAME["LibertyToPrisonTransitionsCount"]]
             )
 
             self.assertEqual(HTTPStatus.OK, response.status_code)
@@ -529,6 +529,37 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.mock_client.create_dataset.assert_called()
         self.mock_client.load_table_from_uri.assert_called()
 
+    def test_load_into_table_from_cloud_storage_async_parquet(self) -> None:
+        self.bq_client.load_table_from_cloud_storage_async(
+            destination_dataset_ref=self.mock_dataset_ref,
+            destination_table_id=self.mock_table_id,
+            destination_table_schema=[
+                SchemaField("my_column", "STRING", "NULLABLE", None, ())
+            ],
+            source_uris=["gs://bucket/export-uri.parquet"],
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            source_format=bigquery.SourceFormat.PARQUET,
+        )
+
+        self.mock_client.load_table_from_uri.assert_called_once()
+        job_config = self.mock_client.load_table_from_uri.call_args.kwargs["job_config"]
+        self.assertEqual(bigquery.SourceFormat.PARQUET, job_config.source_format)
+        self.assertIsNone(job_config.allow_quoted_newlines)
+        self.assertIsNone(job_config.skip_leading_rows)
+
+        with self.assertRaisesRegex(ValueError, r"^Cannot skip leading rows"):
+            self.bq_client.load_table_from_cloud_storage_async(
+                destination_dataset_ref=self.mock_dataset_ref,
+                destination_table_id=self.mock_table_id,
+                destination_table_schema=[
+                    SchemaField("my_column", "STRING", "NULLABLE", None, ())
+                ],
+                source_uris=["gs://bucket/export-uri.parquet"],
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                skip_leading_rows=1,
+                source_format=bigquery.SourceFormat.PARQUET,
+            )
+
     def test_stream_into_table(self) -> None:
         self.mock_client.insert_rows.return_value = None
 
@@ -1216,8 +1247,7 @@ class BigQueryClientImplTest(unittest.TestCase):
             {"supervision_type": 0, "revocations": 1, "district": 2},
         )
 
-        # First call returns a single row, second call returns nothing
-        mock_query_job.result.side_effect = [[first_row], []]
+        mock_query_job.result.return_value.pages = [[first_row]]
 
         processed_results = []
 
@@ -1228,12 +1258,7 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.bq_client.paged_read_and_process(mock_query_job, 1, _process_fn)
 
         self.assertEqual([dict(first_row)], processed_results)
-        mock_query_job.result.assert_has_calls(
-            [
-                call(max_results=1, start_index=0),
-                call(max_results=1, start_index=1),
-            ]
-        )
+        mock_query_job.result.assert_called_once_with(page_size=1)
 
     @mock.patch("google.cloud.bigquery.QueryJob")
     def test_paged_read_single_page_multiple_rows(
@@ -1248,8 +1273,7 @@ class BigQueryClientImplTest(unittest.TestCase):
             {"supervision_type": 0, "revocations": 1, "district": 2},
         )
 
-        # First call returns a single row, second call returns nothing
-        mock_query_job.result.side_effect = [[first_row, second_row], []]
+        mock_query_job.result.return_value.pages = [[first_row, second_row]]
 
         processed_results = []
 
@@ -1260,12 +1284,7 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.bq_client.paged_read_and_process(mock_query_job, 10, _process_fn)
 
         self.assertEqual([dict(first_row), dict(second_row)], processed_results)
-        mock_query_job.result.assert_has_calls(
-            [
-                call(max_results=10, start_index=0),
-                call(max_results=10, start_index=2),
-            ]
-        )
+        mock_query_job.result.assert_called_once_with(page_size=10)
 
     @mock.patch("google.cloud.bigquery.QueryJob")
     def test_paged_read_multiple_pages(self, mock_query_job: mock.MagicMock) -> None:
@@ -1287,8 +1306,7 @@ class BigQueryClientImplTest(unittest.TestCase):
             {"supervision_type": 0, "revocations": 1, "district": 2},
         )
 
-        # First two calls returns results, third call returns nothing
-        mock_query_job.result.side_effect = [[p1_r1, p1_r2], [p2_r1, p2_r2], []]
+        mock_query_job.result.return_value.pages = [[p1_r1, p1_r2], [p2_r1, p2_r2]]
 
         processed_results = []
 
@@ -1301,14 +1319,28 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.assertEqual(
             [dict(p1_r1), dict(p1_r2), dict(p2_r1), dict(p2_r2)], processed_results
         )
-        mock_query_job.result.assert_has_calls(
-            [
-                call(max_results=2, start_index=0),
-                call(max_results=2, start_index=2),
-                call(max_results=2, start_index=4),
-            ]
+        mock_query_job.result.assert_called_once_with(page_size=2)
+
+    @mock.patch("google.cloud.bigquery.QueryJob")
+    def test_stream_query_result_pages_error(
+        self, mock_query_job: mock.MagicMock
+    ) -> None:
+        row = bigquery.table.Row(
+            ["parole", 15, "10N"],
+            {"supervision_type": 0, "revocations": 1, "district": 2},
         )
 
+        def _pages() -> Iterator[List[bigquery.table.Row]]:
+            yield [row]
+            raise exceptions.InternalServerError("Page download failed")
+
+        mock_query_job.result.return_value.pages = _pages()
+
+        pages = self.bq_client.stream_query_result_pages(mock_query_job, 1)
+        self.assertEqual([row], next(pages))
+        with self.assertRaises(exceptions.InternalServerError):
+            next(pages)
+
     @mock.patch("recidiviz.big_query.big_query_client.DataTransferServiceClient")
     @mock.patch(
         "recidiviz.big_query.big_query_client.CROSS_REGION_COPY_STATUS_ATTEMPT_SLEEP_TIME_SEC",
@@ -22,7 +22,7 @@ import re
 import threading
 import time
 import unittest
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from unittest.mock import patch
 
 from recidiviz.big_query.big_query_address import BigQueryAddress
@@ -360,6 +360,95 @@ The following views have less restrictive projects_to_deploy than their parents:
         with self.assertRaises(TestDagWalkException):
             _ = walker.process_dag(process_throws_after_root)
 
+    def _process_dag_single_worker_order(
+        self,
+        walker: BigQueryViewDagWalker,
+        view_runtime_estimates_sec: Optional[Dict[BigQueryAddress, float]] = None,
+    ) -> List[str]:
+        processed_order: List[str] = []
+
+        def process_record_order(
+            view: BigQueryView, _parent_results: Dict[BigQueryView, None]
+        ) -> None:
+            processed_order.append(view.view_id)
+
+        with patch(
+            "recidiviz.big_query.big_query_view_dag_walker.DAG_WALKER_MAX_WORKERS", 1
+        ):
+            result = walker.process_dag(
+                process_record_order,
+                prioritize_critical_path=True,
+                view_runtime_estimates_sec=view_runtime_estimates_sec,
+            )
+        self.assertEqual(len(walker.views), len(result))
+        return processed_order
+
+    def test_dag_prioritize_critical_path(self) -> None:
+        isolated_view = SimpleBigQueryViewBuilder(
+            dataset_id="dataset_7",
+            view_id="table_7",
+            description="table_7 description",
+            view_query_template="SELECT * FROM `{project_id}.source_dataset.source_table`",
+        ).build()
+        walker = BigQueryViewDagWalker(
+            [isolated_view, *self.diamond_shaped_dag_views_list]
+        )
+
+        # The isolated view has the shortest downstream path so it is processed last
+        processed_order = self._process_dag_single_worker_order(walker)
+        self.assertEqual("table_7", processed_order[-1])
+        self.assertEqual(["table_3"], processed_order[2:3])
+
+        # If we expect the isolated view to be slower than the longest chain of diamond
+        # views, it is processed first
+        processed_order = self._process_dag_single_worker_order(
+            walker,
+            view_runtime_estimates_sec={
+                isolated_view.address: 1000.0,
+                **{v.address: 1.0 for v in self.diamond_shaped_dag_views_list},
+            },
+        )
+        self.assertEqual("table_7", processed_order[0])
+
+        # Views without an estimate are weighted by the mean of the known estimates,
+        # which here makes the diamond chains longer than the isolated view
+        processed_order = self._process_dag_single_worker_order(
+            walker,
+            view_runtime_estimates_sec={
+                isolated_view.address: 1000.0,
+                self.diamond_shaped_dag_views_list[0].address: 1.0,
+            },
+        )
+        self.assertCountEqual(["table_1", "table_2"], processed_order[:2])
+
+    def test_dag_prioritize_critical_path_empty(self) -> None:
+        walker = BigQueryViewDagWalker([])
+        self.assertEqual([], self._process_dag_single_worker_order(walker))
+
+    def test_get_perf_stats(self) -> None:
+        walker = BigQueryViewDagWalker(self.diamond_shaped_dag_views_list)
+        view_runtimes_sec = {
+            v.address: float(i)
+            for i, v in enumerate(self.diamond_shaped_dag_views_list, start=1)
+        }
+
+        stats = walker.get_perf_stats(
+            view_runtimes_sec=view_runtimes_sec, total_runtime_sec=20.0
+        )
+
+        self.assertEqual(
+            [
+                BigQueryAddress(dataset_id="dataset_2", table_id="table_2"),
+                BigQueryAddress(dataset_id="dataset_3", table_id="table_3"),
+                BigQueryAddress(dataset_id="dataset_5", table_id="table_5"),
+                BigQueryAddress(dataset_id="dataset_6", table_id="table_6"),
+            ],
+            stats.critical_path,
+        )
+        self.assertEqual(2.0 + 3.0 + 5.0 + 6.0, stats.critical_path_runtime_sec)
+        self.assertEqual({0: 2, 1: 1, 2: 2, 3: 1}, stats.num_views_by_level)
+        self.assertEqual(20.0, stats.total_runtime_sec)
+
     def test_views_use_materialized_if_present(self) -> None:
         """Checks that each view is using the materialized version of a parent view, if
         one exists."""
@@ -15,7 +15,17 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """A fake implementation of BigQueryClient for use in tests."""
-from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import pandas as pd
 import sqlalchemy
@@ -25,6 +35,7 @@ from pandas import DataFrame
 
 from recidiviz.big_query.big_query_client import (
     DEFAULT_CROSS_REGION_COPY_TIMEOUT_SEC,
+    DEFAULT_MAX_PREFETCHED_PAGES,
     BigQueryClient,
 )
 from recidiviz.big_query.big_query_view import BigQueryView
@@ -169,6 +180,7 @@ class FakeBigQueryClient(BigQueryClient):
         destination_table_schema: List[bigquery.SchemaField],
         write_disposition: bigquery.WriteDisposition,
         skip_leading_rows: int = 0,
+        source_format: str = bigquery.SourceFormat.CSV,
     ) -> bigquery.job.LoadJob:
         raise ValueError("Must be implemented for use in tests.")
 
@@ -212,7 +224,9 @@ class FakeBigQueryClient(BigQueryClient):
         self,
         *,
         query_str: str,
-        query_parameters: List[bigquery.ScalarQueryParameter] = None,
+        query_parameters: Sequence[
+            Union[bigquery.ScalarQueryParameter, bigquery.ArrayQueryParameter]
+        ] = None,
         use_query_cache: bool,
     ) -> bigquery.QueryJob:
         def run_query_fn() -> DataFrame:
@@ -228,6 +242,14 @@ class FakeBigQueryClient(BigQueryClient):
     ) -> None:
         raise ValueError("Must be implemented for use in tests.")
 
+    def stream_query_result_pages(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: int,
+        max_prefetched_pages: int = DEFAULT_MAX_PREFETCHED_PAGES,
+    ) -> Iterator[List[bigquery.table.Row]]:
+        raise ValueError("Must be implemented for use in tests.")
+
     def copy_view(
         self,
         view: BigQueryView,
@@ -0,0 +1,330 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for view_fingerprint_index.py"""
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud import bigquery
+
+from recidiviz.big_query.big_query_address import BigQueryAddress
+from recidiviz.big_query.big_query_view import SimpleBigQueryViewBuilder
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.big_query.view_fingerprint_index import (
+    BigQueryTableFingerprint,
+    BigQueryViewFingerprintIndex,
+)
+
+_PROJECT_ID = "recidiviz-456"
+_SOURCE_TABLE = BigQueryAddress(dataset_id="source_dataset", table_id="source_table")
+
+
+class BigQueryViewFingerprintIndexTest(unittest.TestCase):
+    """Tests for BigQueryViewFingerprintIndex"""
+
+    def setUp(self) -> None:
+        self.project_id_patcher = mock.patch("recidiviz.utils.metadata.project_id")
+        self.project_id_patcher.start().return_value = _PROJECT_ID
+
+        # 1 -> 2 -> 3, where 1 reads from a source table
+        self.views = [
+            SimpleBigQueryViewBuilder(
+                dataset_id="dataset_1",
+                view_id="table_1",
+                description="table_1 description",
+                view_query_template="SELECT * FROM `{project_id}.source_dataset.source_table`",
+            ).build(),
+            SimpleBigQueryViewBuilder(
+                dataset_id="dataset_2",
+                view_id="table_2",
+                description="table_2 description",
+                view_query_template="SELECT * FROM `{project_id}.dataset_1.table_1`",
+                clustering_fields=["col"],
+            ).build(),
+            SimpleBigQueryViewBuilder(
+                dataset_id="dataset_3",
+                view_id="table_3",
+                description="table_3 description",
+                view_query_template="SELECT * FROM `{project_id}.dataset_2.table_2`",
+            ).build(),
+        ]
+        self.dag_walker = BigQueryViewDagWalker(self.views)
+        self.source_table_fingerprint = BigQueryTableFingerprint.for_source_table(
+            _SOURCE_TABLE,
+            [{"column_name": "col", "data_type": "STRING", "is_nullable": "YES"}],
+        )
+        self.fingerprints = {
+            **{v.address: BigQueryTableFingerprint.for_view(v) for v in self.views},
+            _SOURCE_TABLE: self.source_table_fingerprint,
+        }
+        self.deployed_addresses = {v.address for v in self.views}
+
+    def tearDown(self) -> None:
+        self.project_id_patcher.stop()
+
+    def test_fingerprint_row_round_trip(self) -> None:
+        for fingerprint in self.fingerprints.values():
+            self.assertEqual(
+                fingerprint, BigQueryTableFingerprint.from_row(fingerprint.as_row())
+            )
+        self.assertEqual(
+            "col", self.fingerprints[self.views[1].address].clustering_fields
+        )
+
+    def test_fingerprint_for_view_includes_view_definition(self) -> None:
+        def fingerprint(
+            view_query_template: str = "SELECT 1",
+            description: str = "table_1 description",
+            should_materialize: bool = False,
+            materialized_address_override: Optional[BigQueryAddress] = None,
+        ) -> BigQueryTableFingerprint:
+            return BigQueryTableFingerprint.for_view(
+                SimpleBigQueryViewBuilder(
+                    dataset_id="dataset_1",
+                    view_id="table_1",
+                    description=description,
+                    view_query_template=view_query_template,
+                    should_materialize=should_materialize,
+                    materialized_address_override=materialized_address_override,
+                ).build()
+            )
+
+        base_fingerprint = fingerprint()
+        self.assertEqual(base_fingerprint, fingerprint())
+        self.assertNotEqual(
+            base_fingerprint, fingerprint(view_query_template="SELECT 2")
+        )
+        self.assertNotEqual(
+            base_fingerprint, fingerprint(description="new table_1 description")
+        )
+        self.assertNotEqual(base_fingerprint, fingerprint(should_materialize=True))
+        self.assertNotEqual(
+            fingerprint(should_materialize=True),
+            fingerprint(
+                should_materialize=True,
+                materialized_address_override=BigQueryAddress(
+                    dataset_id="dataset_1", table_id="table_1_other_materialized"
+                ),
+            ),
+        )
+
+    def test_get_changed_views_no_changes(self) -> None:
+        self.assertEqual(
+            [],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                self.dag_walker,
+                self.fingerprints,
+                self.fingerprints,
+                self.deployed_addresses,
+            ),
+        )
+
+    def test_get_changed_views_empty_index(self) -> None:
+        self.assertCountEqual(
+            self.views,
+            BigQueryViewFingerprintIndex.get_changed_views(
+                self.dag_walker,
+                {},
+                self.fingerprints,
+                self.deployed_addresses,
+            ),
+        )
+
+    def test_get_changed_views_query_changed(self) -> None:
+        stored_fingerprints = {
+            **self.fingerprints,
+            self.views[1].address: BigQueryTableFingerprint(
+                address=self.views[1].address,
+                view_query_hash="old_hash",
+                clustering_fields="col",
+                schema_hash=None,
+            ),
+        }
+        self.assertEqual(
+            [self.views[1]],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                self.dag_walker,
+                stored_fingerprints,
+                self.fingerprints,
+                self.deployed_addresses,
+            ),
+        )
+
+    def test_get_changed_views_source_table_changed(self) -> None:
+        current_fingerprints = {
+            **self.fingerprints,
+            _SOURCE_TABLE: BigQueryTableFingerprint.for_source_table(
+                _SOURCE_TABLE,
+                [{"column_name": "col", "data_type": "INT64", "is_nullable": "YES"}],
+            ),
+        }
+        self.assertEqual(
+            [self.views[0]],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                self.dag_walker,
+                self.fingerprints,
+                current_fingerprints,
+                self.deployed_addresses,
+            ),
+        )
+
+    def test_get_changed_views_source_table_missing(self) -> None:
+        current_fingerprints = {
+            a: f for a, f in self.fingerprints.items() if a != _SOURCE_TABLE
+        }
+        self.assertEqual(
+            [self.views[0]],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                self.dag_walker,
+                self.fingerprints,
+                current_fingerprints,
+                self.deployed_addresses,
+            ),
+        )
+
+    def test_get_changed_views_view_deleted(self) -> None:
+        # The view was deleted outside of a deploy, but its fingerprint is unchanged
+        self.assertEqual(
+            [self.views[1]],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                self.dag_walker,
+                self.fingerprints,
+                self.fingerprints,
+                self.deployed_addresses - {self.views[1].address},
+            ),
+        )
+
+    def test_get_changed_views_materialized_table_deleted(self) -> None:
+        materialized_view = SimpleBigQueryViewBuilder(
+            dataset_id="dataset_1",
+            view_id="table_1",
+            description="table_1 description",
+            view_query_template="SELECT * FROM `{project_id}.source_dataset.source_table`",
+            should_materialize=True,
+        ).build()
+        assert materialized_view.materialized_address is not None
+        dag_walker = BigQueryViewDagWalker([materialized_view])
+        fingerprints = {
+            materialized_view.address: BigQueryTableFingerprint.for_view(
+                materialized_view
+            ),
+            _SOURCE_TABLE: self.source_table_fingerprint,
+        }
+
+        self.assertEqual(
+            [],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                dag_walker,
+                fingerprints,
+                fingerprints,
+                {materialized_view.address, materialized_view.materialized_address},
+            ),
+        )
+        self.assertEqual(
+            [materialized_view],
+            BigQueryViewFingerprintIndex.get_changed_views(
+                dag_walker, fingerprints, fingerprints, {materialized_view.address}
+            ),
+        )
+
+    def test_get_deployed_addresses(self) -> None:
+        mock_client = mock.MagicMock()
+
+        def fake_list_tables(dataset_id: str) -> List[mock.MagicMock]:
+            if dataset_id == "dataset_3":
+                raise exceptions.NotFound("dataset_3 not found")
+            return [
+                mock.MagicMock(table_id=table_id)
+                for table_id in ("table_1", "table_2", "other_table")
+            ]
+
+        mock_client.list_tables.side_effect = fake_list_tables
+
+        self.assertEqual(
+            {self.views[0].address, self.views[1].address},
+            BigQueryViewFingerprintIndex(mock_client).get_deployed_addresses(
+                self.dag_walker
+            ),
+        )
+        mock_client.list_tables.assert_has_calls(
+            [mock.call("dataset_1"), mock.call("dataset_2"), mock.call("dataset_3")],
+            any_order=True,
+        )
+
+    def test_get_current_fingerprints(self) -> None:
+        mock_client = mock.MagicMock()
+        mock_client.project_id = _PROJECT_ID
+        mock_client.run_query_async.return_value = [
+            {
+                "table_name": "source_table",
+                "column_name": "col",
+                "data_type": "STRING",
+                "is_nullable": "YES",
+            },
+            {
+                "table_name": "other_table",
+                "column_name": "col",
+                "data_type": "STRING",
+                "is_nullable": "YES",
+            },
+        ]
+
+        fingerprints = BigQueryViewFingerprintIndex(
+            mock_client
+        ).get_current_fingerprints(self.dag_walker)
+
+        self.assertEqual(self.fingerprints, fingerprints)
+        mock_client.run_query_async.assert_called_once()
+
+    def test_invalidate_fingerprints(self) -> None:
+        mock_client = mock.MagicMock()
+        mock_client.project_id = _PROJECT_ID
+        index = BigQueryViewFingerprintIndex(mock_client)
+
+        index.invalidate_fingerprints({self.views[1].address, self.views[0].address})
+
+        mock_client.run_query_async.assert_called_once()
+        kwargs = mock_client.run_query_async.call_args.kwargs
+        self.assertTrue(
+            kwargs["query_str"]
+            .strip()
+            .startswith(
+                f"DELETE FROM `{_PROJECT_ID}.view_update_metadata.view_fingerprint_index`"
+            )
+        )
+        self.assertEqual(
+            [
+                bigquery.ArrayQueryParameter(
+                    "addresses", "STRING", ["dataset_1.table_1", "dataset_2.table_2"]
+                )
+            ],
+            kwargs["query_parameters"],
+        )
+        mock_client.run_query_async.return_value.result.assert_called_once()
+        # Other fingerprints are never rewritten
+        mock_client.load_into_table_async.assert_not_called()
+
+    def test_invalidate_fingerprints_no_index_table(self) -> None:
+        mock_client = mock.MagicMock()
+        mock_client.table_exists.return_value = False
+        index = BigQueryViewFingerprintIndex(mock_client)
+
+        index.invalidate_fingerprints({self.views[0].address})
+        index.invalidate_fingerprints(set())
+
+        mock_client.run_query_async.assert_not_called()
@@ -25,12 +25,14 @@ from unittest.mock import MagicMock, call, patch
 
 import flask
 from flask import Flask
-from google.cloud import bigquery
+from google.cloud import bigquery, exceptions
 
 from recidiviz.big_query import view_update_manager
 from recidiviz.big_query.big_query_address import BigQueryAddress
 from recidiviz.big_query.big_query_table_checker import BigQueryTableChecker
 from recidiviz.big_query.big_query_view import BigQueryView, SimpleBigQueryViewBuilder
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.big_query.view_fingerprint_index import BigQueryTableFingerprint
 from recidiviz.big_query.view_update_manager import (
     get_dag_walker_for_views_sub_dag,
     view_update_manager_blueprint,
@@ -86,7 +88,15 @@ class ViewManagerTest(unittest.TestCase):
         )
         self.client_patcher_2.start()
 
+        self.fingerprint_index_patcher = mock.patch(
+            "recidiviz.big_query.view_update_manager.BigQueryViewFingerprintIndex"
+        )
+        self.mock_fingerprint_index = (
+            self.fingerprint_index_patcher.start().return_value
+        )
+
     def tearDown(self) -> None:
+        self.fingerprint_index_patcher.stop()
         self.client_patcher.stop()
         self.client_patcher_2.stop()
         self.metadata_patcher.stop()
@@ -148,6 +158,214 @@ class ViewManagerTest(unittest.TestCase):
         )
         self.mock_client.delete_dataset.assert_not_called()
         self.assertEqual(self.mock_client.delete_table.call_count, 2)
+        self.mock_fingerprint_index.invalidate_fingerprints.assert_not_called()
+
+    def test_create_managed_dataset_and_deploy_views_for_view_builders_invalidates_before_deploy(
+        self,
+    ) -> None:
+        """Test that deploys that set invalidate_fingerprint_index invalidate the
+        fingerprints of the views they update before deploying, so that the index is
+        not left stale if the deploy fails."""
+        self.mock_client.dataset_ref_for_id.return_value = (
+            bigquery.dataset.DatasetReference(_PROJECT_ID, _DATASET_NAME)
+        )
+        self.mock_client.create_or_update_view.side_effect = ValueError("Failed")
+
+        with self.assertRaises(ValueError):
+            view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+                view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+                view_builders_to_update=[
+                    SimpleBigQueryViewBuilder(
+                        dataset_id=_DATASET_NAME,
+                        view_id="my_fake_view",
+                        description="my_fake_view description",
+                        view_query_template="SELECT NULL LIMIT 0",
+                    )
+                ],
+                historically_managed_datasets_to_clean=None,
+                invalidate_fingerprint_index=True,
+            )
+
+        self.mock_fingerprint_index.invalidate_fingerprints.assert_called_once_with(
+            {BigQueryAddress(dataset_id=_DATASET_NAME, table_id="my_fake_view")}
+        )
+
+    def test_create_managed_dataset_and_deploy_views_for_view_builders_region_override_skips_index(
+        self,
+    ) -> None:
+        """Test that a deploy with a region override (e.g. a CloudSQL to BQ refresh)
+        neither reads nor writes the fingerprint index."""
+        # Use the real index, backed by the mock client.
+        self.fingerprint_index_patcher.stop()
+        self.mock_client.dataset_ref_for_id.return_value = (
+            bigquery.dataset.DatasetReference(_PROJECT_ID, _DATASET_NAME)
+        )
+        self.mock_client.project_id = _PROJECT_ID
+
+        view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+            view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+            view_builders_to_update=[
+                SimpleBigQueryViewBuilder(
+                    dataset_id=_DATASET_NAME,
+                    view_id="my_fake_view",
+                    description="my_fake_view description",
+                    view_query_template="SELECT NULL LIMIT 0",
+                )
+            ],
+            historically_managed_datasets_to_clean=None,
+            bq_region_override="us-east1",
+        )
+
+        self.mock_client.create_or_update_view.assert_called_once()
+        self.mock_client.run_query_async.assert_not_called()
+        self.mock_client.load_into_table_async.assert_not_called()
+        self.mock_client.table_exists.assert_not_called()
+
+    def test_create_managed_dataset_and_deploy_views_for_view_builders_invalidate_with_region_override(
+        self,
+    ) -> None:
+        with self.assertRaisesRegex(
+            ValueError, r"^Can only invalidate the view fingerprint index"
+        ):
+            view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+                view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+                view_builders_to_update=[],
+                historically_managed_datasets_to_clean=None,
+                bq_region_override="us-east1",
+                invalidate_fingerprint_index=True,
+            )
+        self.mock_fingerprint_index.invalidate_fingerprints.assert_not_called()
+
+    def test_create_managed_dataset_and_deploy_views_for_view_builders_index_with_overrides(
+        self,
+    ) -> None:
+        """Test that deploys with address or region overrides may not use the
+        fingerprint index, which tracks the views deployed in the default region."""
+        view_builders = [
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME,
+                view_id="my_fake_view",
+                description="my_fake_view description",
+                view_query_template="SELECT NULL LIMIT 0",
+            )
+        ]
+        with self.assertRaisesRegex(
+            ValueError, r"^Can only use the view fingerprint index"
+        ):
+            view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+                view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+                view_builders_to_update=view_builders,
+                historically_managed_datasets_to_clean=None,
+                bq_region_override="us-east1",
+                use_fingerprint_index=True,
+            )
+        with self.assertRaisesRegex(
+            ValueError, r"^Can only use the view fingerprint index"
+        ):
+            view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+                view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+                view_builders_to_update=view_builders,
+                historically_managed_datasets_to_clean=None,
+                address_overrides=address_overrides_for_view_builders(
+                    view_dataset_override_prefix="test_prefix",
+                    view_builders=view_builders,
+                ),
+                use_fingerprint_index=True,
+            )
+        self.mock_client.create_or_update_view.assert_not_called()
+        self.mock_fingerprint_index.load_fingerprints.assert_not_called()
+        self.mock_fingerprint_index.save_fingerprints.assert_not_called()
+
+    def test_create_managed_dataset_and_deploy_views_for_view_builders_fingerprint_index(
+        self,
+    ) -> None:
+        """Test that when use_fingerprint_index is set, only views whose fingerprint
+        has changed since the last deploy are updated, and the index is saved."""
+        # Use the real index, backed by the mock client.
+        self.fingerprint_index_patcher.stop()
+        dataset = bigquery.dataset.DatasetReference(_PROJECT_ID, _DATASET_NAME)
+
+        mock_view_builders = [
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME,
+                view_id=view_id,
+                description=f"{view_id} description",
+                view_query_template="SELECT NULL LIMIT 0",
+            )
+            for view_id in ("my_fake_view", "my_other_fake_view")
+        ]
+        unchanged_view = mock_view_builders[0].build()
+
+        self.mock_client.dataset_ref_for_id.return_value = dataset
+        self.mock_client.project_id = _PROJECT_ID
+        self.mock_client.run_query_async.return_value = [
+            BigQueryTableFingerprint.for_view(unchanged_view).as_row()
+        ]
+        self.mock_client.list_tables.return_value = [
+            mock.MagicMock(table_id=b.view_id) for b in mock_view_builders
+        ]
+
+        view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+            view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+            view_builders_to_update=mock_view_builders,
+            historically_managed_datasets_to_clean=None,
+            use_fingerprint_index=True,
+        )
+
+        self.mock_client.create_or_update_view.assert_called_once_with(
+            mock_view_builders[1].build()
+        )
+        self.mock_client.load_into_table_async.assert_called_once_with(
+            dataset,
+            "view_fingerprint_index",
+            [
+                BigQueryTableFingerprint.for_view(b.build()).as_row()
+                for b in mock_view_builders
+            ],
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
+
+    def test_create_managed_dataset_and_deploy_views_for_view_builders_fingerprint_index_view_deleted(
+        self,
+    ) -> None:
+        """Test that when use_fingerprint_index is set, a view that was deleted from
+        BigQuery is redeployed even though its fingerprint has not changed."""
+        # Use the real index, backed by the mock client.
+        self.fingerprint_index_patcher.stop()
+        dataset = bigquery.dataset.DatasetReference(_PROJECT_ID, _DATASET_NAME)
+
+        mock_view_builders = [
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME,
+                view_id=view_id,
+                description=f"{view_id} description",
+                view_query_template="SELECT NULL LIMIT 0",
+            )
+            for view_id in ("my_fake_view", "my_other_fake_view")
+        ]
+
+        self.mock_client.dataset_ref_for_id.return_value = dataset
+        self.mock_client.project_id = _PROJECT_ID
+        self.mock_client.run_query_async.return_value = [
+            BigQueryTableFingerprint.for_view(b.build()).as_row()
+            for b in mock_view_builders
+        ]
+        # my_fake_view was deleted outside of a deploy
+        self.mock_client.list_tables.return_value = [
+            mock.MagicMock(table_id="my_other_fake_view")
+        ]
+
+        view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+            view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+            view_builders_to_update=mock_view_builders,
+            historically_managed_datasets_to_clean=None,
+            use_fingerprint_index=True,
+        )
+
+        self.mock_client.create_or_update_view.assert_called_once_with(
+            mock_view_builders[0].build()
+        )
+        self.mock_client.list_tables.assert_called_once_with(_DATASET_NAME)
 
     def test_rematerialize_views(self) -> None:
         """Test that rematerialize_views_for_view_builders updates the appropriate
@@ -238,6 +456,128 @@ class ViewManagerTest(unittest.TestCase):
             any_order=True,
         )
 
+    def test_get_historical_materialization_runtimes_sec(self) -> None:
+        materialized_view = SimpleBigQueryViewBuilder(
+            dataset_id=_DATASET_NAME,
+            view_id="my_fake_view",
+            description="my_fake_view description",
+            view_query_template="SELECT NULL LIMIT 0",
+            should_materialize=True,
+        ).build()
+        other_materialized_view = SimpleBigQueryViewBuilder(
+            dataset_id=_DATASET_NAME,
+            view_id="my_other_fake_view",
+            description="my_other_fake_view description",
+            view_query_template="SELECT NULL LIMIT 0",
+            should_materialize=True,
+            materialized_address_override=BigQueryAddress(
+                dataset_id=_DATASET_NAME_2, table_id="my_other_fake_table"
+            ),
+        ).build()
+        unmaterialized_view = SimpleBigQueryViewBuilder(
+            dataset_id=_DATASET_NAME,
+            view_id="my_fake_view_2",
+            description="my_fake_view_2 description",
+            view_query_template="SELECT NULL LIMIT 0",
+        ).build()
+        views = [materialized_view, other_materialized_view, unmaterialized_view]
+
+        self.mock_client.project_id = _PROJECT_ID
+        self.mock_client.region = "us"
+        self.mock_client.run_query_async.return_value = [
+            {
+                "dataset_id": _DATASET_NAME,
+                "table_id": "my_fake_view_materialized",
+                "runtime_sec": 12.5,
+            },
+            {
+                "dataset_id": _DATASET_NAME_2,
+                "table_id": "my_other_fake_table",
+                "runtime_sec": 3.0,
+            },
+            # Jobs writing to tables that are not materialized views are ignored
+            {
+                "dataset_id": _DATASET_NAME,
+                "table_id": "my_fake_view",
+                "runtime_sec": 100.0,
+            },
+            {
+                "dataset_id": _DATASET_NAME_2,
+                "table_id": "unmanaged_table",
+                "runtime_sec": 100.0,
+            },
+        ]
+
+        # pylint: disable=protected-access
+        runtimes_sec = view_update_manager._get_historical_materialization_runtimes_sec(
+            self.mock_client, BigQueryViewDagWalker(views)
+        )
+
+        self.assertEqual(
+            {
+                materialized_view.address: 12.5,
+                other_materialized_view.address: 3.0,
+                unmaterialized_view.address: 0.0,
+            },
+            runtimes_sec,
+        )
+        query_str = self.mock_client.run_query_async.call_args.kwargs["query_str"]
+        self.assertIn("`region-us`.INFORMATION_SCHEMA.JOBS_BY_PROJECT", query_str)
+        self.assertIn(f"destination_table.project_id = '{_PROJECT_ID}'", query_str)
+
+    def test_get_historical_materialization_runtimes_sec_no_jobs(self) -> None:
+        materialized_view = SimpleBigQueryViewBuilder(
+            dataset_id=_DATASET_NAME,
+            view_id="my_fake_view",
+            description="my_fake_view description",
+            view_query_template="SELECT NULL LIMIT 0",
+            should_materialize=True,
+        ).build()
+        unmaterialized_view = SimpleBigQueryViewBuilder(
+            dataset_id=_DATASET_NAME,
+            view_id="my_fake_view_2",
+            description="my_fake_view_2 description",
+            view_query_template="SELECT NULL LIMIT 0",
+        ).build()
+        self.mock_client.run_query_async.return_value = []
+
+        # pylint: disable=protected-access
+        # Materialized views with no recent jobs are omitted
+        self.assertEqual(
+            {unmaterialized_view.address: 0.0},
+            view_update_manager._get_historical_materialization_runtimes_sec(
+                self.mock_client,
+                BigQueryViewDagWalker([materialized_view, unmaterialized_view]),
+            ),
+        )
+
+    def test_get_historical_materialization_runtimes_sec_query_fails(self) -> None:
+        views = [
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME,
+                view_id=view_id,
+                description=f"{view_id} description",
+                view_query_template="SELECT NULL LIMIT 0",
+                should_materialize=should_materialize,
+            ).build()
+            for view_id, should_materialize in (
+                ("my_fake_view", True),
+                ("my_fake_view_2", False),
+            )
+        ]
+        self.mock_client.run_query_async.side_effect = exceptions.Forbidden(
+            "Access denied to INFORMATION_SCHEMA.JOBS_BY_PROJECT"
+        )
+
+        # pylint: disable=protected-access
+        # Falls back to an empty dict so that the DAG walk uses its default order
+        self.assertEqual(
+            {},
+            view_update_manager._get_historical_materialization_runtimes_sec(
+                self.mock_client, BigQueryViewDagWalker(views)
+            ),
+        )
+
     def test_create_managed_dataset_and_deploy_views_for_view_builders_no_materialize_no_update(
         self,
     ) -> None:
@@ -642,6 +982,8 @@ class ViewManagerTest(unittest.TestCase):
         # The cleanup function should not be called since we didn't provide a
         #  historically_managed_datasets_to_clean list
         mock_cleanup_datasets_and_delete_unmanaged_views.assert_not_called()
+        # Sandbox deploys do not touch the fingerprint index
+        self.mock_fingerprint_index.invalidate_fingerprints.assert_not_called()
 
         self.mock_client.delete_dataset.assert_not_called()
         # Only delete calls should be from recreating views to have changes updating
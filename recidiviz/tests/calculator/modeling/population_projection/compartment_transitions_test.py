@@ -109,6 +109,42 @@ class TestCompartmentTransitions(unittest.TestCase):
                 split_transitions.get_per_ts_transition_table(ts),
             )
 
+    def test_per_ts_transition_array_matches_per_ts_transition_table(self) -> None:
+        """Make sure the array form of the per-ts transitions matches the table for
+        every ts, including after the last policy table has stopped varying"""
+        policies = [
+            SparkPolicy(
+                policy_fn=partial(
+                    TransitionTable.apply_reductions,
+                    reduction_df=pd.DataFrame(
+                        {
+                            "outflow": ["prison"],
+                            "affected_fraction": [0.5],
+                            "reduction_size": [0.5],
+                        }
+                    ),
+                    reduction_type="+",
+                    retroactive=True,
+                ),
+                sub_population={"compartment": "test_compartment"},
+                spark_compartment="test_compartment",
+                policy_ts=2,
+                apply_retroactive=True,
+            )
+        ]
+        transitions = CompartmentTransitions(self.test_data)
+        transitions.initialize_transition_tables(policies)
+
+        for ts in range(-3, 20):
+            per_ts_table = transitions.get_per_ts_transition_table(ts)
+            per_ts_array, outflows = transitions.get_per_ts_transition_array(ts)
+            self.assertListEqual(outflows, list(per_ts_table.columns))
+            assert_frame_equal(
+                per_ts_table,
+                pd.DataFrame(per_ts_array, index=per_ts_table.index, columns=outflows),
+                check_names=False,
+            )
+
     def test_multiple_policies(self) -> None:
         """Ensure get_per_ts_transition_table returns the correct transistion
         table when there are multiple SparkPolicies that are applied at
@@ -526,6 +526,44 @@ class TestSuperSimulation(unittest.TestCase):
             # Error should be 0 for each compartment/simulation group on the first ts
             self.assertTrue((initial_error == 0).all())
 
+    @patch(
+        "recidiviz.calculator.modeling.population_projection.utils.ignite_bq_utils.load_ignite_table_from_big_query",
+        mock_load_table_from_big_query_micro,
+    )
+    def test_f_parallel_microsim_baseline_over_time_matches_serial(self) -> None:
+        """Tests running the simulations in worker processes gives the same results, in
+        the same order, as running them one after another"""
+        assert isinstance(self.microsim, SuperSimulation)
+        run_dates = pd.date_range(
+            datetime(2020, 12, 1), datetime(2021, 1, 1), freq="MS"
+        ).tolist()
+
+        # Parallel runs are reseeded per run, so they only match serial runs if no
+        # random draws are made. Fail if the ARIMA jitter fallback is reached, in this
+        # process or in a (forked) worker.
+        with patch(
+            "numpy.random.normal",
+            side_effect=AssertionError("Unexpected ARIMA jitter fallback"),
+        ):
+            self.microsim.microsim_baseline_over_time(run_dates)
+            serial_simulations = self.microsim.get_population_simulations()
+
+            self.microsim.simulator.max_workers = 2
+            try:
+                self.microsim.microsim_baseline_over_time(run_dates)
+            finally:
+                self.microsim.simulator.max_workers = None
+            parallel_simulations = self.microsim.get_population_simulations()
+
+        self.assertListEqual(
+            list(serial_simulations.keys()), list(parallel_simulations.keys())
+        )
+        for simulation_name, serial_simulation in serial_simulations.items():
+            assert_frame_equal(
+                serial_simulation.get_population_projections(),
+                parallel_simulations[simulation_name].get_population_projections(),
+            )
+
     @patch(
         "recidiviz.calculator.modeling.population_projection.utils.ignite_bq_utils.load_ignite_table_from_big_query",
         mock_load_table_from_big_query_micro_outflows_missing_time_steps,
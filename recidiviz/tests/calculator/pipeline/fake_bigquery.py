@@ -16,7 +16,9 @@
 # =============================================================================
 """Helper classes for mocking reading / writing from BigQuery in tests."""
 import abc
+import functools
 import re
+from collections import defaultdict
 from typing import (
     Any,
     Callable,
@@ -90,6 +92,17 @@ ASSOCIATION_VALUES_QUERY_REGEX = re.compile(
     r"ON ([a-z_]+\.[a-z_]+) = ([a-z_]+\.[a-z_]+)"
 )
 
+# Rows written to each output table by FakeWriteMetricsToBigQuery sinks created with
+# record_output=True. Test pipelines run in-process, so tests can read these once the
+# pipeline has run.
+RECORDED_METRIC_OUTPUT_ROWS: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+
+def _record_metric_output_rows(
+    output_table: str, output: List[Dict[str, Any]]
+) -> None:
+    RECORDED_METRIC_OUTPUT_ROWS[output_table].extend(output)
+
 
 class FakeBigQueryAssertMatchers:
     """Functions to be used by Apache Beam testing `assert_that` functions to
@@ -493,8 +506,14 @@ class FakeWriteMetricsToBigQuery(FakeWriteToBigQuery):
         self,
         output_table: str,
         expected_output_tags: Collection[str],
+        record_output: bool = False,
+        expected_output_rows_by_table: Optional[
+            Dict[str, List[Dict[str, Any]]]
+        ] = None,
     ):
         super().__init__(output_table, expected_output_tags)
+        self._record_output = record_output
+        self._expected_output_rows_by_table = expected_output_rows_by_table
         metric_types_for_table = {
             metric_class(job_id="xxx", state_code="xxx").metric_type  # type: ignore[call-arg]
             for metric_class, table_id in DATAFLOW_METRICS_TO_TABLES.items()
@@ -515,6 +534,22 @@ class FakeWriteMetricsToBigQuery(FakeWriteToBigQuery):
         else:
             assert_that(input_or_inputs, equal_to([]))
 
+        if self._record_output:
+            assert_that(
+                input_or_inputs,
+                functools.partial(_record_metric_output_rows, self._output_table),
+                label="Record output rows",
+            )
+
+        if self._expected_output_rows_by_table is not None:
+            assert_that(
+                input_or_inputs,
+                equal_to(
+                    self._expected_output_rows_by_table.get(self._output_table, [])
+                ),
+                label="Assert expected output rows",
+            )
+
         return []
 
 
@@ -19,7 +19,7 @@
 import unittest
 from collections import defaultdict
 from datetime import date
-from typing import Dict, Sequence, Type
+from typing import Any, Dict, Sequence, Type
 
 import mock
 from freezegun import freeze_time
@@ -42,6 +42,7 @@ from recidiviz.calculator.pipeline.metrics.incarceration.metrics import (
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
     PersonMetadata,
     RecidivizMetric,
+    metric_row_for_metric,
 )
 from recidiviz.calculator.pipeline.pipeline_type import (
     INCARCERATION_METRICS_PIPELINE_NAME,
@@ -228,6 +229,84 @@ class TestProduceIncarcerationMetrics(unittest.TestCase):
 
         self.assertEqual(expected_count, len(metrics))
 
+    @freeze_time("2020-01-01")
+    def test_produce_metric_rows_matches_produce_metrics(self) -> None:
+        person = StatePerson.new_with_defaults(
+            state_code="US_XX",
+            person_id=12345,
+            birthdate=date(1984, 8, 31),
+            gender=StateGender.FEMALE,
+        )
+        person.races = [
+            StatePersonRace.new_with_defaults(state_code="US_XX", race=StateRace.WHITE)
+        ]
+        person.ethnicities = [
+            StatePersonEthnicity.new_with_defaults(
+                state_code="US_XX", ethnicity=StateEthnicity.NOT_HISPANIC
+            )
+        ]
+
+        incarceration_events = [
+            IncarcerationStayEvent(
+                admission_reason=StateIncarcerationPeriodAdmissionReason.REVOCATION,
+                admission_reason_raw_text="NEW_ADMISSION",
+                state_code="US_XX",
+                event_date=date(2000, 3, 31),
+                facility="FACILITY X",
+                county_of_residence=_COUNTY_OF_RESIDENCE,
+                specialized_purpose_for_incarceration=StateSpecializedPurposeForIncarceration.TREATMENT_IN_PRISON,
+            ),
+            IncarcerationStandardAdmissionEvent(
+                state_code="US_XX",
+                event_date=date(2000, 3, 12),
+                facility="FACILITY X",
+                county_of_residence=_COUNTY_OF_RESIDENCE,
+                admission_reason=AdmissionReason.REVOCATION,
+                admission_reason_raw_text="REVOCATION",
+                specialized_purpose_for_incarceration=StateSpecializedPurposeForIncarceration.TREATMENT_IN_PRISON,
+            ),
+            IncarcerationReleaseEvent(
+                state_code="US_XX",
+                event_date=date(2003, 4, 12),
+                facility="FACILITY X",
+                county_of_residence=_COUNTY_OF_RESIDENCE,
+                supervision_type_at_release=StateSupervisionPeriodSupervisionType.PAROLE,
+            ),
+            IncarcerationCommitmentFromSupervisionAdmissionEvent(
+                state_code="US_XX",
+                event_date=date(2000, 3, 12),
+                facility="FACILITY X",
+                county_of_residence=_COUNTY_OF_RESIDENCE,
+                admission_reason=AdmissionReason.REVOCATION,
+                admission_reason_raw_text="REVOCATION",
+                specialized_purpose_for_incarceration=StateSpecializedPurposeForIncarceration.TREATMENT_IN_PRISON,
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+            ),
+        ]
+        kwargs: Dict[str, Any] = {
+            "person": person,
+            "identifier_results": incarceration_events,
+            "metric_inclusions": ALL_METRICS_INCLUSIONS_DICT,
+            "calculation_end_month": None,
+            "calculation_month_count": -1,
+            "person_metadata": _DEFAULT_PERSON_METADATA,
+            "pipeline_job_id": PIPELINE_JOB_ID,
+            "metrics_producer_delegates": {
+                StateSpecificIncarcerationMetricsProducerDelegate.__name__: UsXxIncarcerationMetricsProducerDelegate()
+            },
+        }
+
+        metric_rows = self.metric_producer.produce_metric_rows(**kwargs)
+
+        self.assertNotEqual([], metric_rows)
+        self.assertEqual(
+            [
+                metric_row_for_metric(metric)
+                for metric in self.metric_producer.produce_metrics(**kwargs)
+            ],
+            metric_rows,
+        )
+
     def test_produce_incarceration_metrics_two_admissions_same_month(self) -> None:
         person = StatePerson.new_with_defaults(
             state_code="US_XX",
@@ -99,6 +99,7 @@ from recidiviz.tests.calculator.calculator_test_utils import (
     normalized_database_base_dict_list,
 )
 from recidiviz.tests.calculator.pipeline.fake_bigquery import (
+    RECORDED_METRIC_OUTPUT_ROWS,
     FakeReadFromBigQueryFactory,
     FakeWriteMetricsToBigQuery,
     FakeWriteToBigQueryFactory,
@@ -412,6 +413,34 @@ class TestIncarcerationPipeline(unittest.TestCase):
             unifying_id_field_filter_set={fake_person_id},
         )
 
+    @freeze_time("2015-01-31")
+    def testIncarcerationPipelineMetricRowOutput(self) -> None:
+        """Tests that the pipeline writes the same rows with --metric_row_output as it
+        does when converting the RecidivizMetrics to dicts."""
+        fake_person_id = 12345
+        data_dict = self.build_incarceration_pipeline_data_dict(
+            fake_person_id=fake_person_id
+        )
+        RECORDED_METRIC_OUTPUT_ROWS.clear()
+
+        self.run_test_pipeline(
+            state_code=_STATE_CODE,
+            data_dict=data_dict,
+            expected_metric_types=ALL_METRIC_TYPES_SET,
+            record_output=True,
+        )
+        metric_dict_output_rows = dict(RECORDED_METRIC_OUTPUT_ROWS)
+        RECORDED_METRIC_OUTPUT_ROWS.clear()
+
+        self.assertTrue(any(metric_dict_output_rows.values()))
+        self.run_test_pipeline(
+            state_code=_STATE_CODE,
+            data_dict=data_dict,
+            expected_metric_types=ALL_METRIC_TYPES_SET,
+            metric_row_output=True,
+            expected_output_rows_by_table=metric_dict_output_rows,
+        )
+
     def testIncarcerationPipelineUsMo(self) -> None:
         self._stop_state_specific_delegate_patchers()
 
@@ -433,6 +462,9 @@ class TestIncarcerationPipeline(unittest.TestCase):
         expected_metric_types: Set[IncarcerationMetricType],
         unifying_id_field_filter_set: Optional[Set[int]] = None,
         metric_types_filter: Optional[Set[str]] = None,
+        metric_row_output: bool = False,
+        record_output: bool = False,
+        expected_output_rows_by_table: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> None:
         """Runs a test version of the supervision pipeline."""
         project = "project"
@@ -450,6 +482,8 @@ class TestIncarcerationPipeline(unittest.TestCase):
                 expected_output_tags=[
                     metric_type.value for metric_type in expected_metric_types
                 ],
+                record_output=record_output,
+                expected_output_rows_by_table=expected_output_rows_by_table,
             )
         )
 
@@ -462,6 +496,7 @@ class TestIncarcerationPipeline(unittest.TestCase):
             write_to_bq_constructor=write_to_bq_constructor,
             unifying_id_field_filter_set=unifying_id_field_filter_set,
             metric_types_filter=metric_types_filter,
+            metric_row_output=metric_row_output,
         )
 
     def build_incarceration_pipeline_data_dict_no_incarceration(
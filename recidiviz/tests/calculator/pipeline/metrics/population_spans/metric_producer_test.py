@@ -17,7 +17,7 @@
 """Tests for population_spans/metric_producer.py."""
 import unittest
 from datetime import date
-from typing import Dict
+from typing import Any, Dict
 
 import attr
 from freezegun import freeze_time
@@ -32,7 +32,10 @@ from recidiviz.calculator.pipeline.metrics.population_spans.spans import (
     IncarcerationPopulationSpan,
     SupervisionPopulationSpan,
 )
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    metric_row_for_metric,
+)
 from recidiviz.calculator.pipeline.utils.state_utils.state_specific_incarceration_metrics_producer_delegate import (
     StateSpecificIncarcerationMetricsProducerDelegate,
 )
@@ -825,3 +828,50 @@ class TestProducePopulationSpanMetrics(unittest.TestCase):
                 ),
             ],
         )
+
+    @freeze_time(CURRENT_DATE)
+    def test_produce_metric_rows_matches_produce_metrics(self) -> None:
+        incarceration_span = IncarcerationPopulationSpan(
+            state_code="US_XX",
+            facility="FACILITY X",
+            start_date_inclusive=date(2015, 3, 1),
+            end_date_exclusive=date(2017, 3, 1),
+            judicial_district_code="XXX",
+            purpose_for_incarceration=StateSpecializedPurposeForIncarceration.GENERAL,
+            included_in_state_population=True,
+            custodial_authority=StateCustodialAuthority.STATE_PRISON,
+        )
+        supervision_span = SupervisionPopulationSpan(
+            state_code="US_XX",
+            included_in_state_population=True,
+            supervising_district_external_id="site",
+            level_1_supervision_location_external_id="site",
+            start_date_inclusive=date(2017, 3, 2),
+            end_date_exclusive=None,
+            supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+            supervision_level=StateSupervisionLevel.MEDIUM,
+            supervision_level_raw_text="MEDIUM",
+            case_type=StateSupervisionCaseType.GENERAL,
+            custodial_authority=StateCustodialAuthority.SUPERVISION_AUTHORITY,
+            supervising_officer_external_id="OFFICER 1",
+            judicial_district_code="XXX",
+        )
+        kwargs: Dict[str, Any] = {
+            "person": self.person,
+            "identifier_results": [incarceration_span, supervision_span],
+            "metric_inclusions": ALL_METRICS_INCLUSIONS_DICT,
+            "person_metadata": self.person_metadata,
+            "pipeline_job_id": PIPELINE_JOB_ID,
+            "metrics_producer_delegates": self.metrics_producer_delegates,
+        }
+
+        metric_rows = self.metric_producer.produce_metric_rows(**kwargs)
+
+        self.assertNotEqual([], metric_rows)
+        self.assertEqual(
+            [
+                metric_row_for_metric(metric)
+                for metric in self.metric_producer.produce_metrics(**kwargs)
+            ],
+            metric_rows,
+        )
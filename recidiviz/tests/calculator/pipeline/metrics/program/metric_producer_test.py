@@ -18,7 +18,7 @@
 import unittest
 from collections import defaultdict
 from datetime import date
-from typing import Dict, List, Type
+from typing import Any, Dict, List, Type
 
 from freezegun import freeze_time
 
@@ -32,6 +32,7 @@ from recidiviz.calculator.pipeline.metrics.program.metrics import ProgramMetricT
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
     PersonMetadata,
     RecidivizMetric,
+    metric_row_for_metric,
 )
 from recidiviz.common.constants.state.state_assessment import StateAssessmentType
 from recidiviz.common.constants.state.state_person import (
@@ -109,6 +110,60 @@ class TestProduceProgramMetrics(unittest.TestCase):
 
         self.assertEqual(expected_count, len(metrics))
 
+    @freeze_time("2030-11-02")
+    def test_produce_metric_rows_matches_produce_metrics(self) -> None:
+        person = StatePerson.new_with_defaults(
+            state_code="US_ND",
+            person_id=12345,
+            birthdate=date(1984, 8, 31),
+            gender=StateGender.FEMALE,
+        )
+        person.races = [
+            StatePersonRace.new_with_defaults(state_code="US_ND", race=StateRace.WHITE)
+        ]
+        person.ethnicities = [
+            StatePersonEthnicity.new_with_defaults(
+                state_code="US_ND", ethnicity=StateEthnicity.NOT_HISPANIC
+            )
+        ]
+
+        program_events = [
+            ProgramReferralEvent(
+                state_code="US_ND",
+                event_date=date(2019, 10, 10),
+                program_id="XXX",
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                assessment_score=22,
+                assessment_type=StateAssessmentType.LSIR,
+                supervising_officer_external_id="OFFICER211",
+                supervising_district_external_id="DISTRICT 100",
+            ),
+            ProgramParticipationEvent(
+                state_code="US_ND", event_date=date(2019, 2, 2), program_id="ZZZ"
+            ),
+        ]
+        kwargs: Dict[str, Any] = {
+            "person": person,
+            "identifier_results": program_events,
+            "metric_inclusions": ALL_METRICS_INCLUSIONS_DICT,
+            "metrics_producer_delegates": {},
+            "calculation_end_month": None,
+            "calculation_month_count": -1,
+            "person_metadata": _DEFAULT_PERSON_METADATA,
+            "pipeline_job_id": PIPELINE_JOB_ID,
+        }
+
+        metric_rows = self.metric_producer.produce_metric_rows(**kwargs)
+
+        self.assertNotEqual([], metric_rows)
+        self.assertEqual(
+            [
+                metric_row_for_metric(metric)
+                for metric in self.metric_producer.produce_metrics(**kwargs)
+            ],
+            metric_rows,
+        )
+
     def test_produce_program_metrics_full_info(self) -> None:
         person = StatePerson.new_with_defaults(
             state_code="US_ND",
@@ -20,7 +20,7 @@
 """Tests for recidivism/metric_producer.py."""
 import unittest
 from datetime import date
-from typing import Dict, List
+from typing import Any, Dict, List
 
 from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
@@ -43,7 +43,10 @@ from recidiviz.calculator.pipeline.metrics.recidivism.metrics import (
 from recidiviz.calculator.pipeline.metrics.recidivism.metrics import (
     ReincarcerationRecidivismRateMetric,
 )
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    metric_row_for_metric,
+)
 from recidiviz.calculator.pipeline.utils.state_utils.state_specific_metrics_producer_delegate import (
     StateSpecificMetricsProducerDelegate,
 )
@@ -427,6 +430,67 @@ class TestProduceMetrics(unittest.TestCase):
             elif isinstance(metric, ReincarcerationRecidivismCountMetric):
                 self.assertEqual(days_at_liberty, metric.days_at_liberty)
 
+    @freeze_time("2100-01-01")
+    def test_produce_metric_rows_matches_produce_metrics(self) -> None:
+        """Tests that produce_metric_rows returns the BigQuery rows of the metrics
+        returned by produce_metrics."""
+        person = StatePerson.new_with_defaults(
+            state_code="US_XX",
+            person_id=12345,
+            birthdate=date(1984, 8, 31),
+            gender=StateGender.FEMALE,
+        )
+        person.races = [
+            StatePersonRace.new_with_defaults(state_code="US_XX", race=StateRace.WHITE)
+        ]
+        person.ethnicities = [
+            StatePersonEthnicity.new_with_defaults(
+                state_code="US_XX", ethnicity=StateEthnicity.NOT_HISPANIC
+            )
+        ]
+
+        release_events_by_cohort: Dict[int, List[ReleaseEvent]] = {
+            2008: [
+                RecidivismReleaseEvent(
+                    "US_XX",
+                    date(2005, 7, 19),
+                    date(2008, 9, 19),
+                    "Hudson",
+                    _COUNTY_OF_RESIDENCE,
+                    date(2014, 5, 12),
+                    "Upstate",
+                )
+            ],
+            2015: [
+                NonRecidivismReleaseEvent(
+                    "US_XX",
+                    date(2013, 1, 4),
+                    date(2015, 4, 1),
+                    "Hudson",
+                    _COUNTY_OF_RESIDENCE,
+                )
+            ],
+        }
+        kwargs: Dict[str, Any] = {
+            "person": person,
+            "identifier_results": release_events_by_cohort,
+            "metric_inclusions": _ALL_METRIC_INCLUSIONS_DICT,
+            "person_metadata": _DEFAULT_PERSON_METADATA,
+            "pipeline_job_id": _PIPELINE_JOB_ID,
+            "metrics_producer_delegates": _DEFAULT_METRICS_PRODUCER_CLASS,
+        }
+
+        metric_rows = self.metric_producer.produce_metric_rows(**kwargs)
+
+        self.assertNotEqual([], metric_rows)
+        self.assertEqual(
+            [
+                metric_row_for_metric(metric)
+                for metric in self.metric_producer.produce_metrics(**kwargs)
+            ],
+            metric_rows,
+        )
+
     def test_produce_recidivism_metrics_multiple_in_period(self) -> None:
         """Tests the produce_recidivism_metrics function where there are multiple instances of recidivism within a
         follow-up period."""
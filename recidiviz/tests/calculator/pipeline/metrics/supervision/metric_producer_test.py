@@ -18,7 +18,7 @@
 import unittest
 from collections import defaultdict
 from datetime import date
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union
 from unittest import mock
 
 from freezegun import freeze_time
@@ -48,7 +48,10 @@ from recidiviz.calculator.pipeline.metrics.supervision.metrics import (
 from recidiviz.calculator.pipeline.metrics.supervision.supervision_case_compliance import (
     SupervisionCaseCompliance,
 )
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    metric_row_for_metric,
+)
 from recidiviz.calculator.pipeline.utils.state_utils.state_specific_supervision_metrics_producer_delegate import (
     StateSpecificSupervisionMetricsProducerDelegate,
 )
@@ -449,6 +452,87 @@ class TestProduceSupervisionMetrics(unittest.TestCase):
 
         self.assertEqual(expected_count, len(metrics))
 
+    @freeze_time("2020-01-01")
+    def test_produce_metric_rows_matches_produce_metrics(self) -> None:
+        """Tests that produce_metric_rows returns the BigQuery rows of the metrics
+        returned by produce_metrics."""
+        person = StatePerson.new_with_defaults(
+            state_code="US_XX",
+            person_id=12345,
+            birthdate=date(1984, 8, 31),
+            gender=StateGender.FEMALE,
+        )
+        person.races = [
+            StatePersonRace.new_with_defaults(state_code="US_XX", race=StateRace.WHITE)
+        ]
+        person.ethnicities = [
+            StatePersonEthnicity.new_with_defaults(
+                state_code="US_XX", ethnicity=StateEthnicity.NOT_HISPANIC
+            )
+        ]
+
+        supervision_events: List[SupervisionEvent] = [
+            ProjectedSupervisionCompletionEvent(
+                state_code="US_XX",
+                year=2018,
+                month=3,
+                event_date=date(2018, 3, 31),
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                case_type=StateSupervisionCaseType.GENERAL,
+                successful_completion=True,
+                incarcerated_during_sentence=False,
+                sentence_days_served=998,
+                supervising_officer_external_id="officer45",
+                supervising_district_external_id="district5",
+            ),
+            SupervisionPopulationEvent(
+                state_code="US_XX",
+                year=2018,
+                month=3,
+                event_date=date(2018, 3, 31),
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                case_type=StateSupervisionCaseType.GENERAL,
+                supervision_level=StateSupervisionLevel.HIGH,
+                supervision_level_raw_text="HIGH",
+                projected_end_date=None,
+            ),
+            SupervisionStartEvent(
+                state_code="US_XX",
+                year=2000,
+                month=1,
+                event_date=date(2000, 1, 13),
+                in_incarceration_population_on_date=False,
+                in_supervision_population_on_date=True,
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                assessment_score=11,
+                assessment_type=StateAssessmentType.LSIR,
+                admission_reason=StateSupervisionPeriodAdmissionReason.COURT_SENTENCE,
+            ),
+        ]
+        kwargs: Dict[str, Any] = {
+            "person": person,
+            "identifier_results": supervision_events,
+            "metric_inclusions": ALL_METRICS_INCLUSIONS_DICT,
+            "calculation_end_month": None,
+            "calculation_month_count": -1,
+            "person_metadata": _DEFAULT_PERSON_METADATA,
+            "pipeline_job_id": _PIPELINE_JOB_ID,
+            "metrics_producer_delegates": {
+                StateSpecificSupervisionMetricsProducerDelegate.__name__: UsXxSupervisionMetricsProducerDelegate()
+            },
+        }
+
+        metric_rows = self.metric_producer.produce_metric_rows(**kwargs)
+
+        self.assertNotEqual([], metric_rows)
+        self.assertEqual(
+            [
+                metric_row_for_metric(metric)
+                for metric in self.metric_producer.produce_metrics(**kwargs)
+            ],
+            metric_rows,
+        )
+
     def test_produce_supervision_metrics_supervision_unsuccessful(self) -> None:
         """Tests the produce_supervision_metrics function when there is a ProjectedSupervisionCompletionEvent
         and the supervision is not successfully completed."""
@@ -19,12 +19,26 @@ import unittest
 from datetime import date, datetime
 from typing import Optional
 
+import attr
+from mock import patch
+
+from recidiviz.calculator.pipeline.metrics.incarceration.events import (
+    IncarcerationStayEvent,
+)
+from recidiviz.calculator.pipeline.metrics.incarceration.metrics import (
+    IncarcerationPopulationMetric,
+)
 from recidiviz.calculator.pipeline.metrics.utils import calculator_utils
 from recidiviz.calculator.pipeline.metrics.utils.calculator_utils import (
+    MetricFactory,
+    PersonCharacteristicsCache,
     age_at_date,
     person_characteristics,
 )
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    metric_row_for_metric,
+)
 from recidiviz.calculator.pipeline.pipeline_type import (
     INCARCERATION_METRICS_PIPELINE_NAME,
     SUPERVISION_METRICS_PIPELINE_NAME,
@@ -44,6 +58,10 @@ from recidiviz.calculator.pipeline.utils.state_utils.state_specific_supervision_
 from recidiviz.calculator.pipeline.utils.state_utils.templates.us_xx.us_xx_incarceration_metrics_producer_delegate import (
     UsXxIncarcerationMetricsProducerDelegate,
 )
+from recidiviz.common.attr_mixins import BuilderException
+from recidiviz.common.constants.state.state_incarceration_period import (
+    StateIncarcerationPeriodAdmissionReason,
+)
 from recidiviz.common.constants.state.state_person import StateGender
 from recidiviz.persistence.entity.state.entities import (
     StatePerson,
@@ -525,3 +543,148 @@ class TestGetCalculationMonthUpperBoundDate(unittest.TestCase):
             ValueError, "Invalid value for calculation_end_month"
         ):
             _ = calculator_utils.get_calculation_month_upper_bound_date(value)
+
+
+@attr.s(frozen=True)
+class _ResultWithoutStateCode:
+    event_date: date = attr.ib()
+
+
+class TestMetricFactory(unittest.TestCase):
+    """Tests the MetricFactory class and PersonCharacteristicsCache."""
+
+    def setUp(self) -> None:
+        self.person = StatePerson.new_with_defaults(
+            state_code="US_XX",
+            person_id=12345,
+            birthdate=date(1984, 8, 31),
+            gender=StateGender.FEMALE,
+        )
+        self.person_metadata = PersonMetadata(prioritized_race_or_ethnicity="ASIAN")
+        self.event = IncarcerationStayEvent(
+            state_code="US_XX",
+            event_date=date(2010, 9, 30),
+            facility="FACILITY X",
+            admission_reason=StateIncarcerationPeriodAdmissionReason.NEW_ADMISSION,
+        )
+
+    def test_build_matches_builder(self) -> None:
+        person_attributes = person_characteristics(
+            self.person, 26, self.person_metadata
+        )
+
+        metric = MetricFactory.for_result_type(
+            IncarcerationStayEvent, IncarcerationPopulationMetric
+        ).build(
+            result=self.event,
+            person_attributes=person_attributes,
+            pipeline_job_id="job_id",
+            created_on=date(2022, 1, 1),
+            additional_attributes={"year": 2010, "month": 9, "not_a_field": 1},
+        )
+
+        metric_builder = IncarcerationPopulationMetric.builder()
+        metric_builder.job_id = "job_id"
+        metric_builder.created_on = date(2022, 1, 1)
+        for attribute, value in person_attributes.items():
+            setattr(metric_builder, attribute, value)
+        for attribute in attr.fields_dict(IncarcerationPopulationMetric):
+            if hasattr(self.event, attribute):
+                setattr(metric_builder, attribute, getattr(self.event, attribute))
+        metric_builder.year = 2010
+        metric_builder.month = 9
+
+        self.assertEqual(metric_builder.build(), metric)
+        assert isinstance(metric, IncarcerationPopulationMetric)
+        self.assertEqual("FACILITY X", metric.facility)
+        self.assertEqual(26, metric.age)
+
+    def test_build_missing_required_field(self) -> None:
+        metric_factory = MetricFactory.for_result_type(
+            _ResultWithoutStateCode, IncarcerationPopulationMetric  # type: ignore[arg-type]
+        )
+
+        with self.assertRaises(BuilderException):
+            metric_factory.build(
+                result=_ResultWithoutStateCode(event_date=date(2010, 9, 30)),  # type: ignore[arg-type]
+                person_attributes={"person_id": 12345},
+                pipeline_job_id="job_id",
+                created_on=date(2022, 1, 1),
+            )
+
+    def test_build_unexpected_field(self) -> None:
+        metric_factory = MetricFactory.for_result_type(
+            IncarcerationStayEvent, IncarcerationPopulationMetric
+        )
+
+        with self.assertRaises(BuilderException):
+            metric_factory.build(
+                result=self.event,
+                person_attributes={"person_id": 12345, "not_a_field": 1},
+                pipeline_job_id="job_id",
+                created_on=date(2022, 1, 1),
+            )
+
+    def test_for_result_type_reuses_factory(self) -> None:
+        self.assertIs(
+            MetricFactory.for_result_type(
+                IncarcerationStayEvent, IncarcerationPopulationMetric
+            ),
+            MetricFactory.for_result_type(
+                IncarcerationStayEvent, IncarcerationPopulationMetric
+            ),
+        )
+
+    def test_build_row_matches_build(self) -> None:
+        metric_factory = MetricFactory.for_result_type(
+            IncarcerationStayEvent, IncarcerationPopulationMetric
+        )
+        person_attributes = person_characteristics(
+            self.person, 26, self.person_metadata
+        )
+
+        metric_row = metric_factory.build_row(
+            result=self.event,
+            person_attributes=person_attributes,
+            pipeline_job_id="job_id",
+            created_on=date(2022, 1, 1),
+            additional_attributes={"year": 2010, "month": 9},
+        )
+        metric = metric_factory.build(
+            result=self.event,
+            person_attributes=person_attributes,
+            pipeline_job_id="job_id",
+            created_on=date(2022, 1, 1),
+            additional_attributes={"year": 2010, "month": 9},
+        )
+
+        self.assertEqual(metric_row_for_metric(metric), metric_row)
+        self.assertEqual("INCARCERATION_POPULATION", metric_row.metric_type)
+
+    def test_build_row_missing_required_field(self) -> None:
+        metric_factory = MetricFactory.for_result_type(
+            _ResultWithoutStateCode, IncarcerationPopulationMetric  # type: ignore[arg-type]
+        )
+
+        with self.assertRaises(BuilderException):
+            metric_factory.build_row(
+                result=_ResultWithoutStateCode(event_date=date(2010, 9, 30)),  # type: ignore[arg-type]
+                person_attributes={"person_id": 12345},
+                pipeline_job_id="job_id",
+                created_on=date(2022, 1, 1),
+            )
+
+    def test_person_characteristics_cache(self) -> None:
+        cache = PersonCharacteristicsCache(self.person, self.person_metadata)
+
+        with patch(
+            "recidiviz.calculator.pipeline.metrics.utils.calculator_utils.person_characteristics",
+            wraps=person_characteristics,
+        ) as mock_person_characteristics:
+            characteristics_26 = cache.characteristics_for_age(26, None)
+            self.assertIs(characteristics_26, cache.characteristics_for_age(26, None))
+            characteristics_27 = cache.characteristics_for_age(27, None)
+
+        self.assertEqual(2, mock_person_characteristics.call_count)
+        self.assertEqual(26, characteristics_26["age"])
+        self.assertEqual(27, characteristics_27["age"])
@@ -16,6 +16,7 @@
 # =============================================================================
 """Tests the functions in the metric_utils file."""
 import unittest
+from datetime import date
 from typing import Dict, Type
 
 from google.cloud import bigquery
@@ -54,12 +55,15 @@ from recidiviz.calculator.pipeline.metrics.supervision.metrics import (
     SupervisionTerminationMetric,
 )
 from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    bq_column_names_for_metric_class,
     json_serializable_list_value_handler,
+    metric_row_for_metric,
 )
 from recidiviz.calculator.pipeline.utils.beam_utils.bigquery_io_utils import (
     json_serializable_dict,
 )
 from recidiviz.common.constants.county.person_characteristics import Gender
+from recidiviz.common.constants.state.state_person import StateGender
 
 
 class TestJsonSerializableMetricKey(unittest.TestCase):
@@ -227,6 +231,62 @@ class TestBQSchemaForMetricTable(unittest.TestCase):
             _ = supervision_metrics_for_type[metric_type].bq_schema_for_metric_table()
 
 
+class TestMetricRowForMetric(unittest.TestCase):
+    """Tests the metric_row_for_metric function."""
+
+    def test_metric_row_for_metric(self) -> None:
+        metric = IncarcerationCommitmentFromSupervisionMetric.build_from_dictionary(
+            {
+                "job_id": "job_id",
+                "state_code": "US_XX",
+                "year": 2010,
+                "month": 9,
+                "admission_date": date(2010, 9, 1),
+                "gender": StateGender.FEMALE,
+                "created_on": date(2022, 1, 1),
+                "violation_type_frequency_counter": [
+                    ["TECHNICAL", "FELONY"],
+                    ["MISDEMEANOR"],
+                ],
+            }
+        )
+        if not metric:
+            self.fail("Expected metric to be built from the dictionary.")
+
+        metric_row = metric_row_for_metric(metric)
+
+        self.assertEqual(
+            IncarcerationMetricType.INCARCERATION_COMMITMENT_FROM_SUPERVISION.value,
+            metric_row.metric_type,
+        )
+        # The row must hold the same values, in the same order, as the dict written
+        # for the metric by RecidivizMetricWritableDict
+        self.assertEqual(
+            list(
+                json_serializable_dict(
+                    metric.__dict__, json_serializable_list_value_handler
+                ).items()
+            ),
+            list(
+                zip(
+                    bq_column_names_for_metric_class(
+                        IncarcerationCommitmentFromSupervisionMetric
+                    ),
+                    metric_row.values,
+                )
+            ),
+        )
+
+    def test_bq_column_names_for_metric_class(self) -> None:
+        for metric_class in DATAFLOW_METRICS_TO_TABLES:
+            self.assertEqual(
+                tuple(
+                    field.name for field in metric_class.bq_schema_for_metric_table()
+                ),
+                bq_column_names_for_metric_class(metric_class),
+            )
+
+
 class TestRecidivizMetricType(unittest.TestCase):
     """Tests required characteristics of various RecidivizMetricTypes."""
 
@@ -19,11 +19,14 @@
 
 import unittest
 from datetime import date
-from typing import List
+from typing import Any, Dict, List
 
 from freezegun.api import freeze_time
 
-from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import (
+    PersonMetadata,
+    metric_row_for_metric,
+)
 from recidiviz.calculator.pipeline.metrics.violation import metric_producer, pipeline
 from recidiviz.calculator.pipeline.metrics.violation.events import (
     ViolationEvent,
@@ -115,6 +118,44 @@ class TestProduceViolationMetrics(unittest.TestCase):
 
         self.assertEqual(1, len(metrics))
 
+    @freeze_time("2030-11-02")
+    def test_produce_metric_rows_matches_produce_metrics(self) -> None:
+        violation_events: List[ViolationEvent] = [
+            ViolationWithResponseEvent(
+                state_code=self.state_code,
+                supervision_violation_id=23456,
+                event_date=date(2019, 10, 10),
+                violation_date=date(2019, 10, 9),
+                violation_type=StateSupervisionViolationType.TECHNICAL,
+                violation_type_subtype=None,
+                is_most_severe_violation_type=True,
+                is_violent=False,
+                is_sex_offense=False,
+                most_severe_response_decision=StateSupervisionViolationResponseDecision.PRIVILEGES_REVOKED,
+            ),
+        ]
+        kwargs: Dict[str, Any] = {
+            "person": self.person,
+            "identifier_results": violation_events,
+            "metric_inclusions": ALL_METRICS_INCLUSIONS_DICT,
+            "metrics_producer_delegates": {},
+            "calculation_end_month": None,
+            "calculation_month_count": -1,
+            "person_metadata": _DEFAULT_PERSON_METADATA,
+            "pipeline_job_id": PIPELINE_JOB_ID,
+        }
+
+        metric_rows = self.metric_producer.produce_metric_rows(**kwargs)
+
+        self.assertNotEqual([], metric_rows)
+        self.assertEqual(
+            [
+                metric_row_for_metric(metric)
+                for metric in self.metric_producer.produce_metrics(**kwargs)
+            ],
+            metric_rows,
+        )
+
     @freeze_time("2020-05-30")
     def test_produce_violation_metrics_calculation_month_count_1(self) -> None:
         included_event = ViolationWithResponseEvent(
@@ -0,0 +1,57 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for the EntityGraphCoder."""
+import unittest
+
+import apache_beam as beam
+
+from recidiviz.calculator.pipeline.normalization.utils.normalized_entities import (
+    NormalizedStateIncarcerationPeriod,
+)
+from recidiviz.calculator.pipeline.utils.beam_utils.entity_coder import (
+    EntityGraphCoder,
+    register_entity_graph_coders,
+)
+from recidiviz.persistence.entity.base_entity import entity_graph_eq
+from recidiviz.persistence.entity.state import entities
+from recidiviz.tests.persistence.entity.state.entities_test_utils import (
+    generate_full_graph_state_person,
+)
+
+
+class TestEntityGraphCoder(unittest.TestCase):
+    """Tests for the EntityGraphCoder."""
+
+    def test_round_trip(self) -> None:
+        person = generate_full_graph_state_person(set_back_edges=True)
+        coder = EntityGraphCoder()
+
+        decoded_person = coder.decode(coder.encode(person))
+
+        self.assertTrue(entity_graph_eq(person, decoded_person))
+
+    def test_register_entity_graph_coders(self) -> None:
+        register_entity_graph_coders()
+
+        self.assertIsInstance(
+            beam.coders.registry.get_coder(entities.StatePerson), EntityGraphCoder
+        )
+        # Entities below the root are encoded as part of the root's graph
+        self.assertNotIsInstance(
+            beam.coders.registry.get_coder(NormalizedStateIncarcerationPeriod),
+            EntityGraphCoder,
+        )
@@ -0,0 +1,238 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for entity_graph_encoding.py."""
+import datetime
+import pickle
+import unittest
+
+import attr
+
+from recidiviz.calculator.pipeline.normalization.utils.normalized_entities import (
+    NormalizedStateSupervisionViolation,
+    NormalizedStateSupervisionViolationResponse,
+    NormalizedStateSupervisionViolationResponseDecisionEntry,
+    NormalizedStateSupervisionViolationTypeEntry,
+)
+from recidiviz.calculator.pipeline.utils import entity_graph_encoding
+from recidiviz.calculator.pipeline.utils.entity_graph_encoding import (
+    ENTITY_GRAPH_ROOT_CLASSES,
+    decode_entity_graph,
+    encode_entity_graph,
+)
+from recidiviz.common.constants.state.state_incarceration_period import (
+    StateIncarcerationPeriodAdmissionReason,
+)
+from recidiviz.common.constants.state.state_supervision_violation import (
+    StateSupervisionViolationType,
+)
+from recidiviz.common.constants.state.state_supervision_violation_response import (
+    StateSupervisionViolationResponseDecision,
+    StateSupervisionViolationResponseType,
+)
+from recidiviz.persistence.entity.base_entity import entity_graph_eq
+from recidiviz.persistence.entity.entity_utils import (
+    CoreEntityFieldIndex,
+    SchemaEdgeDirectionChecker,
+    get_all_entities_from_tree,
+    get_all_entity_classes_in_module,
+)
+from recidiviz.persistence.entity.state import entities
+from recidiviz.tests.persistence.entity.state.entities_test_utils import (
+    generate_full_graph_state_person,
+)
+
+
+class TestEntityGraphEncoding(unittest.TestCase):
+    """Tests for encode_entity_graph and decode_entity_graph."""
+
+    def test_round_trip_full_graph(self) -> None:
+        for person in (
+            generate_full_graph_state_person(set_back_edges=True),
+            generate_full_graph_state_person(set_back_edges=False),
+            generate_full_graph_state_person(
+                set_back_edges=True, include_person_back_edges=False, set_ids=True
+            ),
+        ):
+            decoded_person = decode_entity_graph(encode_entity_graph(person))
+
+            self.assertIsNot(person, decoded_person)
+            self.assertTrue(entity_graph_eq(person, decoded_person))
+
+    def test_round_trip_preserves_shared_entities(self) -> None:
+        person = generate_full_graph_state_person(set_back_edges=True)
+
+        decoded_person = decode_entity_graph(encode_entity_graph(person))
+
+        assert isinstance(decoded_person, entities.StatePerson)
+        for incarceration_period in decoded_person.incarceration_periods:
+            self.assertIs(decoded_person, incarceration_period.person)
+        for violation in decoded_person.supervision_violations:
+            for response in violation.supervision_violation_responses:
+                self.assertIs(violation, response.supervision_violation)
+
+    def test_round_trip_back_edge_not_implied_by_forward_edges(self) -> None:
+        other_person = entities.StatePerson.new_with_defaults(
+            state_code="US_XX", person_id=2
+        )
+        incarceration_period = entities.StateIncarcerationPeriod.new_with_defaults(
+            state_code="US_XX", person=other_person
+        )
+        person = entities.StatePerson.new_with_defaults(
+            state_code="US_XX",
+            person_id=1,
+            incarceration_periods=[incarceration_period],
+        )
+
+        decoded_person = decode_entity_graph(encode_entity_graph(person))
+
+        assert isinstance(decoded_person, entities.StatePerson)
+        self.assertTrue(entity_graph_eq(person, decoded_person))
+        decoded_other_person = decoded_person.incarceration_periods[0].person
+        assert decoded_other_person is not None
+        self.assertEqual(2, decoded_other_person.person_id)
+
+    def test_round_trip_normalized_entities(self) -> None:
+        violation = NormalizedStateSupervisionViolation.new_with_defaults(
+            supervision_violation_id=123,
+            state_code="US_XX",
+            violation_date=datetime.date(2018, 4, 20),
+            supervision_violation_types=[
+                NormalizedStateSupervisionViolationTypeEntry.new_with_defaults(
+                    state_code="US_XX",
+                    violation_type=StateSupervisionViolationType.TECHNICAL,
+                ),
+            ],
+        )
+        response = NormalizedStateSupervisionViolationResponse.new_with_defaults(
+            state_code="US_XX",
+            supervision_violation_response_id=456,
+            response_date=datetime.date(2018, 4, 21),
+            response_type=StateSupervisionViolationResponseType.VIOLATION_REPORT,
+            supervision_violation=violation,
+            supervision_violation_response_decisions=[
+                NormalizedStateSupervisionViolationResponseDecisionEntry.new_with_defaults(
+                    state_code="US_XX",
+                    decision=StateSupervisionViolationResponseDecision.REVOCATION,
+                ),
+            ],
+            sequence_num=0,
+        )
+        violation.supervision_violation_responses = [response]
+        for type_entry in violation.supervision_violation_types:
+            type_entry.supervision_violation = violation
+        for decision_entry in response.supervision_violation_response_decisions:
+            decision_entry.supervision_violation_response = response
+
+        decoded_violation = decode_entity_graph(encode_entity_graph(violation))
+
+        assert isinstance(decoded_violation, NormalizedStateSupervisionViolation)
+        self.assertTrue(entity_graph_eq(violation, decoded_violation))
+        decoded_response = decoded_violation.supervision_violation_responses[0]
+        assert isinstance(decoded_response, NormalizedStateSupervisionViolationResponse)
+        self.assertEqual(0, decoded_response.sequence_num)
+        self.assertIs(decoded_violation, decoded_response.supervision_violation)
+
+    def test_round_trip_values_not_matching_schema(self) -> None:
+        incarceration_period = entities.StateIncarcerationPeriod.new_with_defaults(
+            state_code="US_XX",
+            # A datetime stored on a date field
+            admission_date=datetime.datetime(2020, 1, 1, 12, 30),
+            release_reason_raw_text="RELEASE",
+        )
+        # An attribute that is not an attr field
+        setattr(incarceration_period, "extra_attribute", 1)
+
+        decoded_period = decode_entity_graph(encode_entity_graph(incarceration_period))
+
+        assert isinstance(decoded_period, entities.StateIncarcerationPeriod)
+        self.assertEqual(
+            datetime.datetime(2020, 1, 1, 12, 30), decoded_period.admission_date
+        )
+        self.assertEqual("RELEASE", decoded_period.release_reason_raw_text)
+        self.assertEqual(1, getattr(decoded_period, "extra_attribute"))
+
+    def test_enums_and_dates_encoded_as_ordinals(self) -> None:
+        incarceration_period = entities.StateIncarcerationPeriod.new_with_defaults(
+            state_code="US_XX",
+            admission_date=datetime.date(2020, 1, 1),
+            admission_reason=StateIncarcerationPeriodAdmissionReason.NEW_ADMISSION,
+        )
+
+        _, _, records = pickle.loads(encode_entity_graph(incarceration_period))
+        field_names = list(
+            attr.fields_dict(entities.StateIncarcerationPeriod)  # type: ignore[arg-type]
+        )
+        values = dict(zip(field_names, records[0][1]))
+
+        self.assertEqual(
+            datetime.date(2020, 1, 1).toordinal(), values["admission_date"]
+        )
+        self.assertEqual(
+            list(StateIncarcerationPeriodAdmissionReason).index(
+                StateIncarcerationPeriodAdmissionReason.NEW_ADMISSION
+            ),
+            values["admission_reason"],
+        )
+
+    def test_encoding_smaller_than_pickle(self) -> None:
+        person = generate_full_graph_state_person(set_back_edges=True)
+
+        self.assertLess(
+            len(encode_entity_graph(person)),
+            len(pickle.dumps(person, protocol=pickle.HIGHEST_PROTOCOL)) / 2,
+        )
+
+    def test_entity_graph_root_classes(self) -> None:
+        # Every other state entity must be reachable from the roots, so that encoding
+        # a root encodes the whole graph
+        direction_checker = SchemaEdgeDirectionChecker.state_direction_checker()
+        for root_class in ENTITY_GRAPH_ROOT_CLASSES:
+            for entity_class in get_all_entity_classes_in_module(entities):
+                if entity_class is not root_class:
+                    self.assertTrue(
+                        direction_checker.is_higher_ranked(root_class, entity_class)
+                    )
+
+    def test_encode_root_encodes_each_entity_once(self) -> None:
+        person = generate_full_graph_state_person(set_back_edges=True)
+
+        _, _, records = pickle.loads(encode_entity_graph(person))
+
+        self.assertEqual(
+            len(get_all_entities_from_tree(person, CoreEntityFieldIndex())),
+            len(records),
+        )
+
+    def test_encode_not_entity(self) -> None:
+        with self.assertRaises(ValueError):
+            encode_entity_graph("not an entity")  # type: ignore[arg-type]
+
+    def test_decode_unexpected_format_version(self) -> None:
+        person = entities.StatePerson.new_with_defaults(state_code="US_XX")
+        _, class_names, records = pickle.loads(encode_entity_graph(person))
+
+        with self.assertRaises(ValueError):
+            decode_entity_graph(
+                pickle.dumps(
+                    (
+                        entity_graph_encoding._FORMAT_VERSION  # pylint: disable=protected-access
+                        + 1,
+                        class_names,
+                        records,
+                    )
+                )
+            )
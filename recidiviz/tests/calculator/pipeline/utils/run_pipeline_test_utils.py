@@ -239,6 +239,9 @@ def default_arg_list_for_pipeline(
                     "include_calculation_limit_args", True
                 ),
                 metric_types_filter=additional_pipeline_args.get("metric_types_filter"),
+                metric_row_output=additional_pipeline_args.get(
+                    "metric_row_output", False
+                ),
             )
         )
     elif issubclass(run_delegate, NormalizationPipelineRunDelegate):
@@ -255,6 +258,7 @@ def _additional_default_args_for_metrics_pipeline(
     dataset_id: str,
     include_calculation_limit_args: bool = True,
     metric_types_filter: Optional[Set[str]] = None,
+    metric_row_output: bool = False,
 ) -> List[str]:
     """Returns the additional default arguments that should be used for testing a
     metrics pipeline."""
@@ -277,4 +281,7 @@ def _additional_default_args_for_metrics_pipeline(
     else:
         additional_args.append("ALL")
 
+    if metric_row_output:
+        additional_args.append("--metric_row_output")
+
     return additional_args
@@ -16,6 +16,7 @@
 # =============================================================================
 """Implements tests for Pathways metric cache."""
 import json
+import threading
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
@@ -28,7 +29,12 @@ from recidiviz.case_triage.pathways.dimensions.dimension_mapping import (
     DimensionOperation,
 )
 from recidiviz.case_triage.pathways.dimensions.time_period import TimePeriod
-from recidiviz.case_triage.pathways.metric_cache import PathwaysMetricCache
+from recidiviz.case_triage.pathways import metric_cache
+from recidiviz.case_triage.pathways.metric_cache import (
+    LocalMetricCache,
+    PathwaysMetricCache,
+    default_params_for,
+)
 from recidiviz.case_triage.pathways.metric_fetcher import PathwaysMetricFetcher
 from recidiviz.case_triage.pathways.metrics.metric_query_builders import (
     ALL_METRICS_BY_NAME,
@@ -170,3 +176,310 @@ class PathwaysMetricCacheTest(TestCase):
                 ],
                 self.metric_cache.redis.keys(),
             )
+
+    def test_fetch_stores_compressed_entry(self) -> None:
+        cached_value = [{"foo": "bar"}]
+        params = self.query_builder.build_params({})
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = cached_value
+            self.metric_cache.fetch(self.query_builder, params)
+
+        cache_key = self.metric_cache.cache_key_for(self.query_builder, params)
+        entry = self.redis.get(cache_key)
+        assert entry is not None
+        self.assertTrue(entry.startswith(b"zlib:"))
+        self.assertTrue(
+            0 < self.redis.ttl(cache_key) <= metric_cache.CACHE_EXPIRY_SECONDS
+        )
+
+        # A new process, with an empty local cache, reads the compressed entry
+        other_metric_fetcher = MagicMock()
+        other_metric_cache = PathwaysMetricCache(
+            state_code=_FakeStateCode.US_XX,
+            metric_fetcher=other_metric_fetcher,
+            redis=self.redis,
+        )
+        self.assertEqual(
+            cached_value, other_metric_cache.fetch(self.query_builder, params)
+        )
+        other_metric_fetcher.fetch.assert_not_called()
+
+    def test_fetch_uses_local_cache(self) -> None:
+        cached_value = [{"foo": "bar"}]
+        params = self.query_builder.build_params({})
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = cached_value
+            self.metric_cache.fetch(self.query_builder, params)
+            self.redis.flushall()
+
+            self.assertEqual(
+                cached_value, self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_called_once()
+
+    @patch.object(metric_cache, "COMPUTE_LOCK_POLL_INTERVAL_SECONDS", 0.01)
+    def test_fetch_waits_for_concurrent_computation(self) -> None:
+        """When another request holds the lock for a key, we wait for its result
+        instead of querying the database as well."""
+        cached_value = [{"foo": "bar"}]
+        params = self.query_builder.build_params({})
+        cache_key = self.metric_cache.cache_key_for(self.query_builder, params)
+        self.redis.set(PathwaysMetricCache.lock_key_for(cache_key), "other-request")
+
+        other_metric_fetcher = MagicMock()
+        other_metric_fetcher.fetch.return_value = cached_value
+        other_metric_cache = PathwaysMetricCache(
+            state_code=_FakeStateCode.US_XX,
+            metric_fetcher=other_metric_fetcher,
+            redis=self.redis,
+        )
+        timer = threading.Timer(
+            0.1,
+            # pylint: disable=protected-access
+            lambda: other_metric_cache._fetch_and_store(
+                self.query_builder, params, cache_key
+            ),
+        )
+        timer.start()
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            self.assertEqual(
+                cached_value, self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_not_called()
+        timer.join()
+
+    @patch.object(metric_cache, "COMPUTE_LOCK_TIMEOUT_SECONDS", 0.05)
+    @patch.object(metric_cache, "COMPUTE_LOCK_POLL_INTERVAL_SECONDS", 0.01)
+    def test_fetch_computes_after_lock_wait_timeout(self) -> None:
+        cached_value = [{"foo": "bar"}]
+        params = self.query_builder.build_params({})
+        cache_key = self.metric_cache.cache_key_for(self.query_builder, params)
+        self.redis.set(PathwaysMetricCache.lock_key_for(cache_key), "other-request")
+
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = cached_value
+            self.assertEqual(
+                cached_value, self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_called_once()
+
+        # We don't release a lock we don't hold
+        self.assertEqual(
+            b"other-request",
+            self.redis.get(PathwaysMetricCache.lock_key_for(cache_key)),
+        )
+
+    def test_reset_cache_stale_while_revalidate(self) -> None:
+        old_value = [{"foo": "old"}]
+        new_value = [{"foo": "new"}]
+        params = self.query_builder.build_params({})
+        old_cache_key = self.metric_cache.cache_key_for(self.query_builder, params)
+        self.redis.set(old_cache_key, json.dumps(old_value))
+
+        # The value is not in the active namespace, and another request is
+        # recomputing it, so the value from the previous namespace is served
+        self.redis.hset(
+            self.metric_cache.namespace_key_for(self.query_builder),
+            mapping={"active": 1, "previous": 0},
+        )
+        cache_key = self.metric_cache.cache_key_for(
+            self.query_builder, params, version=1
+        )
+        self.redis.set(PathwaysMetricCache.lock_key_for(cache_key), "other-request")
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            self.assertEqual(
+                old_value, self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_not_called()
+        self.redis.delete(PathwaysMetricCache.lock_key_for(cache_key))
+
+        # The value is recomputed once nobody else is computing it
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = new_value
+            self.assertEqual(
+                new_value, self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.reset_mock()
+            self.assertEqual(
+                new_value, self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_not_called()
+        self.assertIsNotNone(self.redis.get(cache_key))
+
+    def test_reset_cache(self) -> None:
+        params = default_params_for(self.query_builder)[0]
+        cache_key = self.metric_cache.cache_key_for(self.query_builder, params)
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = [{"foo": "old"}]
+            self.metric_cache.fetch(self.query_builder, params)
+
+            mock_metric_fetcher.fetch.return_value = [{"foo": "new"}]
+            self.metric_cache.reset_cache(self.query_builder)
+
+            # The entry is not deleted, but is no longer served
+            self.assertIsNotNone(self.redis.get(cache_key))
+            mock_metric_fetcher.fetch.reset_mock()
+            self.assertEqual(
+                [{"foo": "new"}], self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_not_called()
+
+            self.metric_cache.reset_cache(
+                self.query_builder, stale_while_revalidate=False
+            )
+            self.assertEqual(
+                sorted(
+                    self.metric_cache.cache_key_for(
+                        self.query_builder, params, version=2
+                    ).encode()
+                    for params in default_params_for(self.query_builder)
+                ),
+                sorted(self.redis.keys(f"US_XX {self.query_builder.cache_fragment} *")),
+            )
+
+        # No locks are left behind
+        self.assertEqual([], self.redis.keys("lock *"))
+
+    def test_warm_up(self) -> None:
+        other_query_builder = ALL_METRICS_BY_NAME["PrisonToSupervisionTransitionsCount"]
+        params = default_params_for(self.query_builder)[0]
+        self.redis.set(
+            self.metric_cache.cache_key_for(self.query_builder, params),
+            json.dumps([{"foo": "old"}]),
+        )
+
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.side_effect = lambda mapper, params: [
+                {"metric": mapper.cache_fragment, "params": params.cache_fragment}
+            ]
+            self.metric_cache.warm_up(
+                [self.query_builder, other_query_builder], max_workers=3
+            )
+            self.assertEqual(
+                len(default_params_for(self.query_builder))
+                + len(default_params_for(other_query_builder)),
+                mock_metric_fetcher.fetch.call_count,
+            )
+
+            mock_metric_fetcher.fetch.reset_mock()
+            for query_builder in [self.query_builder, other_query_builder]:
+                self.assertEqual(
+                    {b"active": b"1", b"previous": b"0"},
+                    self.redis.hgetall(
+                        self.metric_cache.namespace_key_for(query_builder)
+                    ),
+                )
+                for default_params in default_params_for(query_builder):
+                    self.assertEqual(
+                        [
+                            {
+                                "metric": query_builder.cache_fragment,
+                                "params": default_params.cache_fragment,
+                            }
+                        ],
+                        self.metric_cache.fetch(query_builder, default_params),
+                    )
+            mock_metric_fetcher.fetch.assert_not_called()
+
+            # The unversioned namespace is kept as the previous namespace until the
+            # next warm-up
+            self.assertIsNotNone(
+                self.redis.get(
+                    self.metric_cache.cache_key_for(self.query_builder, params)
+                )
+            )
+            self.metric_cache.warm_up([self.query_builder])
+
+        self.assertEqual(
+            {b"active": b"2", b"previous": b"1"},
+            self.redis.hgetall(self.metric_cache.namespace_key_for(self.query_builder)),
+        )
+        self.assertTrue(
+            0
+            < self.redis.ttl(
+                self.metric_cache.cache_key_for(self.query_builder, params, version=2)
+            )
+            <= metric_cache.CACHE_EXPIRY_SECONDS
+        )
+        self.assertIsNone(
+            self.redis.get(self.metric_cache.cache_key_for(self.query_builder, params))
+        )
+        self.assertIsNotNone(
+            self.redis.get(
+                self.metric_cache.cache_key_for(self.query_builder, params, version=1)
+            )
+        )
+
+    def test_warm_up_failure_keeps_active_namespace(self) -> None:
+        params = default_params_for(self.query_builder)[0]
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = [{"foo": "old"}]
+            self.metric_cache.warm_up([self.query_builder])
+
+            mock_metric_fetcher.fetch.side_effect = [[{"foo": "new"}], ValueError]
+            with self.assertRaises(ValueError):
+                self.metric_cache.warm_up([self.query_builder], max_workers=1)
+
+        self.assertEqual(
+            {b"active": b"1", b"previous": b"0"},
+            self.redis.hgetall(self.metric_cache.namespace_key_for(self.query_builder)),
+        )
+        self.assertEqual(
+            [],
+            self.redis.keys(
+                self.metric_cache.cache_key_prefix_for(self.query_builder, version=2)
+                + "*"
+            ),
+        )
+        self.assertEqual(
+            [{"foo": "old"}], self.metric_cache.fetch(self.query_builder, params)
+        )
+
+    def test_warm_up_enabled_metrics(self) -> None:
+        with patch.object(
+            self.metric_cache, "metric_fetcher"
+        ) as mock_metric_fetcher, patch.dict(
+            metric_cache.ENABLED_METRICS_BY_STATE,
+            {_FakeStateCode.US_XX: [self.query_builder]},
+        ):
+            mock_metric_fetcher.fetch.return_value = []
+            self.metric_cache.warm_up()
+
+        self.assertEqual(
+            len(default_params_for(self.query_builder)),
+            mock_metric_fetcher.fetch.call_count,
+        )
+
+
+class LocalMetricCacheTest(TestCase):
+    """Tests for LocalMetricCache"""
+
+    def test_evicts_least_recently_used(self) -> None:
+        local_cache = LocalMetricCache(max_entries=2, ttl_seconds=60)
+        local_cache.set("a", {"data": [{"a": 1}]})
+        local_cache.set("b", {"data": [{"b": 1}]})
+        local_cache.get("a")
+        local_cache.set("c", {"data": [{"c": 1}]})
+
+        self.assertEqual({"data": [{"a": 1}]}, local_cache.get("a"))
+        self.assertIsNone(local_cache.get("b"))
+        self.assertEqual({"data": [{"c": 1}]}, local_cache.get("c"))
+
+    def test_expires_entries(self) -> None:
+        local_cache = LocalMetricCache(max_entries=2, ttl_seconds=60)
+        with patch("time.monotonic", return_value=100):
+            local_cache.set("a", {"data": [{"a": 1}]})
+            self.assertEqual({"data": [{"a": 1}]}, local_cache.get("a"))
+        with patch("time.monotonic", return_value=161):
+            self.assertIsNone(local_cache.get("a"))
+
+    def test_delete_prefix(self) -> None:
+        local_cache = LocalMetricCache(max_entries=10, ttl_seconds=60)
+        local_cache.set("US_XX Metric a", {"data": []})
+        local_cache.set("US_XX Metric b", {"data": []})
+        local_cache.set("US_XX Other a", {"data": []})
+        local_cache.delete_prefix("US_XX Metric")
+
+        self.assertIsNone(local_cache.get("US_XX Metric a"))
+        self.assertIsNone(local_cache.get("US_XX Metric b"))
+        self.assertEqual({"data": []}, local_cache.get("US_XX Other a"))
@@ -0,0 +1,106 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+""" Tests for the Redis utils """
+import threading
+import time
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import patch
+
+import fakeredis
+
+from recidiviz.cloud_memorystore import utils
+from recidiviz.cloud_memorystore.utils import (
+    RedisKeyTimeoutError,
+    await_redis_keys,
+    notify_redis_keys_set,
+)
+
+
+class TestAwaitRedisKeys(TestCase):
+    """TestCase for await_redis_keys."""
+
+    def setUp(self) -> None:
+        self.cache = fakeredis.FakeRedis()
+
+    def test_keys_exist(self) -> None:
+        self.cache.set("a", 1)
+        self.cache.set("b", 1)
+        self.cache.set("unrelated", 1)
+
+        with patch.object(self.cache, "scan_iter") as mock_scan_iter:
+            self.assertEqual([set()], list(await_redis_keys(self.cache, ["a", "b"])))
+            mock_scan_iter.assert_not_called()
+
+    @patch.object(utils, "EXISTS_PIPELINE_BATCH_SIZE", 2)
+    def test_yields_remaining_keys(self) -> None:
+        self.cache.set("a", 1)
+        self.cache.set("c", 1)
+        progress = []
+        for remaining_keys in await_redis_keys(
+            self.cache,
+            ["a", "b", "c"],
+            poll_interval=timedelta(seconds=0.01),
+        ):
+            progress.append(set(remaining_keys))
+            self.cache.set("b", 1)
+
+        self.assertEqual([{"b"}, set()], progress)
+
+    def test_timeout(self) -> None:
+        self.cache.set("a", 1)
+        with self.assertRaises(RedisKeyTimeoutError) as e:
+            list(
+                await_redis_keys(
+                    self.cache,
+                    ["a", "b"],
+                    timeout_timedelta=timedelta(seconds=0.05),
+                    poll_interval=timedelta(seconds=0.01),
+                )
+            )
+
+        self.assertEqual(["b"], e.exception.missing_keys)
+
+    def test_completion_channel(self) -> None:
+        """A completion signal wakes up the waiter before the poll interval ends."""
+
+        def set_keys() -> None:
+            self.cache.set("a", 1)
+            notify_redis_keys_set(self.cache, "a_channel")
+
+        timer = threading.Timer(0.1, set_keys)
+        timer.start()
+        start = time.monotonic()
+        list(
+            await_redis_keys(
+                self.cache,
+                ["a"],
+                timeout_timedelta=timedelta(seconds=30),
+                poll_interval=timedelta(seconds=10),
+                completion_channel="a_channel",
+            )
+        )
+        timer.join()
+
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_keyspace_notifications(self) -> None:
+        self.cache.set("a", 1)
+        self.assertEqual(
+            [set()],
+            list(await_redis_keys(self.cache, ["a"], use_keyspace_notifications=True)),
+        )
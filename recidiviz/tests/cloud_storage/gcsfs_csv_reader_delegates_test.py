@@ -0,0 +1,199 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for the SplittingGcsfsCsvReaderDelegate."""
+import unittest
+from typing import List, Optional
+
+import pandas as pd
+
+from recidiviz.cloud_storage.gcs_file_system import GCSFileSystem
+from recidiviz.cloud_storage.gcsfs_csv_reader import GcsfsCsvReader
+from recidiviz.cloud_storage.gcsfs_csv_reader_delegates import (
+    ChunkFileFormat,
+    SplittingGcsfsCsvReaderDelegate,
+)
+from recidiviz.cloud_storage.gcsfs_path import GcsfsFilePath
+from recidiviz.tests.ingest import fixtures
+from recidiviz.tests.cloud_storage.fake_gcs_file_system import FakeGCSFileSystem
+
+
+def _upper_case_transform(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(lambda column: column.str.upper())
+
+
+class _TestSplittingDelegate(SplittingGcsfsCsvReaderDelegate):
+    """Splitting delegate that upper-cases all values and writes chunks to a temp
+    bucket.
+    """
+
+    def __init__(
+        self,
+        path: GcsfsFilePath,
+        fs: GCSFileSystem,
+        max_in_flight_chunks: int = 0,
+        num_transform_processes: int = 0,
+        fail_on_chunk: Optional[int] = None,
+        output_format: ChunkFileFormat = ChunkFileFormat.CSV,
+    ):
+        super().__init__(
+            path,
+            fs,
+            include_header=True,
+            max_in_flight_chunks=max_in_flight_chunks,
+            num_transform_processes=num_transform_processes,
+            output_format=output_format,
+        )
+        self.fail_on_chunk = fail_on_chunk
+        self.num_transformed_chunks = 0
+        self.picklable_transform_fn = _upper_case_transform
+
+    def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.fail_on_chunk is not None and df.index[0] == self.fail_on_chunk:
+            raise ValueError(f"Failed on chunk [{self.fail_on_chunk}]")
+        self.num_transformed_chunks += 1
+        return _upper_case_transform(df)
+
+    def get_output_path(self, chunk_num: int) -> GcsfsFilePath:
+        return GcsfsFilePath.from_absolute_path(f"gs://temp-bucket/chunk_{chunk_num}")
+
+
+class SplittingGcsfsCsvReaderDelegateTest(unittest.TestCase):
+    """Tests for the SplittingGcsfsCsvReaderDelegate."""
+
+    def setUp(self) -> None:
+        self.fake_gcs = FakeGCSFileSystem()
+        self.reader = GcsfsCsvReader(self.fake_gcs)
+
+    def _add_fixture(self, filename: str) -> GcsfsFilePath:
+        file_path = fixtures.as_filepath(filename)
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+        return gcs_path
+
+    def _output_contents(self, delegate: _TestSplittingDelegate) -> List[str]:
+        return [
+            self.fake_gcs.download_as_string(path) for path in delegate.output_paths
+        ]
+
+    def _temp_paths(self) -> List[str]:
+        return sorted(
+            p.abs_path()
+            for p in self.fake_gcs.all_paths
+            if p.bucket_name == "temp-bucket"
+        )
+
+    def test_pipelined_matches_serial(self) -> None:
+        gcs_path = self._add_fixture("encoded_utf_8.csv")
+
+        serial_delegate = _TestSplittingDelegate(gcs_path, self.fake_gcs)
+        self.reader.streaming_read(gcs_path, delegate=serial_delegate, chunk_size=1)
+        serial_contents = self._output_contents(serial_delegate)
+
+        pipelined_delegate = _TestSplittingDelegate(
+            gcs_path, self.fake_gcs, max_in_flight_chunks=2
+        )
+        self.reader.streaming_read(gcs_path, delegate=pipelined_delegate, chunk_size=1)
+
+        self.assertEqual(4, len(pipelined_delegate.output_paths))
+        self.assertEqual(
+            [f"temp-bucket/chunk_{i}" for i in range(4)],
+            [p.abs_path() for p in pipelined_delegate.output_paths],
+        )
+        self.assertEqual(serial_delegate.output_paths, pipelined_delegate.output_paths)
+        self.assertEqual(
+            serial_delegate.output_columns, pipelined_delegate.output_columns
+        )
+        self.assertEqual(serial_contents, self._output_contents(pipelined_delegate))
+        self.assertEqual(4, pipelined_delegate.num_transformed_chunks)
+
+    def test_pipelined_with_transform_processes(self) -> None:
+        gcs_path = self._add_fixture("encoded_utf_8.csv")
+
+        serial_delegate = _TestSplittingDelegate(gcs_path, self.fake_gcs)
+        self.reader.streaming_read(gcs_path, delegate=serial_delegate, chunk_size=1)
+        serial_contents = self._output_contents(serial_delegate)
+
+        pipelined_delegate = _TestSplittingDelegate(
+            gcs_path, self.fake_gcs, max_in_flight_chunks=2, num_transform_processes=2
+        )
+        self.reader.streaming_read(gcs_path, delegate=pipelined_delegate, chunk_size=1)
+
+        self.assertEqual(serial_delegate.output_paths, pipelined_delegate.output_paths)
+        self.assertEqual(
+            serial_delegate.output_columns, pipelined_delegate.output_columns
+        )
+        self.assertEqual(serial_contents, self._output_contents(pipelined_delegate))
+        # Transforms ran in the process pool, not via transform_dataframe()
+        self.assertEqual(0, pipelined_delegate.num_transformed_chunks)
+
+    def test_pipelined_encoding_retry(self) -> None:
+        gcs_path = self._add_fixture("encoded_latin_1.csv")
+
+        serial_delegate = _TestSplittingDelegate(gcs_path, self.fake_gcs)
+        self.reader.streaming_read(gcs_path, delegate=serial_delegate, chunk_size=1)
+        serial_contents = self._output_contents(serial_delegate)
+
+        pipelined_delegate = _TestSplittingDelegate(
+            gcs_path, self.fake_gcs, max_in_flight_chunks=2
+        )
+        self.reader.streaming_read(gcs_path, delegate=pipelined_delegate, chunk_size=1)
+
+        self.assertEqual(4, len(pipelined_delegate.output_paths))
+        self.assertEqual(serial_contents, self._output_contents(pipelined_delegate))
+        self.assertEqual(
+            [p.abs_path() for p in pipelined_delegate.output_paths],
+            self._temp_paths(),
+        )
+
+    def test_pipelined_exception_cleans_up(self) -> None:
+        gcs_path = self._add_fixture("encoded_utf_8.csv")
+
+        delegate = _TestSplittingDelegate(
+            gcs_path, self.fake_gcs, max_in_flight_chunks=2, fail_on_chunk=2
+        )
+        with self.assertRaisesRegex(ValueError, r"Failed on chunk \[2\]"):
+            self.reader.streaming_read(gcs_path, delegate=delegate, chunk_size=1)
+
+        self.assertEqual([], delegate.output_paths)
+        self.assertEqual([], self._temp_paths())
+
+    def test_parquet_output(self) -> None:
+        gcs_path = self._add_fixture("encoded_utf_8.csv")
+
+        csv_delegate = _TestSplittingDelegate(gcs_path, self.fake_gcs)
+        self.reader.streaming_read(gcs_path, delegate=csv_delegate, chunk_size=1)
+        csv_dfs = [
+            pd.read_csv(self.fake_gcs.real_absolute_path_for_path(path), dtype=str)
+            for path in csv_delegate.output_paths
+        ]
+
+        parquet_delegate = _TestSplittingDelegate(
+            gcs_path,
+            self.fake_gcs,
+            max_in_flight_chunks=2,
+            output_format=ChunkFileFormat.PARQUET,
+        )
+        self.reader.streaming_read(gcs_path, delegate=parquet_delegate, chunk_size=1)
+        parquet_dfs = [
+            pd.read_parquet(self.fake_gcs.real_absolute_path_for_path(path))
+            for path in parquet_delegate.output_paths
+        ]
+
+        self.assertEqual(csv_delegate.output_columns, parquet_delegate.output_columns)
+        self.assertEqual(len(csv_dfs), len(parquet_dfs))
+        for csv_df, parquet_df in zip(csv_dfs, parquet_dfs):
+            pd.testing.assert_frame_equal(csv_df, parquet_df)
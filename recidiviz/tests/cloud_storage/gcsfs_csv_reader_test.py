@@ -23,6 +23,7 @@ import pandas as pd
 
 from recidiviz.cloud_storage.gcsfs_csv_reader import (
     COMMON_RAW_FILE_ENCODINGS,
+    EncodingDetectionMode,
     GcsfsCsvReader,
     GcsfsCsvReaderDelegate,
 )
@@ -222,3 +223,98 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         self.assertEqual({"UTF-8"}, {encoding for encoding, df in delegate.dataframes})
         self.assertEqual(0, delegate.decode_errors)
         self.assertEqual(1, delegate.exceptions)
+
+    def test_read_with_failure_first_sample_detection(self) -> None:
+        file_path = fixtures.as_filepath("encoded_latin_1.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        delegate = _TestGcsfsCsvReaderDelegate()
+        encoding = self.reader.streaming_read(
+            gcs_path,
+            delegate=delegate,
+            chunk_size=1,
+            encoding_detection_mode=EncodingDetectionMode.SAMPLE,
+        )
+
+        # UTF-8 is ruled out before we start the pandas read
+        self.assertEqual("ISO-8859-1", encoding)
+        self.assertEqual(["ISO-8859-1"], delegate.encodings_attempted)
+        self.assertEqual("ISO-8859-1", delegate.successful_encoding)
+        self.assertEqual(4, len(delegate.dataframes))
+        self.assertEqual(0, delegate.decode_errors)
+        self.assertEqual(0, delegate.exceptions)
+
+    def test_read_with_failure_after_sample_window(self) -> None:
+        file_path = fixtures.as_filepath("encoded_latin_1.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        delegate = _TestGcsfsCsvReaderDelegate()
+        # The first non-ASCII character is after the sampled window, so we still
+        # fall back once UTF-8 fails in the pandas read.
+        encoding = self.reader.streaming_read(
+            gcs_path,
+            delegate=delegate,
+            chunk_size=1,
+            encoding_detection_mode=EncodingDetectionMode.SAMPLE,
+            encoding_sample_size_bytes=10,
+        )
+
+        self.assertEqual("ISO-8859-1", encoding)
+        self.assertEqual(["UTF-8", "ISO-8859-1"], delegate.encodings_attempted)
+        self.assertEqual(1, delegate.decode_errors)
+
+    def test_read_with_failure_first_validate_full_file(self) -> None:
+        file_path = fixtures.as_filepath("encoded_latin_1.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        delegate = _TestGcsfsCsvReaderDelegate()
+        encoding = self.reader.streaming_read(
+            gcs_path,
+            delegate=delegate,
+            chunk_size=1,
+            encoding_detection_mode=EncodingDetectionMode.VALIDATE_FULL_FILE,
+        )
+
+        self.assertEqual("ISO-8859-1", encoding)
+        self.assertEqual(["ISO-8859-1"], delegate.encodings_attempted)
+        self.assertEqual(4, len(delegate.dataframes))
+        self.assertEqual(0, delegate.decode_errors)
+
+    def test_read_no_encodings_match_validate_full_file(self) -> None:
+        file_path = fixtures.as_filepath("encoded_latin_1.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        delegate = _TestGcsfsCsvReaderDelegate()
+        with self.assertRaisesRegex(ValueError, r"^Unable to read path"):
+            self.reader.streaming_read(
+                gcs_path,
+                delegate=delegate,
+                chunk_size=10,
+                encodings_to_try=["UTF-8", "ASCII"],
+                encoding_detection_mode=EncodingDetectionMode.VALIDATE_FULL_FILE,
+            )
+        self.assertEqual([], delegate.encodings_attempted)
+
+    def test_get_decodable_encodings(self) -> None:
+        file_path = fixtures.as_filepath("encoded_utf_8.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        encodings = ["ASCII", "UTF-8", "ISO-8859-1"]
+        self.assertEqual(
+            encodings,
+            self.reader.get_decodable_encodings(gcs_path, encodings, max_bytes=10),
+        )
+        # Cuts a two-byte UTF-8 character in half, which is still valid
+        self.assertEqual(
+            ["UTF-8", "ISO-8859-1"],
+            self.reader.get_decodable_encodings(gcs_path, encodings, max_bytes=36),
+        )
+        self.assertEqual(
+            ["UTF-8", "ISO-8859-1"],
+            self.reader.get_decodable_encodings(gcs_path, encodings, max_bytes=None),
+        )
@@ -20,6 +20,7 @@ import unittest
 from datetime import date
 from enum import Enum
 from typing import Dict, List, Optional
+from unittest.mock import patch
 
 import attr
 
@@ -345,6 +346,63 @@ class BuildableAttrTests(unittest.TestCase):
             # Build from dictionary
             _ = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
 
+    def testBuildFromDictionary_WithInvalidDay(self) -> None:
+        with self.assertRaises(ValueError):
+
+            # Construct dictionary representation
+            subject_dict = {
+                "required_field": "value",
+                "another_required_field": "another_value",
+                "enum_nonnull_field": FakeEnum.A.value,
+                "date_field": "2001-02-30",
+            }
+
+            # Build from dictionary
+            _ = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
+
+    def testBuildFromDictionary_WithOtherDateFormats(self) -> None:
+        for date_value in ("20010108", "2001-1-8", date(2001, 1, 8)):
+            # Construct dictionary representation
+            subject_dict = {
+                "required_field": "value",
+                "another_required_field": "another_value",
+                "enum_nonnull_field": FakeEnum.A.value,
+                "date_field": date_value,
+            }
+
+            # Build from dictionary
+            subject = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
+
+            # Assert
+            expected_result = FakeBuildableAttrDeluxe(
+                required_field="value",
+                another_required_field="another_value",
+                enum_nonnull_field=FakeEnum.A,
+                date_field=date(2001, 1, 8),
+            )
+
+            self.assertEqual(subject, expected_result)
+
+    def testBuildFromDictionary_InvalidEnumValue(self) -> None:
+        with self.assertRaises(ValueError):
+            # Construct dictionary representation
+            subject_dict = {
+                "required_field": "value",
+                "another_required_field": "another_value",
+                "enum_nonnull_field": "C",
+            }
+
+            # Build from dictionary
+            _ = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
+
+    def testBuildFromDictionary_MissingRequiredArgs_RaisesBuilderException(
+        self,
+    ) -> None:
+        with self.assertRaises(BuilderException):
+            _ = FakeBuildableAttrDeluxe.build_from_dictionary(
+                {"required_field": "value", "enum_field": FakeEnum.A.value}
+            )
+
 
 class CachedClassStructureReferenceTests(unittest.TestCase):
     """Tests the functionality of the cached _class_structure_reference."""
@@ -386,6 +444,33 @@ class CachedClassStructureReferenceTests(unittest.TestCase):
             cached_class_structure_reference.get(FakeBuildableAttrDeluxe)
         )
 
+    def testCachedBuildFromDictionaryFn(self) -> None:
+        """Tests that the function building a class from a dictionary is only created
+        once for each class."""
+        _clear_class_structure_reference()
+
+        subject_dict = {
+            "required_field": "value",
+            "another_required_field": "another_value",
+            "enum_nonnull_field": FakeEnum.A.value,
+        }
+        _ = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
+
+        with patch(
+            "recidiviz.common.attr_mixins._attribute_field_type_reference_for_class"
+        ) as mock_attribute_field_type_reference:
+            subject = FakeBuildableAttrDeluxe.build_from_dictionary(subject_dict)
+            mock_attribute_field_type_reference.assert_not_called()
+
+        self.assertEqual(
+            FakeBuildableAttrDeluxe(
+                required_field="value",
+                another_required_field="another_value",
+                enum_nonnull_field=FakeEnum.A,
+            ),
+            subject,
+        )
+
     def testAttributeFieldTypeReferenceForClass(self) -> None:
         """Tests that the _attribute_field_type_reference_for_class function returns
         the expected mapping from Attribute to BuildableAttrFieldType."""
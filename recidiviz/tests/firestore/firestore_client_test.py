@@ -15,13 +15,20 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Tests for FirestoreClientImpl"""
+import threading
+import time
 import unittest
 from datetime import datetime
+from typing import Callable, List, Tuple
 from unittest import mock
 
 from mock import call
 
-from recidiviz.firestore.firestore_client import FirestoreClientImpl
+from recidiviz.firestore.firestore_client import (
+    FIRESTORE_DELETE_BATCH_SIZE,
+    FirestoreBatchCommitter,
+    FirestoreClientImpl,
+)
 
 
 class BigQueryClientImplTest(unittest.TestCase):
@@ -56,3 +63,83 @@ class BigQueryClientImplTest(unittest.TestCase):
                 call().where("__lastUpdated", "<", datetime(2022, 1, 1)),
             ]
         )
+
+    def test_delete_old_documents_in_concurrent_batches(self) -> None:
+        self.mock_collection = mock.MagicMock()
+        self.mock_client.collection.return_value = self.mock_collection
+        query = self.mock_collection.where.return_value.where.return_value
+        docs = [mock.MagicMock() for _ in range(FIRESTORE_DELETE_BATCH_SIZE * 2 + 1)]
+        query.select.return_value.stream.return_value = iter(docs)
+        batches = [mock.MagicMock() for _ in range(3)]
+        self.mock_client.batch.side_effect = batches
+
+        self.firestore_client.delete_old_documents(
+            "clients", "US_XX", "__lastUpdated", datetime(2022, 1, 1)
+        )
+
+        # Only document references are read
+        query.select.assert_called_once_with([])
+        self.assertEqual(3, len(batches))
+        deleted_references: List[mock.MagicMock] = []
+        for batch in batches:
+            batch.commit.assert_called_once()
+            deleted_references.extend(
+                delete_call.args[0] for delete_call in batch.delete.call_args_list
+            )
+        self.assertCountEqual([doc.reference for doc in docs], deleted_references)
+
+
+class FirestoreBatchCommitterTest(unittest.TestCase):
+    """Tests for FirestoreBatchCommitter"""
+
+    def test_commits_all_batches(self) -> None:
+        batches = [mock.MagicMock() for _ in range(10)]
+
+        def batch_builder(
+            batch: mock.MagicMock,
+        ) -> Callable[[], Tuple[mock.MagicMock, int]]:
+            return lambda: (batch, 2)
+
+        with FirestoreBatchCommitter(
+            "clients", "written", max_in_flight=3
+        ) as committer:
+            for batch in batches:
+                committer.submit(batch_builder(batch))
+            # Empty batches are not committed
+            committer.submit(lambda: (mock.MagicMock(), 0))
+
+        self.assertEqual(20, committer.document_count)
+        for batch in batches:
+            batch.commit.assert_called_once()
+
+    def test_bounds_batches_in_flight(self) -> None:
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def build_batch() -> Tuple[mock.MagicMock, int]:
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return mock.MagicMock(), 1
+
+        with FirestoreBatchCommitter(
+            "clients", "written", max_in_flight=2
+        ) as committer:
+            for _ in range(10):
+                committer.submit(build_batch)
+
+        self.assertEqual(10, committer.document_count)
+        self.assertLessEqual(max_in_flight, 2)
+
+    def test_raises_commit_error(self) -> None:
+        failing_batch = mock.MagicMock()
+        failing_batch.commit.side_effect = ValueError("Commit failed")
+        with self.assertRaisesRegex(ValueError, "Commit failed"):
+            with FirestoreBatchCommitter("clients", "written") as committer:
+                committer.submit(lambda: (mock.MagicMock(), 1))
+                committer.submit(lambda: (failing_batch, 1))
@@ -221,6 +221,7 @@ class FakeDirectIngestRawFileImportManager(DirectIngestRawFileImportManager):
         fs: DirectIngestGCSFileSystem,
         temp_output_directory_path: GcsfsDirectoryPath,
         big_query_client: BigQueryClient,
+        max_in_flight_upload_chunks: int = 0,
     ):
         super().__init__(
             region=region,
@@ -230,6 +231,7 @@ class FakeDirectIngestRawFileImportManager(DirectIngestRawFileImportManager):
             region_raw_file_config=FakeDirectIngestRegionRawFileConfig(
                 region.region_code
             ),
+            max_in_flight_upload_chunks=max_in_flight_upload_chunks,
         )
         self.imported_paths: List[GcsfsFilePath] = []
 
@@ -0,0 +1,154 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for CompiledEntityTreeManifest."""
+import csv
+import datetime
+import os
+import unittest
+from typing import Any, Dict, List
+
+from recidiviz.common.constants.enum_overrides import EnumOverrides
+from recidiviz.common.constants.enum_parser import EnumParsingError
+from recidiviz.common.io.local_file_contents_handle import LocalFileContentsHandle
+from recidiviz.ingest.direct.ingest_mappings.compiled_ingest_view_manifest import (
+    CompiledEntityTreeManifest,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
+    DirectMappingFieldManifest,
+    EntityTreeManifest,
+    EnumMappingManifest,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_results_parser import (
+    IngestViewResultsParser,
+)
+from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
+from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_parser import (
+    ingest_view_files,
+    manifests,
+)
+from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_parser.fake_schema.entities import (
+    FakeGender,
+    FakePerson,
+)
+from recidiviz.tests.ingest.direct.ingest_mappings.ingest_view_results_parser_test import (
+    FakePersonFactory,
+    FakeSchemaIngestViewResultsParserDelegate,
+)
+
+
+def _read_rows(ingest_view_name: str) -> List[Dict[str, str]]:
+    contents_handle = LocalFileContentsHandle(
+        os.path.join(
+            os.path.dirname(ingest_view_files.__file__), f"{ingest_view_name}.csv"
+        ),
+        cleanup_file=False,
+    )
+    return list(csv.DictReader(contents_handle.get_contents_iterator()))
+
+
+class CompiledEntityTreeManifestTest(unittest.TestCase):
+    """Tests for CompiledEntityTreeManifest."""
+
+    def setUp(self) -> None:
+        self.parser = IngestViewResultsParser(
+            FakeSchemaIngestViewResultsParserDelegate(
+                DirectIngestInstance.SECONDARY,
+                is_production=False,
+                results_update_datetime=datetime.datetime(2022, 1, 1),
+            )
+        )
+
+    @staticmethod
+    def _build_all(build_fn: Any, rows: List[Dict[str, str]]) -> List[Any]:
+        """Builds results for each row, capturing any errors raised so that error
+        behavior can be compared as well.
+        """
+        results = []
+        for row in rows:
+            try:
+                results.append(build_fn(dict(row)))
+            except Exception as e:
+                results.append((type(e), str(e)))
+        return results
+
+    def test_compiled_matches_interpreted_for_all_fixtures(self) -> None:
+        manifests_dir = os.path.dirname(manifests.__file__)
+        ingest_view_files_dir = os.path.dirname(ingest_view_files.__file__)
+        num_compared = 0
+        for file_name in sorted(os.listdir(manifests_dir)):
+            ingest_view_name, extension = os.path.splitext(file_name)
+            if extension != ".yaml" or not os.path.exists(
+                os.path.join(ingest_view_files_dir, f"{ingest_view_name}.csv")
+            ):
+                continue
+            with self.subTest(ingest_view_name=ingest_view_name):
+                try:
+                    manifest, _ = self.parser.parse_manifest(
+                        os.path.join(manifests_dir, file_name)
+                    )
+                except Exception:
+                    # Some fixtures exercise manifest parsing errors
+                    continue
+                rows = _read_rows(ingest_view_name)
+                compiled_manifest = CompiledEntityTreeManifest(manifest)
+
+                self.assertEqual(
+                    self._build_all(manifest.build_from_row, rows),
+                    self._build_all(compiled_manifest.build_from_row, rows),
+                )
+                num_compared += 1
+
+        self.assertGreater(num_compared, 0)
+
+    def test_build_from_rows(self) -> None:
+        manifest, _ = self.parser.parse_manifest(
+            os.path.join(os.path.dirname(manifests.__file__), "simple_enums.yaml")
+        )
+        rows = _read_rows("simple_enums")
+        compiled_manifest = CompiledEntityTreeManifest(manifest)
+
+        self.assertEqual(
+            [manifest.build_from_row(dict(row)) for row in rows],
+            compiled_manifest.build_from_rows(dict(row) for row in rows),
+        )
+
+    def test_enum_parse_errors_not_cached(self) -> None:
+        manifest = EntityTreeManifest(
+            entity_cls=FakePerson,
+            entity_factory_cls=FakePersonFactory,
+            field_manifests={
+                "gender": EnumMappingManifest(
+                    enum_cls=FakeGender,
+                    enum_overrides=EnumOverrides.Builder()
+                    .add("M", FakeGender.MALE)
+                    .build(),
+                    raw_text_field_manifest=DirectMappingFieldManifest(
+                        mapped_column="GENDER"
+                    ),
+                ),
+            },
+            common_args={"fake_state_code": "US_XX"},
+        )
+        compiled_manifest = CompiledEntityTreeManifest(manifest)
+
+        for _ in range(2):
+            person = compiled_manifest.build_from_row({"GENDER": "M"})
+            assert isinstance(person, FakePerson)
+            self.assertEqual(FakeGender.MALE, person.gender)
+            for _ in range(2):
+                with self.assertRaises(EnumParsingError):
+                    compiled_manifest.build_from_row({"GENDER": "X"})
@@ -0,0 +1,221 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for IngestViewManifestCache and its use in IngestViewResultsParser."""
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Hashable, Optional
+from unittest.mock import patch
+
+from more_itertools import one
+
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_cache import (
+    IngestViewManifestCache,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_results_parser import (
+    IngestViewResultsParser,
+)
+from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
+from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_parser import (
+    manifests,
+)
+from recidiviz.tests.ingest.direct.ingest_mappings.ingest_view_results_parser_test import (
+    FakeSchemaIngestViewResultsParserDelegate,
+)
+from recidiviz.utils.yaml_dict import YAMLDict
+
+
+class _CacheableFakeDelegate(FakeSchemaIngestViewResultsParserDelegate):
+    cache_key: Hashable = "fake_schema"
+
+    def get_manifest_cache_key(self) -> Optional[Hashable]:
+        return self.cache_key
+
+
+class IngestViewManifestCacheTest(unittest.TestCase):
+    """Tests for IngestViewManifestCache and its use in IngestViewResultsParser."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.temp_dir, "simple_person.yaml")
+        shutil.copy(
+            os.path.join(os.path.dirname(manifests.__file__), "simple_person.yaml"),
+            self.manifest_path,
+        )
+        self.results_update_datetime = datetime.datetime(2022, 1, 1)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _build_parser(
+        self,
+        cache: IngestViewManifestCache,
+        cacheable: bool = True,
+        cache_key: Hashable = "fake_schema",
+    ) -> IngestViewResultsParser:
+        delegate: FakeSchemaIngestViewResultsParserDelegate
+        if cacheable:
+            delegate = _CacheableFakeDelegate(
+                DirectIngestInstance.SECONDARY,
+                is_production=False,
+                results_update_datetime=self.results_update_datetime,
+            )
+            delegate.cache_key = cache_key
+        else:
+            delegate = FakeSchemaIngestViewResultsParserDelegate(
+                DirectIngestInstance.SECONDARY,
+                is_production=False,
+                results_update_datetime=self.results_update_datetime,
+            )
+        return IngestViewResultsParser(delegate, manifest_cache=cache)
+
+    def test_parsed_manifest_shared_across_parsers(self) -> None:
+        cache = IngestViewManifestCache()
+        manifest_1, columns_1 = self._build_parser(cache).parse_manifest(
+            self.manifest_path
+        )
+        with patch.object(YAMLDict, "from_path") as mock_from_path:
+            manifest_2, columns_2 = self._build_parser(cache).parse_manifest(
+                self.manifest_path
+            )
+            mock_from_path.assert_not_called()
+
+        self.assertIs(manifest_1, manifest_2)
+        self.assertEqual(columns_1, columns_2)
+
+    def test_parsed_manifest_not_shared_without_cache_key(self) -> None:
+        cache = IngestViewManifestCache()
+        manifest_1, _ = self._build_parser(cache, cacheable=False).parse_manifest(
+            self.manifest_path
+        )
+        with patch.object(YAMLDict, "validate") as mock_validate:
+            manifest_2, _ = self._build_parser(cache, cacheable=False).parse_manifest(
+                self.manifest_path
+            )
+            # Contents have already been validated against the schema
+            mock_validate.assert_not_called()
+
+        self.assertIsNot(manifest_1, manifest_2)
+        self.assertEqual(manifest_1.field_manifests, manifest_2.field_manifests)
+
+    def test_parsed_manifest_not_shared_across_cache_keys(self) -> None:
+        cache = IngestViewManifestCache()
+        manifest_1, _ = self._build_parser(cache).parse_manifest(self.manifest_path)
+        manifest_2, _ = self._build_parser(
+            cache, cache_key="other_schema"
+        ).parse_manifest(self.manifest_path)
+
+        self.assertIsNot(manifest_1, manifest_2)
+
+    def test_parsed_manifest_shared_across_env_property_values(self) -> None:
+        cache = IngestViewManifestCache()
+        ingest_view_name = "string_datetime_env_property"
+        rows = [{"PERSONNAME": "ELAINE BENES", "TASK_DATE": "2022-01-01"}]
+
+        def parse_update_datetime(
+            results_update_datetime: datetime.datetime,
+        ) -> datetime.datetime:
+            self.results_update_datetime = results_update_datetime
+            parser = self._build_parser(cache)
+            person = one(
+                parser.parse(
+                    ingest_view_name=ingest_view_name, contents_iterator=iter(rows)
+                )
+            )
+            return one(person.task_deadlines).update_datetime  # type: ignore[attr-defined]
+
+        self.assertEqual(
+            datetime.datetime(2022, 1, 1),
+            parse_update_datetime(datetime.datetime(2022, 1, 1)),
+        )
+        with patch.object(YAMLDict, "from_path") as mock_from_path:
+            self.assertEqual(
+                datetime.datetime(2022, 2, 1),
+                parse_update_datetime(datetime.datetime(2022, 2, 1)),
+            )
+            mock_from_path.assert_not_called()
+
+    def test_parsed_manifests_bounded(self) -> None:
+        cache = IngestViewManifestCache(max_parsed_manifests=2)
+        manifest_1, _ = self._build_parser(cache, cache_key=1).parse_manifest(
+            self.manifest_path
+        )
+        self._build_parser(cache, cache_key=2).parse_manifest(self.manifest_path)
+        # Using the first manifest makes the second the least recently used
+        self.assertIs(
+            manifest_1,
+            self._build_parser(cache, cache_key=1).parse_manifest(self.manifest_path)[
+                0
+            ],
+        )
+        self._build_parser(cache, cache_key=3).parse_manifest(self.manifest_path)
+
+        self.assertIsNotNone(
+            cache.get_parsed_manifest(cache.content_hash(self.manifest_path), 1)
+        )
+        self.assertIsNone(
+            cache.get_parsed_manifest(cache.content_hash(self.manifest_path), 2)
+        )
+        self.assertIsNotNone(
+            cache.get_parsed_manifest(cache.content_hash(self.manifest_path), 3)
+        )
+
+    def test_modified_manifest_invalidates_cache(self) -> None:
+        cache = IngestViewManifestCache()
+        _, columns_1 = self._build_parser(cache).parse_manifest(self.manifest_path)
+
+        with open(self.manifest_path, encoding="utf-8") as f:
+            contents = f.read()
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            f.write(contents.replace("  - SSN\n", "  - SSN\n  - EXTRA_COL\n"))
+
+        _, columns_2 = self._build_parser(cache).parse_manifest(self.manifest_path)
+
+        self.assertEqual(columns_1 | {"EXTRA_COL"}, columns_2)
+
+    def test_disk_cache(self) -> None:
+        disk_cache_dir = os.path.join(self.temp_dir, "cache")
+        manifest_1, _ = self._build_parser(
+            IngestViewManifestCache(disk_cache_dir=disk_cache_dir)
+        ).parse_manifest(self.manifest_path)
+
+        with patch.object(YAMLDict, "from_path") as mock_from_path, patch.object(
+            YAMLDict, "validate"
+        ) as mock_validate:
+            manifest_2, _ = self._build_parser(
+                IngestViewManifestCache(disk_cache_dir=disk_cache_dir)
+            ).parse_manifest(self.manifest_path)
+            mock_from_path.assert_not_called()
+            mock_validate.assert_not_called()
+
+        self.assertEqual(manifest_1.field_manifests, manifest_2.field_manifests)
+
+    def test_corrupt_disk_cache_ignored(self) -> None:
+        disk_cache_dir = os.path.join(self.temp_dir, "cache")
+        cache = IngestViewManifestCache(disk_cache_dir=disk_cache_dir)
+        manifest_1, _ = self._build_parser(cache).parse_manifest(self.manifest_path)
+        for file_name in os.listdir(disk_cache_dir):
+            with open(os.path.join(disk_cache_dir, file_name), "wb") as f:
+                f.write(b"not a pickle")
+
+        manifest_2, _ = self._build_parser(
+            IngestViewManifestCache(disk_cache_dir=disk_cache_dir)
+        ).parse_manifest(self.manifest_path)
+
+        self.assertEqual(manifest_1.field_manifests, manifest_2.field_manifests)
@@ -0,0 +1,171 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for helpers in direct_ingest_raw_file_import_manager.py."""
+import datetime
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import parquet as pq
+
+from recidiviz.cloud_storage.gcsfs_csv_reader import (
+    EncodingDetectionMode,
+    GcsfsCsvReader,
+)
+from recidiviz.cloud_storage.gcsfs_csv_reader_delegates import ChunkFileFormat
+from recidiviz.cloud_storage.gcsfs_path import GcsfsDirectoryPath, GcsfsFilePath
+from recidiviz.ingest.direct.gcs.direct_ingest_gcs_file_system import (
+    DirectIngestGCSFileSystem,
+)
+from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
+    DirectIngestRawDataSplittingGcsfsCsvReaderDelegate,
+    DirectIngestRegionRawFileConfig,
+    strip_whitespace_and_filter_empty_rows,
+)
+from recidiviz.persistence.entity.operations.entities import DirectIngestRawFileMetadata
+from recidiviz.tests.cloud_storage.fake_gcs_file_system import FakeGCSFileSystem
+from recidiviz.tests.ingest.direct import fake_regions as fake_regions_module
+
+
+class DirectIngestRawFileConfigEncodingDetectionModeTest(unittest.TestCase):
+    """Tests for parsing the encoding_detection_mode of raw file configs."""
+
+    def test_encoding_detection_mode(self) -> None:
+        region_config = DirectIngestRegionRawFileConfig(
+            region_code="us_xx",
+            region_module=fake_regions_module,
+        )
+
+        # Files use their configured encoding unless they opt in to detection
+        self.assertEqual(
+            EncodingDetectionMode.NONE,
+            region_config.raw_file_configs["tagBasicData"].encoding_detection_mode,
+        )
+        self.assertEqual(
+            EncodingDetectionMode.SAMPLE,
+            region_config.raw_file_configs[
+                "tagDoubleDaggerWINDOWS1252"
+            ].encoding_detection_mode,
+        )
+        self.assertIsNone(
+            region_config.default_config().default_encoding_detection_mode
+        )
+
+
+class StripWhitespaceAndFilterEmptyRowsTest(unittest.TestCase):
+    """Tests for strip_whitespace_and_filter_empty_rows()."""
+
+    def test_strip_and_filter(self) -> None:
+        df = pd.DataFrame(
+            {
+                "COL_1": [" a ", "", "  ", "b\t"],
+                "COL_2": ["1", " ", "", " 2"],
+            },
+            index=[10, 11, 12, 13],
+        )
+
+        result = strip_whitespace_and_filter_empty_rows(df)
+
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(
+                {"COL_1": ["a", "b"], "COL_2": ["1", "2"]},
+                index=[10, 13],
+                dtype=object,
+            ),
+            result,
+        )
+
+    def test_strip_and_filter_partially_empty_row_kept(self) -> None:
+        df = pd.DataFrame({"COL_1": ["  ", "x"], "COL_2": ["y", "  "]})
+
+        result = strip_whitespace_and_filter_empty_rows(df)
+
+        pd.testing.assert_frame_equal(
+            pd.DataFrame({"COL_1": ["", "x"], "COL_2": ["y", ""]}, dtype=object),
+            result,
+        )
+
+    def test_strip_and_filter_empty_chunk(self) -> None:
+        df = pd.DataFrame({"COL_1": pd.Series([], dtype=object)})
+
+        result = strip_whitespace_and_filter_empty_rows(df)
+
+        self.assertEqual(["COL_1"], list(result.columns))
+        self.assertTrue(result.empty)
+
+
+class DirectIngestRawDataSplittingGcsfsCsvReaderDelegateTest(unittest.TestCase):
+    """Tests for DirectIngestRawDataSplittingGcsfsCsvReaderDelegate."""
+
+    def setUp(self) -> None:
+        self.fake_gcs = FakeGCSFileSystem()
+        self.fs = DirectIngestGCSFileSystem(self.fake_gcs)
+        self.path = GcsfsFilePath.from_absolute_path(
+            "gs://bucket-us-xx/unprocessed_2021-09-21T00:00:00:000000_raw_tagA.csv"
+        )
+        self.fake_gcs.upload_from_string(
+            self.path, "COL_1,COL_2\na,b\nc,\ne,f\n", "text/csv"
+        )
+        self.file_metadata = DirectIngestRawFileMetadata(
+            file_id=123,
+            region_code="us_xx",
+            file_tag="tagA",
+            normalized_file_name=self.path.file_name,
+            discovery_time=datetime.datetime(2021, 9, 21),
+            processed_time=None,
+            datetimes_contained_upper_bound_inclusive=datetime.datetime(2021, 9, 21),
+        )
+
+    def test_parquet_output(self) -> None:
+        delegate = DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
+            self.path,
+            self.fs,
+            self.file_metadata,
+            GcsfsDirectoryPath.from_absolute_path("gs://temp-bucket"),
+            output_format=ChunkFileFormat.PARQUET,
+        )
+        GcsfsCsvReader(self.fake_gcs).streaming_read(
+            self.path, delegate=delegate, chunk_size=2, keep_default_na=False
+        )
+
+        self.assertEqual(
+            [
+                "temp-bucket/temp_unprocessed_2021-09-21T00:00:00:000000_raw_tagA_0.parquet",
+                "temp-bucket/temp_unprocessed_2021-09-21T00:00:00:000000_raw_tagA_1.parquet",
+            ],
+            [p.abs_path() for p in delegate.output_paths],
+        )
+
+        table = pq.read_table(
+            self.fake_gcs.real_absolute_path_for_path(delegate.output_paths[0])
+        )
+        output_columns = delegate.output_columns
+        if output_columns is None:
+            self.fail("Expected output_columns to be set.")
+        self.assertEqual(output_columns, table.schema.names)
+        self.assertEqual(
+            [pa.string()] * (len(table.schema) - 2) + [pa.int64(), pa.timestamp("us")],
+            table.schema.types,
+        )
+        # Empty cells are written as nulls, as they are loaded from the CSV output
+        self.assertEqual(["b", None], table.column(output_columns[1]).to_pylist())
+        df = table.to_pandas()
+        self.assertEqual([123, 123], df["file_id"].tolist())
+        self.assertEqual(
+            [datetime.datetime(2021, 9, 21)] * 2,
+            df["update_datetime"].dt.to_pydatetime().tolist(),
+        )
@@ -17,6 +17,7 @@
 """Implements tests for Justice Counts Control Panel bulk upload functionality."""
 
 import os
+import tempfile
 from typing import Dict, cast
 
 import pandas as pd
@@ -261,6 +262,101 @@ class TestJusticeCountsBulkUpload(JusticeCountsDatabaseTestCase):
             reports_by_instance = {report.instance: report for report in reports}
             self._test_prosecution(reports_by_instance=reports_by_instance)
 
+    def test_prosecution_dry_run(self) -> None:
+        """Plan a bulk upload of prosecution metrics without saving it, then save it."""
+        with SessionFactory.using_database(self.database_key) as session:
+            user_account = UserAccountInterface.get_user_by_id(
+                session=session, user_account_id=self.user_account_id
+            )
+            plan, filename_to_error = self.uploader.plan_directory(
+                session=session,
+                directory=self.prosecution_directory,
+                agency_id=self.prosecution_agency_id,
+                system=schema.System.PROSECUTION,
+                user_account=user_account,
+            )
+
+            self.assertEqual({}, filename_to_error)
+            self.assertEqual(5, len(plan.new_report_time_ranges))
+            changes = plan.changes
+            self.assertTrue(len(changes) > 0)
+            for change in changes:
+                self.assertIsNone(change.datapoint_id)
+                self.assertIsNone(change.old_value)
+            # Nothing is saved until the plan is applied
+            self.assertEqual(
+                [],
+                ReportInterface.get_reports_by_agency_id(
+                    session=session, agency_id=self.prosecution_agency_id
+                ),
+            )
+            self.assertEqual(0, session.query(schema.Datapoint).count())
+
+            plan.apply(session)
+
+            reports = ReportInterface.get_reports_by_agency_id(
+                session=session,
+                agency_id=self.prosecution_agency_id,
+                include_datapoints=True,
+            )
+            reports_by_instance = {report.instance: report for report in reports}
+            self._test_prosecution(reports_by_instance=reports_by_instance)
+            self.assertEqual(len(changes), session.query(schema.Datapoint).count())
+            for report in reports:
+                self.assertEqual(schema.ReportStatus.DRAFT, report.status)
+                self.assertEqual([self.user_account_id], report.modified_by)
+
+            # Re-uploading the same data doesn't change anything
+            plan, _ = self.uploader.plan_directory(
+                session=session,
+                directory=self.prosecution_directory,
+                agency_id=self.prosecution_agency_id,
+                system=schema.System.PROSECUTION,
+                user_account=user_account,
+            )
+            self.assertEqual([], plan.new_report_time_ranges)
+            self.assertEqual([], plan.changes)
+
+    def test_plan_discards_changes_from_failed_file(self) -> None:
+        """If an error is encountered partway through planning a file, none of that
+        file's changes are added to the plan."""
+        with SessionFactory.using_database(
+            self.database_key
+        ) as session, tempfile.TemporaryDirectory() as directory:
+            user_account = UserAccountInterface.get_user_by_id(
+                session=session, user_account_id=self.user_account_id
+            )
+            # Two reports for the same time range can't be updated
+            duplicate_reports = [
+                ReportInterface.create_report_object(
+                    agency_id=self.prosecution_agency_id,
+                    user_account_id=self.user_account_id,
+                    year=2021,
+                    month=2,
+                    frequency=schema.ReportingFrequency.MONTHLY.value,
+                )
+                for _ in range(2)
+            ]
+            duplicate_reports[1].instance = "duplicate"
+            session.add_all(duplicate_reports)
+            session.commit()
+            with open(
+                os.path.join(directory, "cases_declined.csv"), "w", encoding="utf-8"
+            ) as f:
+                f.write("year,month,value\n2021,1,100\n2021,2,200\n")
+
+            plan, filename_to_error = self.uploader_catch_errors.plan_directory(
+                session=session,
+                directory=directory,
+                agency_id=self.prosecution_agency_id,
+                system=schema.System.PROSECUTION,
+                user_account=user_account,
+            )
+
+            self.assertEqual(["cases_declined.csv"], list(filename_to_error.keys()))
+            self.assertEqual([], plan.new_report_time_ranges)
+            self.assertEqual([], plan.changes)
+
     def test_prosecution_excel(self) -> None:
         """Bulk upload prosecution metrics from excel spreadsheet."""
 
@@ -18,7 +18,7 @@
 """Tests for optimized_metric_big_query_view_exporter.py."""
 
 import unittest
-from typing import Any, Callable, Dict, List, Set
+from typing import Any, Callable, Dict, List
 
 from google.cloud import bigquery
 from mock import call, create_autospec, patch
@@ -38,7 +38,7 @@ from recidiviz.metrics.export.optimized_metric_big_query_view_exporter import (
 )
 from recidiviz.metrics.metric_big_query_view import MetricBigQueryViewBuilder
 
-_DATA_POINTS = [
+_DATA_POINTS: List[Dict[str, Any]] = [
     {
         "district": "4",
         "year": 2020,
@@ -136,50 +136,69 @@ _DATA_VALUES = [
 ]
 
 
-class PlaceInCompactMatrixTest(unittest.TestCase):
-    """Tests for place_in_compact_matrix"""
+class CompactMatrixBuilderTest(unittest.TestCase):
+    """Tests for _CompactMatrixBuilder"""
 
-    @staticmethod
-    def _create_new_data_values() -> List[List[int]]:
-        return [[], [], [], [], []]
-
-    def test_place_happy_path_single_value(self) -> None:
-        fresh_data_values = self._create_new_data_values()
-        optimized_metric_big_query_view_exporter.place_in_compact_matrix(
-            _DATA_POINTS[3],
-            fresh_data_values,
-            _VALUE_KEYS,
-            _DIMENSION_MANIFEST,
+    # pylint: disable=protected-access
+    def test_build_happy_path(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), _VALUE_KEYS
         )
-        self.assertEqual([[1], [0], [1], [0], [41]], fresh_data_values)
-
-        optimized_metric_big_query_view_exporter.place_in_compact_matrix(
-            _DATA_POINTS[8],
-            fresh_data_values,
-            _VALUE_KEYS,
-            _DIMENSION_MANIFEST,
+        builder.add_rows(
+            [transform_dict_to_bigquery_row(data_point) for data_point in _DATA_POINTS]
         )
-        self.assertEqual([[1, 1], [0, 1], [1, 1], [0, 0], [41, 38]], fresh_data_values)
-
-    def test_place_each_data_point_single_value(self) -> None:
-        fresh_data_values = self._create_new_data_values()
-        for data_point in _DATA_POINTS:
-            optimized_metric_big_query_view_exporter.place_in_compact_matrix(
-                data_point,
-                fresh_data_values,
-                _VALUE_KEYS,
-                _DIMENSION_MANIFEST,
-            )
 
-        self.assertEqual(_DATA_VALUES, fresh_data_values)
+        self.assertEqual((_DIMENSION_MANIFEST, _DATA_VALUES), builder.build())
+
+    def test_build_multiple_pages(self) -> None:
+        dimension_keys = ("district", "year", "month", "supervision_type")
+        value_keys = ["total_revocations", "total_supervision"]
+        # Reverse the data points so that values are first seen out of sorted order
+        data_points: List[Dict[str, Any]] = list(reversed(_DATA_POINTS)) + [
+            {
+                "district": None,
+                "year": 2019,
+                "month": 1,
+                "supervision_type": "Dual",
+                "total_revocations": 7,
+                "total_supervision": 12,
+            },
+        ]
 
-    def test_place_each_data_point_multi_value(self) -> None:
-        multi_data_points: List[Dict[str, Any]] = []
-        for dp in _DATA_POINTS:
-            data_point: Dict[str, Any] = {"total_population": 100}
-            multi_data_points.append({**dp, **data_point})
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            dimension_keys, value_keys
+        )
+        builder.add_rows(data_points[:4])
+        builder.add_rows(data_points[4:])
+
+        expected_dimension_manifest = [
+            ("district", ["4", "5", "6", "none"]),
+            ("month", ["1", "11", "12"]),
+            ("supervision_type", ["dual", "parole", "probation"]),
+            ("year", ["2019", "2020"]),
+        ]
+        expected_data_values = [
+            [2, 2, 1, 1, 0, 0, 2, 1, 1, 0, 0, 3],
+            [2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 0],
+            [2, 1, 2, 1, 2, 1, 1, 2, 1, 2, 1, 0],
+            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0],
+            [4, 15, 38, 51, 36, 30, 10, 41, 73, 68, 100, 7],
+            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 12],
+        ]
 
-        multi_value_keys = ["total_population", "total_revocations"]
+        self.assertEqual(
+            (expected_dimension_manifest, expected_data_values), builder.build()
+        )
+
+    def test_build_multi_value(self) -> None:
+        multi_data_points: List[Dict[str, Any]] = [
+            {**data_point, "total_population": 100} for data_point in _DATA_POINTS
+        ]
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"),
+            ["total_population", "total_revocations"],
+        )
+        builder.add_rows(multi_data_points)
 
         expected = [
             [0, 0, 1, 1, 2, 0, 0, 1, 1, 2, 2],
@@ -190,240 +209,168 @@ class PlaceInCompactMatrixTest(unittest.TestCase):
             [100, 68, 73, 41, 10, 30, 36, 51, 38, 15, 4],
         ]
 
-        fresh_data_values = self._create_new_data_values()
-        fresh_data_values.append([])  # Add one more for this test case
-        for data_point in multi_data_points:
-            optimized_metric_big_query_view_exporter.place_in_compact_matrix(
-                data_point,
-                fresh_data_values,
-                multi_value_keys,
-                _DIMENSION_MANIFEST,
-            )
+        self.assertEqual((_DIMENSION_MANIFEST, expected), builder.build())
 
-        self.assertEqual(expected, fresh_data_values)
-
-    def test_place_value_not_in_dataset(self) -> None:
-        fresh_data_values = self._create_new_data_values()
-        new_data_point = {
-            "district": "6",
-            "year": 2020,
-            "month": 11,
-            "supervision_type": "PROBATION",
-            "other_value": 5,
-        }
-        optimized_metric_big_query_view_exporter.place_in_compact_matrix(
-            new_data_point,
-            fresh_data_values,
-            _VALUE_KEYS,
-            _DIMENSION_MANIFEST,
+    def test_build_subset_of_rows(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), _VALUE_KEYS
         )
-        self.assertEqual([[2], [0], [1], [0], [0]], fresh_data_values)
-
-    def test_place_dimensions_not_in_dataset(self) -> None:
-        fresh_data_values = self._create_new_data_values()
-        with self.assertRaisesRegex(KeyError, "month: 5"):
-            new_data_point = {
-                "district": "4",
-                "year": 2020,
-                "month": 5,
-                "supervision_type": "PAROLE",
-                "total_revocations": 10,
-            }
-            optimized_metric_big_query_view_exporter.place_in_compact_matrix(
-                new_data_point,
-                fresh_data_values,
-                _VALUE_KEYS,
-                _DIMENSION_MANIFEST,
-            )
+        builder.add_rows([_DATA_POINTS[3], _DATA_POINTS[8]])
 
+        expected_dimension_manifest = [
+            ("district", ["5"]),
+            ("month", ["11", "12"]),
+            ("supervision_type", ["probation"]),
+            ("year", ["2020"]),
+        ]
+        expected_data_values = [[0, 0], [0, 1], [0, 0], [0, 0], [41, 38]]
 
-class AddToManifestTest(unittest.TestCase):
-    """Tests for add_to_dimension_manifest"""
-
-    def test_add_all_new_dimensions(self) -> None:
-        data_point = _DATA_POINTS[2]
-        fresh_manifest: Dict[str, Set[str]] = {
-            "district": set(),
-            "month": set(),
-            "supervision_type": set(),
-            "year": set(),
-        }
-
-        expected = {
-            "district": {"5"},
-            "month": {"11"},
-            "supervision_type": {"parole"},
-            "year": {"2020"},
-        }
-
-        updated_manifest = (
-            optimized_metric_big_query_view_exporter.add_to_dimension_manifest(
-                data_point, fresh_manifest
-            )
-        )
-        self.assertEqual(expected, updated_manifest)
-
-    def test_add_to_existing_dimensions(self) -> None:
-        data_point = _DATA_POINTS[2]
-        existing_manifest: Dict[str, Set[str]] = {
-            "district": {"4"},
-            "month": {"11"},
-            "supervision_type": {"parole", "probation"},
-            "year": {"2020"},
-        }
-
-        expected = {
-            "district": {"4", "5"},
-            "month": {"11"},
-            "supervision_type": {"parole", "probation"},
-            "year": {"2020"},
-        }
-
-        updated_manifest = (
-            optimized_metric_big_query_view_exporter.add_to_dimension_manifest(
-                data_point, existing_manifest
-            )
+        self.assertEqual(
+            (expected_dimension_manifest, expected_data_values), builder.build()
         )
-        self.assertEqual(expected, updated_manifest)
-
-    def test_add_data_point_with_empty_values(self) -> None:
-        data_point = {
-            "district": None,
-            "month": None,
-            "supervision_type": None,
-            "year": None,
-        }
-
-        existing_manifest: Dict[str, Set[str]] = {
-            "district": {"4"},
-            "month": {"11"},
-            "supervision_type": {"parole", "probation"},
-            "year": {"2020"},
-        }
-
-        expected: Dict[str, Set[str]] = {
-            "district": {"4", "none"},
-            "month": {"11", "none"},
-            "supervision_type": {"parole", "probation", "none"},
-            "year": {"2020", "none"},
-        }
-
-        updated_manifest = (
-            optimized_metric_big_query_view_exporter.add_to_dimension_manifest(
-                data_point, existing_manifest
-            )
+
+    def test_build_adds_to_existing_dimension_values(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), _VALUE_KEYS
         )
-        self.assertEqual(expected, updated_manifest)
+        builder.add_rows([_DATA_POINTS[2]])
 
-    def test_add_empty_data_point(self) -> None:
-        data_point: Dict[str, Any] = {}
-        existing_manifest: Dict[str, Set[str]] = {
-            "district": {"4"},
-            "month": {"11"},
-            "supervision_type": {"parole", "probation"},
-            "year": {"2020"},
-        }
+        self.assertEqual(
+            (
+                [
+                    ("district", ["5"]),
+                    ("month", ["11"]),
+                    ("supervision_type", ["parole"]),
+                    ("year", ["2020"]),
+                ],
+                [[0], [0], [0], [0], [73]],
+            ),
+            builder.build(),
+        )
 
-        with self.assertRaises(KeyError):
-            optimized_metric_big_query_view_exporter.add_to_dimension_manifest(
-                data_point, existing_manifest
-            )
+        builder.add_rows([_DATA_POINTS[0], _DATA_POINTS[1]])
 
+        self.assertEqual(
+            (
+                [
+                    ("district", ["4", "5"]),
+                    ("month", ["11"]),
+                    ("supervision_type", ["parole", "probation"]),
+                    ("year", ["2020"]),
+                ],
+                [[1, 0, 0], [0, 0, 0], [0, 0, 1], [0, 0, 0], [73, 100, 68]],
+            ),
+            builder.build(),
+        )
 
-class TransformManifestTest(unittest.TestCase):
-    """Tests for transform_dimension_manifest"""
+    def test_build_with_other_types(self) -> None:
+        data_points: List[Dict[str, Any]] = [
+            {
+                **data_point,
+                "district": int(data_point["district"]),
+                "year": str(data_point["year"]),
+            }
+            for data_point in _DATA_POINTS
+        ]
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), _VALUE_KEYS
+        )
+        builder.add_rows(data_points)
 
-    def test_transform_happy_path(self) -> None:
-        dimensions_as_dictionary = {
-            "district": {"6", "5", "4"},
-            "year": {"2020"},
-            "supervision_type": {"probation", "parole"},
-            "month": {"11", "12"},
-        }
+        self.assertEqual((_DIMENSION_MANIFEST, _DATA_VALUES), builder.build())
 
-        dimension_manifest = optimized_metric_big_query_view_exporter.transform_manifest_to_order_enforced_form(
-            dimensions_as_dictionary
-        )
-        self.assertEqual(_DIMENSION_MANIFEST, dimension_manifest)
-
-    def test_transform_with_other_types(self) -> None:
-        dimensions_as_dictionary = {
-            "district": {"6", "5", "4"},
-            "year": {"2020"},
-            "supervision_type": {"probation", "parole"},
-            "month": {"11", "12"},
-        }
-
-        dimension_manifest = optimized_metric_big_query_view_exporter.transform_manifest_to_order_enforced_form(
-            dimensions_as_dictionary
+    def test_build_with_nones(self) -> None:
+        data_points: List[Dict[str, Any]] = _DATA_POINTS + [
+            {
+                "district": "ALL",
+                "year": 2020,
+                "month": 12,
+                "supervision_type": None,
+                "total_revocations": 255,
+            },
+        ]
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), _VALUE_KEYS
         )
-        self.assertEqual(_DIMENSION_MANIFEST, dimension_manifest)
-
-    def test_transform_with_nones(self) -> None:
-        dimensions_as_dictionary = {
-            "district": {"all", "6", "5", "4"},
-            "year": {"2020"},
-            "supervision_type": {"probation", "parole", "none"},
-            "month": {"11", "12"},
-        }
+        builder.add_rows(data_points)
 
-        expected = [
+        expected_dimension_manifest = [
             ("district", ["4", "5", "6", "all"]),
             ("month", ["11", "12"]),
             ("supervision_type", ["none", "parole", "probation"]),
             ("year", ["2020"]),
         ]
+        expected_data_values = [
+            [0, 0, 1, 1, 2, 0, 0, 1, 1, 2, 2, 3],
+            [0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1],
+            [1, 2, 1, 2, 1, 1, 2, 1, 2, 1, 2, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+            [100, 68, 73, 41, 10, 30, 36, 51, 38, 15, 4, 255],
+        ]
 
-        dimension_manifest = optimized_metric_big_query_view_exporter.transform_manifest_to_order_enforced_form(
-            dimensions_as_dictionary
+        self.assertEqual(
+            (expected_dimension_manifest, expected_data_values), builder.build()
         )
-        self.assertEqual(expected, dimension_manifest)
 
-    def test_transform_empty(self) -> None:
-        dimension_manifest = optimized_metric_big_query_view_exporter.transform_manifest_to_order_enforced_form(
-            {}
+    def test_build_value_not_in_row(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), _VALUE_KEYS
+        )
+        builder.add_rows(
+            [
+                {
+                    "district": "6",
+                    "year": 2020,
+                    "month": 11,
+                    "supervision_type": "PROBATION",
+                    "other_value": 5,
+                }
+            ]
         )
-        self.assertEqual([], dimension_manifest)
 
+        self.assertEqual(
+            (
+                [
+                    ("district", ["6"]),
+                    ("month", ["11"]),
+                    ("supervision_type", ["probation"]),
+                    ("year", ["2020"]),
+                ],
+                [[0], [0], [0], [0], [0]],
+            ),
+            builder.build(),
+        )
 
-class GetRowValuesTest(unittest.TestCase):
-    """Tests for get_row_values"""
+    def test_build_no_rows(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district",), _VALUE_KEYS
+        )
 
-    def test_transform_happy_path_single_value(self) -> None:
-        data_point = _DATA_POINTS[1]
-        value_keys = ["total_revocations"]
+        self.assertEqual(([("district", [])], [[], []]), builder.build())
 
-        expected = [data_point["total_revocations"]]
-        self.assertEqual(
-            expected,
-            optimized_metric_big_query_view_exporter.get_row_values(
-                data_point, value_keys
-            ),
+    def test_build_no_value_keys(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "year", "month", "supervision_type"), []
         )
+        builder.add_rows(_DATA_POINTS)
 
-    def test_transform_happy_path_multi_value(self) -> None:
-        data_point: Dict[str, Any] = {**_DATA_POINTS[1], "total_population": 752}
-        value_keys = ["total_population", "total_revocations"]
+        self.assertEqual((_DIMENSION_MANIFEST, _DATA_VALUES[:-1]), builder.build())
 
-        expected = [752, 68]
-        self.assertEqual(
-            expected,
-            optimized_metric_big_query_view_exporter.get_row_values(
-                data_point, value_keys
-            ),
+    def test_build_no_dimensions(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            (), _VALUE_KEYS
         )
 
-    def test_transform_no_value_keys(self) -> None:
-        data_point = _DATA_POINTS[1]
-        value_keys: List[str] = []
+        self.assertEqual(([], [[]]), builder.build())
 
-        self.assertEqual(
-            [],
-            optimized_metric_big_query_view_exporter.get_row_values(
-                data_point, value_keys
-            ),
+    def test_build_missing_dimension(self) -> None:
+        builder = optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+            ("district", "gender"), _VALUE_KEYS
         )
 
+        with self.assertRaises(KeyError):
+            builder.add_rows([_DATA_POINTS[0]])
+
 
 class ConvertQueryResultsTest(unittest.TestCase):
     """Tests for convert_query_results_to_optimized_value_matrix"""
@@ -459,10 +406,7 @@ class ConvertQueryResultsTest(unittest.TestCase):
         ]
 
         mock_query_job = create_autospec(bigquery.QueryJob)
-        mock_query_job.result.side_effect = [
-            all_rows,
-            all_rows,
-        ]
+        mock_query_job.result.side_effect = [all_rows]
 
         def fake_paged_process_fn(
             query_job: bigquery.QueryJob,
@@ -510,40 +454,37 @@ class ConvertQueryResultsTest(unittest.TestCase):
 
         self.assertEqual(expected, optimized_representation)
 
+        # Query results are only read once
         mock_query_job.result.assert_has_calls(
             [
                 call(
                     max_results=optimized_metric_big_query_view_exporter.QUERY_PAGE_SIZE,
                     start_index=0,
                 ),
-                call(
-                    max_results=optimized_metric_big_query_view_exporter.QUERY_PAGE_SIZE,
-                    start_index=0,
-                ),
             ]
         )
 
-        mock_bq_client.paged_read_and_process.assert_called()
+        mock_bq_client.paged_read_and_process.assert_called_once()
         mock_bq_client.dataset_ref_for_id.assert_called()
         mock_bq_client.get_table.assert_called()
 
 
-class TestInitializeDimensionManifest(unittest.TestCase):
-    """Tests the _initialize_dimension_manifest function."""
+class TestCompactMatrixBuilderDimensionKeys(unittest.TestCase):
+    """Tests the dimension keys used by _CompactMatrixBuilder for exported metric views."""
 
     # pylint: disable=protected-access
-    def test_initialize_dimension_manifest(self) -> None:
+    def test_dimension_keys(self) -> None:
         for export_config in VIEW_COLLECTION_EXPORT_INDEX.values():
             for view_builder in export_config.view_builders_to_export:
                 if isinstance(view_builder, MetricBigQueryViewBuilder):
-                    dimension_manifest = optimized_metric_big_query_view_exporter._initialize_dimension_manifest(
-                        view_builder.dimensions
+                    builder = (
+                        optimized_metric_big_query_view_exporter._CompactMatrixBuilder(
+                            view_builder.dimensions, []
+                        )
                     )
-                    dimension_manifest_keys = list(dimension_manifest.keys())
+                    dimension_keys = [key for key, _ in builder.build()[0]]
 
-                    self.assertEqual(
-                        list(view_builder.dimensions), dimension_manifest_keys
-                    )
+                    self.assertEqual(sorted(view_builder.dimensions), dimension_keys)
                     # Makes sure that all of the dimensions are the full dimension column
                     # string, and that the dimensions haven't been split into chars
-                    self.assertNotIn("_", dimension_manifest_keys)
+                    self.assertNotIn("_", dimension_keys)
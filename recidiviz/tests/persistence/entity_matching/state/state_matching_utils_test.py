@@ -16,6 +16,7 @@
 # =============================================================================
 """Tests for state_matching_utils.py"""
 import datetime
+from typing import List
 
 from recidiviz.common.constants.state.state_charge import StateChargeStatus
 from recidiviz.common.constants.state.state_incarceration import StateIncarcerationType
@@ -23,7 +24,7 @@ from recidiviz.common.constants.state.state_incarceration_period import (
     StateIncarcerationPeriodAdmissionReason,
     is_commitment_from_supervision,
 )
-from recidiviz.common.constants.state.state_person import StateGender
+from recidiviz.common.constants.state.state_person import StateGender, StateRace
 from recidiviz.common.constants.state.state_sentence import StateSentenceStatus
 from recidiviz.common.constants.state.state_task_deadline import StateTaskType
 from recidiviz.persistence.database.database_entity import DatabaseEntity
@@ -35,16 +36,19 @@ from recidiviz.persistence.database.schema_utils import get_state_database_entit
 from recidiviz.persistence.entity.base_entity import Entity
 from recidiviz.persistence.entity.entity_utils import (
     CoreEntityFieldIndex,
+    EntityFieldType,
     is_placeholder,
 )
 from recidiviz.persistence.entity_matching.entity_matching_types import EntityTree
 from recidiviz.persistence.entity_matching.state.state_matching_utils import (
+    EntityTreeMatchIndex,
     _is_match,
     add_child_to_entity,
     can_atomically_merge_entity,
     generate_child_entity_trees,
     get_all_entity_trees_of_cls,
     get_all_person_external_ids,
+    is_match,
     merge_flat_fields,
     nonnull_fields_entity_match,
     remove_child_from_entity,
@@ -304,6 +308,115 @@ class TestStateMatchingUtils(BaseStateMatchingUtilsTest):
             )
         )
 
+    def test_entityTreeMatchIndex_externalId(self) -> None:
+        db_charge = schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID)
+        db_charge_2 = schema.StateCharge(
+            state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2
+        )
+        db_placeholder_charge = schema.StateCharge(state_code=_STATE_CODE)
+        db_trees = [
+            EntityTree(entity=db_charge, ancestor_chain=[]),
+            EntityTree(entity=db_charge_2, ancestor_chain=[]),
+            EntityTree(entity=db_placeholder_charge, ancestor_chain=[]),
+        ]
+        index = EntityTreeMatchIndex(db_trees)
+
+        ingested_charge = schema.StateCharge(
+            state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2
+        )
+        self.assertEqual(
+            [db_trees[1]],
+            index.get_candidates(EntityTree(entity=ingested_charge, ancestor_chain=[])),
+        )
+
+        # Entities without external ids are compared against all DB entities
+        ingested_placeholder_charge = schema.StateCharge(state_code=_STATE_CODE)
+        self.assertEqual(
+            db_trees,
+            index.get_candidates(
+                EntityTree(entity=ingested_placeholder_charge, ancestor_chain=[])
+            ),
+        )
+
+        # Re-indexing picks up external id changes and preserves the original order
+        db_placeholder_charge.external_id = _EXTERNAL_ID_2
+        index.update_entity(db_placeholder_charge)
+        self.assertEqual(
+            [db_trees[1], db_trees[2]],
+            index.get_candidates(EntityTree(entity=ingested_charge, ancestor_chain=[])),
+        )
+
+    def test_entityTreeMatchIndex_candidatesIncludeAllMatches(self) -> None:
+        entity_groups: List[List[DatabaseEntity]] = [
+            [
+                schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID),
+                schema.StateCharge(state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2),
+                schema.StateCharge(
+                    state_code=_STATE_CODE_ANOTHER, external_id=_EXTERNAL_ID
+                ),
+                schema.StateCharge(state_code=_STATE_CODE),
+                schema.StateCharge(state_code=_STATE_CODE, description="description"),
+            ],
+            [
+                schema.StatePersonExternalId(
+                    state_code=_STATE_CODE, external_id=_EXTERNAL_ID, id_type=_ID_TYPE
+                ),
+                schema.StatePersonExternalId(
+                    state_code=_STATE_CODE,
+                    external_id=_EXTERNAL_ID,
+                    id_type=_ID_TYPE_ANOTHER,
+                ),
+                schema.StatePersonExternalId(
+                    state_code=_STATE_CODE, external_id=_EXTERNAL_ID_2, id_type=_ID_TYPE
+                ),
+            ],
+            [
+                schema.StatePersonAlias(state_code=_STATE_CODE, full_name="name"),
+                schema.StatePersonAlias(state_code=_STATE_CODE, full_name="name_2"),
+                schema.StatePersonAlias(state_code=_STATE_CODE),
+            ],
+            [
+                schema.StatePersonRace(state_code=_STATE_CODE, race=StateRace.WHITE),
+                schema.StatePersonRace(state_code=_STATE_CODE, race=StateRace.ASIAN),
+            ],
+            [
+                schema.StateTaskDeadline(
+                    state_code=_STATE_CODE, task_type=StateTaskType.DRUG_SCREEN
+                ),
+                schema.StateTaskDeadline(
+                    state_code=_STATE_CODE, task_type=StateTaskType.HOME_VISIT
+                ),
+            ],
+        ]
+        for entities in entity_groups:
+            db_trees = [EntityTree(entity=e, ancestor_chain=[]) for e in entities]
+            index = EntityTreeMatchIndex(db_trees)
+            for ingested_entity in entities:
+                ingested_tree = EntityTree(
+                    entity=ingested_entity.__class__(
+                        **{
+                            field: ingested_entity.get_field(field)
+                            for field in self.field_index.get_fields_with_non_empty_values(
+                                ingested_entity, EntityFieldType.FLAT_FIELD
+                            )
+                        }
+                    ),
+                    ancestor_chain=[],
+                )
+                expected_matches = [
+                    db_tree
+                    for db_tree in db_trees
+                    if is_match(ingested_tree, db_tree, self.field_index)
+                ]
+                self.assertEqual(
+                    expected_matches,
+                    [
+                        db_tree
+                        for db_tree in index.get_candidates(ingested_tree)
+                        if is_match(ingested_tree, db_tree, self.field_index)
+                    ],
+                )
+
     def test_mergeFlatFields_twoDbEntities(self) -> None:
         to_entity = schema.StateIncarcerationSentence(
             state_code=_STATE_CODE,
@@ -0,0 +1,97 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for prefetch.py."""
+import threading
+import time
+import unittest
+from typing import Iterator, List
+
+from recidiviz.utils.prefetch import prefetch_in_background
+
+
+class _TestException(ValueError):
+    pass
+
+
+class PrefetchInBackgroundTest(unittest.TestCase):
+    """Tests for prefetch_in_background()."""
+
+    def test_prefetch_preserves_order(self) -> None:
+        self.assertEqual(
+            list(range(100)),
+            list(prefetch_in_background(iter(range(100)), max_prefetched_items=3)),
+        )
+
+    def test_prefetch_empty(self) -> None:
+        self.assertEqual([], list(prefetch_in_background([], max_prefetched_items=1)))
+
+    def test_prefetch_bounded(self) -> None:
+        produced: List[int] = []
+
+        def _produce() -> Iterator[int]:
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        items = prefetch_in_background(_produce(), max_prefetched_items=2)
+        self.assertEqual(0, next(items))
+        time.sleep(0.1)
+        # One item handed to the caller, two in the queue, and one more that the
+        # producer is blocked trying to enqueue.
+        self.assertEqual([0, 1, 2, 3], produced)
+        self.assertEqual(list(range(1, 10)), list(items))
+
+    def test_prefetch_starts_on_first_item(self) -> None:
+        produced: List[int] = []
+
+        def _produce() -> Iterator[int]:
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        items = prefetch_in_background(_produce(), max_prefetched_items=2)
+        time.sleep(0.1)
+        self.assertEqual([], produced)
+        self.assertEqual(list(range(10)), list(items))
+
+    def test_prefetch_raises_producer_exception(self) -> None:
+        def _produce() -> Iterator[int]:
+            yield 1
+            raise _TestException()
+
+        items = prefetch_in_background(_produce(), max_prefetched_items=2)
+        self.assertEqual(1, next(items))
+        with self.assertRaises(_TestException):
+            next(items)
+
+    def test_prefetch_consumer_stops_early(self) -> None:
+        producer_done = threading.Event()
+
+        def _produce() -> Iterator[int]:
+            try:
+                yield from range(100)
+            finally:
+                producer_done.set()
+
+        items = prefetch_in_background(_produce(), max_prefetched_items=1)
+        self.assertEqual(0, next(items))
+        items.close()  # type: ignore[attr-defined]
+        self.assertTrue(producer_done.wait(timeout=5))
+
+    def test_prefetch_invalid_max(self) -> None:
+        with self.assertRaises(ValueError):
+            _ = prefetch_in_background([1], max_prefetched_items=0)
@@ -0,0 +1,356 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for validation_job_scheduler.py."""
+import datetime
+import unittest
+from typing import Any, Dict, List, Optional
+
+import pytz
+from mock import MagicMock, create_autospec, patch
+
+from recidiviz.big_query.address_overrides import BigQueryAddressOverrides
+from recidiviz.big_query.big_query_client import BigQueryClient
+from recidiviz.big_query.big_query_view import SimpleBigQueryViewBuilder
+from recidiviz.validation.checks.existence_check import (
+    ExistenceDataValidationCheck,
+    ExistenceValidationResultDetails,
+)
+from recidiviz.validation.validation_job_scheduler import (
+    ValidationJobHistory,
+    ValidationJobInputsFingerprinter,
+    ValidationJobScheduler,
+    load_validation_job_histories,
+    validation_job_key,
+)
+from recidiviz.validation.validation_models import (
+    DataValidationJob,
+    DataValidationJobResult,
+    ValidationCategory,
+    ValidationResultStatus,
+)
+from recidiviz.validation.validation_result_storage import ValidationResultForStorage
+
+_SUCCESS_DETAILS = ExistenceValidationResultDetails(
+    num_invalid_rows=0, hard_num_allowed_rows=0, soft_num_allowed_rows=0
+)
+
+
+def _build_job(
+    view_id: str,
+    region_code: str = "US_XX",
+    view_query_template: str = "select * from literally_anything",
+    address_overrides: Optional[BigQueryAddressOverrides] = None,
+) -> DataValidationJob:
+    return DataValidationJob(
+        region_code=region_code,
+        validation=ExistenceDataValidationCheck(
+            validation_category=ValidationCategory.INVARIANT,
+            view_builder=SimpleBigQueryViewBuilder(
+                dataset_id="validation_views",
+                view_id=view_id,
+                description=f"{view_id} description",
+                view_query_template=view_query_template,
+            ),
+        ),
+        address_overrides=address_overrides,
+    )
+
+
+def _build_history(
+    status: ValidationResultStatus = ValidationResultStatus.SUCCESS,
+    runtime_seconds: Optional[float] = None,
+    inputs_fingerprint: Optional[str] = None,
+) -> ValidationJobHistory:
+    return ValidationJobHistory(
+        last_runtime_seconds=runtime_seconds,
+        last_result_status=status,
+        last_inputs_fingerprint=inputs_fingerprint,
+        last_result_details=_SUCCESS_DETAILS,
+        last_result_run_id="previous_run",
+    )
+
+
+class ValidationJobSchedulerTest(unittest.TestCase):
+    """Tests for ValidationJobScheduler."""
+
+    def setUp(self) -> None:
+        self.job_1 = _build_job("test_1")
+        self.job_2 = _build_job("test_2")
+        self.job_3 = _build_job("test_3")
+        self.jobs = [self.job_1, self.job_2, self.job_3]
+
+    def test_schedule_no_history(self) -> None:
+        schedule = ValidationJobScheduler(
+            histories={}, inputs_fingerprints={}
+        ).schedule(self.jobs)
+
+        self.assertEqual(self.jobs, schedule.jobs_to_run)
+        self.assertEqual([], schedule.cached_results)
+
+    def test_schedule_longest_first(self) -> None:
+        schedule = ValidationJobScheduler(
+            histories={
+                validation_job_key(self.job_1): _build_history(runtime_seconds=10),
+                validation_job_key(self.job_2): _build_history(runtime_seconds=100),
+            },
+            inputs_fingerprints={},
+        ).schedule(self.jobs)
+
+        # Jobs with unknown runtimes are scheduled first
+        self.assertEqual([self.job_3, self.job_2, self.job_1], schedule.jobs_to_run)
+
+    def test_schedule_reuses_unchanged_success(self) -> None:
+        schedule = ValidationJobScheduler(
+            histories={
+                validation_job_key(self.job_1): _build_history(
+                    runtime_seconds=10, inputs_fingerprint="abc"
+                ),
+                # Inputs have changed since the last success
+                validation_job_key(self.job_2): _build_history(
+                    runtime_seconds=10, inputs_fingerprint="def"
+                ),
+                # Last result was not a success
+                validation_job_key(self.job_3): _build_history(
+                    status=ValidationResultStatus.FAIL_HARD,
+                    runtime_seconds=10,
+                    inputs_fingerprint="ghi",
+                ),
+            },
+            inputs_fingerprints={
+                validation_job_key(self.job_1): "abc",
+                validation_job_key(self.job_2): "xyz",
+                validation_job_key(self.job_3): "ghi",
+            },
+        ).schedule(self.jobs)
+
+        self.assertEqual([self.job_2, self.job_3], schedule.jobs_to_run)
+        self.assertEqual(1, len(schedule.cached_results))
+        cached_result = schedule.cached_results[0]
+        self.assertEqual(
+            DataValidationJobResult(
+                validation_job=self.job_1, result_details=_SUCCESS_DETAILS
+            ),
+            cached_result.result,
+        )
+        self.assertEqual("abc", cached_result.inputs_fingerprint)
+        self.assertEqual("previous_run", cached_result.cached_from_run_id)
+        self.assertEqual(
+            {
+                validation_job_key(self.job_2): "xyz",
+                validation_job_key(self.job_3): "ghi",
+            },
+            schedule.inputs_fingerprints,
+        )
+
+    def test_schedule_no_fingerprint(self) -> None:
+        schedule = ValidationJobScheduler(
+            histories={
+                validation_job_key(self.job_1): _build_history(inputs_fingerprint=None)
+            },
+            inputs_fingerprints={},
+        ).schedule([self.job_1])
+
+        self.assertEqual([self.job_1], schedule.jobs_to_run)
+        self.assertEqual([], schedule.cached_results)
+
+    @patch("recidiviz.utils.environment.in_gcp", MagicMock(return_value=False))
+    def test_for_current_environment_not_in_gcp(self) -> None:
+        scheduler = ValidationJobScheduler.for_current_environment(self.jobs, [])
+
+        self.assertEqual({}, scheduler.histories)
+        self.assertEqual({}, scheduler.inputs_fingerprints)
+
+
+@patch("recidiviz.utils.metadata.project_id", MagicMock(return_value="test-project"))
+@patch("recidiviz.utils.environment.get_version", MagicMock(return_value="v1.0.0"))
+class LoadValidationJobHistoriesTest(unittest.TestCase):
+    """Tests for load_validation_job_histories."""
+
+    def test_load_histories(self) -> None:
+        job = _build_job("test_1")
+        stored_result = ValidationResultForStorage.from_validation_result(
+            run_id="abc123",
+            run_datetime=datetime.datetime(2000, 1, 1, tzinfo=pytz.UTC),
+            result=DataValidationJobResult(
+                validation_job=job, result_details=_SUCCESS_DETAILS
+            ),
+            runtime_seconds=12.5,
+            inputs_fingerprint="fingerprint",
+        ).to_serializable()
+        mock_bq_client = create_autospec(BigQueryClient)
+        mock_bq_client.run_query_async.return_value = [
+            {
+                "validation_name": stored_result["validation_name"],
+                "region_code": stored_result["region_code"],
+                "validation_result_status": stored_result["validation_result_status"],
+                "inputs_fingerprint": stored_result["inputs_fingerprint"],
+                "result_details_type": stored_result["result_details_type"],
+                "result_details": stored_result["result_details"],
+                "result_run_id": stored_result["run_id"],
+                "last_runtime_seconds": stored_result["runtime_seconds"],
+            },
+            {
+                "validation_name": "test_2",
+                "region_code": "US_XX",
+                "validation_result_status": None,
+                "inputs_fingerprint": None,
+                "result_details_type": None,
+                "result_details": None,
+                "result_run_id": "def456",
+                "last_runtime_seconds": None,
+            },
+        ]
+
+        histories = load_validation_job_histories(mock_bq_client)
+
+        self.assertEqual(
+            {
+                ("test_1", "US_XX"): ValidationJobHistory(
+                    last_runtime_seconds=12.5,
+                    last_result_status=ValidationResultStatus.SUCCESS,
+                    last_inputs_fingerprint="fingerprint",
+                    last_result_details=_SUCCESS_DETAILS,
+                    last_result_run_id="abc123",
+                ),
+                ("test_2", "US_XX"): ValidationJobHistory(
+                    last_runtime_seconds=None,
+                    last_result_status=None,
+                    last_inputs_fingerprint=None,
+                    last_result_details=None,
+                    last_result_run_id="def456",
+                ),
+            },
+            histories,
+        )
+
+
+@patch("recidiviz.utils.metadata.project_id", MagicMock(return_value="test-project"))
+class ValidationJobInputsFingerprinterTest(unittest.TestCase):
+    """Tests for ValidationJobInputsFingerprinter."""
+
+    def setUp(self) -> None:
+        self.view_builders = [
+            SimpleBigQueryViewBuilder(
+                dataset_id="my_views",
+                view_id="unmaterialized_view",
+                description="unmaterialized_view description",
+                view_query_template="SELECT * FROM `{project_id}.source_dataset.source_table`",
+            ),
+            SimpleBigQueryViewBuilder(
+                dataset_id="my_views",
+                view_id="materialized_view",
+                description="materialized_view description",
+                view_query_template="SELECT * FROM `{project_id}.source_dataset.other_table`",
+                should_materialize=True,
+            ),
+        ]
+        self.job = _build_job(
+            "test_1",
+            view_query_template=(
+                "SELECT * FROM `{project_id}.my_views.unmaterialized_view` "
+                "JOIN `{project_id}.my_views.materialized_view_materialized` USING (id)"
+            ),
+        )
+        self.last_modified_rows: List[Dict[str, Any]] = [
+            {
+                "dataset_id": "source_dataset",
+                "table_id": "source_table",
+                "last_modified_time": 1000,
+            },
+            {
+                "dataset_id": "source_dataset",
+                "table_id": "other_table",
+                "last_modified_time": 1000,
+            },
+            {
+                "dataset_id": "my_views",
+                "table_id": "materialized_view_materialized",
+                "last_modified_time": 2000,
+            },
+        ]
+        self.mock_bq_client = create_autospec(BigQueryClient)
+        self.mock_bq_client.run_query_async.side_effect = (
+            lambda query_str, use_query_cache: self.last_modified_rows
+        )
+
+    def _get_fingerprints(self, jobs: List[DataValidationJob]) -> Dict[Any, str]:
+        return ValidationJobInputsFingerprinter(
+            bq_client=self.mock_bq_client, view_builders=self.view_builders
+        ).get_inputs_fingerprints(jobs)
+
+    def test_fingerprint_stable(self) -> None:
+        fingerprints = self._get_fingerprints([self.job])
+
+        self.assertEqual({validation_job_key(self.job)}, set(fingerprints))
+        self.assertEqual(fingerprints, self._get_fingerprints([self.job]))
+
+        # Only the tables that are actually read from are queried
+        self.mock_bq_client.run_query_async.assert_called_with(
+            query_str=(
+                "SELECT dataset_id, table_id, last_modified_time FROM `test-project.my_views.__TABLES__`\n"
+                "UNION ALL\n"
+                "SELECT dataset_id, table_id, last_modified_time FROM `test-project.source_dataset.__TABLES__`"
+            ),
+            use_query_cache=False,
+        )
+
+    def test_fingerprint_changes_with_unmaterialized_parent_input(self) -> None:
+        fingerprints = self._get_fingerprints([self.job])
+        self.last_modified_rows[0]["last_modified_time"] = 3000
+
+        self.assertNotEqual(fingerprints, self._get_fingerprints([self.job]))
+
+    def test_fingerprint_ignores_unread_tables(self) -> None:
+        fingerprints = self._get_fingerprints([self.job])
+        # The validation reads from the materialized table, not its parents
+        self.last_modified_rows[1]["last_modified_time"] = 3000
+
+        self.assertEqual(fingerprints, self._get_fingerprints([self.job]))
+
+    def test_fingerprint_changes_with_config(self) -> None:
+        fingerprints = self._get_fingerprints([self.job])
+        job = DataValidationJob(
+            region_code=self.job.region_code,
+            validation=ExistenceDataValidationCheck(
+                validation_category=ValidationCategory.INVARIANT,
+                view_builder=self.job.validation.view_builder,
+                hard_num_allowed_rows=10,
+            ),
+        )
+
+        self.assertNotEqual(
+            fingerprints[validation_job_key(self.job)],
+            self._get_fingerprints([job])[validation_job_key(job)],
+        )
+
+    def test_no_fingerprint_for_missing_table(self) -> None:
+        self.last_modified_rows.pop(0)
+
+        self.assertEqual({}, self._get_fingerprints([self.job]))
+
+    def test_no_fingerprint_for_sandbox_job(self) -> None:
+        job = _build_job(
+            "test_1",
+            address_overrides=BigQueryAddressOverrides.Builder(
+                sandbox_prefix="my_prefix"
+            )
+            .register_sandbox_override_for_entire_dataset("validation_views")
+            .build(),
+        )
+
+        self.assertEqual({}, self._get_fingerprints([job]))
+        self.mock_bq_client.run_query_async.assert_not_called()
@@ -44,6 +44,11 @@ from recidiviz.validation.validation_config import (
     ValidationNumAllowedRowsOverride,
     ValidationRegionConfig,
 )
+from recidiviz.validation.validation_job_scheduler import (
+    ValidationJobHistory,
+    ValidationJobScheduler,
+    validation_job_key,
+)
 from recidiviz.validation.validation_manager import (
     _fetch_validation_jobs_to_perform,
     validation_manager_blueprint,
@@ -432,6 +437,78 @@ class TestHandleRequest(TestCase):
             validation_run_id=mock.ANY,
         )
 
+    @patch(
+        "recidiviz.validation.validation_manager.ValidationJobScheduler.for_current_environment"
+    )
+    @patch("recidiviz.validation.validation_manager._emit_opencensus_failure_events")
+    @patch("recidiviz.validation.validation_manager._run_job")
+    @patch("recidiviz.validation.validation_manager._fetch_validation_jobs_to_perform")
+    @patch(
+        "recidiviz.validation.validation_manager.store_validation_results_in_big_query"
+    )
+    @patch(
+        "recidiviz.validation.validation_manager.store_validation_run_completion_in_big_query"
+    )
+    def test_handle_request_reuses_unchanged_results(
+        self,
+        mock_store_run_success: MagicMock,
+        mock_store_validation_results: MagicMock,
+        mock_fetch_validations: MagicMock,
+        mock_run_job: MagicMock,
+        mock_emit_opencensus_failure_events: MagicMock,
+        mock_for_current_environment: MagicMock,
+    ) -> None:
+        mock_fetch_validations.return_value = self._TEST_VALIDATIONS
+        cached_job = self._TEST_VALIDATIONS[0]
+        mock_for_current_environment.return_value = ValidationJobScheduler(
+            histories={
+                validation_job_key(cached_job): ValidationJobHistory(
+                    last_runtime_seconds=10,
+                    last_result_status=ValidationResultStatus.SUCCESS,
+                    last_inputs_fingerprint="abc",
+                    last_result_details=FakeValidationResultDetails(
+                        validation_status=ValidationResultStatus.SUCCESS
+                    ),
+                    last_result_run_id="previous-run",
+                )
+            },
+            inputs_fingerprints={validation_job_key(cached_job): "abc"},
+        )
+        mock_run_job.return_value = DataValidationJobResult(
+            validation_job=self._TEST_VALIDATIONS[1],
+            result_details=FakeValidationResultDetails(
+                validation_status=ValidationResultStatus.SUCCESS
+            ),
+        )
+
+        response = self.client.post("/validate", headers=APP_ENGINE_HEADERS)
+
+        self.assertEqual(200, response.status_code)
+
+        self.assertEqual(4, mock_run_job.call_count)
+        for job in self._TEST_VALIDATIONS[1:]:
+            mock_run_job.assert_any_call(job)
+
+        mock_emit_opencensus_failure_events.assert_not_called()
+        mock_store_validation_results.assert_called_once()
+        ((results,), _kwargs) = mock_store_validation_results.call_args
+        self.assertEqual(5, len(results))
+        cached_results = [r for r in results if r.cached_from_run_id is not None]
+        self.assertEqual(1, len(cached_results))
+        self.assertEqual("previous-run", cached_results[0].cached_from_run_id)
+        self.assertEqual("abc", cached_results[0].inputs_fingerprint)
+        self.assertIsNone(cached_results[0].runtime_seconds)
+        for result in results:
+            if result.cached_from_run_id is None:
+                self.assertIsNotNone(result.runtime_seconds)
+
+        mock_store_run_success.assert_called_with(
+            cloud_task_id="my-task-id",
+            num_validations_run=5,
+            validations_runtime_sec=mock.ANY,
+            validation_run_id=mock.ANY,
+        )
+
 
 class TestFetchValidations(TestCase):
     """Tests the _fetch_validation_jobs_to_perform function."""
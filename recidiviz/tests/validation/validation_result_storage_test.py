@@ -126,6 +126,9 @@ class TestValidationResultStorage(unittest.TestCase):
                 "result_details": '{"failed_rows": [], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "dev_mode": false}',
                 "validation_category": "EXTERNAL_AGGREGATE",
                 "exception_log": None,
+                "runtime_seconds": None,
+                "inputs_fingerprint": None,
+                "cached_from_run_id": None,
                 "trace_id": result.trace_id,
             },
             result.to_serializable(),
@@ -205,6 +208,9 @@ class TestValidationResultStorage(unittest.TestCase):
                 "result_details": '{"num_error_rows": 0, "total_num_rows": 5, "hard_max_allowed_error": 0.5, "soft_max_allowed_error": 0.5, "dev_mode": false, "non_null_counts_per_column_per_partition": [[["US_XX", "2020-12-01"], {"internal": 5, "external": 5}]]}',
                 "validation_category": "EXTERNAL_INDIVIDUAL",
                 "exception_log": None,
+                "runtime_seconds": None,
+                "inputs_fingerprint": None,
+                "cached_from_run_id": None,
                 "trace_id": result.trace_id,
             },
             result.to_serializable(),
@@ -295,6 +301,9 @@ class TestValidationResultStorage(unittest.TestCase):
                 "validation_category": "EXTERNAL_AGGREGATE",
                 "trace_id": result.trace_id,
                 "exception_log": None,
+                "runtime_seconds": None,
+                "inputs_fingerprint": None,
+                "cached_from_run_id": None,
             },
             result.to_serializable(),
         )
@@ -361,6 +370,9 @@ class TestValidationResultStorage(unittest.TestCase):
                 "result_details_type": None,
                 "result_details": None,
                 "exception_log": None,
+                "runtime_seconds": None,
+                "inputs_fingerprint": None,
+                "cached_from_run_id": None,
                 "trace_id": result.trace_id,
                 "validation_category": "EXTERNAL_AGGREGATE",
             },
@@ -508,6 +520,9 @@ class TestValidationResultStorage(unittest.TestCase):
                     "result_details": '{"failed_rows": [], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "dev_mode": false}',
                     "validation_category": "EXTERNAL_AGGREGATE",
                     "exception_log": None,
+                    "runtime_seconds": None,
+                    "inputs_fingerprint": None,
+                    "cached_from_run_id": None,
                     "trace_id": storage_result_1.trace_id,
                 },
                 {
@@ -525,6 +540,9 @@ class TestValidationResultStorage(unittest.TestCase):
                     "result_details": '{"failed_rows": [[{"label_values": ["US_XX"], "comparison_values": [5, 10]}, 0.5]], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "dev_mode": false}',
                     "validation_category": "EXTERNAL_AGGREGATE",
                     "exception_log": None,
+                    "runtime_seconds": None,
+                    "inputs_fingerprint": None,
+                    "cached_from_run_id": None,
                     "trace_id": storage_result_2.trace_id,
                 },
                 {
@@ -542,6 +560,9 @@ class TestValidationResultStorage(unittest.TestCase):
                     "result_details": None,
                     "validation_category": "CONSISTENCY",
                     "exception_log": None,
+                    "runtime_seconds": None,
+                    "inputs_fingerprint": None,
+                    "cached_from_run_id": None,
                     "trace_id": storage_result_3.trace_id,
                 },
             ],
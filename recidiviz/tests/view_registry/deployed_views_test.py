@@ -16,17 +16,59 @@
 # =============================================================================
 """Tests deployed_views"""
 import datetime
+import json
+import os
+import tempfile
 import unittest
-from typing import Set
+from typing import List, Set
 from unittest.mock import MagicMock, patch
 
 from recidiviz.big_query.big_query_address import BigQueryAddress
+from recidiviz.big_query.big_query_view import (
+    BigQueryViewBuilder,
+    SimpleBigQueryViewBuilder,
+)
 from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAGING
 from recidiviz.view_registry.deployed_views import (
+    DEPLOYED_VIEW_BUILDER_REGISTRY,
+    DEPLOYED_VIEWS_MANIFEST_PATH,
+    DeployedViewBuilderCollection,
+    DeployedViewBuilderRegistry,
     all_deployed_view_builders,
     deployed_view_builders,
 )
 
+_FAKE_VIEW_BUILDER_CALLS: List[str] = []
+
+
+def _fake_view_builders() -> List[BigQueryViewBuilder]:
+    _FAKE_VIEW_BUILDER_CALLS.append("collected")
+    return [
+        SimpleBigQueryViewBuilder(
+            dataset_id="dataset_1",
+            view_id="view_1",
+            description="view_1 description",
+            view_query_template="SELECT 1",
+        ),
+        SimpleBigQueryViewBuilder(
+            dataset_id="dataset_1",
+            view_id="view_2",
+            description="view_2 description",
+            view_query_template="SELECT 2",
+            projects_to_deploy={GCP_PROJECT_STAGING},
+        ),
+    ]
+
+
+_FAKE_VIEW_BUILDERS = [
+    SimpleBigQueryViewBuilder(
+        dataset_id="dataset_2",
+        view_id="view_3",
+        description="view_3 description",
+        view_query_template="SELECT 3",
+    )
+]
+
 
 @patch("recidiviz.utils.metadata.project_id", MagicMock(return_value="test-project"))
 class DeployedViewsTest(unittest.TestCase):
@@ -77,3 +119,125 @@ class DeployedViewsTest(unittest.TestCase):
         # Building all our views should take less than 5s (as of 4/11/2022 it takes
         # about .28 seconds).
         self.assertLessEqual(total_seconds, 5)
+
+    def test_manifest_up_to_date(self) -> None:
+        with open(DEPLOYED_VIEWS_MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.assertEqual(
+            DEPLOYED_VIEW_BUILDER_REGISTRY.build_manifest(),
+            manifest,
+            "The deployed views manifest is out of date. Regenerate it by running "
+            "`python -m recidiviz.tools.profile_deployed_view_builders "
+            "--write-manifest True`.",
+        )
+
+
+@patch("recidiviz.utils.metadata.project_id", MagicMock(return_value="test-project"))
+class DeployedViewBuilderRegistryTest(unittest.TestCase):
+    """Tests for DeployedViewBuilderRegistry"""
+
+    def setUp(self) -> None:
+        _FAKE_VIEW_BUILDER_CALLS.clear()
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.temp_dir, "manifest.json")
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"dataset_1": ["function"], "dataset_2": ["constant"]}, f)
+        self.registry = DeployedViewBuilderRegistry(
+            collections=[
+                DeployedViewBuilderCollection(
+                    name="function",
+                    module_name=__name__,
+                    attribute_name="_fake_view_builders",
+                ),
+                DeployedViewBuilderCollection(
+                    name="constant",
+                    module_name=__name__,
+                    attribute_name="_FAKE_VIEW_BUILDERS",
+                ),
+            ],
+            manifest_path=self.manifest_path,
+        )
+
+    def tearDown(self) -> None:
+        os.remove(self.manifest_path)
+        os.rmdir(self.temp_dir)
+
+    def test_all_view_builders_memoized(self) -> None:
+        builders = self.registry.all_view_builders()
+        self.assertEqual(["view_1", "view_2", "view_3"], [b.view_id for b in builders])
+
+        self.registry.all_view_builders()
+        self.registry.deployed_view_builders(GCP_PROJECT_STAGING)
+        self.assertEqual(["collected"], _FAKE_VIEW_BUILDER_CALLS)
+
+        self.assertEqual(
+            ["function", "constant"],
+            [t.collection_name for t in self.registry.load_timings],
+        )
+
+    def test_memoized_per_project(self) -> None:
+        self.registry.all_view_builders()
+        with patch(
+            "recidiviz.utils.metadata.project_id",
+            MagicMock(return_value="other-project"),
+        ):
+            self.registry.all_view_builders()
+        self.registry.all_view_builders()
+
+        self.assertEqual(["collected", "collected"], _FAKE_VIEW_BUILDER_CALLS)
+
+    def test_clear(self) -> None:
+        self.registry.all_view_builders()
+        self.registry.clear()
+        self.registry.all_view_builders()
+
+        self.assertEqual(["collected", "collected"], _FAKE_VIEW_BUILDER_CALLS)
+
+    def test_deployed_view_builders(self) -> None:
+        self.assertEqual(
+            ["view_1", "view_2", "view_3"],
+            [
+                b.view_id
+                for b in self.registry.deployed_view_builders(GCP_PROJECT_STAGING)
+            ],
+        )
+        self.assertEqual(
+            ["view_1", "view_3"],
+            [
+                b.view_id
+                for b in self.registry.deployed_view_builders(GCP_PROJECT_PRODUCTION)
+            ],
+        )
+
+    def test_view_builder_for_address_only_loads_manifest_collections(self) -> None:
+        builder = self.registry.view_builder_for_address(
+            BigQueryAddress(dataset_id="dataset_2", table_id="view_3")
+        )
+
+        self.assertIsNotNone(builder)
+        assert builder is not None
+        self.assertEqual("view_3", builder.view_id)
+        self.assertEqual([], _FAKE_VIEW_BUILDER_CALLS)
+        self.assertIsNone(
+            self.registry.view_builder_for_address(
+                BigQueryAddress(dataset_id="dataset_2", table_id="view_1")
+            )
+        )
+
+    def test_view_builder_for_address_not_in_manifest(self) -> None:
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump({}, f)
+
+        builder = self.registry.view_builder_for_address(
+            BigQueryAddress(dataset_id="dataset_1", table_id="view_2")
+        )
+
+        self.assertIsNotNone(builder)
+        assert builder is not None
+        self.assertEqual("view_2", builder.view_id)
+
+    def test_build_manifest(self) -> None:
+        self.assertEqual(
+            {"dataset_1": ["function"], "dataset_2": ["constant"]},
+            self.registry.build_manifest(),
+        )
@@ -47,6 +47,7 @@ class FakeBatchWriter(TestCase):
     ) -> None:
         super().__init__()
         self.doc_count = 0
+        self.committed_doc_count = 0
         self.verify_batch_size = verify_batch_size
         self.verify_timestamp = verify_timestamp
 
@@ -60,6 +61,7 @@ class FakeBatchWriter(TestCase):
     def commit(self) -> None:
         if self.verify_batch_size:
             self.assertGreaterEqual(MAX_FIRESTORE_RECORDS_PER_BATCH, self.doc_count)
+        self.committed_doc_count += self.doc_count
         self.doc_count = 0
 
 
@@ -99,13 +101,24 @@ class WorkflowsFirestoreEtlDelegateTest(TestCase):
         mock_firestore_client: mock.MagicMock,  # pylint: disable=unused-argument
     ) -> None:
         """Tests that the ETL Delegate respects the max batch size for writing to Firestore."""
-        mock_batch_writer.return_value = FakeBatchWriter(verify_batch_size=True)
+        batch_writers: List[FakeBatchWriter] = []
+
+        def new_batch_writer() -> FakeBatchWriter:
+            batch_writers.append(FakeBatchWriter(verify_batch_size=True))
+            return batch_writers[-1]
+
+        mock_batch_writer.side_effect = new_batch_writer
         mock_get_file_stream.return_value = [FakeFileStream(3000)]
         with local_project_id_override("test-project"):
             delegate = TestETLDelegate()
             delegate.run_etl("US_XX", "test_export.json")
 
         mock_get_collection.assert_called_once_with("testOpportunity")
+        # Batches are committed concurrently, and every record is committed once
+        self.assertEqual(7, len(batch_writers))
+        self.assertEqual(
+            3000, sum(writer.committed_doc_count for writer in batch_writers)
+        )
 
     def test_run_etl_timestamp(
         self,
@@ -118,7 +131,9 @@ class WorkflowsFirestoreEtlDelegateTest(TestCase):
         """Tests that the ETL Delegate adds timestamp to each loaded record."""
         mock_now = datetime(2022, 5, 1, tzinfo=timezone.utc)
 
-        mock_batch_writer.return_value = FakeBatchWriter(verify_timestamp=mock_now)
+        mock_batch_writer.side_effect = lambda: FakeBatchWriter(
+            verify_timestamp=mock_now
+        )
         mock_get_file_stream.return_value = [FakeFileStream(2)]
         with local_project_id_override("test-project"):
             delegate = TestETLDelegate()
@@ -0,0 +1,727 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmark for the calculation pipelines, run locally on the DirectRunner.
+
+Generates |--num-people| synthetic people in |--state-code|, each with |--num-periods|
+cycles of an incarceration period followed by a supervision period that ends in a
+revocation, along with the sentences, violations, assessments, contacts and program
+assignments of each cycle. Runs each of the normalization and metric pipelines in
+|--pipelines| over these people with the BigQuery sources and sinks replaced by local
+fixtures, each in its own process, and reports the following as JSON:
+    - The wall time of the pipeline and the number of people processed per second
+    - The peak memory used by the process running the pipeline
+    - For each DoFn step of the pipeline, the time spent processing elements, the
+      number of elements in and out of the step and the elements processed per second
+    - The number of rows written to each output table
+
+The JSON written to |--output-path| can be passed as the |--baseline-path| of a run on
+another commit to log how the wall time and the time of each step have changed.
+
+Note that the metric pipelines read the synthetic periods and violation responses as
+if they had already been normalized, so they do not depend on the output of the
+normalization pipeline.
+
+Example Usage:
+    python -m recidiviz.tools.calculator.benchmark_calculation_pipelines \
+        --num-people 1000 [--num-periods 5] [--state-code US_ND] \
+        [--pipelines INCARCERATION_METRICS SUPERVISION_METRICS] \
+        [--output-path benchmark.json] [--baseline-path baseline.json]
+"""
+import argparse
+import datetime
+import functools
+import json
+import logging
+import multiprocessing
+import resource
+import sys
+import time
+from collections import defaultdict
+from concurrent import futures
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Type
+
+import apache_beam as beam
+import attr
+from apache_beam.pvalue import PCollection
+from dateutil.relativedelta import relativedelta
+from mock import patch
+
+from recidiviz.calculator.pipeline.base_pipeline import PipelineRunDelegate
+from recidiviz.calculator.pipeline.metrics import base_metric_pipeline
+from recidiviz.calculator.pipeline.metrics.base_metric_pipeline import (
+    MetricPipelineRunDelegate,
+)
+from recidiviz.calculator.pipeline.normalization import base_normalization_pipeline
+from recidiviz.calculator.pipeline.normalization.base_normalization_pipeline import (
+    NormalizationPipelineRunDelegate,
+)
+from recidiviz.calculator.pipeline.utils.beam_utils import extractor_utils, person_utils
+from recidiviz.calculator.pipeline.utils.pipeline_run_delegate_utils import (
+    collect_all_pipeline_run_delegate_classes,
+)
+from recidiviz.calculator.query.state.dataset_config import (
+    normalized_state_dataset_for_state_code,
+)
+from recidiviz.calculator.query.state.state_specific_query_strings import (
+    STATE_RACE_ETHNICITY_POPULATION_TABLE_NAME,
+)
+from recidiviz.calculator.query.state.views.reference.persons_to_recent_county_of_residence import (
+    PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME,
+)
+from recidiviz.calculator.query.state.views.reference.supervision_period_to_agent_association import (
+    SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME,
+)
+from recidiviz.common.constants.state.state_assessment import (
+    StateAssessmentLevel,
+    StateAssessmentType,
+)
+from recidiviz.common.constants.state.state_case_type import StateSupervisionCaseType
+from recidiviz.common.constants.state.state_incarceration import StateIncarcerationType
+from recidiviz.common.constants.state.state_incarceration_period import (
+    StateIncarcerationPeriodAdmissionReason,
+    StateIncarcerationPeriodReleaseReason,
+    StateSpecializedPurposeForIncarceration,
+)
+from recidiviz.common.constants.state.state_person import (
+    StateEthnicity,
+    StateGender,
+    StateRace,
+    StateResidencyStatus,
+)
+from recidiviz.common.constants.state.state_program_assignment import (
+    StateProgramAssignmentParticipationStatus,
+)
+from recidiviz.common.constants.state.state_sentence import StateSentenceStatus
+from recidiviz.common.constants.state.state_shared_enums import StateCustodialAuthority
+from recidiviz.common.constants.state.state_supervision_contact import (
+    StateSupervisionContactStatus,
+)
+from recidiviz.common.constants.state.state_supervision_period import (
+    StateSupervisionLevel,
+    StateSupervisionPeriodAdmissionReason,
+    StateSupervisionPeriodSupervisionType,
+    StateSupervisionPeriodTerminationReason,
+)
+from recidiviz.common.constants.state.state_supervision_sentence import (
+    StateSupervisionSentenceSupervisionType,
+)
+from recidiviz.common.constants.state.state_supervision_violation import (
+    StateSupervisionViolationType,
+)
+from recidiviz.common.constants.state.state_supervision_violation_response import (
+    StateSupervisionViolationResponseDecision,
+    StateSupervisionViolationResponseType,
+)
+from recidiviz.common.constants.states import StateCode
+from recidiviz.persistence.database.base_schema import StateBase
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.tests.calculator.calculator_test_utils import (
+    normalized_database_base_dict,
+)
+from recidiviz.tests.calculator.pipeline.fake_bigquery import (
+    DataTablesDict,
+    FakeReadFromBigQueryFactory,
+    FakeWriteToBigQuery,
+    FakeWriteToBigQueryFactory,
+)
+from recidiviz.tests.calculator.pipeline.utils.run_pipeline_test_utils import (
+    default_data_dict_for_run_delegate,
+    run_test_pipeline,
+)
+
+_PROJECT = "benchmark-project"
+_DATASET = "benchmark_dataset"
+_FIRST_ADMISSION_DATE = datetime.date(2000, 1, 1)
+
+# The maximum number of periods for each person, so that the ids of the entities of
+# every person are unique
+_MAX_NUM_PERIODS = 1000
+
+# DoFns whose processing time is reported for each pipeline step
+_TIMED_DO_FNS: List[Type[beam.DoFn]] = [
+    extractor_utils._ShallowHydrateEntity,  # pylint: disable=protected-access
+    extractor_utils._PackageAssociationIDValues,  # pylint: disable=protected-access
+    extractor_utils._ConnectHydratedRelatedEntities,  # pylint: disable=protected-access
+    extractor_utils.ConvertEntitiesToStateSpecificTypes,
+    extractor_utils._AttachStateBasedReferenceDataToEntities,  # pylint: disable=protected-access
+    base_normalization_pipeline.NormalizeEntities,
+    base_normalization_pipeline.NormalizedEntityTreeWritableDicts,
+    base_metric_pipeline.ClassifyResults,
+    person_utils.BuildPersonMetadata,
+    person_utils.ExtractPersonEventsMetadata,
+    base_metric_pipeline.ProduceMetrics,
+    base_metric_pipeline.ProduceMetricRows,
+    base_metric_pipeline.RecidivizMetricWritableDict,
+    base_metric_pipeline.RecidivizMetricRowWritableDict,
+]
+
+
+@attr.s
+class _StepStats:
+    """The processing time and number of elements in and out of a pipeline step."""
+
+    seconds: float = attr.ib(default=0.0)
+    input_elements: int = attr.ib(default=0)
+    output_elements: int = attr.ib(default=0)
+
+
+# Stats for each timed DoFn and the number of rows written to each table, collected
+# in the process running the pipeline
+_STEP_STATS: Dict[str, _StepStats] = defaultdict(_StepStats)
+_OUTPUT_ROWS: Dict[str, int] = defaultdict(int)
+
+
+def _timed_process(do_fn_cls: Type[beam.DoFn]) -> Callable[..., List[Any]]:
+    """Returns a version of the process method of the |do_fn_cls| that records the
+    time spent processing each element in _STEP_STATS. Outputs are collected before
+    the timer is stopped, so the time does not include the downstream steps that
+    consume them."""
+    process = do_fn_cls.process
+
+    @functools.wraps(process)
+    def timed_process(
+        self: beam.DoFn, *process_args: Any, **process_kwargs: Any
+    ) -> List[Any]:
+        start = time.perf_counter()
+        outputs = list(process(self, *process_args, **process_kwargs) or [])
+        step_stats = _STEP_STATS[do_fn_cls.__name__]
+        step_stats.seconds += time.perf_counter() - start
+        step_stats.input_elements += 1
+        step_stats.output_elements += len(outputs)
+        return outputs
+
+    return timed_process
+
+
+def _count_output_row(_row: Dict[str, Any], output_table: str) -> None:
+    _OUTPUT_ROWS[output_table] += 1
+
+
+class _CountingWriteToBigQuery(FakeWriteToBigQuery):
+    """Fake PTransform that counts the rows that would be written to BQ."""
+
+    def expand(self, input_or_inputs: PCollection) -> Any:
+        return input_or_inputs | "Count rows" >> beam.Map(
+            _count_output_row, self._output_table
+        )
+
+
+def _row(
+    database_entity: StateBase, sequence_num: Optional[int] = None
+) -> Dict[str, Any]:
+    """Returns the table row of the |database_entity|. If a |sequence_num| is
+    provided, the row can also be read as a normalized entity."""
+    return normalized_database_base_dict(
+        database_entity,
+        {"sequence_num": sequence_num} if sequence_num is not None else None,
+    )
+
+
+def build_person_rows(
+    state_code: str, person_id: int, num_periods: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Returns the rows of every table for a person with |num_periods| cycles of an
+    incarceration period followed by a supervision period. Every supervision period
+    but the last ends in a revocation that is preceded by a violation."""
+    if not 0 < num_periods < _MAX_NUM_PERIODS:
+        raise ValueError(
+            f"Expected between 1 and {_MAX_NUM_PERIODS - 1} periods, found "
+            f"[{num_periods}]."
+        )
+
+    rows: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    rows[schema.StatePerson.__tablename__].append(
+        _row(
+            schema.StatePerson(
+                state_code=state_code,
+                person_id=person_id,
+                gender=StateGender.FEMALE if person_id % 2 else StateGender.MALE,
+                birthdate=datetime.date(1960 + person_id % 40, person_id % 12 + 1, 1),
+                residency_status=StateResidencyStatus.PERMANENT,
+            )
+        )
+    )
+    rows[schema.StatePersonExternalId.__tablename__].append(
+        _row(
+            schema.StatePersonExternalId(
+                person_external_id_id=person_id,
+                state_code=state_code,
+                external_id=str(person_id),
+                id_type=f"{state_code}_SID",
+                person_id=person_id,
+            )
+        )
+    )
+    rows[schema.StatePersonRace.__tablename__].append(
+        _row(
+            schema.StatePersonRace(
+                person_race_id=person_id,
+                state_code=state_code,
+                race=StateRace.BLACK if person_id % 3 else StateRace.WHITE,
+                person_id=person_id,
+            )
+        )
+    )
+    rows[schema.StatePersonEthnicity.__tablename__].append(
+        _row(
+            schema.StatePersonEthnicity(
+                person_ethnicity_id=person_id,
+                state_code=state_code,
+                ethnicity=StateEthnicity.NOT_HISPANIC,
+                person_id=person_id,
+            )
+        )
+    )
+    rows[PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME].append(
+        {
+            "state_code": state_code,
+            "person_id": person_id,
+            "county_of_residence": "COUNTY",
+        }
+    )
+
+    for period_index in range(num_periods):
+        entity_id = person_id * _MAX_NUM_PERIODS + period_index
+        admission_date = _FIRST_ADMISSION_DATE + relativedelta(years=3 * period_index)
+        release_date = admission_date + relativedelta(years=1)
+        is_last_period = period_index == num_periods - 1
+        termination_date = (
+            None if is_last_period else release_date + relativedelta(years=2)
+        )
+
+        rows[schema.StateIncarcerationSentence.__tablename__].append(
+            _row(
+                schema.StateIncarcerationSentence(
+                    incarceration_sentence_id=entity_id,
+                    state_code=state_code,
+                    status=StateSentenceStatus.COMPLETED,
+                    incarceration_type=StateIncarcerationType.STATE_PRISON,
+                    date_imposed=admission_date,
+                    start_date=admission_date,
+                    completion_date=release_date,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateIncarcerationPeriod.__tablename__].append(
+            _row(
+                schema.StateIncarcerationPeriod(
+                    incarceration_period_id=entity_id,
+                    state_code=state_code,
+                    incarceration_type=StateIncarcerationType.STATE_PRISON,
+                    admission_date=admission_date,
+                    release_date=release_date,
+                    county_code="COUNTY",
+                    facility="FACILITY",
+                    admission_reason=(
+                        StateIncarcerationPeriodAdmissionReason.NEW_ADMISSION
+                        if period_index == 0
+                        else StateIncarcerationPeriodAdmissionReason.REVOCATION
+                    ),
+                    release_reason=StateIncarcerationPeriodReleaseReason.CONDITIONAL_RELEASE,
+                    specialized_purpose_for_incarceration=StateSpecializedPurposeForIncarceration.GENERAL,
+                    custodial_authority=StateCustodialAuthority.STATE_PRISON,
+                    person_id=person_id,
+                ),
+                sequence_num=period_index,
+            )
+        )
+
+        rows[schema.StateSupervisionSentence.__tablename__].append(
+            _row(
+                schema.StateSupervisionSentence(
+                    supervision_sentence_id=entity_id,
+                    state_code=state_code,
+                    status=(
+                        StateSentenceStatus.SERVING
+                        if is_last_period
+                        else StateSentenceStatus.REVOKED
+                    ),
+                    supervision_type=StateSupervisionSentenceSupervisionType.PAROLE,
+                    date_imposed=release_date,
+                    start_date=release_date,
+                    completion_date=termination_date,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateSupervisionPeriod.__tablename__].append(
+            _row(
+                schema.StateSupervisionPeriod(
+                    supervision_period_id=entity_id,
+                    state_code=state_code,
+                    supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                    start_date=release_date,
+                    termination_date=termination_date,
+                    county_code="COUNTY",
+                    supervision_site="SITE",
+                    admission_reason=StateSupervisionPeriodAdmissionReason.RELEASE_FROM_INCARCERATION,
+                    termination_reason=(
+                        None
+                        if is_last_period
+                        else StateSupervisionPeriodTerminationReason.REVOCATION
+                    ),
+                    supervision_level=StateSupervisionLevel.MEDIUM,
+                    custodial_authority=StateCustodialAuthority.SUPERVISION_AUTHORITY,
+                    person_id=person_id,
+                ),
+                sequence_num=period_index,
+            )
+        )
+        rows[schema.StateSupervisionCaseTypeEntry.__tablename__].append(
+            _row(
+                schema.StateSupervisionCaseTypeEntry(
+                    supervision_case_type_entry_id=entity_id,
+                    state_code=state_code,
+                    case_type=StateSupervisionCaseType.GENERAL,
+                    supervision_period_id=entity_id,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME].append(
+            {
+                "state_code": state_code,
+                "agent_id": person_id % 100,
+                "person_id": person_id,
+                "agent_external_id": f"AGENT{person_id % 100}",
+                "supervision_period_id": entity_id,
+                "agent_start_date": release_date,
+                "agent_end_date": termination_date,
+            }
+        )
+        rows[schema.StateAssessment.__tablename__].append(
+            _row(
+                schema.StateAssessment(
+                    assessment_id=entity_id,
+                    state_code=state_code,
+                    assessment_type=StateAssessmentType.LSIR,
+                    assessment_date=release_date,
+                    assessment_score=20 + period_index % 20,
+                    assessment_level=StateAssessmentLevel.MEDIUM,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateSupervisionContact.__tablename__].append(
+            _row(
+                schema.StateSupervisionContact(
+                    supervision_contact_id=entity_id,
+                    state_code=state_code,
+                    status=StateSupervisionContactStatus.COMPLETED,
+                    contact_date=release_date + relativedelta(months=1),
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateProgramAssignment.__tablename__].append(
+            _row(
+                schema.StateProgramAssignment(
+                    program_assignment_id=entity_id,
+                    state_code=state_code,
+                    participation_status=StateProgramAssignmentParticipationStatus.DISCHARGED,
+                    referral_date=release_date,
+                    start_date=release_date,
+                    discharge_date=release_date + relativedelta(months=6),
+                    program_id="PROGRAM",
+                    program_location_id="LOCATION",
+                    person_id=person_id,
+                ),
+                sequence_num=period_index,
+            )
+        )
+
+        if termination_date is None:
+            continue
+
+        violation_date = termination_date - relativedelta(months=1)
+        rows[schema.StateSupervisionViolation.__tablename__].append(
+            _row(
+                schema.StateSupervisionViolation(
+                    supervision_violation_id=entity_id,
+                    state_code=state_code,
+                    violation_date=violation_date,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateSupervisionViolationTypeEntry.__tablename__].append(
+            _row(
+                schema.StateSupervisionViolationTypeEntry(
+                    supervision_violation_type_entry_id=entity_id,
+                    state_code=state_code,
+                    violation_type=StateSupervisionViolationType.TECHNICAL,
+                    supervision_violation_id=entity_id,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateSupervisionViolatedConditionEntry.__tablename__].append(
+            _row(
+                schema.StateSupervisionViolatedConditionEntry(
+                    supervision_violated_condition_entry_id=entity_id,
+                    state_code=state_code,
+                    condition="CURFEW",
+                    supervision_violation_id=entity_id,
+                    person_id=person_id,
+                )
+            )
+        )
+        rows[schema.StateSupervisionViolationResponse.__tablename__].append(
+            _row(
+                schema.StateSupervisionViolationResponse(
+                    supervision_violation_response_id=entity_id,
+                    state_code=state_code,
+                    response_type=StateSupervisionViolationResponseType.VIOLATION_REPORT,
+                    response_date=violation_date,
+                    supervision_violation_id=entity_id,
+                    person_id=person_id,
+                ),
+                sequence_num=0,
+            )
+        )
+        rows[
+            schema.StateSupervisionViolationResponseDecisionEntry.__tablename__
+        ].append(
+            _row(
+                schema.StateSupervisionViolationResponseDecisionEntry(
+                    supervision_violation_response_decision_entry_id=entity_id,
+                    state_code=state_code,
+                    decision=StateSupervisionViolationResponseDecision.REVOCATION,
+                    supervision_violation_response_id=entity_id,
+                    person_id=person_id,
+                )
+            )
+        )
+
+    return rows
+
+
+def build_data_dict(
+    run_delegate: Type[PipelineRunDelegate],
+    state_code: str,
+    num_people: int,
+    num_periods: int,
+) -> DataTablesDict:
+    """Returns the rows of every table read by the pipeline of the |run_delegate|
+    for |num_people| synthetic people."""
+    pipeline_config = run_delegate.pipeline_config()
+    data_dict = default_data_dict_for_run_delegate(run_delegate)
+
+    reference_tables = [
+        *pipeline_config.required_reference_tables,
+        *pipeline_config.required_state_based_reference_tables,
+        *pipeline_config.state_specific_required_reference_tables.get(
+            StateCode(state_code), []
+        ),
+    ]
+    if issubclass(run_delegate, MetricPipelineRunDelegate):
+        reference_tables.append(STATE_RACE_ETHNICITY_POPULATION_TABLE_NAME)
+    for table in reference_tables:
+        data_dict[table] = []
+
+    for person_id in range(1, num_people + 1):
+        for table, rows in build_person_rows(
+            state_code, person_id, num_periods
+        ).items():
+            if table in data_dict:
+                data_dict[table].extend(rows)
+
+    return data_dict
+
+
+def _run_delegates_by_pipeline_name() -> Dict[str, Type[PipelineRunDelegate]]:
+    return {
+        run_delegate.pipeline_config().pipeline_name: run_delegate
+        for run_delegate in collect_all_pipeline_run_delegate_classes()
+        if issubclass(
+            run_delegate, (MetricPipelineRunDelegate, NormalizationPipelineRunDelegate)
+        )
+    }
+
+
+def _peak_memory_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_pipeline(
+    pipeline_name: str, state_code: str, num_people: int, num_periods: int
+) -> Dict[str, Any]:
+    """Runs the pipeline with the given |pipeline_name| over synthetic people and
+    returns the wall time, peak memory, output row counts and stats of each step."""
+    run_delegate = _run_delegates_by_pipeline_name()[pipeline_name]
+    data_dict = build_data_dict(run_delegate, state_code, num_people, num_periods)
+    input_memory_mb = _peak_memory_mb()
+
+    read_from_bq_constructor = FakeReadFromBigQueryFactory().create_fake_bq_source_constructor(
+        _DATASET,
+        data_dict,
+        # Metric pipelines read normalized entities from the normalized dataset
+        expected_normalized_dataset=(
+            normalized_state_dataset_for_state_code(StateCode(state_code))
+            if issubclass(run_delegate, MetricPipelineRunDelegate)
+            else None
+        ),
+    )
+    write_to_bq_factory: FakeWriteToBigQueryFactory[
+        _CountingWriteToBigQuery
+    ] = FakeWriteToBigQueryFactory(_CountingWriteToBigQuery)
+    write_to_bq_constructor = write_to_bq_factory.create_fake_bq_sink_constructor(
+        _DATASET, expected_output_tags=[]
+    )
+
+    _STEP_STATS.clear()
+    _OUTPUT_ROWS.clear()
+    with ExitStack() as stack:
+        for do_fn_cls in _TIMED_DO_FNS:
+            stack.enter_context(
+                patch.object(do_fn_cls, "process", _timed_process(do_fn_cls))
+            )
+        start = time.perf_counter()
+        run_test_pipeline(
+            run_delegate=run_delegate,
+            state_code=state_code,
+            project_id=_PROJECT,
+            dataset_id=_DATASET,
+            read_from_bq_constructor=read_from_bq_constructor,
+            write_to_bq_constructor=write_to_bq_constructor,
+        )
+        wall_time_seconds = time.perf_counter() - start
+
+    return {
+        "wall_time_seconds": wall_time_seconds,
+        "people_per_second": num_people / wall_time_seconds,
+        "input_memory_mb": input_memory_mb,
+        "peak_memory_mb": _peak_memory_mb(),
+        "steps": {
+            step_name: {
+                **attr.asdict(step_stats),
+                "elements_per_second": step_stats.input_elements
+                / max(step_stats.seconds, 1e-9),
+            }
+            for step_name, step_stats in _STEP_STATS.items()
+        },
+        "output_rows": dict(_OUTPUT_ROWS),
+    }
+
+
+def run_benchmark(
+    pipeline_names: List[str], state_code: str, num_people: int, num_periods: int
+) -> Dict[str, Any]:
+    """Benchmarks each pipeline in a separate process, so that the peak memory of
+    each process only reflects the pipeline run in it."""
+    results: Dict[str, Any] = {
+        "state_code": state_code,
+        "num_people": num_people,
+        "num_periods": num_periods,
+        "pipelines": {},
+    }
+    mp_context = (
+        multiprocessing.get_context("fork")
+        if "fork" in multiprocessing.get_all_start_methods()
+        else None
+    )
+    for pipeline_name in pipeline_names:
+        with futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=mp_context
+        ) as executor:
+            pipeline_results = executor.submit(
+                benchmark_pipeline, pipeline_name, state_code, num_people, num_periods
+            ).result()
+        logging.info(
+            "%s: [%.2f]s ([%.1f] people/s), peak memory [%.0f] MB",
+            pipeline_name,
+            pipeline_results["wall_time_seconds"],
+            pipeline_results["people_per_second"],
+            pipeline_results["peak_memory_mb"],
+        )
+        for step_name, step_results in pipeline_results["steps"].items():
+            logging.info(
+                "    %s: [%.2f]s for [%d] elements ([%.1f] elements/s)",
+                step_name,
+                step_results["seconds"],
+                step_results["input_elements"],
+                step_results["elements_per_second"],
+            )
+        results["pipelines"][pipeline_name] = pipeline_results
+    return results
+
+
+def log_comparison_to_baseline(
+    results: Dict[str, Any], baseline: Dict[str, Any]
+) -> None:
+    """Logs how the wall time of each pipeline and the time of each of its steps
+    compare to the |baseline| results of an earlier run."""
+    for pipeline_name, pipeline_results in results["pipelines"].items():
+        baseline_results = baseline["pipelines"].get(pipeline_name)
+        if not baseline_results:
+            continue
+        logging.info(
+            "%s: wall time [%.2f]s -> [%.2f]s ([%.2f]x)",
+            pipeline_name,
+            baseline_results["wall_time_seconds"],
+            pipeline_results["wall_time_seconds"],
+            baseline_results["wall_time_seconds"]
+            / pipeline_results["wall_time_seconds"],
+        )
+        for step_name, step_results in pipeline_results["steps"].items():
+            baseline_step_results = baseline_results["steps"].get(step_name)
+            if not baseline_step_results or not step_results["seconds"]:
+                continue
+            logging.info(
+                "    %s: [%.2f]s -> [%.2f]s ([%.2f]x)",
+                step_name,
+                baseline_step_results["seconds"],
+                step_results["seconds"],
+                baseline_step_results["seconds"] / step_results["seconds"],
+            )
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Parses the arguments needed to call the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-people", type=int, default=1000)
+    parser.add_argument("--num-periods", type=int, default=5)
+    parser.add_argument("--state-code", type=str, default=StateCode.US_ND.value)
+    parser.add_argument(
+        "--pipelines",
+        nargs="+",
+        choices=sorted(_run_delegates_by_pipeline_name()),
+        default=sorted(_run_delegates_by_pipeline_name()),
+    )
+    parser.add_argument("--output-path", type=str)
+    parser.add_argument("--baseline-path", type=str)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments(sys.argv[1:])
+    benchmark_results = run_benchmark(
+        args.pipelines, args.state_code, args.num_people, args.num_periods
+    )
+    if args.output_path:
+        with open(args.output_path, "w", encoding="utf-8") as output_file:
+            json.dump(benchmark_results, output_file, indent=2)
+    else:
+        print(json.dumps(benchmark_results, indent=2))
+    if args.baseline_path:
+        with open(args.baseline_path, encoding="utf-8") as baseline_file:
+            log_comparison_to_baseline(benchmark_results, json.load(baseline_file))
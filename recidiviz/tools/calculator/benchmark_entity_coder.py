@@ -0,0 +1,106 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmark comparing the entity graph encoding used by the EntityGraphCoder in the
+calculation pipelines to pickling the same graphs, which is what Beam falls back to
+for Entity classes without a registered coder.
+
+Builds |--num-people| StatePerson graphs with at least one child of every state
+entity type and all back edges set, and reports the total encoded size and the
+time to encode and decode every graph with each method.
+
+Example Usage:
+    python -m recidiviz.tools.calculator.benchmark_entity_coder \
+        --num-people 1000
+"""
+import argparse
+import logging
+import pickle
+import sys
+import time
+from typing import Callable, List, Sequence
+
+from recidiviz.calculator.pipeline.utils.entity_graph_encoding import (
+    decode_entity_graph,
+    encode_entity_graph,
+)
+from recidiviz.persistence.entity.base_entity import Entity
+from recidiviz.persistence.entity.state.entities import StatePerson
+from recidiviz.tests.persistence.entity.state.entities_test_utils import (
+    generate_full_graph_state_person,
+)
+
+
+def build_person(person_id: int) -> StatePerson:
+    person = generate_full_graph_state_person(set_back_edges=True, set_ids=True)
+    person.person_id = person_id
+    return person
+
+
+def _time_encoding(
+    name: str,
+    people: Sequence[StatePerson],
+    encode: Callable[[Entity], bytes],
+    decode: Callable[[bytes], Entity],
+) -> None:
+    """Encodes and decodes every person graph with the given functions and logs the
+    encoded size and the time taken."""
+    start = time.perf_counter()
+    encoded_people = [encode(person) for person in people]
+    encode_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for encoded_person in encoded_people:
+        decode(encoded_person)
+    decode_elapsed = time.perf_counter() - start
+
+    num_bytes = sum(len(encoded_person) for encoded_person in encoded_people)
+    logging.info(
+        "%s: [%d] bytes ([%.0f] bytes/person), encode [%.1f] us/person, "
+        "decode [%.1f] us/person",
+        name,
+        num_bytes,
+        num_bytes / len(people),
+        1e6 * encode_elapsed / len(people),
+        1e6 * decode_elapsed / len(people),
+    )
+
+
+def run_benchmark(num_people: int) -> None:
+    people = [build_person(person_id) for person_id in range(num_people)]
+
+    _time_encoding(
+        "pickle",
+        people,
+        lambda entity: pickle.dumps(entity, protocol=pickle.HIGHEST_PROTOCOL),
+        pickle.loads,
+    )
+    _time_encoding(
+        "entity graph encoding", people, encode_entity_graph, decode_entity_graph
+    )
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Parses the arguments needed to call the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-people", type=int, default=1000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments(sys.argv[1:])
+    run_benchmark(args.num_people)
@@ -0,0 +1,270 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmark for producing metrics from identifier results in the incarceration and
+supervision metric pipelines.
+
+Generates |--num-people| synthetic US_ND people, each with |--num-months| months of
+IncarcerationEvents and SupervisionEvents, and reports how long the
+IncarcerationMetricProducer and SupervisionMetricProducer take to turn them into
+metrics, and into the BigQuery rows of those metrics when run with
+--metric_row_output. This is the per-person work done in the ProduceMetrics and
+ProduceMetricRows steps of each pipeline, without the Beam overhead around it. Note
+that the rows already hold BigQuery-formatted values, while the metrics are still
+converted into dicts later in the pipeline by RecidivizMetricWritableDict.
+
+Example Usage:
+    python -m recidiviz.tools.calculator.benchmark_metric_producers \
+        --num-people 1000 [--num-months 120]
+"""
+import argparse
+import datetime
+import logging
+import sys
+import time
+from typing import List, Sequence, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+from recidiviz.calculator.pipeline.metrics.base_metric_producer import (
+    BaseMetricProducer,
+)
+from recidiviz.calculator.pipeline.metrics.incarceration.events import (
+    IncarcerationReleaseEvent,
+    IncarcerationStandardAdmissionEvent,
+    IncarcerationStayEvent,
+)
+from recidiviz.calculator.pipeline.metrics.incarceration.metric_producer import (
+    IncarcerationMetricProducer,
+)
+from recidiviz.calculator.pipeline.metrics.incarceration.metrics import (
+    IncarcerationMetricType,
+)
+from recidiviz.calculator.pipeline.metrics.supervision.events import (
+    SupervisionPopulationEvent,
+    SupervisionTerminationEvent,
+)
+from recidiviz.calculator.pipeline.metrics.supervision.metric_producer import (
+    SupervisionMetricProducer,
+)
+from recidiviz.calculator.pipeline.metrics.supervision.metrics import (
+    SupervisionMetricType,
+)
+from recidiviz.calculator.pipeline.metrics.utils.metric_utils import PersonMetadata
+from recidiviz.calculator.pipeline.utils.identifier_models import IdentifierResult
+from recidiviz.calculator.pipeline.utils.state_utils.state_calculation_config_manager import (
+    get_required_state_specific_metrics_producer_delegates,
+)
+from recidiviz.calculator.pipeline.utils.state_utils.state_specific_incarceration_metrics_producer_delegate import (
+    StateSpecificIncarcerationMetricsProducerDelegate,
+)
+from recidiviz.calculator.pipeline.utils.state_utils.state_specific_supervision_metrics_producer_delegate import (
+    StateSpecificSupervisionMetricsProducerDelegate,
+)
+from recidiviz.common.constants.state.external_id_types import US_ND_ELITE, US_ND_SID
+from recidiviz.common.constants.state.state_case_type import StateSupervisionCaseType
+from recidiviz.common.constants.state.state_incarceration_period import (
+    StateIncarcerationPeriodAdmissionReason,
+    StateSpecializedPurposeForIncarceration,
+)
+from recidiviz.common.constants.state.state_person import StateGender
+from recidiviz.common.constants.state.state_supervision_period import (
+    StateSupervisionLevel,
+    StateSupervisionPeriodSupervisionType,
+)
+from recidiviz.persistence.entity.state.entities import (
+    StatePerson,
+    StatePersonExternalId,
+)
+
+_STATE_CODE = "US_ND"
+_FIRST_MONTH = datetime.date(2010, 1, 1)
+
+
+def build_person(person_id: int) -> StatePerson:
+    person = StatePerson.new_with_defaults(
+        state_code=_STATE_CODE,
+        person_id=person_id,
+        gender=StateGender.FEMALE if person_id % 2 else StateGender.MALE,
+        birthdate=datetime.date(1960 + person_id % 40, person_id % 12 + 1, 1),
+    )
+    person.external_ids = [
+        StatePersonExternalId.new_with_defaults(
+            state_code=_STATE_CODE,
+            external_id=f"{id_type}_{person_id}",
+            id_type=id_type,
+        )
+        for id_type in (US_ND_ELITE, US_ND_SID)
+    ]
+    return person
+
+
+def build_incarceration_events(num_months: int) -> List[IdentifierResult]:
+    """Returns one stay per month, with an admission and release every year."""
+    events: List[IdentifierResult] = []
+    for month in range(num_months):
+        event_date = _FIRST_MONTH + relativedelta(months=month)
+        events.append(
+            IncarcerationStayEvent(
+                state_code=_STATE_CODE,
+                event_date=event_date,
+                facility="FACILITY",
+                county_of_residence="COUNTY",
+                admission_reason=StateIncarcerationPeriodAdmissionReason.NEW_ADMISSION,
+                admission_reason_raw_text="NEW_ADMISSION",
+                specialized_purpose_for_incarceration=StateSpecializedPurposeForIncarceration.GENERAL,
+            )
+        )
+        if month % 12 == 0:
+            events.append(
+                IncarcerationStandardAdmissionEvent(
+                    state_code=_STATE_CODE,
+                    event_date=event_date,
+                    facility="FACILITY",
+                    county_of_residence="COUNTY",
+                    admission_reason=StateIncarcerationPeriodAdmissionReason.NEW_ADMISSION,
+                    admission_reason_raw_text="NEW_ADMISSION",
+                    specialized_purpose_for_incarceration=StateSpecializedPurposeForIncarceration.GENERAL,
+                )
+            )
+        if month % 12 == 11:
+            events.append(
+                IncarcerationReleaseEvent(
+                    state_code=_STATE_CODE,
+                    event_date=event_date,
+                    facility="FACILITY",
+                    county_of_residence="COUNTY",
+                )
+            )
+    return events
+
+
+def build_supervision_events(num_months: int) -> List[IdentifierResult]:
+    """Returns one population event per month, with a termination every year."""
+    events: List[IdentifierResult] = []
+    for month in range(num_months):
+        event_date = _FIRST_MONTH + relativedelta(months=month)
+        events.append(
+            SupervisionPopulationEvent(
+                state_code=_STATE_CODE,
+                year=event_date.year,
+                month=event_date.month,
+                event_date=event_date,
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                case_type=StateSupervisionCaseType.GENERAL,
+                supervision_level=StateSupervisionLevel.MEDIUM,
+                supervision_level_raw_text="MEDIUM",
+                projected_end_date=None,
+            )
+        )
+        if month % 12 == 11:
+            events.append(
+                SupervisionTerminationEvent(
+                    state_code=_STATE_CODE,
+                    year=event_date.year,
+                    month=event_date.month,
+                    event_date=event_date,
+                    supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                    case_type=StateSupervisionCaseType.GENERAL,
+                )
+            )
+    return events
+
+
+def _time_metric_producer(
+    name: str,
+    metric_producer: BaseMetricProducer,
+    people_and_events: Sequence[Tuple[StatePerson, List[IdentifierResult]]],
+    metric_inclusions: dict,
+    produce_rows: bool,
+) -> None:
+    """Runs the |metric_producer| over every person's events and logs the time. If
+    |produce_rows| is set, produces the BigQuery rows of the metrics instead."""
+    person_metadata = PersonMetadata(prioritized_race_or_ethnicity="WHITE")
+    metrics_producer_delegates = get_required_state_specific_metrics_producer_delegates(
+        _STATE_CODE,
+        {
+            StateSpecificIncarcerationMetricsProducerDelegate,
+            StateSpecificSupervisionMetricsProducerDelegate,
+        },
+    )
+
+    produce = (
+        metric_producer.produce_metric_rows
+        if produce_rows
+        else metric_producer.produce_metrics
+    )
+
+    num_metrics = 0
+    start = time.perf_counter()
+    for person, events in people_and_events:
+        num_metrics += len(
+            produce(
+                person=person,
+                identifier_results=list(events),
+                metric_inclusions=metric_inclusions,
+                person_metadata=person_metadata,
+                pipeline_job_id="benchmark",
+                metrics_producer_delegates=metrics_producer_delegates,
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    logging.info(
+        "%s%s: [%d] metrics for [%d] people in [%.2f]s ([%.1f] us/metric)",
+        name,
+        " (rows)" if produce_rows else "",
+        num_metrics,
+        len(people_and_events),
+        elapsed,
+        1e6 * elapsed / max(num_metrics, 1),
+    )
+
+
+def run_benchmark(num_people: int, num_months: int) -> None:
+    people = [build_person(person_id) for person_id in range(num_people)]
+    incarceration_events = build_incarceration_events(num_months)
+    supervision_events = build_supervision_events(num_months)
+
+    for produce_rows in (False, True):
+        _time_metric_producer(
+            "incarceration",
+            IncarcerationMetricProducer(),
+            [(person, incarceration_events) for person in people],
+            {metric_type: True for metric_type in IncarcerationMetricType},
+            produce_rows,
+        )
+        _time_metric_producer(
+            "supervision",
+            SupervisionMetricProducer(),
+            [(person, supervision_events) for person in people],
+            {metric_type: True for metric_type in SupervisionMetricType},
+            produce_rows,
+        )
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Parses the arguments needed to call the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-people", type=int, default=1000)
+    parser.add_argument("--num-months", type=int, default=120)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments(sys.argv[1:])
+    run_benchmark(args.num_people, args.num_months)
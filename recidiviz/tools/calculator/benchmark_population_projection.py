@@ -0,0 +1,200 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmark for the population projection cohort engine.
+
+Builds a synthetic macrosimulation with |--num-groups| disaggregation groups flowing
+through PRETRIAL (shell) -> PRISON -> SUPERVISION -> RELEASE (full compartments), runs
+the baseline PopulationSimulation and reports how long initialization and projection
+took. Inputs are generated from a fixed seed, so the projections can be written out
+with --output-path and compared against another run with --compare-to-path to check
+that engine changes do not change the results.
+
+Example Usage:
+    python -m recidiviz.tools.calculator.benchmark_population_projection \
+        --num-groups 50 [--projection-time-steps 120] [--output-path /tmp/projection.csv]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from recidiviz.calculator.modeling.population_projection.population_simulation.population_simulation_factory import (
+    PopulationSimulationFactory,
+)
+from recidiviz.calculator.modeling.population_projection.super_simulation.initializer import (
+    SimulationInputData,
+    UserInputs,
+)
+
+_COMPARTMENTS_ARCHITECTURE = {
+    "PRETRIAL": "shell",
+    "PRISON": "full",
+    "SUPERVISION": "full",
+    "RELEASE": "full",
+}
+
+# (compartment, outflow_to, max compartment_duration)
+_TRANSITIONS: List[Tuple[str, str, int]] = [
+    ("PRISON", "SUPERVISION", 60),
+    ("PRISON", "RELEASE", 120),
+    ("SUPERVISION", "PRISON", 36),
+    ("SUPERVISION", "RELEASE", 48),
+    ("RELEASE", "PRISON", 60),
+    ("RELEASE", "RELEASE", 240),
+]
+
+
+def build_simulation_inputs(
+    num_groups: int, history_time_steps: int, seed: int
+) -> SimulationInputData:
+    """Generates random, but reproducible, macrosimulation inputs."""
+    rng = np.random.default_rng(seed)
+    groups = [f"GROUP_{i:03d}" for i in range(num_groups)]
+
+    outflows_data = pd.DataFrame(
+        [
+            {
+                "compartment": "PRETRIAL",
+                "outflow_to": "PRISON",
+                "time_step": time_step,
+                "group": group,
+                "total_population": float(rng.integers(50, 150)),
+            }
+            for group in groups
+            for time_step in range(-history_time_steps, 1)
+        ]
+    )
+
+    transitions_data = pd.DataFrame(
+        [
+            {
+                "compartment": compartment,
+                "outflow_to": outflow_to,
+                "compartment_duration": float(duration),
+                "group": group,
+                "total_population": float(rng.integers(1, 20)),
+            }
+            for group in groups
+            for compartment, outflow_to, max_duration in _TRANSITIONS
+            for duration in range(1, max_duration + 1, 3)
+        ]
+    )
+
+    total_population_data = pd.DataFrame(
+        [
+            {
+                "compartment": compartment,
+                "time_step": 0,
+                "group": group,
+                "total_population": float(rng.integers(500, 2000)),
+            }
+            for group in groups
+            for compartment in ["PRISON", "SUPERVISION", "RELEASE"]
+        ]
+    )
+
+    return SimulationInputData(
+        outflows_data=outflows_data,
+        transitions_data=transitions_data,
+        total_population_data=total_population_data,
+        compartments_architecture=_COMPARTMENTS_ARCHITECTURE,
+        disaggregation_axes=["group"],
+        microsim=False,
+        microsim_data=pd.DataFrame(),
+        should_initialize_compartment_populations=False,
+        should_scale_populations_after_step=True,
+        override_cross_flow_function=None,
+    )
+
+
+def run_benchmark(
+    num_groups: int, projection_time_steps: int, history_time_steps: int, seed: int
+) -> pd.DataFrame:
+    """Runs the baseline simulation, logs timings and returns the projections."""
+    data_inputs = build_simulation_inputs(num_groups, history_time_steps, seed)
+    user_inputs = UserInputs(
+        start_time_step=0,
+        projection_time_steps=projection_time_steps,
+        constant_admissions=True,
+        speed_run=False,
+    )
+
+    # The simulation objects print their own timings, which we replace with ours
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        population_simulation = PopulationSimulationFactory.build_population_simulation(
+            user_inputs, [], -history_time_steps, data_inputs
+        )
+        initialized = time.perf_counter()
+        projections = population_simulation.simulate_policies()
+        projected = time.perf_counter()
+
+    logging.info(
+        "%d groups, %d history + %d projection time steps: initialization [%.2f]s, "
+        "projection [%.2f]s, total [%.2f]s",
+        num_groups,
+        history_time_steps,
+        projection_time_steps,
+        initialized - start,
+        projected - initialized,
+        projected - start,
+    )
+    return projections.reset_index(drop=True)
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Parses the arguments needed to call the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-groups", type=int, default=20)
+    parser.add_argument("--projection-time-steps", type=int, default=60)
+    parser.add_argument("--history-time-steps", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output-path",
+        help="If set, the projections are written to this CSV file.",
+    )
+    parser.add_argument(
+        "--compare-to-path",
+        help="If set, the projections are checked against those in this CSV file.",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments(sys.argv[1:])
+    result = run_benchmark(
+        args.num_groups,
+        args.projection_time_steps,
+        args.history_time_steps,
+        args.seed,
+    )
+    if args.output_path:
+        result.to_csv(args.output_path, index=False, float_format="%.17g")
+    if args.compare_to_path:
+        expected = pd.read_csv(args.compare_to_path)
+        actual = pd.read_csv(
+            io.StringIO(result.to_csv(index=False, float_format="%.17g"))
+        )
+        pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+        logging.info("Projections match [%s]", args.compare_to_path)
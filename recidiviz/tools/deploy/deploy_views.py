@@ -152,6 +152,9 @@ def deploy_views(
         # This script does not do any clean up of previously managed views
         historically_managed_datasets_to_clean=None,
         default_table_expiration_for_new_datasets=table_expiration,
+        # Views deployed to production datasets by this script must be redeployed by
+        # the next deploy that uses the fingerprint index.
+        invalidate_fingerprint_index=not test_schema,
     )
 
 
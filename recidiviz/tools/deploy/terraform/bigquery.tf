@@ -116,6 +116,21 @@ resource "google_bigquery_table" "validation_results" {
         "name": "failure_description",
         "type": "STRING",
         "mode": "NULLABLE"
+    },
+    {
+        "name": "runtime_seconds",
+        "type": "FLOAT",
+        "mode": "NULLABLE"
+    },
+    {
+        "name": "inputs_fingerprint",
+        "type": "STRING",
+        "mode": "NULLABLE"
+    },
+    {
+        "name": "cached_from_run_id",
+        "type": "STRING",
+        "mode": "NULLABLE"
     }
 ]
 EOF
@@ -30,19 +30,16 @@ from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAG
 from recidiviz.utils.metadata import local_project_id_override
 from recidiviz.utils.params import str_to_bool
 from recidiviz.view_registry.datasets import VIEW_SOURCE_TABLE_DATASETS
-from recidiviz.view_registry.deployed_views import all_deployed_view_builders
+from recidiviz.view_registry.deployed_views import (
+    DEPLOYED_VIEW_BUILDER_REGISTRY,
+    all_deployed_view_builders,
+)
 
 
 def build_dag_walker(dataset_id: str, view_id: str) -> BigQueryViewDagWalker:
-    is_valid_view = False
-    for builder in all_deployed_view_builders():
-        if (
-            not is_valid_view
-            and builder.dataset_id == dataset_id
-            and builder.view_id == view_id
-        ):
-            is_valid_view = True
-    if not is_valid_view:
+    if not DEPLOYED_VIEW_BUILDER_REGISTRY.view_builder_for_address(
+        BigQueryAddress(dataset_id=dataset_id, table_id=view_id)
+    ):
         raise ValueError(f"invalid view {dataset_id}.{view_id}")
     return BigQueryViewDagWalker(
         build_views_to_update(
@@ -0,0 +1,188 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmark for evaluating ingest view manifests against ingest view results rows.
+
+For every ingest view mappings manifest in the given states that has an extract and
+merge fixture file checked in, times the interpreted EntityTreeManifest.build_from_row()
+against CompiledEntityTreeManifest.build_from_rows(), and checks that both produce the
+same entity trees. Since fixture files are small, each file's rows are repeated
+|--row-multiplier| times to get more stable timings.
+
+Example Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_ingest_view_manifest_evaluation \
+        --state-codes US_ND US_PA [--row-multiplier 100] [--iterations 3]
+"""
+import argparse
+import csv
+import datetime
+import functools
+import logging
+import os
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+from recidiviz.common.constants.states import StateCode
+from recidiviz.common.io.local_file_contents_handle import LocalFileContentsHandle
+from recidiviz.ingest.direct.direct_ingest_regions import get_direct_ingest_region
+from recidiviz.ingest.direct.ingest_mappings.compiled_ingest_view_manifest import (
+    CompiledEntityTreeManifest,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
+    EntityTreeManifest,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_results_parser import (
+    MANIFEST_LANGUAGE_VERSION_KEY,
+    IngestViewResultsParser,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_results_parser_delegate import (
+    IngestViewResultsParserDelegateImpl,
+    ingest_view_manifest_dir,
+)
+from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
+from recidiviz.persistence.database.schema_utils import SchemaType
+from recidiviz.tests.ingest.direct.fixture_util import (
+    DirectIngestFixtureDataFileType,
+    direct_ingest_fixture_path,
+)
+from recidiviz.utils.yaml_dict import YAMLDict
+
+
+def _read_fixture_rows(state_code: StateCode, ingest_view_name: str) -> List[Dict]:
+    fixture_path = direct_ingest_fixture_path(
+        region_code=state_code.value.lower(),
+        file_name=f"{ingest_view_name}.csv",
+        fixture_file_type=DirectIngestFixtureDataFileType.EXTRACT_AND_MERGE_INPUT,
+    )
+    if not os.path.exists(fixture_path):
+        return []
+    return list(
+        csv.DictReader(
+            LocalFileContentsHandle(
+                fixture_path, cleanup_file=False
+            ).get_contents_iterator()
+        )
+    )
+
+
+def _build_from_rows_interpreted(
+    manifest: EntityTreeManifest, rows: List[Dict]
+) -> List[object]:
+    return [manifest.build_from_row(row) for row in rows]
+
+
+def _time(fn: Callable[[], object], iterations: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=iterations))
+
+
+def benchmark_state(
+    state_code: StateCode, row_multiplier: int, iterations: int
+) -> Dict[str, float]:
+    """Benchmarks all manifests for the given state, returning the total interpreted
+    and compiled evaluation times.
+    """
+    region = get_direct_ingest_region(state_code.value.lower())
+    parser = IngestViewResultsParser(
+        delegate=IngestViewResultsParserDelegateImpl(
+            region=region,
+            schema_type=SchemaType.STATE,
+            ingest_instance=DirectIngestInstance.SECONDARY,
+            results_update_datetime=datetime.datetime.now(),
+        )
+    )
+
+    totals = {"interpreted": 0.0, "compiled": 0.0}
+    manifest_dir = ingest_view_manifest_dir(region)
+    for file_name in sorted(os.listdir(manifest_dir)):
+        manifest_path = os.path.join(manifest_dir, file_name)
+        ingest_view_name, extension = os.path.splitext(file_name)
+        if (
+            extension != ".yaml"
+            or MANIFEST_LANGUAGE_VERSION_KEY
+            not in YAMLDict.from_path(manifest_path).keys()
+        ):
+            continue
+
+        rows = _read_fixture_rows(state_code, ingest_view_name) * row_multiplier
+        if not rows:
+            logging.info("[%s] No fixture file found, skipping.", ingest_view_name)
+            continue
+
+        manifest, _ = parser.parse_manifest(manifest_path)
+        compiled_manifest = CompiledEntityTreeManifest(manifest)
+
+        if _build_from_rows_interpreted(manifest, rows) != (
+            compiled_manifest.build_from_rows(rows)
+        ):
+            raise ValueError(
+                f"Compiled manifest output for [{ingest_view_name}] does not match "
+                f"interpreted output."
+            )
+
+        interpreted_time = _time(
+            functools.partial(_build_from_rows_interpreted, manifest, rows),
+            iterations,
+        )
+        compiled_time = _time(
+            functools.partial(compiled_manifest.build_from_rows, rows), iterations
+        )
+        logging.info(
+            "[%s] %s rows - interpreted: %.3fs, compiled: %.3fs (%.2fx)",
+            ingest_view_name,
+            len(rows),
+            interpreted_time,
+            compiled_time,
+            interpreted_time / compiled_time if compiled_time else float("inf"),
+        )
+        totals["interpreted"] += interpreted_time
+        totals["compiled"] += compiled_time
+    return totals
+
+
+def main(state_codes: List[StateCode], row_multiplier: int, iterations: int) -> None:
+    for state_code in state_codes:
+        totals = benchmark_state(state_code, row_multiplier, iterations)
+        logging.info(
+            "[%s] TOTAL - interpreted: %.3fs, compiled: %.3fs",
+            state_code.value,
+            totals["interpreted"],
+            totals["compiled"],
+        )
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Parses the named arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--state-codes",
+        dest="state_codes",
+        type=StateCode,
+        choices=list(StateCode),
+        nargs="+",
+        required=True,
+    )
+    parser.add_argument(
+        "--row-multiplier", dest="row_multiplier", type=int, default=100
+    )
+    parser.add_argument("--iterations", dest="iterations", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+    args = parse_arguments(sys.argv[1:])
+    main(args.state_codes, args.row_multiplier, args.iterations)
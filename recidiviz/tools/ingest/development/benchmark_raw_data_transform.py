@@ -0,0 +1,127 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Microbenchmark for the whitespace stripping / empty row filtering we do on every
+chunk of a raw data file before it is re-uploaded for import to BigQuery.
+
+Generates a synthetic chunk of string values (with padding whitespace and some
+fully empty rows) that is shaped like a chunk of a wide raw data table, then times the
+per-cell applymap() implementation we used previously against
+strip_whitespace_and_filter_empty_rows(), and checks that both produce the same
+result.
+
+Example Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_raw_data_transform \
+        [--num-rows 250000] [--num-columns 60] [--empty-row-fraction 0.01] \
+        [--iterations 3]
+"""
+import argparse
+import logging
+import random
+import string
+import sys
+import timeit
+from typing import Callable, List
+
+import pandas as pd
+
+from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
+    strip_whitespace_and_filter_empty_rows,
+)
+
+
+def _applymap_transform(df: pd.DataFrame) -> pd.DataFrame:
+    """The original per-cell implementation, kept here for comparison."""
+    df = df.applymap(lambda x: x.strip())
+    return df[~pd.isnull(df.applymap(lambda x: None if x == "" else x)).all(axis=1)]
+
+
+def _random_value(rng: random.Random) -> str:
+    value = "".join(
+        rng.choices(string.ascii_uppercase + string.digits, k=rng.randint(0, 12))
+    )
+    return " " * rng.randint(0, 2) + value + " " * rng.randint(0, 4)
+
+
+def build_synthetic_chunk(
+    num_rows: int, num_columns: int, empty_row_fraction: float, seed: int = 0
+) -> pd.DataFrame:
+    """Returns a DataFrame of string values shaped like a chunk read from a raw data
+    file with dtype=str and keep_default_na=False."""
+    rng = random.Random(seed)
+    # Build a pool of values up front so generation time does not dominate the run.
+    value_pool = [_random_value(rng) for _ in range(10000)]
+    columns = {}
+    for i in range(num_columns):
+        rng.shuffle(value_pool)
+        columns[f"COLUMN_{i}"] = [
+            value_pool[j % len(value_pool)] for j in range(num_rows)
+        ]
+    df = pd.DataFrame(columns)
+    empty_rows = rng.sample(range(num_rows), int(num_rows * empty_row_fraction))
+    df.iloc[empty_rows] = " "
+    return df
+
+
+def _time_transform(
+    transform_fn: Callable[[pd.DataFrame], pd.DataFrame],
+    df: pd.DataFrame,
+    iterations: int,
+) -> List[float]:
+    return timeit.repeat(lambda: transform_fn(df.copy()), number=1, repeat=iterations)
+
+
+def main(
+    num_rows: int, num_columns: int, empty_row_fraction: float, iterations: int
+) -> None:
+    logging.info("Building synthetic chunk of [%s x %s]...", num_rows, num_columns)
+    df = build_synthetic_chunk(num_rows, num_columns, empty_row_fraction)
+
+    pd.testing.assert_frame_equal(
+        _applymap_transform(df.copy()),
+        strip_whitespace_and_filter_empty_rows(df.copy()),
+    )
+
+    for name, transform_fn in [
+        ("applymap", _applymap_transform),
+        ("vectorized", strip_whitespace_and_filter_empty_rows),
+    ]:
+        times = _time_transform(transform_fn, df, iterations)
+        logging.info(
+            "[%s] min: %.3fs, mean: %.3fs over %s iterations",
+            name,
+            min(times),
+            sum(times) / len(times),
+            iterations,
+        )
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Parses the named arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-rows", dest="num_rows", type=int, default=250000)
+    parser.add_argument("--num-columns", dest="num_columns", type=int, default=60)
+    parser.add_argument(
+        "--empty-row-fraction", dest="empty_row_fraction", type=float, default=0.01
+    )
+    parser.add_argument("--iterations", dest="iterations", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+    args = parse_arguments(sys.argv[1:])
+    main(args.num_rows, args.num_columns, args.empty_row_fraction, args.iterations)
@@ -135,6 +135,7 @@ def _update_enum_known_values(
         always_historical_export=original_config.always_historical_export,
         import_chunk_size_rows=original_config.import_chunk_size_rows,
         infer_columns_from_config=original_config.infer_columns_from_config,
+        encoding_detection_mode=original_config.encoding_detection_mode,
     )
 
 
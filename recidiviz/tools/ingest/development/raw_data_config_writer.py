@@ -19,6 +19,7 @@
 import os
 from typing import List
 
+from recidiviz.cloud_storage.gcsfs_csv_reader import EncodingDetectionMode
 from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
     DirectIngestRawFileConfig,
     RawTableColumnInfo,
@@ -110,6 +111,9 @@ class RawDataConfigWriter:
             config += "supplemental_order_by_clause: True\n"
         if raw_file_config.infer_columns_from_config:
             config += "infer_columns_from_config: True\n"
+        if raw_file_config.encoding_detection_mode != EncodingDetectionMode.NONE:
+            detection_mode = raw_file_config.encoding_detection_mode.value
+            config += f"encoding_detection_mode: {detection_mode}\n"
 
         # If an encoding is not the default, we need to include it in the config
         if raw_file_config.encoding != default_encoding:
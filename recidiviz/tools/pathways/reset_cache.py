@@ -40,6 +40,4 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     for state, metric_list in ENABLED_METRICS_BY_STATE.items():
-        metric_cache = PathwaysMetricCache.build(state)
-        for metric in metric_list:
-            metric_cache.reset_cache(metric)
+        PathwaysMetricCache.build(state).warm_up(metric_list)
@@ -0,0 +1,122 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Script that reports how long it takes to import and collect each group of deployed
+view builders, and that regenerates the deployed views manifest used to look up
+individual views without loading every view config module.
+
+Collections are loaded in order, so the import time for each collection only includes
+modules that were not already imported by an earlier collection. Pass --collection to
+profile a single collection from a cold start.
+
+Example terminal execution:
+python -m recidiviz.tools.profile_deployed_view_builders --project-id recidiviz-staging --write-manifest True
+"""
+import argparse
+import json
+import logging
+import time
+from typing import List, Optional
+
+from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAGING
+from recidiviz.utils.metadata import local_project_id_override
+from recidiviz.utils.params import str_to_bool
+from recidiviz.view_registry.deployed_views import (
+    DEPLOYED_VIEW_BUILDER_REGISTRY,
+    DEPLOYED_VIEW_BUILDERS_LOAD_TIME_BUDGET_SECONDS,
+    DEPLOYED_VIEWS_MANIFEST_PATH,
+    ViewBuilderCollectionLoadTiming,
+)
+
+
+def format_load_timings_report(
+    timings: List[ViewBuilderCollectionLoadTiming], total_seconds: float
+) -> str:
+    """Formats per-collection load timings as a table, slowest collections first."""
+    lines = [
+        f"{'collection':<30}{'import (s)':>12}{'collect (s)':>13}{'total (s)':>11}"
+        f"{'builders':>10}"
+    ]
+    for timing in sorted(timings, key=lambda t: t.total_seconds, reverse=True):
+        lines.append(
+            f"{timing.collection_name:<30}{timing.import_seconds:>12.2f}"
+            f"{timing.collect_seconds:>13.2f}{timing.total_seconds:>11.2f}"
+            f"{timing.view_builder_count:>10}"
+        )
+    lines.append(
+        f"Loaded {sum(t.view_builder_count for t in timings)} view builders in "
+        f"{total_seconds:.2f}s (budget: {DEPLOYED_VIEW_BUILDERS_LOAD_TIME_BUDGET_SECONDS:.2f}s)"
+    )
+    return "\n".join(lines)
+
+
+def main(project_id: str, collection: Optional[str], write_manifest: bool) -> None:
+    """Executes the main flow of the script."""
+    with local_project_id_override(project_id):
+        start = time.perf_counter()
+        if collection:
+            DEPLOYED_VIEW_BUILDER_REGISTRY.builders_for_collection(collection)
+        else:
+            DEPLOYED_VIEW_BUILDER_REGISTRY.all_view_builders()
+        total_seconds = time.perf_counter() - start
+
+        print(
+            format_load_timings_report(
+                DEPLOYED_VIEW_BUILDER_REGISTRY.load_timings, total_seconds
+            )
+        )
+
+        if write_manifest:
+            if collection:
+                raise ValueError("Cannot write the manifest for a single collection.")
+            with open(DEPLOYED_VIEWS_MANIFEST_PATH, "w", encoding="utf-8") as f:
+                json.dump(DEPLOYED_VIEW_BUILDER_REGISTRY.build_manifest(), f, indent=2)
+                f.write("\n")
+            logging.info("Wrote manifest to [%s]", DEPLOYED_VIEWS_MANIFEST_PATH)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses the required arguments."""
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--project-id",
+        choices=[GCP_PROJECT_STAGING, GCP_PROJECT_PRODUCTION],
+        default=GCP_PROJECT_STAGING,
+        help="The project whose deployed view builders should be loaded. The manifest "
+        "should be written using staging, which deploys a superset of production's "
+        "views.",
+    )
+    parser.add_argument(
+        "--collection",
+        choices=DEPLOYED_VIEW_BUILDER_REGISTRY.collection_names,
+        default=None,
+        help="If set, only loads this collection of view builders.",
+    )
+    parser.add_argument(
+        "--write-manifest",
+        default=False,
+        type=str_to_bool,
+        help="If True, regenerates the deployed views manifest.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+    args = parse_arguments()
+    main(args.project_id, args.collection, args.write_manifest)
@@ -136,6 +136,7 @@ class TagKey:
     INGEST_VIEW_EXPORT_TAG = "ingest_view_export_tag"
     INGEST_VIEW_MATERIALIZATION_TAG = "ingest_view_materialization_tag"
     RAW_DATA_IMPORT_TAG = "raw_data_import_tag"
+    RAW_DATA_FILE_TAG = "raw_data_file_tag"
 
     # Bigquery related tags
     VALIDATION_CHECK_TYPE = "validation_check_type"
@@ -147,6 +148,10 @@ class TagKey:
     METRIC_VIEW_EXPORT_NAME = "metric_view_export_name"
     SFTP_TASK_TYPE = "sftp_task_type"
 
+    # Firestore related tags
+    FIRESTORE_COLLECTION = "firestore_collection"
+    FIRESTORE_OPERATION = "firestore_operation"
+
     # Postgres related tags
     SCHEMA_TYPE = "schema_type"
     DATABASE_NAME = "database_name"
@@ -0,0 +1,99 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Helpers for reading from a slow iterator (e.g. one that downloads each item over
+the network) on a background thread while the caller processes earlier items.
+"""
+import queue
+import threading
+from typing import Any, Iterable, Iterator
+
+from recidiviz.utils import structured_logging
+from recidiviz.utils.types import T
+
+# How long the background thread waits on a full queue before checking whether the
+# consumer has stopped reading.
+_PUT_POLL_INTERVAL_SEC = 0.1
+
+
+class _EndOfItems:
+    pass
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch_in_background(
+    items: Iterable[T], max_prefetched_items: int
+) -> Iterator[T]:
+    """Returns an iterator over |items| that reads up to |max_prefetched_items| ahead
+    of the caller on a background thread, so the caller can process item N while item
+    N+1 is being produced. At most |max_prefetched_items| items are held in memory in
+    addition to the item the caller is processing.
+
+    The background thread is started when the caller first requests an item, so
+    nothing is read from |items| until then. Exceptions raised while producing items
+    are re-raised to the caller in order. If the caller stops iterating early, the
+    background thread stops reading from |items| as soon as it next tries to enqueue
+    an item.
+    """
+    if max_prefetched_items < 1:
+        raise ValueError(
+            f"Expected max_prefetched_items >= 1, found [{max_prefetched_items}]"
+        )
+
+    item_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_prefetched_items)
+    consumer_stopped = threading.Event()
+
+    def _put(item: Any) -> bool:
+        """Blocks until |item| is enqueued. Returns False if the consumer stopped
+        reading before there was room in the queue."""
+        while not consumer_stopped.is_set():
+            try:
+                item_queue.put(item, timeout=_PUT_POLL_INTERVAL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(_ProducerError(e))
+            return
+        _put(_EndOfItems())
+
+    def _consume() -> Iterator[T]:
+        try:
+            threading.Thread(
+                target=structured_logging.with_context(_produce), daemon=True
+            ).start()
+            while True:
+                item: Any = item_queue.get()
+                if isinstance(item, _EndOfItems):
+                    return
+                if isinstance(item, _ProducerError):
+                    raise item.error
+                yield item
+        finally:
+            consumer_stopped.set()
+
+    return _consume()
@@ -0,0 +1,398 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2022 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Decides which validation jobs need to run in a given validation run, and in what
+order.
+
+Uses results from previous runs stored in the validation_results table to:
+  1) Order jobs by their most recent runtime, longest first, so that a few slow
+     queries started at the end of a run don't dominate the total runtime. Jobs with
+     no known runtime are scheduled first.
+  2) Skip jobs whose most recent result was a SUCCESS, if nothing the job depends on
+     has changed since. Each job is summarized by an "inputs fingerprint", a hash of
+     the validation config, the validation queries and the last-modified times of all
+     tables the validation view reads from. If the fingerprint matches the one stored
+     with the previous SUCCESS result, that result is reused instead of re-running
+     the job.
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+import attr
+import cattr
+
+from recidiviz.big_query.big_query_address import BigQueryAddress
+from recidiviz.big_query.big_query_client import BigQueryClient, BigQueryClientImpl
+from recidiviz.big_query.big_query_view import BigQueryView, BigQueryViewBuilder
+from recidiviz.common import serialization
+from recidiviz.utils import environment, metadata
+from recidiviz.validation.checks.existence_check import ExistenceValidationResultDetails
+from recidiviz.validation.checks.sameness_check import (
+    SamenessPerRowValidationResultDetails,
+    SamenessPerViewValidationResultDetails,
+)
+from recidiviz.validation.validation_models import (
+    DataValidationJob,
+    DataValidationJobResult,
+    DataValidationJobResultDetails,
+    ValidationResultStatus,
+)
+from recidiviz.validation.validation_result_storage import (
+    VALIDATION_RESULTS_BIGQUERY_ADDRESS,
+)
+
+# Only results from this many days back are considered when scheduling a run
+VALIDATION_JOB_HISTORY_LOOKBACK_DAYS = 30
+
+_RESULT_DETAILS_CLASSES: List[Type[DataValidationJobResultDetails]] = [
+    ExistenceValidationResultDetails,
+    SamenessPerRowValidationResultDetails,
+    SamenessPerViewValidationResultDetails,
+]
+_RESULT_DETAILS_CLASSES_BY_NAME: Dict[str, Type[DataValidationJobResultDetails]] = {
+    cls.__name__: cls for cls in _RESULT_DETAILS_CLASSES
+}
+
+
+@attr.s(frozen=True, kw_only=True)
+class ValidationJobHistory:
+    """Information about previous runs of a single validation job."""
+
+    # The runtime of the most recent run of this job that actually ran, if known
+    last_runtime_seconds: Optional[float] = attr.ib()
+
+    # The status, inputs fingerprint and result details of the most recent result for
+    # this job.
+    last_result_status: Optional[ValidationResultStatus] = attr.ib()
+    last_inputs_fingerprint: Optional[str] = attr.ib()
+    last_result_details: Optional[DataValidationJobResultDetails] = attr.ib()
+
+    # The id of the run in which the most recent result was actually computed
+    last_result_run_id: str = attr.ib()
+
+
+@attr.s(frozen=True, kw_only=True)
+class CachedValidationJobResult:
+    """A result for a validation job that was reused from a previous run."""
+
+    result: DataValidationJobResult = attr.ib()
+    inputs_fingerprint: str = attr.ib()
+
+    # The id of the run in which this result was actually computed
+    cached_from_run_id: str = attr.ib()
+
+
+@attr.s(frozen=True, kw_only=True)
+class ValidationJobSchedule:
+    """The jobs to run in a validation run, along with results reused for jobs that do
+    not need to run."""
+
+    # Jobs to run, in the order they should be started
+    jobs_to_run: List[DataValidationJob] = attr.ib()
+
+    cached_results: List[CachedValidationJobResult] = attr.ib()
+
+    # Inputs fingerprints for jobs in |jobs_to_run|, if they could be computed, keyed by
+    # validation_job_key().
+    inputs_fingerprints: Dict[Tuple[str, str], str] = attr.ib()
+
+
+def validation_job_key(job: DataValidationJob) -> Tuple[str, str]:
+    """Returns a key that uniquely identifies a job within a validation run."""
+    return job.validation.validation_name, job.region_code
+
+
+def validation_job_history_query(project_id: str) -> str:
+    address = VALIDATION_RESULTS_BIGQUERY_ADDRESS
+    return f"""
+SELECT
+    validation_name,
+    region_code,
+    validation_result_status,
+    inputs_fingerprint,
+    result_details_type,
+    result_details,
+    COALESCE(cached_from_run_id, run_id) AS result_run_id,
+    -- Cached results do not have a runtime, so this picks the runtime of the most
+    -- recent run where the job actually ran.
+    LAST_VALUE(runtime_seconds IGNORE NULLS) OVER (
+        PARTITION BY validation_name, region_code
+        ORDER BY run_datetime
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+    ) AS last_runtime_seconds
+FROM `{project_id}.{address.dataset_id}.{address.table_id}`
+WHERE run_datetime >= DATETIME_SUB(
+    CURRENT_DATETIME(), INTERVAL {VALIDATION_JOB_HISTORY_LOOKBACK_DAYS} DAY
+)
+QUALIFY ROW_NUMBER() OVER (
+    PARTITION BY validation_name, region_code ORDER BY run_datetime DESC
+) = 1
+"""
+
+
+def _result_details_from_json(
+    result_details_type: Optional[str], result_details: Optional[str]
+) -> Optional[DataValidationJobResultDetails]:
+    if not result_details_type or not result_details:
+        return None
+    details_cls = _RESULT_DETAILS_CLASSES_BY_NAME.get(result_details_type)
+    if details_cls is None:
+        return None
+    converter = serialization.with_datetime_hooks(cattr.Converter())
+    return converter.structure(json.loads(result_details), details_cls)
+
+
+def load_validation_job_histories(
+    bq_client: BigQueryClient,
+) -> Dict[Tuple[str, str], ValidationJobHistory]:
+    """Returns the history for each validation job that has run recently, keyed by
+    (validation_name, region_code)."""
+    query_job = bq_client.run_query_async(
+        query_str=validation_job_history_query(metadata.project_id()),
+        use_query_cache=False,
+    )
+    histories = {}
+    for row in query_job:
+        status = row["validation_result_status"]
+        histories[(row["validation_name"], row["region_code"])] = ValidationJobHistory(
+            last_runtime_seconds=row["last_runtime_seconds"],
+            last_result_status=ValidationResultStatus(status) if status else None,
+            last_inputs_fingerprint=row["inputs_fingerprint"],
+            last_result_details=_result_details_from_json(
+                row["result_details_type"], row["result_details"]
+            ),
+            last_result_run_id=row["result_run_id"],
+        )
+    return histories
+
+
+class ValidationJobInputsFingerprinter:
+    """Computes inputs fingerprints for validation jobs. See the module docstring for
+    details."""
+
+    def __init__(
+        self,
+        *,
+        bq_client: BigQueryClient,
+        view_builders: Sequence[BigQueryViewBuilder],
+    ) -> None:
+        self.bq_client = bq_client
+        self._builders_by_address: Dict[BigQueryAddress, BigQueryViewBuilder] = {
+            builder.address: builder for builder in view_builders
+        }
+        self._views_by_address: Dict[BigQueryAddress, BigQueryView] = {}
+        # Last-modified time (in epoch millis) of every table in the datasets we have
+        # looked up so far.
+        self._last_modified_by_address: Dict[BigQueryAddress, int] = {}
+        self._loaded_dataset_ids: Set[str] = set()
+
+    def get_inputs_fingerprints(
+        self, jobs: Iterable[DataValidationJob]
+    ) -> Dict[Tuple[str, str], str]:
+        """Returns inputs fingerprints, keyed by validation_job_key(), for all of the
+        given jobs that can be fingerprinted. Jobs that run against sandbox datasets
+        are never fingerprinted."""
+        input_addresses_by_job = [
+            (
+                job,
+                self._get_input_addresses(
+                    job.validation.view_builder.build(address_overrides=None)
+                ),
+            )
+            for job in jobs
+            if job.address_overrides is None
+        ]
+        self._load_last_modified_times(
+            {
+                address.dataset_id
+                for _job, input_addresses in input_addresses_by_job
+                for address in input_addresses
+            }
+        )
+
+        fingerprints = {}
+        for job, input_addresses in input_addresses_by_job:
+            if any(
+                address not in self._last_modified_by_address
+                for address in input_addresses
+            ):
+                continue
+            fingerprints[validation_job_key(job)] = self._fingerprint(
+                job, input_addresses
+            )
+        return fingerprints
+
+    def _get_input_addresses(self, view: BigQueryView) -> Set[BigQueryAddress]:
+        """Returns the addresses of all tables the given view reads data from, looking
+        through any views that are not materialized."""
+        input_addresses: Set[BigQueryAddress] = set()
+        visited: Set[BigQueryAddress] = set()
+        to_visit = list(view.parent_tables)
+        while to_visit:
+            address = to_visit.pop()
+            if address in visited:
+                continue
+            visited.add(address)
+
+            builder = self._builders_by_address.get(address)
+            if builder is None:
+                input_addresses.add(address)
+            elif builder.materialized_address:
+                input_addresses.add(builder.materialized_address)
+            else:
+                if address not in self._views_by_address:
+                    self._views_by_address[address] = builder.build()
+                to_visit.extend(self._views_by_address[address].parent_tables)
+        return input_addresses
+
+    def _load_last_modified_times(self, dataset_ids: Set[str]) -> None:
+        dataset_ids_to_load = sorted(dataset_ids - self._loaded_dataset_ids)
+        if not dataset_ids_to_load:
+            return
+        project_id = metadata.project_id()
+        query_str = "\nUNION ALL\n".join(
+            f"SELECT dataset_id, table_id, last_modified_time "
+            f"FROM `{project_id}.{dataset_id}.__TABLES__`"
+            for dataset_id in dataset_ids_to_load
+        )
+        query_job = self.bq_client.run_query_async(
+            query_str=query_str, use_query_cache=False
+        )
+        for row in query_job:
+            self._last_modified_by_address[
+                BigQueryAddress(dataset_id=row["dataset_id"], table_id=row["table_id"])
+            ] = row["last_modified_time"]
+        self._loaded_dataset_ids.update(dataset_ids_to_load)
+
+    def _fingerprint(
+        self, job: DataValidationJob, input_addresses: Set[BigQueryAddress]
+    ) -> str:
+        validation_config = attr.asdict(
+            job.validation,
+            filter=lambda attribute, _value: attribute.name != "view_builder",
+        )
+        fingerprint_contents = {
+            "validation_config": validation_config,
+            "original_builder_query": job.original_builder_query_str(),
+            "error_builder_query": job.error_builder_query_str(),
+            "input_last_modified_times": sorted(
+                (
+                    address.dataset_id,
+                    address.table_id,
+                    self._last_modified_by_address[address],
+                )
+                for address in input_addresses
+            ),
+        }
+        return hashlib.sha256(
+            json.dumps(fingerprint_contents, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+
+class ValidationJobScheduler:
+    """Builds a ValidationJobSchedule for a set of validation jobs. See the module
+    docstring for details."""
+
+    def __init__(
+        self,
+        *,
+        histories: Dict[Tuple[str, str], ValidationJobHistory],
+        inputs_fingerprints: Dict[Tuple[str, str], str],
+    ) -> None:
+        self.histories = histories
+        self.inputs_fingerprints = inputs_fingerprints
+
+    @classmethod
+    def for_current_environment(
+        cls,
+        jobs: List[DataValidationJob],
+        view_builders: Sequence[BigQueryViewBuilder],
+    ) -> "ValidationJobScheduler":
+        """Returns a scheduler that uses stored validation results. Outside of GCP,
+        where validation results are not stored, returns a scheduler that runs all
+        jobs in their original order."""
+        if not environment.in_gcp():
+            return cls(histories={}, inputs_fingerprints={})
+
+        bq_client = BigQueryClientImpl()
+        try:
+            histories = load_validation_job_histories(bq_client)
+            inputs_fingerprints = ValidationJobInputsFingerprinter(
+                bq_client=bq_client, view_builders=view_builders
+            ).get_inputs_fingerprints(jobs)
+        except Exception as e:
+            # Scheduling is only an optimization, so we fall back to running
+            # everything rather than failing the whole validation run.
+            logging.warning(
+                "Failed to load validation job history, running all jobs: %r", e
+            )
+            return cls(histories={}, inputs_fingerprints={})
+        return cls(histories=histories, inputs_fingerprints=inputs_fingerprints)
+
+    def schedule(self, jobs: List[DataValidationJob]) -> ValidationJobSchedule:
+        jobs_to_run: List[DataValidationJob] = []
+        cached_results: List[CachedValidationJobResult] = []
+        for job in jobs:
+            cached_result = self._get_cached_result(job)
+            if cached_result:
+                cached_results.append(cached_result)
+            else:
+                jobs_to_run.append(job)
+
+        return ValidationJobSchedule(
+            jobs_to_run=sorted(jobs_to_run, key=self._sort_key),
+            cached_results=cached_results,
+            inputs_fingerprints={
+                validation_job_key(job): self.inputs_fingerprints[
+                    validation_job_key(job)
+                ]
+                for job in jobs_to_run
+                if validation_job_key(job) in self.inputs_fingerprints
+            },
+        )
+
+    def _get_history(self, job: DataValidationJob) -> Optional[ValidationJobHistory]:
+        return self.histories.get(validation_job_key(job))
+
+    def _get_cached_result(
+        self, job: DataValidationJob
+    ) -> Optional[CachedValidationJobResult]:
+        history = self._get_history(job)
+        inputs_fingerprint = self.inputs_fingerprints.get(validation_job_key(job))
+        if (
+            history is None
+            or inputs_fingerprint is None
+            or history.last_result_status != ValidationResultStatus.SUCCESS
+            or history.last_inputs_fingerprint != inputs_fingerprint
+            or history.last_result_details is None
+        ):
+            return None
+        return CachedValidationJobResult(
+            result=DataValidationJobResult(
+                validation_job=job, result_details=history.last_result_details
+            ),
+            inputs_fingerprint=inputs_fingerprint,
+            cached_from_run_id=history.last_result_run_id,
+        )
+
+    def _sort_key(self, job: DataValidationJob) -> Tuple[bool, float]:
+        """Sorts jobs with unknown runtimes first, then by descending runtime."""
+        history = self._get_history(job)
+        if history is None or history.last_runtime_seconds is None:
+            return False, 0.0
+        return True, -history.last_runtime_seconds
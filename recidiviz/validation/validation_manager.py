@@ -19,16 +19,18 @@
 import datetime
 import logging
 import re
+import time
 import uuid
 from concurrent import futures
 from http import HTTPStatus
-from typing import Any, Dict, List, Optional, Pattern, Tuple
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
 
 import pytz
 from flask import Blueprint
 from opencensus.stats import aggregation, measure, view
 
 from recidiviz.big_query.address_overrides import BigQueryAddressOverrides
+from recidiviz.big_query.big_query_view import BigQueryViewBuilder
 from recidiviz.cloud_tasks.utils import get_current_cloud_task_id
 from recidiviz.utils import metadata, monitoring, structured_logging
 from recidiviz.utils.auth.gae import requires_gae_auth
@@ -37,6 +39,10 @@ from recidiviz.validation.configured_validations import (
     get_validation_global_config,
     get_validation_region_configs,
 )
+from recidiviz.validation.validation_job_scheduler import (
+    ValidationJobScheduler,
+    validation_job_key,
+)
 from recidiviz.validation.validation_models import (
     DataValidationJob,
     DataValidationJobResult,
@@ -88,6 +94,10 @@ failed_validations_view = view.View(
 
 monitoring.register_views([failed_validations_view, failed_to_run_validations_view])
 
+# The maximum number of validation jobs to run at once. Each job runs one or more
+# BigQuery queries, so this bounds the number of concurrent validation queries.
+MAX_CONCURRENT_VALIDATION_JOBS = 16
+
 
 validation_manager_blueprint = Blueprint("validation_manager", __name__)
 
@@ -127,8 +137,11 @@ def execute_validation(
     Returns a tuple with the validation run_id and the number of validation jobs run.
     """
 
+    view_builders = deployed_view_builders(metadata.project_id())
+
     # Fetch collection of validation jobs to perform
     validation_jobs = _get_validations_jobs(
+        view_builders=view_builders,
         region_code_filter=region_code_filter,
         validation_name_filter=validation_name_filter,
         sandbox_dataset_prefix=sandbox_dataset_prefix,
@@ -143,26 +156,53 @@ def execute_validation(
         run_id,
     )
 
+    # Skip jobs whose inputs have not changed since their last successful result and
+    # order the rest so that the slowest jobs start first.
+    schedule = ValidationJobScheduler.for_current_environment(
+        validation_jobs, view_builders
+    ).schedule(validation_jobs)
+    logging.info(
+        "Reusing results from previous runs for [%s] validation jobs, running [%s]...",
+        len(schedule.cached_results),
+        len(schedule.jobs_to_run),
+    )
+
     # Perform all validations and track failures
     failed_to_run_validations: List[DataValidationJob] = []
     failed_soft_validations: List[DataValidationJobResult] = []
     failed_hard_validations: List[DataValidationJobResult] = []
-    results_to_store: List[ValidationResultForStorage] = []
-    with futures.ThreadPoolExecutor() as executor:
+    results_to_store: List[ValidationResultForStorage] = [
+        ValidationResultForStorage.from_validation_result(
+            run_id=run_id,
+            run_datetime=run_datetime,
+            result=cached_result.result,
+            inputs_fingerprint=cached_result.inputs_fingerprint,
+            cached_from_run_id=cached_result.cached_from_run_id,
+        )
+        for cached_result in schedule.cached_results
+    ]
+    with futures.ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_VALIDATION_JOBS
+    ) as executor:
         future_to_jobs = {
-            executor.submit(structured_logging.with_context(_run_job), job): job
-            for job in validation_jobs
+            executor.submit(structured_logging.with_context(_run_timed_job), job): job
+            for job in schedule.jobs_to_run
         }
 
         for future in futures.as_completed(future_to_jobs):
             job = future_to_jobs[future]
             try:
-                result: DataValidationJobResult = future.result()
+                result: DataValidationJobResult
+                result, runtime_seconds = future.result()
                 results_to_store.append(
                     ValidationResultForStorage.from_validation_result(
                         run_id=run_id,
                         run_datetime=run_datetime,
                         result=result,
+                        runtime_seconds=runtime_seconds,
+                        inputs_fingerprint=schedule.inputs_fingerprints.get(
+                            validation_job_key(job)
+                        ),
                     )
                 )
                 if result.validation_result_status == ValidationResultStatus.FAIL_HARD:
@@ -215,12 +255,11 @@ def execute_validation(
 
 
 def _get_validations_jobs(
+    view_builders: Sequence[BigQueryViewBuilder],
     region_code_filter: Optional[str] = None,
     validation_name_filter: Optional[Pattern] = None,
     sandbox_dataset_prefix: Optional[str] = None,
 ) -> List[DataValidationJob]:
-    view_builders = deployed_view_builders(metadata.project_id())
-
     sandbox_address_overrides = None
     if sandbox_dataset_prefix:
         sandbox_address_overrides = address_overrides_for_view_builders(
@@ -277,6 +316,14 @@ def _run_job(job: DataValidationJob) -> DataValidationJobResult:
     return job.validation.get_checker().run_check(job)
 
 
+def _run_timed_job(job: DataValidationJob) -> Tuple[DataValidationJobResult, float]:
+    """Runs the given job, returning the result along with the job runtime in
+    seconds."""
+    start = time.perf_counter()
+    result = _run_job(job)
+    return result, time.perf_counter() - start
+
+
 def _fetch_validation_jobs_to_perform(
     region_code_filter: Optional[str] = None,
     validation_name_filter: Optional[Pattern] = None,
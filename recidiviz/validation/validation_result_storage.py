@@ -68,6 +68,17 @@ class ValidationResultForStorage:
     validation_category: Optional[ValidationCategory] = attr.ib()
     exception_log: Optional[Exception] = attr.ib()
 
+    # How long the job took to run, if it ran in this validation run
+    runtime_seconds: Optional[float] = attr.ib(default=None)
+
+    # A hash of everything this result depends on, used to determine whether the job
+    # needs to be re-run in later validation runs. See validation_job_scheduler.py.
+    inputs_fingerprint: Optional[str] = attr.ib(default=None)
+
+    # If this result was reused from a previous run instead of re-running the job, the
+    # id of the run where the result was computed.
+    cached_from_run_id: Optional[str] = attr.ib(default=None)
+
     @trace_id.default
     def _trace_id_factory(self) -> str:
         return execution_context.get_opencensus_tracer().span_context.trace_id
@@ -84,6 +95,9 @@ class ValidationResultForStorage:
         run_id: str,
         run_datetime: datetime.datetime,
         result: DataValidationJobResult,
+        runtime_seconds: Optional[float] = None,
+        inputs_fingerprint: Optional[str] = None,
+        cached_from_run_id: Optional[str] = None,
     ) -> "ValidationResultForStorage":
         return cls(
             run_id=run_id,
@@ -100,6 +114,9 @@ class ValidationResultForStorage:
             result_details=result.result_details,
             validation_category=result.validation_job.validation.validation_category,
             exception_log=None,
+            runtime_seconds=runtime_seconds,
+            inputs_fingerprint=inputs_fingerprint,
+            cached_from_run_id=cached_from_run_id,
         )
 
     @classmethod
@@ -14,74 +14,363 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
-"""Views that are regularly updated with the deploy and rematerialized with metric exports.."""
-import itertools
+"""Views that are regularly updated with the deploy and rematerialized with metric exports.
+
+Collecting every deployed view builder means importing and running the view config
+modules for all of our view datasets, which is slow. Builders are therefore collected
+lazily through the DeployedViewBuilderRegistry, which only imports a view config module
+once one of its builders is needed, memoizes the collected builders per project and uses
+a prebuilt manifest of dataset_id -> collection names so that looking up a single view
+only loads the collections that can contain it.
+
+To regenerate the manifest after adding a view dataset, or to see how long each
+collection takes to load, run:
+    python -m recidiviz.tools.profile_deployed_view_builders --write-manifest True
+"""
+import importlib
+import json
 import logging
-from typing import Dict, List, Set
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
+import attr
+
+from recidiviz.big_query.big_query_address import BigQueryAddress
 from recidiviz.big_query.big_query_view import BigQueryViewBuilder
-from recidiviz.calculator.query.county.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as COUNTY_VIEW_BUILDERS,
-)
-from recidiviz.calculator.query.experiments.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as EXPERIMENTS_VIEW_BUILDERS,
-)
-from recidiviz.calculator.query.externally_shared_views.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as EXTERNALLY_SHARED_VIEW_BUILDERS,
-)
-from recidiviz.calculator.query.justice_counts.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as JUSTICE_COUNTS_VIEW_BUILDERS,
-)
-from recidiviz.calculator.query.state.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as STATE_VIEW_BUILDERS,
-)
-from recidiviz.case_triage.views.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as CASE_TRIAGE_VIEW_BUILDERS,
-)
-from recidiviz.ingest.direct.views.view_config import (
-    get_view_builders_for_views_to_update as get_direct_ingest_view_builders,
-)
-from recidiviz.ingest.views.view_config import (
-    VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as INGEST_METADATA_VIEW_BUILDERS,
-)
 from recidiviz.persistence.database.schema_utils import SchemaType
-from recidiviz.task_eligibility.view_config import (
-    get_view_builders_for_views_to_update as get_task_eligibility_view_builders,
-)
-from recidiviz.utils import environment
-from recidiviz.validation.views.view_config import (
-    METADATA_VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as VALIDATION_METADATA_VIEW_BUILDERS,
-)
-from recidiviz.validation.views.view_config import (
-    get_view_builders_for_views_to_update as get_validation_view_builders,
+from recidiviz.utils import environment, metadata
+
+DEPLOYED_VIEWS_MANIFEST_PATH = os.path.join(
+    os.path.dirname(__file__), "deployed_views_manifest.json"
 )
 
+# If loading all deployed view builders from a cold start takes longer than this, we
+# log a warning that points at the profiling script.
+DEPLOYED_VIEW_BUILDERS_LOAD_TIME_BUDGET_SECONDS = 30.0
 
-def _all_deployed_view_builders() -> List[BigQueryViewBuilder]:
-    logging.info("Gathering all deployed view builders...")
-    return list(
-        itertools.chain(
-            CASE_TRIAGE_VIEW_BUILDERS,
-            COUNTY_VIEW_BUILDERS,
-            get_direct_ingest_view_builders(),
-            EXPERIMENTS_VIEW_BUILDERS,
-            EXTERNALLY_SHARED_VIEW_BUILDERS,
-            JUSTICE_COUNTS_VIEW_BUILDERS,
-            INGEST_METADATA_VIEW_BUILDERS,
-            STATE_VIEW_BUILDERS,
-            get_task_eligibility_view_builders(),
-            get_validation_view_builders(),
-            VALIDATION_METADATA_VIEW_BUILDERS,
+
+@attr.s(frozen=True)
+class DeployedViewBuilderCollection:
+    """A group of deployed view builders exported by a single view config module,
+    either as a list constant or as a function that takes no arguments.
+    """
+
+    # Name used to refer to this collection in the manifest and in profiling reports
+    name: str = attr.ib()
+    module_name: str = attr.ib()
+    attribute_name: str = attr.ib()
+
+    def load(self) -> Tuple[List[BigQueryViewBuilder], float, float]:
+        """Imports the module for this collection and collects its builders. Returns
+        the builders, along with the seconds spent importing and collecting.
+        """
+        start = time.perf_counter()
+        builders = getattr(
+            importlib.import_module(self.module_name), self.attribute_name
         )
-    )
+        imported = time.perf_counter()
+        if callable(builders):
+            builders = builders()
+        builders = list(builders)
+        return builders, imported - start, time.perf_counter() - imported
+
+
+DEPLOYED_VIEW_BUILDER_COLLECTIONS: List[DeployedViewBuilderCollection] = [
+    DeployedViewBuilderCollection(
+        name="case_triage",
+        module_name="recidiviz.case_triage.views.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="county",
+        module_name="recidiviz.calculator.query.county.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="direct_ingest",
+        module_name="recidiviz.ingest.direct.views.view_config",
+        attribute_name="get_view_builders_for_views_to_update",
+    ),
+    DeployedViewBuilderCollection(
+        name="experiments",
+        module_name="recidiviz.calculator.query.experiments.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="externally_shared_views",
+        module_name="recidiviz.calculator.query.externally_shared_views.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="justice_counts",
+        module_name="recidiviz.calculator.query.justice_counts.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="ingest_metadata",
+        module_name="recidiviz.ingest.views.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="state",
+        module_name="recidiviz.calculator.query.state.view_config",
+        attribute_name="VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+    DeployedViewBuilderCollection(
+        name="task_eligibility",
+        module_name="recidiviz.task_eligibility.view_config",
+        attribute_name="get_view_builders_for_views_to_update",
+    ),
+    DeployedViewBuilderCollection(
+        name="validation",
+        module_name="recidiviz.validation.views.view_config",
+        attribute_name="get_view_builders_for_views_to_update",
+    ),
+    DeployedViewBuilderCollection(
+        name="validation_metadata",
+        module_name="recidiviz.validation.views.view_config",
+        attribute_name="METADATA_VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE",
+    ),
+]
+
+
+@attr.s(frozen=True)
+class ViewBuilderCollectionLoadTiming:
+    """How long it took to load a single DeployedViewBuilderCollection."""
+
+    collection_name: str = attr.ib()
+    # Time spent importing the collection's module, including any modules it imports
+    # that were not already loaded by an earlier collection.
+    import_seconds: float = attr.ib()
+    # Time spent running the collection's function (if any) and building the list.
+    collect_seconds: float = attr.ib()
+    view_builder_count: int = attr.ib()
+
+    @property
+    def total_seconds(self) -> float:
+        return self.import_seconds + self.collect_seconds
+
+
+class DeployedViewBuilderRegistry:
+    """Lazily collects and memoizes deployed view builders.
+
+    Which builders are collected depends on the project and environment we are running
+    in (e.g. playground regions are not deployed to production), so collected builders
+    are cached per (project_id, GCP environment).
+    """
+
+    def __init__(
+        self,
+        collections: Optional[Sequence[DeployedViewBuilderCollection]] = None,
+        manifest_path: str = DEPLOYED_VIEWS_MANIFEST_PATH,
+    ) -> None:
+        if collections is None:
+            collections = DEPLOYED_VIEW_BUILDER_COLLECTIONS
+        self._collections = {collection.name: collection for collection in collections}
+        self._manifest_path = manifest_path
+        self._manifest: Optional[Dict[str, List[str]]] = None
+        self._lock = threading.RLock()
+        self._builders_by_collection: Dict[
+            Tuple[str, Optional[str], str], List[BigQueryViewBuilder]
+        ] = {}
+        self._builders_by_address: Dict[
+            Tuple[str, Optional[str], str],
+            Dict[BigQueryAddress, BigQueryViewBuilder],
+        ] = {}
+        # Builders filtered by the project they are deployed to, keyed by
+        # (current project_id, GCP environment, project_id to deploy to).
+        self._builders_by_deploy_project: Dict[
+            Tuple[str, Optional[str], str], List[BigQueryViewBuilder]
+        ] = {}
+        self._load_timings: Dict[str, ViewBuilderCollectionLoadTiming] = {}
+
+    @property
+    def collection_names(self) -> List[str]:
+        return list(self._collections)
+
+    @property
+    def load_timings(self) -> List[ViewBuilderCollectionLoadTiming]:
+        """Timings for the first load of each collection in this process, in the order
+        the collections were loaded.
+        """
+        return list(self._load_timings.values())
+
+    def clear(self) -> None:
+        """Drops all memoized builders. Modules that have already been imported stay
+        imported, so collecting again only pays the cost of running collectors.
+        """
+        with self._lock:
+            self._builders_by_collection.clear()
+            self._builders_by_address.clear()
+            self._builders_by_deploy_project.clear()
+
+    def builders_for_collection(
+        self, collection_name: str
+    ) -> List[BigQueryViewBuilder]:
+        """Returns all builders in the given collection for the current project."""
+        return list(self._load_collection(collection_name))
+
+    def all_view_builders(self) -> List[BigQueryViewBuilder]:
+        """Returns all deployed view builders for the current project, regardless of
+        whether they are deployed to that project.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            needs_load = any(
+                self._cache_key(name) not in self._builders_by_collection
+                for name in self._collections
+            )
+            if needs_load:
+                logging.info("Gathering all deployed view builders...")
+            builders = [
+                builder
+                for name in self._collections
+                for builder in self._load_collection(name)
+            ]
+            elapsed = time.perf_counter() - start
+            if needs_load and elapsed > DEPLOYED_VIEW_BUILDERS_LOAD_TIME_BUDGET_SECONDS:
+                logging.warning(
+                    "Gathering all deployed view builders took [%.1f]s, which exceeds "
+                    "the budget of [%.1f]s. Run "
+                    "recidiviz.tools.profile_deployed_view_builders to see which "
+                    "collections are slow.",
+                    elapsed,
+                    DEPLOYED_VIEW_BUILDERS_LOAD_TIME_BUDGET_SECONDS,
+                )
+            return builders
+
+    def deployed_view_builders(self, project_id: str) -> List[BigQueryViewBuilder]:
+        """Returns the deployed view builders for the current project that are
+        deployed to |project_id|.
+        """
+        key = self._cache_key(project_id)
+        with self._lock:
+            if key not in self._builders_by_deploy_project:
+                self._builders_by_deploy_project[key] = [
+                    builder
+                    for builder in self.all_view_builders()
+                    if builder.should_deploy_in_project(project_id)
+                ]
+            return list(self._builders_by_deploy_project[key])
+
+    def view_builder_for_address(
+        self, address: BigQueryAddress
+    ) -> Optional[BigQueryViewBuilder]:
+        """Returns the deployed view builder with the given address, or None if there
+        is no such view. Only the collections that the manifest lists for the
+        address's dataset are loaded.
+        """
+        collection_names = self._manifest_collections_for_dataset(address.dataset_id)
+        if collection_names is None:
+            logging.warning(
+                "Dataset [%s] not found in the deployed views manifest, loading all "
+                "collections. The manifest may be stale.",
+                address.dataset_id,
+            )
+            collection_names = list(self._collections)
+
+        for name in collection_names:
+            builder = self._index_collection(name).get(address)
+            if builder:
+                return builder
+        return None
+
+    def _manifest_collections_for_dataset(self, dataset_id: str) -> Optional[List[str]]:
+        with self._lock:
+            if self._manifest is None:
+                try:
+                    with open(self._manifest_path, encoding="utf-8") as f:
+                        self._manifest = json.load(f)
+                except FileNotFoundError:
+                    logging.warning(
+                        "No deployed views manifest found at [%s]", self._manifest_path
+                    )
+                    self._manifest = {}
+            collection_names = self._manifest.get(dataset_id)
+        if collection_names is None:
+            return None
+        return [name for name in collection_names if name in self._collections]
+
+    def build_manifest(self) -> Dict[str, List[str]]:
+        """Builds the dataset_id -> collection names manifest from the builders that
+        are collected for the current project.
+        """
+        manifest: Dict[str, Set[str]] = {}
+        for name in self._collections:
+            for builder in self._load_collection(name):
+                manifest.setdefault(builder.dataset_id, set()).add(name)
+        return {
+            dataset_id: sorted(collection_names)
+            for dataset_id, collection_names in sorted(manifest.items())
+        }
+
+    @staticmethod
+    def _cache_key(name: str) -> Tuple[str, Optional[str], str]:
+        return metadata.project_id(), environment.get_gcp_environment(), name
+
+    def _load_collection(self, collection_name: str) -> List[BigQueryViewBuilder]:
+        key = self._cache_key(collection_name)
+        with self._lock:
+            if key not in self._builders_by_collection:
+                builders, import_seconds, collect_seconds = self._collections[
+                    collection_name
+                ].load()
+                if collection_name not in self._load_timings:
+                    self._load_timings[
+                        collection_name
+                    ] = ViewBuilderCollectionLoadTiming(
+                        collection_name=collection_name,
+                        import_seconds=import_seconds,
+                        collect_seconds=collect_seconds,
+                        view_builder_count=len(builders),
+                    )
+                self._builders_by_collection[key] = builders
+            return self._builders_by_collection[key]
+
+    def _index_collection(
+        self, collection_name: str
+    ) -> Dict[BigQueryAddress, BigQueryViewBuilder]:
+        key = self._cache_key(collection_name)
+        with self._lock:
+            if key not in self._builders_by_address:
+                self._builders_by_address[key] = {
+                    builder.address: builder
+                    for builder in self._load_collection(collection_name)
+                }
+            return self._builders_by_address[key]
+
+
+DEPLOYED_VIEW_BUILDER_REGISTRY = DeployedViewBuilderRegistry()
+
+
+def _all_deployed_view_builders() -> List[BigQueryViewBuilder]:
+    return DEPLOYED_VIEW_BUILDER_REGISTRY.all_view_builders()
 
 
 def deployed_view_builders(project_id: str) -> List[BigQueryViewBuilder]:
-    return [
-        builder
-        for builder in _all_deployed_view_builders()
-        if builder.should_deploy_in_project(project_id)
-    ]
+    return DEPLOYED_VIEW_BUILDER_REGISTRY.deployed_view_builders(project_id)
+
+
+def deployed_view_builder_for_address(
+    project_id: str, address: BigQueryAddress
+) -> Optional[BigQueryViewBuilder]:
+    """Returns the builder for the view at |address| if that view is deployed to
+    |project_id|, otherwise None. Only imports the view config modules that can hold
+    views in the address's dataset.
+    """
+    builder = DEPLOYED_VIEW_BUILDER_REGISTRY.view_builder_for_address(address)
+    if builder and builder.should_deploy_in_project(project_id):
+        return builder
+    return None
+
+
+def clear_deployed_view_builders_cache() -> None:
+    """Drops all memoized deployed view builders so that the next call collects them
+    again, e.g. after a test modifies a view config.
+    """
+    DEPLOYED_VIEW_BUILDER_REGISTRY.clear()
 
 
 # Full list of all deployed view builders
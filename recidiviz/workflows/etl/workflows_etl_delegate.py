@@ -20,11 +20,16 @@ import abc
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from google.cloud import firestore
 
 from recidiviz.cloud_storage.gcsfs_factory import GcsfsFactory
 from recidiviz.cloud_storage.gcsfs_path import GcsfsFilePath
-from recidiviz.firestore.firestore_client import FirestoreClientImpl
+from recidiviz.firestore.firestore_client import (
+    FirestoreBatchCommitter,
+    FirestoreClientImpl,
+)
 from recidiviz.metrics.export.export_config import WORKFLOWS_VIEWS_OUTPUT_DIRECTORY_URI
 from recidiviz.utils import metadata
 from recidiviz.utils.string import StrictStringFormatter
@@ -112,37 +117,47 @@ class WorkflowsFirestoreETLDelegate(WorkflowsETLDelegate):
             collection_name,
         )
         firestore_client = FirestoreClientImpl()
-        batch = firestore_client.batch()
         firestore_collection = firestore_client.get_collection(collection_name)
-        num_records_to_write = 0
-        total_records_written = 0
 
         etl_timestamp = datetime.now(timezone.utc)
 
-        # step 1: load new documents
-        for file_stream in self.get_file_stream(state_code, filename):
-            while line := file_stream.readline():
-                row_id, document_fields = self.transform_row(line)
-                if row_id is None or document_fields is None:
-                    continue
-                document_id = f"{state_code.lower()}_{row_id}"
-                new_document = {
-                    **document_fields,
-                    self.timestamp_key: etl_timestamp,
-                }
-                batch.set(firestore_collection.document(document_id), new_document)
-                num_records_to_write += 1
-                total_records_written += 1
-
-                if num_records_to_write >= MAX_FIRESTORE_RECORDS_PER_BATCH:
-                    batch.commit()
-                    batch = firestore_client.batch()
-                    num_records_to_write = 0
-
-        batch.commit()
+        def batch_builder(
+            lines: List[str],
+        ) -> Callable[[], Tuple[firestore.WriteBatch, int]]:
+            def build_batch() -> Tuple[firestore.WriteBatch, int]:
+                batch = firestore_client.batch()
+                num_records = 0
+                for line in lines:
+                    row_id, document_fields = self.transform_row(line)
+                    if row_id is None or document_fields is None:
+                        continue
+                    document_id = f"{state_code.lower()}_{row_id}"
+                    new_document = {
+                        **document_fields,
+                        self.timestamp_key: etl_timestamp,
+                    }
+                    batch.set(firestore_collection.document(document_id), new_document)
+                    num_records += 1
+                return batch, num_records
+
+            return build_batch
+
+        # step 1: load new documents. Rows are transformed and committed in batches
+        # on worker threads, while we keep reading the file.
+        with FirestoreBatchCommitter(collection_name, "written") as committer:
+            for file_stream in self.get_file_stream(state_code, filename):
+                lines: List[str] = []
+                while line := file_stream.readline():
+                    lines.append(line)
+                    if len(lines) >= MAX_FIRESTORE_RECORDS_PER_BATCH:
+                        committer.submit(batch_builder(lines))
+                        lines = []
+                if lines:
+                    committer.submit(batch_builder(lines))
+
         logging.info(
             '%d records written to Firestore collection "%s".',
-            total_records_written,
+            committer.document_count,
             collection_name,
         )
 
@@ -14,13 +14,44 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
-from typing import Any
+from typing import Any, List, Optional, Union
+
+import numpy as np
+import pandas as pd
 
 class DataType:
     pass
 
+class Field:
+    type: DataType
+
+class Schema:
+    names: List[str]
+    types: List[DataType]
+    def field(self, i: Union[int, str]) -> Field: ...
+    def __len__(self) -> int: ...
+
+class ChunkedArray:
+    def to_pylist(self) -> List[Any]: ...
+
+class Table:
+    schema: Schema
+    @staticmethod
+    def from_pandas(
+        df: pd.DataFrame,
+        schema: Optional[Schema] = None,
+        preserve_index: Optional[bool] = None,
+    ) -> Table: ...
+    def column(self, i: Union[int, str]) -> ChunkedArray: ...
+    def to_pandas(self) -> pd.DataFrame: ...
+
 class Scalar:
     def cast(self, data_type: DataType) -> Scalar: ...
 
 def null() -> DataType: ...
+def string() -> DataType: ...
+def int64() -> DataType: ...
+def timestamp(unit: str) -> DataType: ...
+def from_numpy_dtype(dtype: np.dtype) -> DataType: ...
+def schema(fields: List[Any]) -> Schema: ...
 def scalar(value: Any) -> Scalar: ...
@@ -15,14 +15,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 from io import BytesIO
-from typing import Union
+from typing import Any, Union
 
-from pyarrow import DataType
-
-class Field:
-    type: DataType
-
-class Schema:
-    def field(self, i: Union[int, str]) -> Field: ...
+from pyarrow import Schema, Table
 
 def read_schema(file: BytesIO) -> Schema: ...
+def read_table(source: Union[str, BytesIO]) -> Table: ...
+def write_table(table: Table, where: Union[str, BytesIO], **kwargs: Any) -> None: ...